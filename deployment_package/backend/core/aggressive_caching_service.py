@@ -3,16 +3,228 @@ Aggressive Caching Service
 Implements multi-layer caching strategy to reduce redundant calculations.
 """
 import logging
+import pickle
+import sys
+import threading
 import time
 import hashlib
+import inspect
 import json
-from typing import Dict, Any, Optional, Callable, List
+from collections import OrderedDict, defaultdict
+from fnmatch import fnmatchcase
+from typing import Dict, Any, Iterable, Optional, Callable, List, Tuple
 from functools import wraps
+from itertools import islice
+from django.conf import settings
 from django.core.cache import cache
 from django.core.cache.backends.base import DEFAULT_TIMEOUT
 
+from .cache_tags import CacheTagRegistry, InvalidationBus, get_tag_registry
+from . import single_flight
+
 logger = logging.getLogger(__name__)
 
+# Memory tier defaults (overridable via settings.AGGRESSIVE_CACHE_MEMORY_*)
+DEFAULT_MEMORY_TTL = 60
+DEFAULT_MEMORY_MAX_ENTRIES = 10_000
+DEFAULT_MEMORY_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_SWEEP_INTERVAL = 30.0
+# Containers are sized from at most this many of their items, a quarter as
+# many per level of nesting (but at least _SIZE_MIN_SAMPLE_ITEMS), down to
+# _SIZE_MAX_DEPTH levels
+_SIZE_SAMPLE_ITEMS = 64
+_SIZE_MIN_SAMPLE_ITEMS = 4
+_SIZE_MAX_DEPTH = 4
+
+_MISSING = object()
+
+
+def _key_prefix(cache_key: str) -> str:
+    """Stats bucket for a key: the part before the first ':' (e.g. 'kelly')"""
+    return cache_key.split(':', 1)[0]
+
+
+def _estimate_size(value: Any, depth: int = 0) -> int:
+    """
+    Approximate in-memory footprint of a cached value, in bytes.
+
+    sys.getsizeof of the value plus, recursively, its items down to
+    _SIZE_MAX_DEPTH levels. Large containers are sized from a sample of their
+    items (fewer at each level down) and extrapolated; non-container values
+    such as DataFrames report their own __sizeof__. Nothing is serialized, so
+    this is cheap enough for every set and L2->L1 promotion;
+    MemoryCacheTier.measure_bytes() pickles the entries when an exact
+    serialized size is wanted.
+    """
+    size = sys.getsizeof(value, 0)
+    if depth >= _SIZE_MAX_DEPTH:
+        return size
+    limit = max(_SIZE_MIN_SAMPLE_ITEMS, _SIZE_SAMPLE_ITEMS >> (2 * depth))
+    if isinstance(value, dict):
+        sample = list(islice(value.items(), limit))
+        item_bytes = sum(_estimate_size(k, depth + 1) + _estimate_size(v, depth + 1) for k, v in sample)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        sample = list(islice(value, limit))
+        item_bytes = sum(_estimate_size(v, depth + 1) for v in sample)
+    else:
+        return size
+    if sample:
+        size += item_bytes * len(value) // len(sample)
+    return size
+
+
+class MemoryCacheTier:
+    """
+    Bounded, thread-safe in-process cache with LRU eviction and TTL.
+
+    Limits both the number of entries and their approximate total size, so a
+    long-lived worker cannot grow without bound. Expired entries are dropped
+    lazily on read and by a periodic sweep piggy-backed on cache traffic.
+    Hit/miss/eviction/expiry counters are kept per key prefix.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MEMORY_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MEMORY_MAX_BYTES,
+        sweep_interval: float = DEFAULT_SWEEP_INTERVAL,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        # key -> (value, expires_at, size_bytes); order = least recently used first
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._last_sweep = time.monotonic()
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+        )
+
+    def get(self, cache_key: str, default: Any = None) -> Any:
+        """Return the cached value, or default if missing/expired"""
+        now = time.monotonic()
+        with self._lock:
+            self._maybe_sweep(now)
+            entry = self._entries.get(cache_key)
+            stats = self._stats[_key_prefix(cache_key)]
+            if entry is None:
+                stats['misses'] += 1
+                return default
+            if entry[1] <= now:
+                self._remove(cache_key)
+                stats['expirations'] += 1
+                stats['misses'] += 1
+                return default
+            self._entries.move_to_end(cache_key)
+            stats['hits'] += 1
+            return entry[0]
+
+    def set(self, cache_key: str, value: Any, ttl: float, size: Optional[int] = None) -> bool:
+        """
+        Store value for ttl seconds, evicting least recently used entries
+        as needed. Returns False if the value alone exceeds max_bytes.
+
+        size overrides the estimated footprint (e.g. a known payload length).
+        """
+        if size is None:
+            size = _estimate_size(value)
+        now = time.monotonic()
+        with self._lock:
+            self._maybe_sweep(now)
+            if cache_key in self._entries:
+                self._remove(cache_key)
+            if size > self.max_bytes:
+                logger.debug(f"Memory tier: {cache_key} too large to cache ({size} bytes)")
+                return False
+            self._entries[cache_key] = (value, now + ttl, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                evicted_key, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats[_key_prefix(evicted_key)]['evictions'] += 1
+            return True
+
+    def delete(self, cache_key: str) -> bool:
+        with self._lock:
+            if cache_key in self._entries:
+                self._remove(cache_key)
+                return True
+            return False
+
+    def delete_matching(self, predicate: Callable[[str], bool]) -> int:
+        """Delete every key for which predicate(key) is true"""
+        with self._lock:
+            keys = [k for k in self._entries if predicate(k)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def sweep(self) -> int:
+        """Drop all expired entries; returns how many were removed"""
+        now = time.monotonic()
+        with self._lock:
+            self._last_sweep = now
+            expired = [k for k, (_, expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                self._remove(key)
+                self._stats[_key_prefix(key)]['expirations'] += 1
+            return len(expired)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def measure_bytes(self) -> int:
+        """
+        Serialized size of every live entry.
+
+        Pickles each value, so it is meant for explicit memory accounting
+        (diagnostics, stats with deep=True), not for the cache hot path.
+        """
+        with self._lock:
+            values = [value for value, _, _ in self._entries.values()]
+        total = 0
+        for value in values:
+            try:
+                total += len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+            except Exception:
+                total += _estimate_size(value)
+        return total
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, cache_key: str) -> bool:
+        return self.get(cache_key, _MISSING) is not _MISSING
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'prefixes': {prefix: dict(counts) for prefix, counts in self._stats.items()},
+            }
+
+    def _remove(self, cache_key: str) -> None:
+        _, _, size = self._entries.pop(cache_key)
+        self._bytes -= size
+
+    def _maybe_sweep(self, now: float) -> None:
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep()
+
 
 class AggressiveCachingService:
     """
@@ -22,17 +234,54 @@ class AggressiveCachingService:
     3. Database query cache (for expensive queries)
     """
     
-    def __init__(self):
-        self.memory_cache = {}  # In-memory cache (per-process)
-        self.memory_cache_ttl = {}  # TTL for memory cache entries
+    def __init__(
+        self,
+        memory_max_entries: Optional[int] = None,
+        memory_max_bytes: Optional[int] = None,
+        memory_ttl: Optional[int] = None,
+        redis_client=None,
+        enable_pubsub: Optional[bool] = None,
+    ):
+        # In-memory cache (per-process, bounded LRU with TTL)
+        self.memory_cache = MemoryCacheTier(
+            max_entries=memory_max_entries or getattr(
+                settings, 'AGGRESSIVE_CACHE_MEMORY_MAX_ENTRIES', DEFAULT_MEMORY_MAX_ENTRIES
+            ),
+            max_bytes=memory_max_bytes or getattr(
+                settings, 'AGGRESSIVE_CACHE_MEMORY_MAX_BYTES', DEFAULT_MEMORY_MAX_BYTES
+            ),
+        )
         self.default_ttl = 300  # 5 minutes default
         
         # Cache layers configuration
         self.cache_layers = {
-            'memory': {'enabled': True, 'ttl': 60},  # 1 minute
+            'memory': {
+                'enabled': True,
+                'ttl': memory_ttl or getattr(settings, 'AGGRESSIVE_CACHE_MEMORY_TTL_S', DEFAULT_MEMORY_TTL),
+            },
             'redis': {'enabled': True, 'ttl': 300},  # 5 minutes
             'database': {'enabled': True, 'ttl': 600}  # 10 minutes
         }
+        # Redis-layer hit/miss counters per key prefix
+        self._redis_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {'hits': 0, 'misses': 0})
+        
+        # Tag index + peer invalidation share the raw client behind the default cache.
+        # The default service uses the module-level registry, so tags registered by
+        # helpers (raha_query_cache, risk types) are seen even without Redis.
+        if redis_client is None:
+            self.tags = get_tag_registry()
+            redis_client = self.tags.redis
+        else:
+            self.tags = CacheTagRegistry(redis_client)
+        self.invalidation_bus = InvalidationBus(redis_client)
+        # Request coalescing: one computation per key per process, optionally per fleet
+        self.flight = single_flight.SingleFlight()
+        self.lock = single_flight.DistributedLock(redis_client)
+        self.distributed_locks = getattr(settings, 'AGGRESSIVE_CACHE_DISTRIBUTED_LOCKS', False)
+        if enable_pubsub is None:
+            enable_pubsub = getattr(settings, 'AGGRESSIVE_CACHE_PUBSUB_INVALIDATION', True)
+        if enable_pubsub:
+            self.invalidation_bus.start(self._on_peer_invalidation)
     
     def get_cache_key(self, prefix: str, *args, **kwargs) -> str:
         """
@@ -72,28 +321,25 @@ class AggressiveCachingService:
         """
         # Layer 1: Memory cache (fastest)
         if self.cache_layers['memory']['enabled']:
-            if cache_key in self.memory_cache:
-                ttl_entry = self.memory_cache_ttl.get(cache_key, 0)
-                if time.time() < ttl_entry:
-                    logger.debug(f"Memory cache hit: {cache_key}")
-                    return self.memory_cache[cache_key]
-                else:
-                    # Expired, remove from memory cache
-                    del self.memory_cache[cache_key]
-                    del self.memory_cache_ttl[cache_key]
+            cached_value = self.memory_cache.get(cache_key)
+            if cached_value is not None:
+                logger.debug(f"Memory cache hit: {cache_key}")
+                return cached_value
         
         # Layer 2: Redis cache (shared)
         if self.cache_layers['redis']['enabled']:
             try:
                 cached_value = cache.get(cache_key)
+                redis_stats = self._redis_stats[_key_prefix(cache_key)]
                 if cached_value is not None:
+                    redis_stats['hits'] += 1
                     logger.debug(f"Redis cache hit: {cache_key}")
                     # Also store in memory cache for faster access
                     if self.cache_layers['memory']['enabled']:
-                        self.memory_cache[cache_key] = cached_value
                         memory_ttl = self.cache_layers['memory']['ttl']
-                        self.memory_cache_ttl[cache_key] = time.time() + memory_ttl
+                        self.memory_cache.set(cache_key, cached_value, memory_ttl)
                     return cached_value
+                redis_stats['misses'] += 1
             except Exception as e:
                 logger.warning(f"Redis cache error for {cache_key}: {e}")
         
@@ -103,7 +349,8 @@ class AggressiveCachingService:
         self,
         cache_key: str,
         value: Any,
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None
     ) -> None:
         """
         Set cached value in multiple layers.
@@ -112,15 +359,15 @@ class AggressiveCachingService:
             cache_key: Cache key
             value: Value to cache
             ttl: Time to live (optional, uses default if not provided)
+            tags: Invalidation tags (e.g. 'user:42', 'symbol:AAPL')
         """
         if ttl is None:
             ttl = self.default_ttl
         
         # Layer 1: Memory cache
         if self.cache_layers['memory']['enabled']:
-            self.memory_cache[cache_key] = value
             memory_ttl = min(ttl, self.cache_layers['memory']['ttl'])
-            self.memory_cache_ttl[cache_key] = time.time() + memory_ttl
+            self.memory_cache.set(cache_key, value, memory_ttl)
         
         # Layer 2: Redis cache
         if self.cache_layers['redis']['enabled']:
@@ -129,24 +376,29 @@ class AggressiveCachingService:
                 logger.debug(f"Cached in Redis: {cache_key} (TTL: {ttl}s)")
             except Exception as e:
                 logger.warning(f"Redis cache set error for {cache_key}: {e}")
+        
+        if tags:
+            self.tags.register(cache_key, tags, ttl)
     
     def invalidate(self, cache_key: str) -> None:
-        """Invalidate cache key from all layers"""
+        """Invalidate cache key from all layers (including peers' memory tiers)"""
         # Memory cache
-        if cache_key in self.memory_cache:
-            del self.memory_cache[cache_key]
-            if cache_key in self.memory_cache_ttl:
-                del self.memory_cache_ttl[cache_key]
+        self.memory_cache.delete(cache_key)
         
         # Redis cache
         try:
             cache.delete(cache_key)
         except Exception as e:
             logger.warning(f"Redis cache delete error for {cache_key}: {e}")
+        
+        self.invalidation_bus.publish(keys=[cache_key])
     
     def invalidate_pattern(self, pattern: str) -> int:
         """
-        Invalidate all cache keys matching a pattern.
+        Invalidate all cache keys matching a glob pattern.
+        
+        Redis deletion scans the keyspace (django-redis delete_pattern), so
+        prefer invalidate_tags on hot paths.
         
         Args:
             pattern: Pattern to match (e.g., 'kelly:*')
@@ -154,81 +406,196 @@ class AggressiveCachingService:
         Returns:
             Number of keys invalidated
         """
-        count = 0
+        count = self.memory_cache.delete_matching(lambda k: fnmatchcase(k, pattern))
         
-        # Memory cache
-        keys_to_delete = [k for k in self.memory_cache.keys() if pattern.replace('*', '') in k]
-        for key in keys_to_delete:
-            del self.memory_cache[key]
-            if key in self.memory_cache_ttl:
-                del self.memory_cache_ttl[key]
-            count += 1
-        
-        # Redis cache (requires Redis SCAN, simplified here)
-        try:
-            # Note: This is a simplified version. In production, use Redis SCAN
-            # For now, we'll just log the pattern
-            logger.info(f"Invalidating Redis cache pattern: {pattern} ({count} memory keys)")
-        except Exception as e:
-            logger.warning(f"Redis pattern invalidation error: {e}")
+        if hasattr(cache, 'delete_pattern'):
+            try:
+                count = max(count, cache.delete_pattern(pattern) or 0)
+            except Exception as e:
+                logger.warning(f"Redis pattern invalidation error: {e}")
+        else:
+            logger.debug(f"Cache backend has no pattern delete; cleared {count} memory keys for {pattern}")
         
+        self.invalidation_bus.publish(patterns=[pattern])
         return count
     
+    def invalidate_tags(self, *tags: str) -> int:
+        """
+        Invalidate every key registered under the given tags.
+        
+        Only the tag sets are read (no keyspace scan); keys are deleted from
+        Redis in batches and announced to peer processes.
+        
+        Returns:
+            Number of keys invalidated
+        """
+        keys = self.tags.invalidate(*tags)
+        for cache_key in keys:
+            self.memory_cache.delete(cache_key)
+        self.invalidation_bus.publish(keys=keys)
+        if keys:
+            logger.debug(f"Invalidated {len(keys)} keys for tags {tags}")
+        return len(keys)
+    
+    def _on_peer_invalidation(self, keys: List[str], patterns: List[str]) -> None:
+        """Drop keys another process deleted from this process' memory tier"""
+        for cache_key in keys:
+            self.memory_cache.delete(cache_key)
+        for pattern in patterns:
+            self.memory_cache.delete_matching(lambda k, p=pattern: fnmatchcase(k, p))
+    
+    def _flight_options(
+        self,
+        ttl: Optional[int],
+        stale_ttl: int,
+        tags: Optional[Iterable[str]],
+        distributed: Optional[bool],
+    ) -> Dict[str, Any]:
+        ttl = self.default_ttl if ttl is None else ttl
+        if distributed is None:
+            distributed = self.distributed_locks
+        return {
+            'get': self.get_cached,
+            'set': lambda key, value, timeout: self.set_cached(key, value, timeout, tags=tags),
+            'ttl': ttl,
+            'stale_ttl': stale_ttl,
+            'lock': self.lock if distributed else None,
+            'flight': self.flight,
+        }
+    
+    def get_or_compute(
+        self,
+        cache_key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int] = None,
+        stale_ttl: int = 0,
+        tags: Optional[Iterable[str]] = None,
+        distributed: Optional[bool] = None
+    ) -> Any:
+        """
+        Get a cached value, computing it at most once per key on a miss.
+        
+        Concurrent callers in this process share one computation. With
+        distributed=True a Redis lock also coalesces across workers. With
+        stale_ttl > 0 an expired value keeps being served for up to stale_ttl
+        seconds while a single background refresh runs.
+        
+        Args:
+            cache_key: Cache key
+            compute: Zero-argument function producing the value
+            ttl: Seconds the value is fresh (default_ttl if not provided)
+            stale_ttl: Seconds a stale value may be served during refresh
+            tags: Invalidation tags for the stored value
+            distributed: Coalesce across workers (AGGRESSIVE_CACHE_DISTRIBUTED_LOCKS if None)
+        
+        Returns:
+            Cached or freshly computed value
+        """
+        return single_flight.get_or_compute(
+            cache_key, compute, **self._flight_options(ttl, stale_ttl, tags, distributed)
+        )
+    
+    async def aget_or_compute(
+        self,
+        cache_key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int] = None,
+        stale_ttl: int = 0,
+        tags: Optional[Iterable[str]] = None,
+        distributed: Optional[bool] = None
+    ) -> Any:
+        """Async get_or_compute; compute is a zero-argument coroutine function"""
+        return await single_flight.aget_or_compute(
+            cache_key, compute, **self._flight_options(ttl, stale_ttl, tags, distributed)
+        )
+    
     def cached_function(
         self,
         prefix: str,
         ttl: Optional[int] = None,
-        key_func: Optional[Callable] = None
+        key_func: Optional[Callable] = None,
+        stale_ttl: int = 0,
+        distributed: Optional[bool] = None
     ):
         """
         Decorator for caching function results.
         
+        Works on plain and async functions; concurrent misses for the same
+        key share a single call (see get_or_compute).
+        
         Args:
             prefix: Cache key prefix
             ttl: Time to live in seconds
             key_func: Optional function to generate cache key from arguments
+            stale_ttl: Seconds a stale result may be served while refreshing
+            distributed: Coalesce across workers with a Redis lock
         
         Example:
             @caching_service.cached_function('price_data', ttl=60)
             def get_price(symbol):
                 return fetch_price(symbol)
         """
+        def make_key(args, kwargs):
+            if key_func:
+                return key_func(*args, **kwargs)
+            return self.get_cache_key(prefix, *args, **kwargs)
+        
         def decorator(func):
+            if inspect.iscoroutinefunction(func):
+                @wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    return await self.aget_or_compute(
+                        make_key(args, kwargs), lambda: func(*args, **kwargs),
+                        ttl=ttl, stale_ttl=stale_ttl, distributed=distributed
+                    )
+                
+                return async_wrapper
+            
             @wraps(func)
             def wrapper(*args, **kwargs):
-                # Generate cache key
-                if key_func:
-                    cache_key = key_func(*args, **kwargs)
-                else:
-                    cache_key = self.get_cache_key(prefix, *args, **kwargs)
-                
-                # Try to get from cache
-                cached_value = self.get_cached(cache_key, ttl)
-                if cached_value is not None:
-                    return cached_value
-                
-                # Cache miss - compute value
-                value = func(*args, **kwargs)
-                
-                # Store in cache
-                self.set_cached(cache_key, value, ttl)
-                
-                return value
+                return self.get_or_compute(
+                    make_key(args, kwargs), lambda: func(*args, **kwargs),
+                    ttl=ttl, stale_ttl=stale_ttl, distributed=distributed
+                )
             
             return wrapper
         return decorator
     
-    def get_stats(self) -> Dict[str, Any]:
-        """Get caching statistics"""
-        return {
-            'memory_cache_size': len(self.memory_cache),
-            'memory_cache_keys': list(self.memory_cache.keys())[:10],  # First 10 keys
+    def get_stats(self, deep: bool = False) -> Dict[str, Any]:
+        """
+        Get caching statistics (per-prefix counters for both layers).
+        
+        Args:
+            deep: Also report the memory tier's serialized size (pickles every entry)
+        """
+        memory_stats = self.memory_cache.get_stats()
+        prefix_stats: Dict[str, Dict[str, int]] = {}
+        for prefix, counts in memory_stats['prefixes'].items():
+            prefix_stats[prefix] = {f'memory_{name}': value for name, value in counts.items()}
+        for prefix, counts in list(self._redis_stats.items()):
+            bucket = prefix_stats.setdefault(prefix, {})
+            bucket.update({f'redis_{name}': value for name, value in counts.items()})
+        
+        stats = {
+            'memory_cache_size': memory_stats['entries'],
+            'memory_cache_bytes': memory_stats['bytes'],
+            'memory_cache_limits': {
+                'max_entries': memory_stats['max_entries'],
+                'max_bytes': memory_stats['max_bytes'],
+                'ttl': self.cache_layers['memory']['ttl'],
+            },
+            'memory_cache_keys': self.memory_cache.keys()[-10:],  # 10 most recently used
+            'prefix_stats': prefix_stats,
+            'single_flight': dict(self.flight.stats),
             'layers_enabled': {
                 layer: config['enabled']
                 for layer, config in self.cache_layers.items()
             },
             'default_ttl': self.default_ttl
         }
+        if deep:
+            stats['memory_cache_serialized_bytes'] = self.memory_cache.measure_bytes()
+        return stats
 
 
 # Global instance
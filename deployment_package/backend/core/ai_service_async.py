@@ -40,6 +40,7 @@ class OpenAIAsyncConfig:
     max_retries: int = 2
     max_concurrency: int = 10
     max_history: int = 20
+    ping_cache_ttl_s: int = 15
 
 
 class AIServiceAsync:
@@ -67,6 +68,7 @@ class AIServiceAsync:
             max_retries=int(getattr(settings, "OPENAI_MAX_RETRIES", 2)),
             max_concurrency=int(getattr(settings, "OPENAI_MAX_CONCURRENCY", 10)),
             max_history=int(getattr(settings, "OPENAI_MAX_HISTORY", 20)),
+            ping_cache_ttl_s=int(getattr(settings, "OPENAI_PING_CACHE_TTL_S", 15)),
         )
 
         self.async_client: Optional[AsyncOpenAI] = (
@@ -435,32 +437,42 @@ class AIServiceAsync:
         }
         
         if status["openai_available"] and self.async_client:
-            t0 = time.perf_counter()
-            try:
-                await self.async_client.chat.completions.create(
-                    model=self.cfg.model,
-                    messages=[
-                        {"role": "system", "content": "Return 'ok'."},
-                        {"role": "user", "content": "ok"}
-                    ],
-                    max_tokens=2,
-                    temperature=0.0,
-                )
-                status["openai_ping"] = {
-                    "ok": True,
-                    "latency_ms": int((time.perf_counter() - t0) * 1000)
-                }
-            except Exception as e:
-                status["openai_ping"] = {
-                    "ok": False,
-                    "error": str(e),
-                    "latency_ms": int((time.perf_counter() - t0) * 1000)
-                }
+            # Health checks from every probe/pod share one billed ping per TTL window
+            from .aggressive_caching_service import get_aggressive_caching_service
+            status["openai_ping"] = await get_aggressive_caching_service().aget_or_compute(
+                f"ai_ping:openai:{self.cfg.model}",
+                self._ping_openai,
+                ttl=self.cfg.ping_cache_ttl_s,
+            )
         else:
             status["openai_ping"] = {"ok": False, "error": "Not configured"}
         
         return status
 
+    async def _ping_openai(self) -> Dict[str, Any]:
+        """Minimal OpenAI round trip for ping()"""
+        t0 = time.perf_counter()
+        try:
+            await self.async_client.chat.completions.create(
+                model=self.cfg.model,
+                messages=[
+                    {"role": "system", "content": "Return 'ok'."},
+                    {"role": "user", "content": "ok"}
+                ],
+                max_tokens=2,
+                temperature=0.0,
+            )
+            return {
+                "ok": True,
+                "latency_ms": int((time.perf_counter() - t0) * 1000)
+            }
+        except Exception as e:
+            return {
+                "ok": False,
+                "error": str(e),
+                "latency_ms": int((time.perf_counter() - t0) * 1000)
+            }
+
     async def _format_oracle_response(
         self,
         raw_response: Dict[str, Any],
@@ -0,0 +1,247 @@
+"""
+Shared async HTTP plumbing for market-data fan-out.
+
+- ``TokenBucket``: per-provider-plan request pacing that works from any
+  thread or event loop.
+- ``ClientSessionPool``: one keep-alive ``aiohttp`` session per event loop, so
+  concurrent requests reuse pooled connections instead of re-handshaking.
+- ``run_sync``: runs a coroutine on a long-lived background event loop. Sync
+  callers (Django views, GraphQL resolvers) use it so that the pooled
+  connections survive between requests, which ``asyncio.run`` would not
+  allow.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, Optional, Tuple
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 50
+DEFAULT_KEEPALIVE_S = 30.0
+DEFAULT_USER_AGENT = 'RichesReach-MarketData/1.0'
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Sustained requests per second plus the burst allowed on top of it"""
+    rate: float
+    burst: int
+
+
+# Published request limits per provider plan. Paid Polygon plans are
+# "unlimited", but Polygon asks clients to stay under ~100 requests/second.
+PROVIDER_RATE_LIMITS: Dict[str, Dict[str, RateLimit]] = {
+    'polygon': {
+        'free': RateLimit(rate=5 / 60, burst=5),
+        'starter': RateLimit(rate=100.0, burst=100),
+        'developer': RateLimit(rate=100.0, burst=100),
+        'advanced': RateLimit(rate=100.0, burst=100),
+    },
+    'alpaca': {
+        'free': RateLimit(rate=200 / 60, burst=200),
+        'algo_trader_plus': RateLimit(rate=10000 / 60, burst=1000),
+    },
+    'finnhub': {
+        'free': RateLimit(rate=1.0, burst=30),
+    },
+    'alpha_vantage': {
+        'free': RateLimit(rate=5 / 60, burst=5),
+        'premium': RateLimit(rate=75 / 60, burst=75),
+    },
+}
+
+
+def get_provider_plan(provider: str) -> str:
+    """
+    Configured plan for a provider, e.g. settings.POLYGON_PLAN.
+
+    Falls back to the environment (``POLYGON_PLAN``) and then to 'free'.
+    """
+    name = f"{provider.upper()}_PLAN"
+    try:
+        from django.conf import settings
+        plan = getattr(settings, name, None)
+    except Exception:
+        plan = None
+    return (plan or os.getenv(name) or 'free').lower()
+
+
+class TokenBucket:
+    """
+    Token-bucket limiter.
+
+    A caller reserves a token under a thread lock and then sleeps until the
+    token is due, so the bucket can be shared across threads and event loops.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Invalid token bucket rate={rate} burst={burst}")
+        self.rate = rate
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, max_wait: Optional[float]) -> Optional[float]:
+        """Take one token, returning how long to wait for it (None if over max_wait)"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (1.0 - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            # Tokens may go negative: later callers queue behind this reservation
+            self._tokens -= 1.0
+            return wait
+
+    async def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """
+        Wait for a token.
+
+        Args:
+            max_wait: Give up immediately instead of waiting longer than this
+
+        Returns:
+            True if a token was taken, False if it would take over max_wait
+        """
+        wait = self._reserve(max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available right now"""
+        return self._reserve(0.0) is not None
+
+
+_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, plan: Optional[str] = None) -> TokenBucket:
+    """Process-wide token bucket for a provider plan (unknown plans get the most conservative limit)"""
+    plan = (plan or get_provider_plan(provider)).lower()
+    with _buckets_lock:
+        bucket = _buckets.get((provider, plan))
+        if bucket is None:
+            limits = PROVIDER_RATE_LIMITS.get(provider, {})
+            limit = limits.get(plan) or min(limits.values(), key=lambda l: l.rate, default=RateLimit(1.0, 1))
+            bucket = _buckets[(provider, plan)] = TokenBucket(limit.rate, limit.burst)
+        return bucket
+
+
+class ClientSessionPool:
+    """
+    Keep-alive ``aiohttp`` sessions, one per event loop.
+
+    aiohttp sessions are bound to the loop that created them, so the pool
+    keys sessions by loop and drops entries whose loop has closed.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_S,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.headers = {'User-Agent': DEFAULT_USER_AGENT, **(headers or {})}
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._lock = threading.Lock()
+
+    def get(self) -> aiohttp.ClientSession:
+        """Session for the running event loop (created on first use)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for other in [l for l in self._sessions if l.is_closed()]:
+                del self._sessions[other]
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=300,
+                )
+                session = self._sessions[loop] = aiohttp.ClientSession(
+                    connector=connector, headers=self.headers
+                )
+            return session
+
+    async def close(self) -> None:
+        """Close the running loop's session"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+
+
+_default_pool: Optional[ClientSessionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> ClientSessionPool:
+    """Process-wide session pool"""
+    global _default_pool
+    with _pool_lock:
+        if _default_pool is None:
+            _default_pool = ClientSessionPool()
+        return _default_pool
+
+
+class _BackgroundLoop:
+    """Event loop running forever on a daemon thread"""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='async-http-loop', daemon=True)
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+
+_background_loop = _BackgroundLoop()
+
+
+def run_sync(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine from sync code on the shared background loop.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Seconds to wait before cancelling it
+
+    Returns:
+        The coroutine's result
+    """
+    loop = _background_loop.get()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync() cannot block the background loop it runs on")
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except BaseException:
+        future.cancel()
+        raise
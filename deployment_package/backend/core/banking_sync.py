@@ -0,0 +1,171 @@
+"""
+Bulk transaction ingestion for Yodlee syncs.
+
+Pages of raw Yodlee transactions are normalized, diffed against the rows
+already stored for the account (one query per page), and only new or changed
+rows are written, with bulk_create(update_conflicts=True) in chunked batches.
+A 12-month backfill costs a few queries per page instead of two per row.
+"""
+import logging
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .banking_models import BankAccount, BankTransaction
+from .yodlee_client import YodleeClient
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT ... ON CONFLICT statement
+UPSERT_BATCH_SIZE = 500
+
+# Columns refreshed when Yodlee sends a changed transaction
+SYNCED_FIELDS = [
+    'user_id',
+    'amount',
+    'currency',
+    'description',
+    'merchant_name',
+    'category',
+    'subcategory',
+    'transaction_type',
+    'posted_date',
+    'transaction_date',
+    'status',
+    'raw_json',
+]
+
+
+@dataclass
+class TransactionSyncStats:
+    """Outcome of a bulk transaction sync"""
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0  # Rows rejected by the database (e.g. the posted_date/amount/merchant dedup constraint)
+    pages: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+def transaction_fields(normalized: Dict[str, Any]) -> Dict[str, Any]:
+    """Model field values for a transaction from YodleeClient.normalize_transaction"""
+    return {
+        'amount': Decimal(str(normalized['amount'])).quantize(Decimal('0.01')),
+        'currency': normalized['currency'],
+        'description': normalized['description'],
+        'merchant_name': normalized['merchant_name'],
+        'category': normalized['category'],
+        'subcategory': normalized['subcategory'],
+        'transaction_type': normalized['transaction_type'],
+        'posted_date': datetime.strptime(normalized['posted_date'], '%Y-%m-%d').date() if normalized['posted_date'] else timezone.now().date(),
+        'transaction_date': datetime.strptime(normalized['transaction_date'], '%Y-%m-%d').date() if normalized['transaction_date'] else None,
+        'status': normalized['status'],
+        'raw_json': normalized['raw_json'],
+    }
+
+
+def sync_transaction_pages(
+    bank_account: BankAccount,
+    pages: Iterable[List[Dict[str, Any]]],
+    batch_size: int = UPSERT_BATCH_SIZE
+) -> TransactionSyncStats:
+    """
+    Upsert pages of raw Yodlee transactions into an account.
+
+    Pages are consumed one at a time, so a long backfill never holds more
+    than a page in memory.
+
+    Args:
+        bank_account: Account the transactions belong to
+        pages: Iterable of lists of raw Yodlee transactions
+        batch_size: Rows per bulk write
+
+    Returns:
+        TransactionSyncStats with inserted/updated/unchanged/skipped counts
+    """
+    stats = TransactionSyncStats()
+    for page in pages:
+        stats.pages += 1
+        _sync_page(bank_account, page, batch_size, stats)
+    return stats
+
+
+def _sync_page(
+    bank_account: BankAccount,
+    page: List[Dict[str, Any]],
+    batch_size: int,
+    stats: TransactionSyncStats
+) -> None:
+    # Normalize; a transaction repeated within the page keeps its last version
+    incoming: Dict[str, Dict[str, Any]] = {}
+    for yodlee_txn in page:
+        normalized = YodleeClient.normalize_transaction(yodlee_txn)
+        fields = transaction_fields(normalized)
+        fields['user_id'] = bank_account.user_id
+        incoming[normalized['yodlee_transaction_id']] = fields
+    if not incoming:
+        return
+
+    existing = {
+        row['yodlee_transaction_id']: row
+        for row in BankTransaction.objects.filter(
+            bank_account=bank_account,
+            yodlee_transaction_id__in=list(incoming),
+        ).values('yodlee_transaction_id', *SYNCED_FIELDS)
+    }
+
+    changed = []
+    for yodlee_id, fields in incoming.items():
+        stored = existing.get(yodlee_id)
+        if stored is not None and all(stored[name] == fields[name] for name in SYNCED_FIELDS):
+            stats.unchanged += 1
+            continue
+        changed.append((stored is None, BankTransaction(
+            bank_account=bank_account,
+            yodlee_transaction_id=yodlee_id,
+            **fields
+        )))
+
+    for start in range(0, len(changed), batch_size):
+        _write_batch(changed[start:start + batch_size], stats)
+
+
+def _write_batch(batch: List[tuple], stats: TransactionSyncStats) -> None:
+    """Upsert one batch; if the database rejects it, retry row by row and skip the offenders"""
+    try:
+        with transaction.atomic():
+            BankTransaction.objects.bulk_create(
+                [obj for _, obj in batch],
+                update_conflicts=True,
+                unique_fields=['bank_account', 'yodlee_transaction_id'],
+                update_fields=SYNCED_FIELDS + ['updated_at'],
+            )
+    except IntegrityError as e:
+        logger.warning(f"Bulk upsert of {len(batch)} transactions failed ({e}), retrying row by row")
+        for is_new, obj in batch:
+            try:
+                with transaction.atomic():
+                    BankTransaction.objects.update_or_create(
+                        bank_account=obj.bank_account,
+                        yodlee_transaction_id=obj.yodlee_transaction_id,
+                        defaults={name: getattr(obj, name) for name in SYNCED_FIELDS},
+                    )
+            except IntegrityError as row_error:
+                logger.warning(f"Skipping transaction {obj.yodlee_transaction_id}: {row_error}")
+                stats.skipped += 1
+                continue
+            if is_new:
+                stats.inserted += 1
+            else:
+                stats.updated += 1
+        return
+
+    inserted = sum(1 for is_new, _ in batch if is_new)
+    stats.inserted += inserted
+    stats.updated += len(batch) - inserted
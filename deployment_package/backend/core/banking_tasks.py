@@ -6,7 +6,8 @@ import logging
 from celery import shared_task
 from django.utils import timezone
 from datetime import timedelta, datetime
-from .banking_models import BankAccount, BankProviderAccount, BankTransaction
+from .banking_models import BankAccount, BankProviderAccount
+from .banking_sync import sync_transaction_pages
 from .yodlee_client import YodleeClient
 
 logger = logging.getLogger(__name__)
@@ -133,43 +134,20 @@ def sync_transactions_task(self, user_id, bank_account_id, from_date=None, to_da
         yodlee = YodleeClient()
         user_id_str = str(user_id)
         
-        # Fetch transactions from Yodlee
-        yodlee_transactions = yodlee.get_transactions(
+        # Stream pages from Yodlee straight into the bulk upsert
+        pages = yodlee.iter_transaction_pages(
             user_id_str,
             account_id=bank_account.yodlee_account_id,
             from_date=from_date.strftime('%Y-%m-%d'),
             to_date=to_date.strftime('%Y-%m-%d'),
         )
+        stats = sync_transaction_pages(bank_account, pages)
         
-        # Store transactions
-        count = 0
-        for yodlee_txn in yodlee_transactions:
-            normalized = YodleeClient.normalize_transaction(yodlee_txn)
-            
-            # Get or create transaction
-            txn, created = BankTransaction.objects.update_or_create(
-                bank_account=bank_account,
-                yodlee_transaction_id=normalized['yodlee_transaction_id'],
-                defaults={
-                    'user': user,
-                    'amount': normalized['amount'],
-                    'currency': normalized['currency'],
-                    'description': normalized['description'],
-                    'merchant_name': normalized['merchant_name'],
-                    'category': normalized['category'],
-                    'subcategory': normalized['subcategory'],
-                    'transaction_type': normalized['transaction_type'],
-                    'posted_date': datetime.strptime(normalized['posted_date'], '%Y-%m-%d').date() if normalized['posted_date'] else timezone.now().date(),
-                    'transaction_date': datetime.strptime(normalized['transaction_date'], '%Y-%m-%d').date() if normalized['transaction_date'] else None,
-                    'status': normalized['status'],
-                    'raw_json': normalized['raw_json'],
-                }
-            )
-            if created:
-                count += 1
-        
-        logger.info(f"Successfully synced {count} new transactions for account {bank_account_id}")
-        return {'success': True, 'transactions_synced': count}
+        logger.info(
+            f"Synced transactions for account {bank_account_id}: {stats.inserted} new, "
+            f"{stats.updated} updated, {stats.unchanged} unchanged, {stats.skipped} skipped ({stats.pages} pages)"
+        )
+        return {'success': True, 'transactions_synced': stats.inserted, **stats.as_dict()}
     
     except Exception as e:
         logger.error(f"Error syncing transactions: {e}", exc_info=True)
@@ -20,6 +20,11 @@ class BankAccountType(DjangoObjectType):
     isPrimary = graphene.Boolean()
     lastUpdated = graphene.String()
     createdAt = graphene.String()
+    transactions = graphene.List(
+        lambda: BankTransactionType,
+        limit=graphene.Int(default_value=20),
+        description="Most recent transactions on this account"
+    )
     
     class Meta:
         model = BankAccount
@@ -68,6 +73,17 @@ class BankAccountType(DjangoObjectType):
     def resolve_createdAt(self, info):
         """CamelCase alias for created_at"""
         return self.created_at.isoformat() if self.created_at else None
+    
+    def resolve_transactions(self, info, limit=20):
+        """Recent transactions, batched across every account in the result"""
+        from .dataloaders import Deferred, batch_load_bank_transactions
+        from .graphql.dataloaders import get_loader
+        
+        loader = get_loader(info, 'bank_transactions_loader')
+        transactions = loader.load(self.id) if loader else batch_load_bank_transactions([self.id])[0]
+        if isinstance(transactions, Deferred):
+            return transactions.then(lambda rows: (rows or [])[:limit])
+        return (transactions or [])[:limit]
 
 
 class BankTransactionType(DjangoObjectType):
@@ -0,0 +1,495 @@
+"""
+Local bar store for historical OHLCV.
+
+Bars are kept on disk, partitioned by timeframe and symbol:
+
+    {root}/{timeframe}/{SYMBOL}.npy    structured array (ts, open, high, low, close, volume), ts-sorted
+    {root}/{timeframe}/{SYMBOL}.json   date ranges already fetched from a provider
+
+Reads memory-map the ``.npy`` file and binary-search the requested window, so
+slicing a few symbols out of years of history does not load whole files.
+``get`` and ``aget`` read through the store: only the date ranges it has not
+seen are requested from the provider, then merged in. Ranges are recorded as
+covered up to yesterday; today is always re-fetched since its bar may still be
+forming.
+
+Providers are plain callables ``fetch(symbols, start, end) -> {symbol: bars}``
+(``aget`` also accepts coroutine functions). ``bars`` is a DataFrame with
+open/high/low/close/volume columns and a DatetimeIndex. A symbol left out of
+the result counts as a failed fetch and is retried next time.
+
+Top-ups re-read the last stored bar. If its close has changed, the provider has
+re-adjusted history (split or dividend), and the symbol is re-fetched in full.
+"""
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+BAR_DTYPE = np.dtype([('ts', '<i8')] + [(column, '<f8') for column in OHLCV_COLUMNS])
+
+# Relative change in a stored close that means the provider re-adjusted history
+ADJUSTMENT_TOLERANCE = 1e-4
+# How far back a top-up looks for a stored bar to compare against
+ADJUSTMENT_LOOKBACK_DAYS = 10
+
+Fetcher = Callable[[List[str], date, date], Any]
+DateLike = Any
+
+
+@dataclass(frozen=True)
+class FetchTask:
+    """One provider request: the same date range for a group of symbols"""
+    symbols: Tuple[str, ...]
+    start: date
+    end: date
+    # (symbol, timestamp ns, close) of the stored bar each symbol's top-up re-reads
+    checks: Tuple[Tuple[str, int, float], ...] = ()
+
+
+class BarStore:
+    """
+    Per-symbol, per-timeframe bar files with incremental top-up.
+
+    Args:
+        root: Directory holding the store (created on first write)
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def read(
+        self,
+        symbol: str,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+        timeframe: str = '1d'
+    ) -> pd.DataFrame:
+        """
+        Stored bars for one symbol between start and end (inclusive dates).
+
+        Returns:
+            DataFrame with OHLCV columns and a tz-naive DatetimeIndex (UTC); empty if nothing is stored
+        """
+        bars = self._load(symbol, timeframe)
+        lo = 0 if start is None else np.searchsorted(bars['ts'], _day_start_ns(start), side='left')
+        hi = len(bars) if end is None else np.searchsorted(bars['ts'], _day_start_ns(end, 1), side='left')
+        window = bars[lo:hi]
+        return pd.DataFrame(
+            {column: np.array(window[column]) for column in OHLCV_COLUMNS},
+            index=pd.DatetimeIndex(np.array(window['ts']).astype('datetime64[ns]'), name='date'),
+        )
+
+    def read_many(
+        self,
+        symbols: Iterable[str],
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+        timeframe: str = '1d'
+    ) -> Dict[str, pd.DataFrame]:
+        """``read`` for several symbols; symbols with no stored bars are left out"""
+        result = {}
+        for symbol in symbols:
+            bars = self.read(symbol, start, end, timeframe)
+            if not bars.empty:
+                result[symbol] = bars
+        return result
+
+    def panel(
+        self,
+        symbols: Iterable[str],
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+        field: str = 'close',
+        timeframe: str = '1d'
+    ) -> pd.DataFrame:
+        """One field as a (date x symbol) frame, outer-joined on dates"""
+        frames = self.read_many(symbols, start, end, timeframe)
+        if not frames:
+            return pd.DataFrame()
+        return pd.DataFrame({symbol: bars[field] for symbol, bars in frames.items()}).sort_index()
+
+    def coverage(self, symbol: str, timeframe: str = '1d') -> List[Tuple[date, date]]:
+        """Date ranges already fetched for a symbol, sorted and non-overlapping"""
+        try:
+            with open(self._meta_path(symbol, timeframe)) as f:
+                ranges = json.load(f).get('ranges', [])
+        except (OSError, ValueError):
+            return []
+        return [(date.fromisoformat(a), date.fromisoformat(b)) for a, b in ranges]
+
+    # ------------------------------------------------------------------
+    # Read-through
+    # ------------------------------------------------------------------
+
+    def get(
+        self,
+        symbols: Iterable[str],
+        start: DateLike,
+        end: Optional[DateLike] = None,
+        fetch: Optional[Fetcher] = None,
+        timeframe: str = '1d'
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Bars for symbols between start and end, fetching only what is missing.
+
+        Args:
+            symbols: Symbols to return
+            start: First date (inclusive)
+            end: Last date (inclusive, defaults to today)
+            fetch: Provider for missing ranges; None reads the store only
+            timeframe: Bar timeframe, e.g. '1d', '1h', '5m'
+
+        Returns:
+            {symbol: bars} for symbols with data in the window
+        """
+        symbols = list(dict.fromkeys(symbols))
+        start, end = _as_date(start), _as_date(end or date.today())
+        pending = symbols if fetch else []
+        # Second round re-fetches symbols whose history was re-adjusted
+        for _ in range(2):
+            stale = []
+            for task in self.plan(pending, start, end, timeframe):
+                try:
+                    fetched = fetch(list(task.symbols), task.start, task.end)
+                except Exception as e:
+                    logger.warning(f"Bar fetch failed for {len(task.symbols)} symbols {task.start}..{task.end}: {e}")
+                    continue
+                stale += self.apply(task, fetched or {}, timeframe)
+            if not stale:
+                break
+            pending = stale
+        return self.read_many(symbols, start, end, timeframe)
+
+    async def aget(
+        self,
+        symbols: Iterable[str],
+        start: DateLike,
+        end: Optional[DateLike] = None,
+        fetch: Optional[Fetcher] = None,
+        timeframe: str = '1d'
+    ) -> Dict[str, pd.DataFrame]:
+        """``get`` for async callers; ``fetch`` may be a coroutine function"""
+        symbols = list(dict.fromkeys(symbols))
+        start, end = _as_date(start), _as_date(end or date.today())
+        pending = symbols if fetch else []
+        for _ in range(2):
+            stale = []
+            for task in self.plan(pending, start, end, timeframe):
+                try:
+                    fetched = fetch(list(task.symbols), task.start, task.end)
+                    if hasattr(fetched, '__await__'):
+                        fetched = await fetched
+                except Exception as e:
+                    logger.warning(f"Bar fetch failed for {len(task.symbols)} symbols {task.start}..{task.end}: {e}")
+                    continue
+                stale += self.apply(task, fetched or {}, timeframe)
+            if not stale:
+                break
+            pending = stale
+        return self.read_many(symbols, start, end, timeframe)
+
+    def plan(self, symbols: Iterable[str], start: DateLike, end: DateLike, timeframe: str = '1d') -> List[FetchTask]:
+        """
+        Provider requests needed to cover [start, end] for every symbol.
+
+        Symbols missing the same range share one task, so the usual nightly
+        top-up (every symbol missing the same few days) is a single request.
+        """
+        start, end = _as_date(start), _as_date(end)
+        groups: Dict[Tuple[date, date], List[str]] = {}
+        checks: Dict[Tuple[date, date], List[Tuple[str, int, float]]] = {}
+        for symbol in dict.fromkeys(symbols):
+            covered = self.coverage(symbol, timeframe)
+            for gap_start, gap_end in _subtract(start, end, covered):
+                if timeframe.endswith('d') and np.busday_count(gap_start, gap_end + timedelta(days=1)) == 0:
+                    continue  # Weekend only: nothing to fetch
+                last = self._last_bar_before(symbol, gap_start, timeframe) if covered else None
+                if last is not None:
+                    gap_start = pd.Timestamp(last[0]).date()
+                    checks.setdefault((gap_start, gap_end), []).append((symbol, *last))
+                groups.setdefault((gap_start, gap_end), []).append(symbol)
+        return [
+            FetchTask(tuple(names), a, b, tuple(checks.get((a, b), ())))
+            for (a, b), names in sorted(groups.items())
+        ]
+
+    def apply(self, task: FetchTask, fetched: Dict[str, pd.DataFrame], timeframe: str = '1d') -> List[str]:
+        """
+        Merge a provider response for ``task`` into the store.
+
+        Returns:
+            Symbols whose stored history no longer matches the provider; they have
+            been cleared and need a full re-fetch
+        """
+        checks = {symbol: (ts, close) for symbol, ts, close in task.checks}
+        stale = []
+        for symbol in task.symbols:
+            if symbol not in fetched:
+                continue
+            bars = _normalize(fetched[symbol], timeframe)
+            if symbol in checks and _readjusted(bars, *checks[symbol]):
+                logger.info(f"{symbol}: provider history was re-adjusted, re-fetching in full")
+                self.drop(symbol, timeframe)
+                stale.append(symbol)
+                continue
+            self.write(symbol, bars, task.start, task.end, timeframe)
+        return stale
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def write(
+        self,
+        symbol: str,
+        bars: pd.DataFrame,
+        start: DateLike,
+        end: DateLike,
+        timeframe: str = '1d'
+    ) -> None:
+        """
+        Replace stored bars in [start, end] with ``bars`` and mark the range covered.
+
+        Args:
+            bars: Everything the provider has for the symbol in [start, end]
+        """
+        start, end = _as_date(start), _as_date(end)
+        new = _to_records(_normalize(bars, timeframe))
+        with self._locked(symbol, timeframe):
+            old = self._load(symbol, timeframe)
+            keep = (old['ts'] < _day_start_ns(start)) | (old['ts'] >= _day_start_ns(end, 1))
+            merged = np.concatenate([np.array(old[keep]), new])
+            merged = merged[np.argsort(merged['ts'], kind='stable')]
+            # Later rows win on duplicate timestamps
+            last = np.append(merged['ts'][1:] != merged['ts'][:-1], True)
+            self._save(symbol, timeframe, merged[last])
+            covered_end = min(end, date.today() - timedelta(days=1))
+            if start <= covered_end:
+                ranges = _merge(self.coverage(symbol, timeframe) + [(start, covered_end)])
+                self._save_meta(symbol, timeframe, ranges)
+
+    def drop(self, symbol: str, timeframe: str = '1d') -> None:
+        """Forget everything stored for a symbol"""
+        with self._locked(symbol, timeframe):
+            for path in (self._data_path(symbol, timeframe), self._meta_path(symbol, timeframe)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    def _dir(self, timeframe: str) -> str:
+        return os.path.join(self.root, timeframe)
+
+    def _data_path(self, symbol: str, timeframe: str) -> str:
+        return os.path.join(self._dir(timeframe), f"{_file_key(symbol)}.npy")
+
+    def _meta_path(self, symbol: str, timeframe: str) -> str:
+        return os.path.join(self._dir(timeframe), f"{_file_key(symbol)}.json")
+
+    def _load(self, symbol: str, timeframe: str) -> np.ndarray:
+        try:
+            return np.load(self._data_path(symbol, timeframe), mmap_mode='r')
+        except (FileNotFoundError, ValueError):
+            return np.empty(0, dtype=BAR_DTYPE)
+
+    def _last_bar_before(self, symbol: str, day: date, timeframe: str) -> Optional[Tuple[int, float]]:
+        """(timestamp ns, close) of the last stored bar before ``day``, if recent"""
+        bars = self._load(symbol, timeframe)
+        i = np.searchsorted(bars['ts'], _day_start_ns(day), side='left') - 1
+        if i < 0 or bars['ts'][i] < _day_start_ns(day, -ADJUSTMENT_LOOKBACK_DAYS):
+            return None
+        return int(bars['ts'][i]), float(bars['close'][i])
+
+    def _save(self, symbol: str, timeframe: str, records: np.ndarray) -> None:
+        path = self._data_path(symbol, timeframe)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            np.save(f, records)
+        os.replace(tmp, path)
+
+    def _save_meta(self, symbol: str, timeframe: str, ranges: List[Tuple[date, date]]) -> None:
+        path = self._meta_path(symbol, timeframe)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'ranges': [[a.isoformat(), b.isoformat()] for a, b in ranges]}, f)
+        os.replace(tmp, path)
+
+    @contextmanager
+    def _locked(self, symbol: str, timeframe: str):
+        """Serialize read-modify-write of one symbol across threads and processes"""
+        os.makedirs(self._dir(timeframe), exist_ok=True)
+        with self._lock, open(os.path.join(self._dir(timeframe), f"{_file_key(symbol)}.lock"), 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# ----------------------------------------------------------------------
+# Providers
+# ----------------------------------------------------------------------
+
+def fetch_yfinance_bars(symbols: List[str], start: date, end: date, interval: str = '1d') -> Dict[str, pd.DataFrame]:
+    """
+    Split/dividend-adjusted bars from yfinance, one batched download for all symbols.
+
+    Args:
+        start, end: Inclusive date range
+    """
+    import yfinance as yf
+
+    raw = yf.download(
+        tickers=list(symbols),
+        start=start.isoformat(),
+        end=(end + timedelta(days=1)).isoformat(),  # yfinance end is exclusive
+        interval=interval,
+        auto_adjust=True,
+        progress=False,
+        threads=True,
+    )
+    if raw is None or raw.empty:
+        return {}
+    result = {}
+    for symbol in symbols:
+        if isinstance(raw.columns, pd.MultiIndex):
+            if symbol not in raw.columns.get_level_values(1):
+                continue
+            bars = raw.xs(symbol, axis=1, level=1)
+        elif len(symbols) == 1:
+            bars = raw
+        else:
+            continue
+        bars = bars.rename(columns=str.lower).dropna(how='all')
+        if not bars.empty and 'close' in bars.columns:
+            result[symbol] = bars
+    return result
+
+
+# ----------------------------------------------------------------------
+# Helpers
+# ----------------------------------------------------------------------
+
+def _as_date(value: DateLike) -> date:
+    return pd.Timestamp(value).date()
+
+
+def _day_start_ns(value: DateLike, days: int = 0) -> int:
+    """Epoch nanoseconds of midnight ``days`` after the given date"""
+    return pd.Timestamp(_as_date(value) + timedelta(days=days)).value
+
+
+def _file_key(symbol: str) -> str:
+    return str(symbol).upper().replace(os.sep, '_')
+
+
+def _subtract(start: date, end: date, covered: List[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    """Parts of [start, end] not inside any covered range"""
+    gaps, cursor = [], start
+    for a, b in covered:
+        if b < cursor:
+            continue
+        if a > end:
+            break
+        if a > cursor:
+            gaps.append((cursor, a - timedelta(days=1)))
+        cursor = max(cursor, b + timedelta(days=1))
+        if cursor > end:
+            return gaps
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def _merge(ranges: List[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    """Union of date ranges; adjacent ranges are joined"""
+    merged = []
+    for a, b in sorted(ranges):
+        if merged and a <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], b))
+        else:
+            merged.append((a, b))
+    return merged
+
+
+def _normalize(bars: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """OHLCV columns, tz-naive UTC index (midnight for daily bars), sorted"""
+    if bars is None or len(bars) == 0:
+        return pd.DataFrame(columns=list(OHLCV_COLUMNS), index=pd.DatetimeIndex([], name='date'), dtype=float)
+    bars = bars.rename(columns=str.lower)
+    index = pd.DatetimeIndex(pd.to_datetime(bars.index))
+    if index.tz is not None:
+        if timeframe.endswith('d'):
+            index = index.tz_localize(None)  # Keep the exchange-local session date
+        else:
+            index = index.tz_convert('UTC').tz_localize(None)
+    if timeframe.endswith('d'):
+        index = index.normalize()
+    out = pd.DataFrame(
+        {column: pd.to_numeric(bars[column], errors='coerce').to_numpy(dtype=float) if column in bars.columns
+         else np.full(len(bars), np.nan) for column in OHLCV_COLUMNS},
+        index=index.rename('date'),
+    )
+    return out.sort_index()
+
+
+def _to_records(bars: pd.DataFrame) -> np.ndarray:
+    records = np.empty(len(bars), dtype=BAR_DTYPE)
+    records['ts'] = bars.index.asi8
+    for column in OHLCV_COLUMNS:
+        records[column] = bars[column].to_numpy(dtype=float)
+    return records
+
+
+def _readjusted(bars: pd.DataFrame, ts: int, stored_close: float) -> bool:
+    """True if the provider's close for the bar at ``ts`` differs from the stored one"""
+    match = bars['close'][bars.index.asi8 == ts]
+    if match.empty or not np.isfinite(stored_close) or stored_close == 0:
+        return False
+    return abs(float(match.iloc[0]) / stored_close - 1.0) > ADJUSTMENT_TOLERANCE
+
+
+_bar_store: Optional[BarStore] = None
+
+
+def get_bar_store() -> BarStore:
+    """Shared store, rooted at BAR_STORE_DIR (env or Django setting) or core/data/bars"""
+    global _bar_store
+    if _bar_store is None:
+        root = os.getenv('BAR_STORE_DIR')
+        if not root:
+            try:
+                from django.conf import settings
+                root = getattr(settings, 'BAR_STORE_DIR', None)
+            except Exception:  # Scripts running without Django settings
+                root = None
+        _bar_store = BarStore(root or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'bars'))
+    return _bar_store
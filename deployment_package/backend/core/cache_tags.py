@@ -0,0 +1,259 @@
+"""
+Cache tagging and cross-process invalidation.
+
+Cache entries can be registered under tags such as ``user:42``,
+``symbol:AAPL`` or ``strategy:7``. Each tag is a Redis set holding the
+(versioned) cache keys stored under it, so invalidating a tag only walks that
+set - never a KEYS/SCAN over the whole keyspace - and deletes the members in
+batches.
+
+Processes that keep a local memory tier in front of Redis subscribe to an
+invalidation channel; whoever deletes keys publishes them so that peers drop
+their in-process copies too.
+
+Without a Redis-backed cache (LocMemCache in dev/tests) the registry falls
+back to an in-process tag index and the bus is a no-op.
+"""
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from django.core.cache import cache as default_cache
+
+logger = logging.getLogger(__name__)
+
+TAG_KEY_PREFIX = 'cachetag'
+INVALIDATION_CHANNEL = 'cache-invalidation'
+DELETE_BATCH_SIZE = 500
+MIN_TAG_TTL = 24 * 3600  # Tag sets outlive their members; stale names are harmless
+
+
+def user_tag(user_id: Any) -> str:
+    return f"user:{user_id}"
+
+
+def symbol_tag(symbol: str) -> str:
+    return f"symbol:{str(symbol).upper()}"
+
+
+def strategy_tag(strategy_id: Any) -> str:
+    return f"strategy:{strategy_id}"
+
+
+def get_default_redis_client():
+    """Raw client behind the default cache, or None if it is not django-redis"""
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+    except Exception:
+        return None
+
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class CacheTagRegistry:
+    """
+    Tag -> cache key index.
+
+    Keys are stored as the caller passes them to the Django cache API; the tag
+    sets themselves live under ``cache.make_key('cachetag:<tag>')`` so they
+    share the cache's prefix and version.
+    """
+
+    def __init__(self, redis_client=None, cache_backend=None, batch_size: int = DELETE_BATCH_SIZE):
+        self.redis = redis_client
+        self.cache = cache_backend or default_cache
+        self.batch_size = batch_size
+        # In-process fallback when no Redis client is available
+        self._local_tags: Dict[str, Set[str]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def tag_key(self, tag: str) -> str:
+        return self.cache.make_key(f"{TAG_KEY_PREFIX}:{tag}")
+
+    def register(self, cache_key: str, tags: Iterable[str], ttl: Optional[int] = None) -> None:
+        """Record cache_key under each tag"""
+        tags = [tag for tag in tags if tag]
+        if not tags:
+            return
+
+        if self.redis is None:
+            with self._lock:
+                for tag in tags:
+                    self._local_tags[tag].add(cache_key)
+            return
+
+        tag_ttl = max(int(ttl or 0), MIN_TAG_TTL)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for tag in tags:
+                pipe.sadd(self.tag_key(tag), cache_key)
+                pipe.ttl(self.tag_key(tag))
+            results = pipe.execute()
+
+            # Only ever extend a tag set's lifetime, never shorten it
+            pipe = self.redis.pipeline(transaction=False)
+            needs_expire = False
+            for tag, current_ttl in zip(tags, results[1::2]):
+                if current_ttl is None or current_ttl < tag_ttl:
+                    pipe.expire(self.tag_key(tag), tag_ttl)
+                    needs_expire = True
+            if needs_expire:
+                pipe.execute()
+        except Exception as e:
+            logger.warning(f"Cache tag registration failed for {cache_key}: {e}")
+
+    def members(self, tag: str) -> Set[str]:
+        if self.redis is None:
+            with self._lock:
+                return set(self._local_tags.get(tag, ()))
+        return {_decode(member) for member in self.redis.sscan_iter(self.tag_key(tag), count=self.batch_size)}
+
+    def invalidate(self, *tags: str) -> List[str]:
+        """
+        Delete every key registered under the given tags.
+
+        Returns the deleted keys so callers can drop them from local tiers
+        and announce them to peers.
+        """
+        deleted: List[str] = []
+        for tag in tags:
+            if not tag:
+                continue
+            keys = self._detach(tag)
+            for batch in _chunks(keys, self.batch_size):
+                try:
+                    self.cache.delete_many(batch)
+                except Exception as e:
+                    logger.warning(f"Cache tag delete failed for tag {tag}: {e}")
+                    continue
+                deleted.extend(batch)
+        return deleted
+
+    def _detach(self, tag: str) -> List[str]:
+        """Atomically take the tag set out of service and return its members"""
+        if self.redis is None:
+            with self._lock:
+                return sorted(self._local_tags.pop(tag, ()))
+
+        # Renaming first means keys tagged while we delete land in a fresh set
+        # instead of being dropped together with the old one.
+        source = self.tag_key(tag)
+        detached = f"{source}:invalidating:{uuid.uuid4().hex}"
+        try:
+            self.redis.rename(source, detached)
+        except Exception:
+            return []  # No such tag
+        try:
+            return sorted(_decode(m) for m in self.redis.sscan_iter(detached, count=self.batch_size))
+        finally:
+            self.redis.delete(detached)
+
+
+class InvalidationBus:
+    """
+    Redis pub/sub channel announcing deleted cache keys and patterns.
+
+    Messages carry the publisher's origin id so a process ignores its own
+    announcements.
+    """
+
+    def __init__(self, redis_client=None, cache_backend=None, channel: Optional[str] = None):
+        self.redis = redis_client
+        self.cache = cache_backend or default_cache
+        self.channel = channel or self.cache.make_key(INVALIDATION_CHANNEL)
+        self.origin = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return self.redis is not None
+
+    def publish(self, keys: Iterable[str] = (), patterns: Iterable[str] = ()) -> None:
+        if self.redis is None:
+            return
+        keys, patterns = list(keys), list(patterns)
+        if not keys and not patterns:
+            return
+        payload = json.dumps({'origin': self.origin, 'keys': keys, 'patterns': patterns})
+        try:
+            self.redis.publish(self.channel, payload)
+        except Exception as e:
+            logger.warning(f"Cache invalidation publish failed: {e}")
+
+    def start(self, handler: Callable[[List[str], List[str]], None]) -> bool:
+        """Run handler(keys, patterns) for peer announcements on a daemon thread"""
+        if self.redis is None or (self._thread is not None and self._thread.is_alive()):
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._listen, args=(handler,), name='cache-invalidation-listener', daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _listen(self, handler: Callable[[List[str], List[str]], None]) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                backoff = 1.0
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=0.5)
+                    if message and message.get('type') == 'message':
+                        self._dispatch(message.get('data'), handler)
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener error, reconnecting in {backoff:.0f}s: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def _dispatch(self, data: Any, handler: Callable[[List[str], List[str]], None]) -> None:
+        try:
+            payload = json.loads(_decode(data))
+        except (TypeError, ValueError):
+            logger.debug(f"Ignoring malformed cache invalidation message: {data!r}")
+            return
+        if payload.get('origin') == self.origin:
+            return
+        try:
+            handler(payload.get('keys') or [], payload.get('patterns') or [])
+        except Exception as e:
+            logger.warning(f"Cache invalidation handler failed: {e}")
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+# Global registry shared by module-level cache helpers
+_tag_registry: Optional[CacheTagRegistry] = None
+
+
+def get_tag_registry() -> CacheTagRegistry:
+    """Get global cache tag registry instance"""
+    global _tag_registry
+    if _tag_registry is None:
+        _tag_registry = CacheTagRegistry(get_default_redis_client())
+    return _tag_registry
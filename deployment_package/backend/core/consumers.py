@@ -171,6 +171,19 @@ await self.send(text_data=json.dumps({
 'message': event['message'],
 'timestamp': event['timestamp']
 }))
+async def stock_price_batch(self, event):
+"""Handle one update cycle's changed stock prices from group"""
+# Clients expect one price_update frame per symbol
+for update in event['updates']:
+await self.send(text_data=json.dumps({
+'type': 'price_update',
+'symbol': update['symbol'],
+'price': update['price'],
+'change': update['change'],
+'change_percent': update['change_percent'],
+'volume': update['volume'],
+'timestamp': event['timestamp']
+}))
 class DiscussionConsumer(AsyncWebsocketConsumer):
 """WebSocket consumer for real-time discussion updates"""
 async def connect(self):
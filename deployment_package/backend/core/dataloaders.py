@@ -4,30 +4,192 @@ DataLoader implementation for GraphQL to prevent N+1 query problems
 from typing import List, Dict, Any, Optional
 from collections import defaultdict
 import logging
+import threading
 from django.contrib.auth import get_user_model
-from .models import Stock, IncomeProfile
-from .banking_models import BankAccount
+from .models import Stock, IncomeProfile, Portfolio
+from .banking_models import BankAccount, BankTransaction
+from .raha_models import RAHASignal
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
+class Deferred:
+    """
+    A value that becomes available once its DataLoader batch is dispatched.
+
+    Minimal synchronous future for the sync GraphQL executor: callbacks run as
+    soon as the value is set, so every resolver waiting on one batch completes
+    in a single pass (see core.graphql.dataloaders.execution).
+    """
+
+    __slots__ = ("_state", "_value", "_callbacks")
+
+    PENDING, FULFILLED, REJECTED = 0, 1, 2
+
+    def __init__(self):
+        self._state = Deferred.PENDING
+        self._value = None
+        self._callbacks = []
+
+    @property
+    def is_pending(self) -> bool:
+        return self._state == Deferred.PENDING
+
+    @property
+    def value(self):
+        """The resolved value (raises the error if rejected, RuntimeError if still pending)"""
+        if self._state == Deferred.FULFILLED:
+            return self._value
+        if self._state == Deferred.REJECTED:
+            raise self._value
+        raise RuntimeError("Deferred value accessed before its batch was dispatched")
+
+    def resolve(self, value):
+        if self._state != Deferred.PENDING:
+            return
+        if isinstance(value, Deferred):
+            value._subscribe(self._adopt)
+            return
+        self._settle(Deferred.FULFILLED, value)
+
+    def reject(self, error: Exception):
+        if self._state == Deferred.PENDING:
+            self._settle(Deferred.REJECTED, error)
+
+    def then(self, on_value=None, on_error=None) -> "Deferred":
+        """
+        Chain a callback on the value (or error).
+
+        Returns a new Deferred for the callback's result; exceptions raised by a
+        callback reject it, and a missing callback passes the outcome through.
+        """
+        result = Deferred()
+
+        def run(source):
+            handler = on_value if source._state == Deferred.FULFILLED else on_error
+            if handler is None:
+                result._adopt(source)
+                return
+            try:
+                result.resolve(handler(source._value))
+            except Exception as e:
+                result.reject(e)
+
+        self._subscribe(run)
+        return result
+
+    @staticmethod
+    def gather(values):
+        """
+        Turn a list or dict that may contain Deferreds into one Deferred of the
+        same container with every value resolved (rejects on the first error).
+        """
+        keys = range(len(values)) if isinstance(values, list) else list(values)
+        out = list(values) if isinstance(values, list) else dict(values)
+        result = Deferred()
+        pending = [k for k in keys if isinstance(out[k], Deferred)]
+        remaining = [len(pending)]
+        if not pending:
+            result.resolve(out)
+            return result
+
+        def on_settled(key):
+            def run(source):
+                if source._state == Deferred.REJECTED:
+                    result.reject(source._value)
+                    return
+                out[key] = source._value
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    result.resolve(out)
+            return run
+
+        for key in pending:
+            out[key]._subscribe(on_settled(key))
+        return result
+
+    def _subscribe(self, callback):
+        if self._state == Deferred.PENDING:
+            self._callbacks.append(callback)
+        else:
+            callback(self)
+
+    def _adopt(self, source):
+        if source._state == Deferred.FULFILLED:
+            self.resolve(source._value)
+        else:
+            self.reject(source._value)
+
+    def _settle(self, state, value):
+        self._state = state
+        self._value = value
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+
+# Loaders (deferred mode) with queued keys waiting for the current tick to end.
+# Thread-local because each WSGI request executes on a single thread.
+_scheduled = threading.local()
+
+
+def _scheduled_loaders() -> List["DataLoader"]:
+    loaders = getattr(_scheduled, "loaders", None)
+    if loaders is None:
+        loaders = _scheduled.loaders = []
+    return loaders
+
+
+def dispatch_pending() -> bool:
+    """
+    Dispatch every batch queued on this thread (one query per loader).
+
+    Resolving a batch can queue further loads (nested relations), so callers
+    loop until this returns False.
+
+    Returns:
+        True if at least one batch was dispatched
+    """
+    loaders = _scheduled_loaders()
+    if not loaders:
+        return False
+    batch = list(loaders)
+    loaders.clear()
+    for loader in batch:
+        loader._dispatch_batch()
+    return True
+
+
+def discard_pending():
+    """Drop queued batches on this thread (e.g. after an aborted execution)"""
+    _scheduled_loaders().clear()
+
+
 class DataLoader:
     """
-    Simple DataLoader implementation for batching and caching GraphQL queries
+    DataLoader for batching and caching GraphQL queries
     Prevents N+1 query problems by batching multiple requests into single queries
+
+    In deferred mode (per-request loaders, see core.graphql.dataloaders) load()
+    returns a Deferred and only queues the key; all keys collected while the
+    executor walks one level of the query are fetched by a single
+    batch_load_fn call when the executor dispatches pending batches.
+    Without deferred mode load() fetches immediately and returns the value.
     """
     
-    def __init__(self, batch_load_fn, cache_key_fn=None):
+    def __init__(self, batch_load_fn, cache_key_fn=None, deferred=False):
         """
         Initialize DataLoader
         
         Args:
             batch_load_fn: Function that takes a list of keys and returns a list of values
             cache_key_fn: Optional function to generate cache key from key (default: str)
+            deferred: Queue keys and return Deferreds until the batch is dispatched
         """
         self.batch_load_fn = batch_load_fn
         self.cache_key_fn = cache_key_fn or str
+        self.deferred = deferred
         self.cache = {}
         self.queue = []
         self.batch_scheduled = False
@@ -40,40 +202,77 @@ class DataLoader:
             key: The key to load
             
         Returns:
-            Promise-like object (in this case, a simple value since we're sync)
+            The value, or a Deferred for it in deferred mode while the batch is pending
         """
         cache_key = self.cache_key_fn(key)
         
-        # Check cache first
+        # Check cache first (holds the pending Deferred for keys already queued)
         if cache_key in self.cache:
             return self.cache[cache_key]
         
         # Add to queue for batching
-        if key not in self.queue:
-            self.queue.append(key)
+        self.queue.append(key)
         
-        # Schedule batch load if not already scheduled
-        if not self.batch_scheduled:
-            self.batch_scheduled = True
-            # In a real async implementation, this would be scheduled
-            # For now, we'll do immediate batch loading
-            self._dispatch_batch()
+        if self.deferred:
+            pending = Deferred()
+            self.cache[cache_key] = pending
+            if not self.batch_scheduled:
+                self.batch_scheduled = True
+                _scheduled_loaders().append(self)
+            return pending
         
-        # Return from cache (will be populated by batch load)
+        self._dispatch_batch()
         return self.cache.get(cache_key)
     
-    def load_many(self, keys: List) -> List:
+    def load_many(self, keys: List):
         """
         Load multiple values by keys
         
         Args:
             keys: List of keys to load
             
+        Returns:
+            List of values (None for missing keys); a Deferred list in deferred mode
+        """
+        values = [self.load(key) for key in keys]
+        if self.deferred and any(isinstance(v, Deferred) for v in values):
+            return Deferred.gather(values)
+        return values
+
+    def load_many_now(self, keys: List) -> List:
+        """
+        Load multiple values immediately, for callers that need plain values
+        (e.g. mutations or helpers that score inside a resolver)
+
+        Keys without a settled cache entry are fetched with one batch call,
+        together with anything already queued on this loader.
+
+        Args:
+            keys: List of keys to load
+
         Returns:
             List of values (None for missing keys)
         """
-        return [self.load(key) for key in keys]
-    
+        cache_keys = [self.cache_key_fn(key) for key in keys]
+        missing = False
+        for key, cache_key in zip(keys, cache_keys):
+            if cache_key not in self.cache:
+                self.queue.append(key)
+                self.cache[cache_key] = Deferred() if self.deferred else None
+                missing = True
+            elif isinstance(self.cache[cache_key], Deferred):
+                missing = True
+        if missing:
+            scheduled = _scheduled_loaders()
+            if self in scheduled:
+                scheduled.remove(self)
+            self._dispatch_batch()
+        return [self.cache.get(cache_key) for cache_key in cache_keys]
+
+    def load_now(self, key):
+        """Load a single value immediately (see load_many_now)"""
+        return self.load_many_now([key])[0]
+
     def _dispatch_batch(self):
         """Execute batch load for all queued keys"""
         if not self.queue:
@@ -86,18 +285,23 @@ class DataLoader:
         
         try:
             # Call batch load function
-            results = self.batch_load_fn(keys)
-            
-            # Cache results
-            for key, value in zip(keys, results):
-                cache_key = self.cache_key_fn(key)
-                self.cache[cache_key] = value
+            results = list(self.batch_load_fn(keys))
+            if len(results) != len(keys):
+                raise ValueError(
+                    f"batch_load_fn returned {len(results)} values for {len(keys)} keys"
+                )
         except Exception as e:
             logger.error(f"Error in DataLoader batch load: {e}", exc_info=True)
             # Cache None for failed keys
-            for key in keys:
-                cache_key = self.cache_key_fn(key)
-                self.cache[cache_key] = None
+            results = [None] * len(keys)
+        
+        # Cache results (settled values replace the pending Deferreds)
+        for key, value in zip(keys, results):
+            cache_key = self.cache_key_fn(key)
+            pending = self.cache.get(cache_key)
+            self.cache[cache_key] = value
+            if isinstance(pending, Deferred):
+                pending.resolve(value)
     
     def clear(self, key=None):
         """
@@ -124,6 +328,79 @@ class DataLoader:
         self.cache[cache_key] = value
 
 
+# ---------------------------------------------------------------------------
+# Batch load functions (shared by the global and per-request loaders)
+# ---------------------------------------------------------------------------
+
+def batch_load_users(user_ids: List[int]) -> List[Optional[User]]:
+    """Batch load users by IDs"""
+    users = User.objects.filter(id__in=user_ids)
+    user_dict = {user.id: user for user in users}
+    return [user_dict.get(user_id) for user_id in user_ids]
+
+
+def batch_load_stocks(symbols: List[str]) -> List[Optional[Stock]]:
+    """Batch load stocks by symbols"""
+    symbols_upper = [s.upper() for s in symbols]
+    stocks = Stock.objects.filter(symbol__in=symbols_upper)
+    stock_dict = {stock.symbol.upper(): stock for stock in stocks}
+    return [stock_dict.get(s.upper()) for s in symbols]
+
+
+def batch_load_stocks_by_id(stock_ids: List[int]) -> List[Optional[Stock]]:
+    """Batch load stocks by primary key (resolving Stock foreign keys)"""
+    stock_dict = Stock.objects.in_bulk(stock_ids)
+    return [stock_dict.get(stock_id) for stock_id in stock_ids]
+
+
+def batch_load_income_profiles(user_ids: List[int]) -> List[Optional[IncomeProfile]]:
+    """Batch load income profiles by user IDs"""
+    profiles = IncomeProfile.objects.filter(user_id__in=user_ids).select_related('user')
+    profile_dict = {profile.user_id: profile for profile in profiles}
+    return [profile_dict.get(user_id) for user_id in user_ids]
+
+
+def batch_load_bank_accounts(user_ids: List[int]) -> List[List[BankAccount]]:
+    """Batch load bank accounts by user IDs (returns list of lists)"""
+    accounts = BankAccount.objects.filter(user_id__in=user_ids, is_verified=True)
+    accounts_by_user = defaultdict(list)
+    for account in accounts:
+        accounts_by_user[account.user_id].append(account)
+    return [accounts_by_user.get(user_id, []) for user_id in user_ids]
+
+
+def batch_load_portfolio_holdings(user_ids: List[int]) -> List[List[Portfolio]]:
+    """Batch load portfolio holdings (with their stocks) by user IDs"""
+    holdings = Portfolio.objects.filter(user_id__in=user_ids).select_related('stock')
+    holdings_by_user = defaultdict(list)
+    for holding in holdings:
+        holdings_by_user[holding.user_id].append(holding)
+    return [holdings_by_user.get(user_id, []) for user_id in user_ids]
+
+
+def batch_load_bank_transactions(account_ids: List[int]) -> List[List[BankTransaction]]:
+    """Batch load transactions by bank account IDs (most recent first)"""
+    transactions = BankTransaction.objects.filter(
+        bank_account_id__in=account_ids
+    ).order_by('-posted_date', '-id')
+    transactions_by_account = defaultdict(list)
+    for transaction in transactions:
+        transactions_by_account[transaction.bank_account_id].append(transaction)
+    return [transactions_by_account.get(account_id, []) for account_id in account_ids]
+
+
+def batch_load_raha_signals(symbols: List[str]) -> List[List[RAHASignal]]:
+    """Batch load RAHA signals by symbol (most recent first, with strategy version)"""
+    symbols_upper = [s.upper() for s in symbols]
+    signals = RAHASignal.objects.filter(
+        symbol__in=symbols_upper
+    ).select_related('strategy_version').order_by('-timestamp')
+    signals_by_symbol = defaultdict(list)
+    for signal in signals:
+        signals_by_symbol[signal.symbol.upper()].append(signal)
+    return [signals_by_symbol.get(s.upper(), []) for s in symbols]
+
+
 # Global DataLoader instances
 _user_loader = None
 _stock_loader = None
@@ -135,12 +412,6 @@ def get_user_loader() -> DataLoader:
     """Get or create User DataLoader"""
     global _user_loader
     if _user_loader is None:
-        def batch_load_users(user_ids: List[int]) -> List[Optional[User]]:
-            """Batch load users by IDs"""
-            users = User.objects.filter(id__in=user_ids)
-            user_dict = {user.id: user for user in users}
-            return [user_dict.get(user_id) for user_id in user_ids]
-        
         _user_loader = DataLoader(batch_load_users)
     return _user_loader
 
@@ -149,13 +420,6 @@ def get_stock_loader() -> DataLoader:
     """Get or create Stock DataLoader"""
     global _stock_loader
     if _stock_loader is None:
-        def batch_load_stocks(symbols: List[str]) -> List[Optional[Stock]]:
-            """Batch load stocks by symbols"""
-            symbols_upper = [s.upper() for s in symbols]
-            stocks = Stock.objects.filter(symbol__in=symbols_upper)
-            stock_dict = {stock.symbol.upper(): stock for stock in stocks}
-            return [stock_dict.get(s.upper()) for s in symbols]
-        
         _stock_loader = DataLoader(batch_load_stocks)
     return _stock_loader
 
@@ -164,12 +428,6 @@ def get_income_profile_loader() -> DataLoader:
     """Get or create IncomeProfile DataLoader"""
     global _income_profile_loader
     if _income_profile_loader is None:
-        def batch_load_income_profiles(user_ids: List[int]) -> List[Optional[IncomeProfile]]:
-            """Batch load income profiles by user IDs"""
-            profiles = IncomeProfile.objects.filter(user_id__in=user_ids).select_related('user')
-            profile_dict = {profile.user_id: profile for profile in profiles}
-            return [profile_dict.get(user_id) for user_id in user_ids]
-        
         _income_profile_loader = DataLoader(batch_load_income_profiles)
     return _income_profile_loader
 
@@ -178,14 +436,6 @@ def get_bank_account_loader() -> DataLoader:
     """Get or create BankAccount DataLoader"""
     global _bank_account_loader
     if _bank_account_loader is None:
-        def batch_load_bank_accounts(user_ids: List[int]) -> List[List[BankAccount]]:
-            """Batch load bank accounts by user IDs (returns list of lists)"""
-            accounts = BankAccount.objects.filter(user_id__in=user_ids, is_verified=True)
-            accounts_by_user = defaultdict(list)
-            for account in accounts:
-                accounts_by_user[account.user_id].append(account)
-            return [accounts_by_user.get(user_id, []) for user_id in user_ids]
-        
         _bank_account_loader = DataLoader(batch_load_bank_accounts)
     return _bank_account_loader
 
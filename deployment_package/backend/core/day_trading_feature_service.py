@@ -10,8 +10,63 @@ from datetime import datetime, timedelta
 import logging
 import math
 
+from core import indicators
+
 logger = logging.getLogger(__name__)
 
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Column order of the batch feature matrix (same keys, same order as extract_all_features)
+FEATURE_COLUMNS = (
+    'body_pct', 'upper_wick_pct', 'lower_wick_pct', 'range_pct', 'gap_up_pct', 'gap_down_pct',
+    'is_hammer', 'is_shooting_star', 'is_doji', 'is_engulfing_bull', 'is_engulfing_bear',
+    'is_marubozu', 'is_spinning_top', 'is_hanging_man', 'is_inverted_hammer',
+    'is_three_white_soldiers', 'is_three_black_crows', 'sma_5', 'sma_10', 'sma_20', 'sma_50',
+    'ema_12', 'ema_26', 'macd', 'macd_signal', 'macd_hist', 'rsi_14', 'bb_upper', 'bb_middle',
+    'bb_lower', 'bb_width', 'bb_position', 'stoch_k', 'stoch_d', 'atr_14', 'volume_ratio',
+    'volume_zscore', 'price_above_sma20', 'price_above_sma50', 'sma20_above_sma50',
+    'rsi_overbought', 'rsi_oversold', 'price_at_bb_upper', 'price_at_bb_lower', 'realized_vol_20',
+    'realized_vol_10', 'atr_14_pct', 'atr_5_pct', 'true_range_pct', 'breakout_pct',
+    'breakdown_pct', 'range_compression', 'is_vol_expansion', 'is_breakout', 'is_breakdown',
+    'trend_strength', 'is_trend_regime', 'is_range_regime', 'is_high_vol_chop', 'is_trend_up',
+    'is_trend_down', 'regime_confidence', 'dow', 'dom', 'hour_of_day', 'dow_sin', 'dow_cos',
+    'hour_sin', 'hour_cos', 'is_opening_hour', 'is_closing_hour', 'is_midday', 'is_pre_market',
+    'is_after_hours', 'is_month_end', 'is_month_start', 'is_week_start', 'is_week_end',
+    'sentiment_score', 'sentiment_volume', 'bull_ratio', 'bear_ratio', 'extreme_sentiment_flag',
+    'extreme_bullish', 'extreme_bearish', 'sentiment_divergence', 'momentum_15m', 'momentum_5m',
+    'momentum_1m', 'roc_10', 'vwap', 'vwap_dist', 'vwap_dist_pct', 'vwap_dist_20',
+    'vwap_dist_pct_20', 'spread_bps', 'liquidity_score', 'atr_5m', 'atr_5m_pct',
+    'risk_per_trade_pct', 'vol_norm_size', 'risk_reward_ratio',
+)
+
+
+def stack_ohlcv(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Stack per-symbol OHLCV frames into the (symbol, bar) panel extract_features_batch takes"""
+    frames = {symbol: frame for symbol, frame in frames.items() if frame is not None and len(frame)}
+    if not frames:
+        return pd.DataFrame(columns=list(OHLCV_COLUMNS))
+    return pd.concat(frames, names=['symbol', 'bar'])
+
+
+def _panel_blocks(panel: pd.DataFrame, columns: Tuple[str, ...], max_bars: int):
+    """
+    Flatten a (symbol, bar) panel so each symbol's rows are contiguous.
+
+    Returns:
+        (symbols, values, starts, counts) where values[starts[i]:starts[i] + counts[i]]
+        are the last max_bars rows of symbols[i], oldest first
+    """
+    if panel is None or panel.empty:
+        empty = np.zeros(0, dtype=int)
+        return [], np.empty((0, len(columns))), empty, empty
+    codes, symbols = pd.factorize(panel.index.get_level_values(0))
+    order = np.argsort(codes, kind='stable')
+    values = panel[list(columns)].to_numpy(dtype=float)[order]
+    counts = np.bincount(codes, minlength=len(symbols))
+    kept = np.minimum(counts, max_bars)
+    return list(symbols), values, np.cumsum(counts) - kept, kept
+
+
 
 class DayTradingFeatureService:
     """
@@ -47,362 +102,307 @@ class DayTradingFeatureService:
         if current_time is None:
             current_time = datetime.now()
         
-        features = {}
-        
         # Ensure we have enough data
         if len(ohlcv_1m) < 20 or len(ohlcv_5m) < 20:
             logger.warning(f"Insufficient data for {symbol}: 1m={len(ohlcv_1m)}, 5m={len(ohlcv_5m)}")
             return self._get_default_features()
         
-        # Use most recent data
-        ohlcv_1m = ohlcv_1m.tail(390).copy()
-        ohlcv_5m = ohlcv_5m.tail(78).copy()
-        
-        # 1. Candlestick Pattern Features (Day Trading 101)
-        features.update(self._extract_candlestick_features(ohlcv_5m))
-        
-        # 2. Classic Technical Indicators (Day Trading 101)
-        features.update(self._extract_technical_indicators(ohlcv_5m))
-        
-        # 3. Volatility & Breakout Features (Ultimate Day Trader)
-        features.update(self._extract_volatility_features(ohlcv_5m))
-        
-        # 4. Regime Detection (Ultimate Day Trader)
-        features.update(self._detect_market_regime(ohlcv_5m))
-        
-        # 5. Time-of-Day Features (Ultimate Day Trader)
-        features.update(self._extract_time_features(current_time))
-        
-        # 6. Sentiment Features (Ultimate Day Trader - Sentiment Index)
-        if sentiment_data:
-            features.update(self._extract_sentiment_features(sentiment_data))
-        else:
-            features.update(self._get_default_sentiment_features())
-        
-        # 7. Momentum & Volume Features
-        features.update(self._extract_momentum_features(ohlcv_1m, ohlcv_5m))
-        
-        # 8. VWAP Features
-        features.update(self._extract_vwap_features(ohlcv_5m))
-        
-        # 9. Spread & Liquidity Features
-        features.update(self._extract_liquidity_features(ohlcv_5m))
-        
-        # 10. Risk Management Features (Day Trading 101)
-        features.update(self._extract_risk_features(ohlcv_5m))
-        
-        return features
-    
-    def _extract_candlestick_features(self, ohlcv: pd.DataFrame) -> Dict[str, float]:
-        """
-        Extract candlestick pattern features from "Day Trading 101"
-        Returns binary flags and ratios for pattern detection
+        # A panel of one: every rule lives in _extract_panel_features
+        batch = self.extract_features_batch(
+            stack_ohlcv({symbol: ohlcv_1m}),
+            stack_ohlcv({symbol: ohlcv_5m}),
+            symbols=[symbol],
+            sentiment_data={symbol: sentiment_data} if sentiment_data else None,
+            current_time=current_time
+        )
+        return {name: float(value) for name, value in batch.iloc[0].items()}
+    
+    def extract_features_batch(
+        self,
+        ohlcv_1m: pd.DataFrame,
+        ohlcv_5m: pd.DataFrame,
+        symbols: Optional[List[str]] = None,
+        sentiment_data: Optional[Dict[str, Dict]] = None,
+        current_time: Optional[datetime] = None
+    ) -> pd.DataFrame:
         """
-        if len(ohlcv) < 2:
-            return self._get_default_candlestick_features()
+        Extract features for many symbols at once.
         
-        features = {}
-        latest = ohlcv.iloc[-1]
-        prev = ohlcv.iloc[-2] if len(ohlcv) >= 2 else latest
-        
-        open_price = float(latest['open'])
-        high_price = float(latest['high'])
-        low_price = float(latest['low'])
-        close_price = float(latest['close'])
-        prev_close = float(prev['close'])
-        
-        # Body and wick ratios
-        body = abs(close_price - open_price)
-        upper_wick = high_price - max(open_price, close_price)
-        lower_wick = min(open_price, close_price) - low_price
-        total_range = high_price - low_price
-        
-        if open_price > 0:
-            features['body_pct'] = body / open_price
-            features['upper_wick_pct'] = upper_wick / open_price if upper_wick > 0 else 0.0
-            features['lower_wick_pct'] = lower_wick / open_price if lower_wick > 0 else 0.0
-            features['range_pct'] = total_range / open_price
-        else:
-            features['body_pct'] = 0.0
-            features['upper_wick_pct'] = 0.0
-            features['lower_wick_pct'] = 0.0
-            features['range_pct'] = 0.0
+        Cross-sectional version of extract_all_features: symbols with the same
+        number of 5-minute bars are stacked into (bars, symbols) arrays and each
+        feature is computed once for the whole group. Values match
+        extract_all_features symbol by symbol; symbols with insufficient data get
+        the same defaults, with 0.0 for the features the defaults leave out.
         
-        # Gap features
-        if prev_close > 0:
-            gap = open_price - prev_close
-            features['gap_up_pct'] = max(0, gap / prev_close) if gap > 0 else 0.0
-            features['gap_down_pct'] = abs(min(0, gap / prev_close)) if gap < 0 else 0.0
-        else:
-            features['gap_up_pct'] = 0.0
-            features['gap_down_pct'] = 0.0
-        
-        # Pattern detection (binary flags)
-        features['is_hammer'] = float(self._is_hammer(latest))
-        features['is_shooting_star'] = float(self._is_shooting_star(latest))
-        features['is_doji'] = float(self._is_doji(latest))
-        features['is_engulfing_bull'] = float(self._is_bullish_engulfing(latest, prev))
-        features['is_engulfing_bear'] = float(self._is_bearish_engulfing(latest, prev))
-        features['is_marubozu'] = float(self._is_marubozu(latest))
-        features['is_spinning_top'] = float(self._is_spinning_top(latest))
-        features['is_hanging_man'] = float(self._is_hanging_man(latest, prev))
-        features['is_inverted_hammer'] = float(self._is_inverted_hammer(latest))
-        
-        # Multi-bar patterns (need 3+ bars)
-        if len(ohlcv) >= 3:
-            features['is_three_white_soldiers'] = float(self._is_three_white_soldiers(ohlcv.tail(3)))
-            features['is_three_black_crows'] = float(self._is_three_black_crows(ohlcv.tail(3)))
-        else:
-            features['is_three_white_soldiers'] = 0.0
-            features['is_three_black_crows'] = 0.0
+        Args:
+            ohlcv_1m: 1-minute OHLCV bars indexed by (symbol, bar), oldest first (see stack_ohlcv)
+            ohlcv_5m: 5-minute OHLCV bars indexed by (symbol, bar), oldest first
+            symbols: Row order of the result (defaults to order of appearance in the panels)
+            sentiment_data: Optional sentiment data per symbol
+            current_time: Current timestamp (defaults to now)
         
-        return features
-    
-    def _extract_technical_indicators(self, ohlcv: pd.DataFrame) -> Dict[str, float]:
+        Returns:
+            DataFrame indexed by symbol with FEATURE_COLUMNS columns
         """
-        Extract classic technical indicators from "Day Trading 101"
+        if current_time is None:
+            current_time = datetime.now()
+        sentiment_data = sentiment_data or {}
+        
+        symbols_5m, values_5m, starts_5m, counts_5m = _panel_blocks(ohlcv_5m, OHLCV_COLUMNS, 78)
+        symbols_1m, values_1m, starts_1m, counts_1m = _panel_blocks(ohlcv_1m, ('close',), 390)
+        if symbols is None:
+            symbols = list(dict.fromkeys(symbols_5m + symbols_1m))
+        
+        column = {name: i for i, name in enumerate(FEATURE_COLUMNS)}
+        defaults = self._get_default_features()
+        matrix = np.tile(
+            np.array([defaults.get(name, 0.0) for name in FEATURE_COLUMNS], dtype=float),
+            (len(symbols), 1)
+        )
+        
+        # Symbols with enough 1m and 5m bars; the rest keep the defaults
+        pos_5m = {symbol: i for i, symbol in enumerate(symbols_5m)}
+        pos_1m = {symbol: i for i, symbol in enumerate(symbols_1m)}
+        rows, blocks_5m, blocks_1m = [], [], []
+        for row, symbol in enumerate(symbols):
+            i, j = pos_5m.get(symbol), pos_1m.get(symbol)
+            if i is None or j is None or counts_5m[i] < 20 or counts_1m[j] < 20:
+                continue
+            rows.append(row)
+            blocks_5m.append(i)
+            blocks_1m.append(j)
+        if len(rows) < len(symbols):
+            logger.warning(f"Insufficient data for {len(symbols) - len(rows)} of {len(symbols)} symbols")
+        if not rows:
+            return pd.DataFrame(matrix, index=pd.Index(symbols, name='symbol'), columns=list(FEATURE_COLUMNS))
+        rows, blocks_5m, blocks_1m = np.array(rows), np.array(blocks_5m), np.array(blocks_1m)
+        
+        # Same for every symbol at this timestamp
+        for name, value in self._extract_time_features(current_time).items():
+            matrix[rows, column[name]] = value
+        for row in rows:
+            data = sentiment_data.get(symbols[row])
+            sentiment = self._extract_sentiment_features(data) if data else self._get_default_sentiment_features()
+            for name, value in sentiment.items():
+                matrix[row, column[name]] = value
+        
+        # Last two 1m closes per symbol (1-minute momentum)
+        ends_1m = starts_1m[blocks_1m] + counts_1m[blocks_1m]
+        closes_1m = values_1m[np.stack([ends_1m - 2, ends_1m - 1]), 0]
+        
+        n_bars = counts_5m[blocks_5m]
+        for length in np.unique(n_bars):
+            group = np.flatnonzero(n_bars == length)
+            # (symbols, bars, columns) -> (columns, bars, symbols)
+            bar_rows = starts_5m[blocks_5m[group]][:, None] + np.arange(length)
+            opens, highs, lows, closes, volumes = values_5m[bar_rows].transpose(2, 1, 0)
+            features = self._extract_panel_features(opens, highs, lows, closes, volumes, closes_1m[:, group])
+            for name, values in features.items():
+                matrix[rows[group], column[name]] = values
+        
+        return pd.DataFrame(matrix, index=pd.Index(symbols, name='symbol'), columns=list(FEATURE_COLUMNS))
+    
+    def _extract_panel_features(
+        self,
+        opens: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        closes: np.ndarray,
+        volumes: np.ndarray,
+        closes_1m: np.ndarray
+    ) -> Dict[str, np.ndarray]:
         """
-        if len(ohlcv) < 20:
-            return self._get_default_technical_features()
+        Candlestick, indicator, volatility, regime, momentum, VWAP, liquidity and
+        risk features for symbols with the same bar count.
         
-        features = {}
-        closes = ohlcv['close'].values
-        opens = ohlcv['open'].values
-        highs = ohlcv['high'].values
-        lows = ohlcv['low'].values
-        volumes = ohlcv['volume'].values
-        current_price = float(closes[-1])
-        
-        # Moving Averages
-        features['sma_5'] = float(np.mean(closes[-5:])) if len(closes) >= 5 else current_price
-        features['sma_10'] = float(np.mean(closes[-10:])) if len(closes) >= 10 else current_price
-        features['sma_20'] = float(np.mean(closes[-20:])) if len(closes) >= 20 else current_price
-        features['sma_50'] = float(np.mean(closes[-50:])) if len(closes) >= 50 else current_price
-        
-        # EMA (simplified - using weighted average)
-        features['ema_12'] = float(self._calculate_ema(closes, 12))
-        features['ema_26'] = float(self._calculate_ema(closes, 26))
-        
-        # MACD
-        macd = features['ema_12'] - features['ema_26']
-        features['macd'] = macd
-        features['macd_signal'] = macd * 0.9  # Simplified signal line
-        features['macd_hist'] = macd - features['macd_signal']
-        
-        # RSI
-        features['rsi_14'] = float(self._calculate_rsi(closes, 14))
-        
-        # Bollinger Bands
-        if len(closes) >= 20:
-            sma_20 = features['sma_20']
-            std_20 = float(np.std(closes[-20:]))
-            features['bb_upper'] = sma_20 + (2 * std_20)
-            features['bb_middle'] = sma_20
-            features['bb_lower'] = sma_20 - (2 * std_20)
-            features['bb_width'] = (features['bb_upper'] - features['bb_lower']) / sma_20 if sma_20 > 0 else 0.0
-            features['bb_position'] = (current_price - features['bb_lower']) / (features['bb_upper'] - features['bb_lower']) if (features['bb_upper'] - features['bb_lower']) > 0 else 0.5
-        else:
-            features['bb_upper'] = current_price * 1.02
-            features['bb_middle'] = current_price
-            features['bb_lower'] = current_price * 0.98
-            features['bb_width'] = 0.04
-            features['bb_position'] = 0.5
-        
-        # Stochastic Oscillator
-        if len(closes) >= 14:
-            high_14 = float(np.max(highs[-14:]))
-            low_14 = float(np.min(lows[-14:]))
-            if high_14 != low_14:
-                features['stoch_k'] = ((current_price - low_14) / (high_14 - low_14)) * 100
-            else:
-                features['stoch_k'] = 50.0
-            # Simplified %D (3-period SMA of %K)
-            if len(closes) >= 17:
-                k_values = []
-                for i in range(-3, 0):
-                    end = i + 1
-                    if end == 0:
-                        end = None
-                    window_highs = highs[i-13:end]
-                    window_lows = lows[i-13:end]
-                    if len(window_highs) == 0 or len(window_lows) == 0:
-                        k_values.append(50.0)
-                        continue
-                    denom = float(np.max(window_highs)) - float(np.min(window_lows))
-                    if denom > 0:
-                        k_values.append(((closes[i] - float(np.min(window_lows))) / denom) * 100)
-                    else:
-                        k_values.append(50.0)
-                features['stoch_d'] = float(np.mean(k_values))
-            else:
-                features['stoch_d'] = features['stoch_k']
-        else:
-            features['stoch_k'] = 50.0
-            features['stoch_d'] = 50.0
-        
-        # ATR (Average True Range)
-        if len(ohlcv) >= 14:
-            true_ranges = []
-            for i in range(1, min(15, len(ohlcv))):
-                tr1 = highs[i] - lows[i]
-                tr2 = abs(highs[i] - closes[i-1])
-                tr3 = abs(lows[i] - closes[i-1])
-                true_ranges.append(max(tr1, tr2, tr3))
-            features['atr_14'] = float(np.mean(true_ranges))
-        else:
-            features['atr_14'] = current_price * 0.02  # Default 2%
-        
-        # Volume features
-        if len(volumes) >= 20:
-            avg_volume = float(np.mean(volumes[-20:]))
-            current_volume = float(volumes[-1])
-            features['volume_ratio'] = current_volume / avg_volume if avg_volume > 0 else 1.0
-            features['volume_zscore'] = (current_volume - avg_volume) / (float(np.std(volumes[-20:])) + 1e-6)
-        else:
-            features['volume_ratio'] = 1.0
-            features['volume_zscore'] = 0.0
-        
-        # Indicator state flags
-        features['price_above_sma20'] = 1.0 if current_price > features['sma_20'] else 0.0
-        features['price_above_sma50'] = 1.0 if current_price > features['sma_50'] else 0.0
-        features['sma20_above_sma50'] = 1.0 if features['sma_20'] > features['sma_50'] else 0.0
-        features['rsi_overbought'] = 1.0 if features['rsi_14'] > 70 else 0.0
-        features['rsi_oversold'] = 1.0 if features['rsi_14'] < 30 else 0.0
-        features['price_at_bb_upper'] = 1.0 if current_price >= features['bb_upper'] * 0.995 else 0.0
-        features['price_at_bb_lower'] = 1.0 if current_price <= features['bb_lower'] * 1.005 else 0.0
+        Args:
+            opens, highs, lows, closes, volumes: (bars, symbols) 5-minute data, 20-78 bars
+            closes_1m: (2, symbols) last two 1-minute closes
         
-        return features
-    
-    def _extract_volatility_features(self, ohlcv: pd.DataFrame) -> Dict[str, float]:
-        """
-        Extract volatility and breakout features from "The Ultimate Day Trader"
-        Bernstein's volatility expansion/contraction concepts
+        Returns:
+            Feature name -> (symbols,) array, excluding time and sentiment features
         """
-        if len(ohlcv) < 20:
-            return self._get_default_volatility_features()
-        
+        n_bars = closes.shape[0]
         features = {}
-        closes = ohlcv['close'].values
-        highs = ohlcv['high'].values
-        lows = ohlcv['low'].values
-        current_price = float(closes[-1])
-        
-        # Realized volatility
-        if len(closes) >= 20:
-            returns = np.diff(closes[-20:]) / closes[-20:-1]
-            features['realized_vol_20'] = float(np.std(returns)) * np.sqrt(252)  # Annualized
-            features['realized_vol_10'] = float(np.std(returns[-10:])) * np.sqrt(252) if len(returns) >= 10 else features['realized_vol_20']
-        else:
-            features['realized_vol_20'] = 0.2  # Default 20% vol
-            features['realized_vol_10'] = 0.2
-        
-        # ATR as percentage
-        atr = self._calculate_atr(ohlcv, 14)
-        features['atr_14_pct'] = atr / current_price if current_price > 0 else 0.02
-        features['atr_5_pct'] = self._calculate_atr(ohlcv, 5) / current_price if current_price > 0 else 0.02
-        
-        # True range percentage
-        latest = ohlcv.iloc[-1]
-        features['true_range_pct'] = (float(latest['high']) - float(latest['low'])) / current_price if current_price > 0 else 0.0
-        
-        # Breakout strength (Bernstein's concept)
-        if len(ohlcv) >= 20:
-            prior_high_20 = float(np.max(highs[-20:]))
-            prior_low_20 = float(np.min(lows[-20:]))
-            prior_range_20 = prior_high_20 - prior_low_20
+        open_price, high_price, low_price, price = opens[-1], highs[-1], lows[-1], closes[-1]
+        prev_open, prev_close = opens[-2], closes[-2]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # 1. Candlesticks
+            body = np.abs(price - open_price)
+            upper_wick = high_price - np.maximum(open_price, price)
+            lower_wick = np.minimum(open_price, price) - low_price
+            total_range = high_price - low_price
+            has_range = total_range != 0
+            has_open = open_price > 0
+            features['body_pct'] = np.where(has_open, body / open_price, 0.0)
+            features['upper_wick_pct'] = np.where(has_open & (upper_wick > 0), upper_wick / open_price, 0.0)
+            features['lower_wick_pct'] = np.where(has_open & (lower_wick > 0), lower_wick / open_price, 0.0)
+            features['range_pct'] = np.where(has_open, total_range / open_price, 0.0)
+            gap = open_price - prev_close
+            features['gap_up_pct'] = np.where((prev_close > 0) & (gap > 0), gap / prev_close, 0.0)
+            features['gap_down_pct'] = np.where((prev_close > 0) & (gap < 0), np.abs(gap / prev_close), 0.0)
             
-            if prior_range_20 > 0:
-                features['breakout_pct'] = (current_price - prior_high_20) / prior_range_20
-                features['breakdown_pct'] = (current_price - prior_low_20) / prior_range_20
-            else:
-                features['breakout_pct'] = 0.0
-                features['breakdown_pct'] = 0.0
+            long_upper_wick = has_range & (upper_wick > 2 * body) & (lower_wick < body * 0.5) & (body > 0)
+            prev_body, curr_body = prev_close - prev_open, price - open_price
+            features['is_hammer'] = has_range & (lower_wick > 2 * body) & (upper_wick < body * 0.5) & (body > 0)
+            features['is_shooting_star'] = long_upper_wick
+            features['is_doji'] = has_range & (body < total_range * 0.1)
+            features['is_engulfing_bull'] = (
+                (prev_body < 0) & (curr_body > 0) & (open_price < prev_close) & (price > prev_open)
+            )
+            features['is_engulfing_bear'] = (
+                (prev_body > 0) & (curr_body < 0) & (open_price > prev_close) & (price < prev_open)
+            )
+            features['is_marubozu'] = has_range & (body > total_range * 0.95)
+            features['is_spinning_top'] = (
+                has_range & (body < total_range * 0.3) & (upper_wick > body) & (lower_wick > body)
+            )
+            features['is_hanging_man'] = (
+                has_range & (price > prev_close) & (lower_wick > 2 * body) & (body < total_range * 0.3)
+            )
+            features['is_inverted_hammer'] = long_upper_wick
+            # Closes 1-3 are compared with opens 1, 3, 2; trained models expect this
+            closes_3, opens_3 = closes[-3:], opens[-3:]
+            bodies_3, opens_ref = closes_3 - opens_3, opens_3[[0, 2, 1]]
+            features['is_three_white_soldiers'] = (
+                np.all(bodies_3 > 0, axis=0) & np.all(np.diff(closes_3, axis=0) > 0, axis=0)
+                & np.all(closes_3 > opens_ref, axis=0)
+            )
+            features['is_three_black_crows'] = (
+                np.all(bodies_3 < 0, axis=0) & np.all(np.diff(closes_3, axis=0) < 0, axis=0)
+                & np.all(closes_3 < opens_ref, axis=0)
+            )
             
-            # Prior range for context
-            if len(ohlcv) >= 60:
-                prior_range_60 = float(np.max(highs[-60:])) - float(np.min(lows[-60:]))
-                features['range_compression'] = prior_range_20 / prior_range_60 if prior_range_60 > 0 else 1.0
+            # 2. Technical indicators
+            sma_20 = closes[-20:].mean(axis=0)
+            features['sma_5'] = closes[-5:].mean(axis=0)
+            features['sma_10'] = closes[-10:].mean(axis=0)
+            features['sma_20'] = sma_20
+            features['sma_50'] = closes[-50:].mean(axis=0) if n_bars >= 50 else price
+            features['ema_12'] = indicators.ema(closes[:12], span=12)[-1]
+            features['ema_26'] = indicators.ema(closes[:26], span=26)[-1] if n_bars >= 26 else closes.mean(axis=0)
+            macd = features['ema_12'] - features['ema_26']
+            features['macd'] = macd
+            features['macd_signal'] = macd * 0.9
+            features['macd_hist'] = macd - features['macd_signal']
+            rsi_14 = indicators.rsi(closes[-15:], 14)[-1]
+            features['rsi_14'] = rsi_14
+            
+            std_20 = closes[-20:].std(axis=0)
+            bb_upper, bb_lower = sma_20 + (2 * std_20), sma_20 - (2 * std_20)
+            band = bb_upper - bb_lower
+            features['bb_upper'] = bb_upper
+            features['bb_middle'] = sma_20
+            features['bb_lower'] = bb_lower
+            features['bb_width'] = np.where(sma_20 > 0, band / sma_20, 0.0)
+            features['bb_position'] = np.where(band > 0, (price - bb_lower) / band, 0.5)
+            
+            high_14, low_14 = highs[-14:].max(axis=0), lows[-14:].min(axis=0)
+            features['stoch_k'] = np.where(high_14 != low_14, ((price - low_14) / (high_14 - low_14)) * 100, 50.0)
+            k_values = []
+            for end in (n_bars - 2, n_bars - 1, n_bars):
+                window_high, window_low = highs[end - 14:end].max(axis=0), lows[end - 14:end].min(axis=0)
+                denom = window_high - window_low
+                k_values.append(np.where(denom > 0, ((closes[end - 1] - window_low) / denom) * 100, 50.0))
+            features['stoch_d'] = np.mean(k_values, axis=0)
+            
+            atr_14 = self._panel_atr(highs, lows, closes, 14)
+            features['atr_14'] = atr_14
+            
+            avg_volume, current_volume = volumes[-20:].mean(axis=0), volumes[-1]
+            features['volume_ratio'] = np.where(avg_volume > 0, current_volume / avg_volume, 1.0)
+            features['volume_zscore'] = (current_volume - avg_volume) / (volumes[-20:].std(axis=0) + 1e-6)
+            
+            features['price_above_sma20'] = price > sma_20
+            features['price_above_sma50'] = price > features['sma_50']
+            features['sma20_above_sma50'] = sma_20 > features['sma_50']
+            features['rsi_overbought'] = rsi_14 > 70
+            features['rsi_oversold'] = rsi_14 < 30
+            features['price_at_bb_upper'] = price >= bb_upper * 0.995
+            features['price_at_bb_lower'] = price <= bb_lower * 1.005
+            
+            # 3. Volatility & breakouts
+            returns = np.diff(closes[-20:], axis=0) / closes[-20:-1]
+            features['realized_vol_20'] = returns.std(axis=0) * np.sqrt(252)
+            features['realized_vol_10'] = returns[-10:].std(axis=0) * np.sqrt(252)
+            has_price = price > 0
+            atr_14_pct = np.where(has_price, atr_14 / price, 0.02)
+            features['atr_14_pct'] = atr_14_pct
+            features['atr_5_pct'] = np.where(has_price, self._panel_atr(highs, lows, closes, 5) / price, 0.02)
+            features['true_range_pct'] = np.where(has_price, total_range / price, 0.0)
+            
+            prior_high_20, prior_low_20 = highs[-20:].max(axis=0), lows[-20:].min(axis=0)
+            prior_range_20 = prior_high_20 - prior_low_20
+            breakout_pct = np.where(prior_range_20 > 0, (price - prior_high_20) / prior_range_20, 0.0)
+            breakdown_pct = np.where(prior_range_20 > 0, (price - prior_low_20) / prior_range_20, 0.0)
+            features['breakout_pct'] = breakout_pct
+            features['breakdown_pct'] = breakdown_pct
+            if n_bars >= 60:
+                prior_range_60 = highs[-60:].max(axis=0) - lows[-60:].min(axis=0)
+                features['range_compression'] = np.where(prior_range_60 > 0, prior_range_20 / prior_range_60, 1.0)
             else:
                 features['range_compression'] = 1.0
-        else:
-            features['breakout_pct'] = 0.0
-            features['breakdown_pct'] = 0.0
-            features['range_compression'] = 1.0
-        
-        # Volatility expansion flags
-        if len(ohlcv) >= 50:
-            atr_history = [self._calculate_atr(ohlcv.iloc[:i+14], 14) / float(ohlcv.iloc[i+13]['close']) 
-                          for i in range(len(ohlcv) - 50, len(ohlcv) - 13)]
-            if atr_history:
-                atr_p80 = np.percentile(atr_history, 80)
-                features['is_vol_expansion'] = 1.0 if features['atr_14_pct'] > atr_p80 else 0.0
+            if n_bars >= 50:
+                atr_values = np.repeat(atr_14[None, :], 37, axis=0)
+                if n_bars == 50:
+                    atr_values[0] = self._panel_atr(highs[:14], lows[:14], closes[:14], 14)
+                atr_p80 = np.percentile(atr_values / closes[-37:], 80, axis=0)
+                features['is_vol_expansion'] = atr_14_pct > atr_p80
             else:
                 features['is_vol_expansion'] = 0.0
-        else:
-            features['is_vol_expansion'] = 0.0
-        
-        # Breakout flags
-        features['is_breakout'] = 1.0 if features['breakout_pct'] > 0.1 else 0.0  # 10% above prior high
-        features['is_breakdown'] = 1.0 if features['breakdown_pct'] < -0.1 else 0.0  # 10% below prior low
-        
-        return features
-    
-    def _detect_market_regime(self, ohlcv: pd.DataFrame) -> Dict[str, float]:
-        """
-        Detect market regime from "The Ultimate Day Trader"
-        Classifies: trend_up, trend_down, range, high_vol_chop
-        """
-        if len(ohlcv) < 50:
-            return self._get_default_regime_features()
-        
-        features = {}
-        closes = ohlcv['close'].values
-        current_price = float(closes[-1])
-        
-        # Calculate SMAs
-        sma_20 = float(np.mean(closes[-20:]))
-        sma_50 = float(np.mean(closes[-50:])) if len(closes) >= 50 else sma_20
-        
-        # Trend strength
-        trend_strength = abs(sma_20 - sma_50) / current_price if current_price > 0 else 0.0
-        features['trend_strength'] = trend_strength
-        
-        # Range compression
-        if len(ohlcv) >= 60:
-            highs = ohlcv['high'].values
-            lows = ohlcv['low'].values
-            prior_range_20 = float(np.max(highs[-20:])) - float(np.min(lows[-20:]))
-            prior_range_60 = float(np.max(highs[-60:])) - float(np.min(lows[-60:]))
-            range_compression = prior_range_20 / prior_range_60 if prior_range_60 > 0 else 1.0
-        else:
-            range_compression = 1.0
-        
-        # ATR percentage
-        atr_pct = self._calculate_atr(ohlcv, 14) / current_price if current_price > 0 else 0.02
-        
-        # Regime classification
-        is_trending = trend_strength > 0.02  # 2% difference
-        is_ranging = trend_strength < 0.01 and atr_pct < 0.015  # Low trend, low vol
-        is_chop = atr_pct > 0.02 and trend_strength < 0.01  # High vol, low trend
-        
-        features['is_trend_regime'] = 1.0 if is_trending else 0.0
-        features['is_range_regime'] = 1.0 if is_ranging else 0.0
-        features['is_high_vol_chop'] = 1.0 if is_chop else 0.0
-        
-        # Trend direction
-        price_vs_sma20 = (current_price - sma_20) / sma_20 if sma_20 > 0 else 0.0
-        features['is_trend_up'] = 1.0 if price_vs_sma20 > 0.005 else 0.0  # 0.5% above SMA20
-        features['is_trend_down'] = 1.0 if price_vs_sma20 < -0.005 else 0.0  # 0.5% below SMA20
-        
-        # Regime confidence
-        if is_trending:
-            features['regime_confidence'] = min(1.0, trend_strength * 10)  # Higher trend = higher confidence
-        elif is_ranging:
-            features['regime_confidence'] = 0.7  # Moderate confidence in range
-        elif is_chop:
-            features['regime_confidence'] = 0.3  # Low confidence in chop
-        else:
-            features['regime_confidence'] = 0.5  # Neutral
+            features['is_breakout'] = breakout_pct > 0.1
+            features['is_breakdown'] = breakdown_pct < -0.1
+            
+            # 4. Regime
+            if n_bars >= 50:
+                trend_strength = np.where(has_price, np.abs(sma_20 - closes[-50:].mean(axis=0)) / price, 0.0)
+                atr_pct = np.where(has_price, atr_14 / price, 0.02)
+                is_trending = trend_strength > 0.02
+                is_ranging = (trend_strength < 0.01) & (atr_pct < 0.015)
+                is_chop = (atr_pct > 0.02) & (trend_strength < 0.01)
+                price_vs_sma20 = np.where(sma_20 > 0, (price - sma_20) / sma_20, 0.0)
+                features['trend_strength'] = trend_strength
+                features['is_trend_regime'] = is_trending
+                features['is_range_regime'] = is_ranging
+                features['is_high_vol_chop'] = is_chop
+                features['is_trend_up'] = price_vs_sma20 > 0.005
+                features['is_trend_down'] = price_vs_sma20 < -0.005
+                features['regime_confidence'] = np.select(
+                    [is_trending, is_ranging, is_chop], [np.minimum(1.0, trend_strength * 10), 0.7, 0.3], 0.5
+                )
+            else:
+                features.update(self._get_default_regime_features())
+            
+            # 7. Momentum
+            for name, back in (('momentum_15m', closes[-3]), ('momentum_5m', closes[-2]), ('roc_10', closes[-10])):
+                features[name] = np.where(back > 0, (price - back) / back, 0.0)
+            features['momentum_1m'] = np.where(
+                closes_1m[0] > 0, (closes_1m[1] - closes_1m[0]) / closes_1m[0], 0.0
+            )
+            
+            # 8. VWAP
+            vwap = indicators.vwap(highs, lows, closes, volumes)[-1]
+            vwap = np.where(np.isnan(vwap), price, vwap)
+            vwap_20 = indicators.vwap(highs, lows, closes, volumes, window=20)[-1]
+            features['vwap'] = vwap
+            features['vwap_dist'] = price - vwap
+            features['vwap_dist_pct'] = np.where(vwap > 0, (price - vwap) / vwap, 0.0)
+            features['vwap_dist_20'] = price - vwap_20
+            features['vwap_dist_pct_20'] = np.where(vwap_20 > 0, (price - vwap_20) / vwap_20, 0.0)
+            
+            # 9. Liquidity
+            features['spread_bps'] = np.where(has_price, total_range / price, 0.0) * 10000
+            features['liquidity_score'] = np.minimum(1.0, avg_volume / 1000000)
+            
+            # 10. Risk
+            atr_5m = self._panel_atr(highs[-5:], lows[-5:], closes[-5:], 5)
+            atr_5m_pct = np.where(has_price, atr_5m / price, 0.01)
+            features['atr_5m'] = atr_5m
+            features['atr_5m_pct'] = atr_5m_pct
+            features['risk_per_trade_pct'] = 0.005
+            features['vol_norm_size'] = np.where(atr_5m > 0, 0.005 / atr_5m_pct, 1.0)
+            features['risk_reward_ratio'] = 2.0
         
         return features
     
@@ -479,129 +479,6 @@ class DayTradingFeatureService:
         
         return features
     
-    def _extract_momentum_features(self, ohlcv_1m: pd.DataFrame, ohlcv_5m: pd.DataFrame) -> Dict[str, float]:
-        """
-        Extract momentum features for day trading
-        """
-        features = {}
-        
-        # 15-minute momentum (from frontend expectation)
-        if len(ohlcv_5m) >= 3:  # 3 * 5min = 15min
-            closes_5m = ohlcv_5m['close'].values
-            features['momentum_15m'] = (closes_5m[-1] - closes_5m[-3]) / closes_5m[-3] if closes_5m[-3] > 0 else 0.0
-        else:
-            features['momentum_15m'] = 0.0
-        
-        # 5-minute momentum
-        if len(ohlcv_5m) >= 2:
-            closes_5m = ohlcv_5m['close'].values
-            features['momentum_5m'] = (closes_5m[-1] - closes_5m[-2]) / closes_5m[-2] if closes_5m[-2] > 0 else 0.0
-        else:
-            features['momentum_5m'] = 0.0
-        
-        # 1-minute momentum
-        if len(ohlcv_1m) >= 2:
-            closes_1m = ohlcv_1m['close'].values
-            features['momentum_1m'] = (closes_1m[-1] - closes_1m[-2]) / closes_1m[-2] if closes_1m[-2] > 0 else 0.0
-        else:
-            features['momentum_1m'] = 0.0
-        
-        # Rate of Change (ROC)
-        if len(ohlcv_5m) >= 10:
-            closes_5m = ohlcv_5m['close'].values
-            features['roc_10'] = (closes_5m[-1] - closes_5m[-10]) / closes_5m[-10] if closes_5m[-10] > 0 else 0.0
-        else:
-            features['roc_10'] = 0.0
-        
-        return features
-    
-    def _extract_vwap_features(self, ohlcv: pd.DataFrame) -> Dict[str, float]:
-        """
-        Extract VWAP (Volume Weighted Average Price) features
-        """
-        if len(ohlcv) < 2:
-            return {'vwap': 0.0, 'vwap_dist': 0.0, 'vwap_dist_pct': 0.0}
-        
-        features = {}
-        current_price = float(ohlcv.iloc[-1]['close'])
-        
-        # Calculate VWAP (typically for the day, but we'll use available data)
-        typical_price = (ohlcv['high'] + ohlcv['low'] + ohlcv['close']) / 3
-        vwap = (typical_price * ohlcv['volume']).sum() / ohlcv['volume'].sum() if ohlcv['volume'].sum() > 0 else current_price
-        
-        features['vwap'] = float(vwap)
-        features['vwap_dist'] = current_price - vwap
-        features['vwap_dist_pct'] = (current_price - vwap) / vwap if vwap > 0 else 0.0
-        
-        # VWAP position
-        if len(ohlcv) >= 20:
-            vwap_20 = (typical_price[-20:] * ohlcv['volume'].iloc[-20:]).sum() / ohlcv['volume'].iloc[-20:].sum()
-            features['vwap_dist_20'] = current_price - float(vwap_20)
-            features['vwap_dist_pct_20'] = (current_price - float(vwap_20)) / float(vwap_20) if vwap_20 > 0 else 0.0
-        else:
-            features['vwap_dist_20'] = features['vwap_dist']
-            features['vwap_dist_pct_20'] = features['vwap_dist_pct']
-        
-        return features
-    
-    def _extract_liquidity_features(self, ohlcv: pd.DataFrame) -> Dict[str, float]:
-        """
-        Extract spread and liquidity features
-        """
-        features = {}
-        
-        # Spread (bid-ask spread in basis points)
-        # We'll estimate from high-low range
-        if len(ohlcv) >= 1:
-            latest = ohlcv.iloc[-1]
-            high = float(latest['high'])
-            low = float(latest['low'])
-            close = float(latest['close'])
-            
-            # Estimate spread as % of price (typical intraday spread)
-            estimated_spread = (high - low) / close if close > 0 else 0.0
-            features['spread_bps'] = estimated_spread * 10000  # Convert to basis points
-        else:
-            features['spread_bps'] = 5.0  # Default 5 bps
-        
-        # Volume-based liquidity
-        if len(ohlcv) >= 20:
-            volumes = ohlcv['volume'].values
-            avg_volume = float(np.mean(volumes[-20:]))
-            features['liquidity_score'] = min(1.0, avg_volume / 1000000)  # Normalize to 1M shares
-        else:
-            features['liquidity_score'] = 0.5
-        
-        return features
-    
-    def _extract_risk_features(self, ohlcv: pd.DataFrame) -> Dict[str, float]:
-        """
-        Extract risk management features from "Day Trading 101"
-        """
-        if len(ohlcv) < 5:
-            return {'atr_5m': 0.0, 'risk_per_trade_pct': 0.005}
-        
-        features = {}
-        current_price = float(ohlcv.iloc[-1]['close'])
-        
-        # ATR for 5-minute bars (for day trading)
-        features['atr_5m'] = self._calculate_atr(ohlcv.tail(5), 5)
-        features['atr_5m_pct'] = features['atr_5m'] / current_price if current_price > 0 else 0.01
-        
-        # Risk per trade (from book: 0.5% for SAFE, 1.2% for AGGRESSIVE)
-        features['risk_per_trade_pct'] = 0.005  # Default 0.5%
-        
-        # Position sizing (volatility-normalized)
-        if features['atr_5m'] > 0:
-            features['vol_norm_size'] = features['risk_per_trade_pct'] / features['atr_5m_pct']
-        else:
-            features['vol_norm_size'] = 1.0
-        
-        # Risk/reward ratio
-        features['risk_reward_ratio'] = 2.0  # Default 2:1 R:R
-        
-        return features
-    
     def calculate_risk_metrics(
         self,
         features: Dict[str, float],
@@ -654,185 +531,12 @@ class DayTradingFeatureService:
             'timeStopMin': time_stop_min
         }
     
-    # Helper methods for pattern detection
-    
-    def _is_hammer(self, candle: pd.Series) -> bool:
-        """Detect hammer pattern"""
-        body = abs(float(candle['close']) - float(candle['open']))
-        lower_wick = min(float(candle['open']), float(candle['close'])) - float(candle['low'])
-        upper_wick = float(candle['high']) - max(float(candle['open']), float(candle['close']))
-        total_range = float(candle['high']) - float(candle['low'])
-        
-        if total_range == 0:
-            return False
-        
-        return (lower_wick > 2 * body) and (upper_wick < body * 0.5) and (body > 0)
-    
-    def _is_shooting_star(self, candle: pd.Series) -> bool:
-        """Detect shooting star pattern"""
-        body = abs(float(candle['close']) - float(candle['open']))
-        upper_wick = float(candle['high']) - max(float(candle['open']), float(candle['close']))
-        lower_wick = min(float(candle['open']), float(candle['close'])) - float(candle['low'])
-        total_range = float(candle['high']) - float(candle['low'])
-        
-        if total_range == 0:
-            return False
-        
-        return (upper_wick > 2 * body) and (lower_wick < body * 0.5) and (body > 0)
-    
-    def _is_doji(self, candle: pd.Series) -> bool:
-        """Detect doji pattern"""
-        body = abs(float(candle['close']) - float(candle['open']))
-        total_range = float(candle['high']) - float(candle['low'])
-        
-        if total_range == 0:
-            return False
-        
-        return body < (total_range * 0.1)  # Body is less than 10% of range
-    
-    def _is_bullish_engulfing(self, current: pd.Series, prev: pd.Series) -> bool:
-        """Detect bullish engulfing pattern"""
-        prev_body = float(prev['close']) - float(prev['open'])
-        curr_body = float(current['close']) - float(current['open'])
-        
-        return (prev_body < 0) and (curr_body > 0) and \
-               (float(current['open']) < float(prev['close'])) and \
-               (float(current['close']) > float(prev['open']))
-    
-    def _is_bearish_engulfing(self, current: pd.Series, prev: pd.Series) -> bool:
-        """Detect bearish engulfing pattern"""
-        prev_body = float(prev['close']) - float(prev['open'])
-        curr_body = float(current['close']) - float(current['open'])
-        
-        return (prev_body > 0) and (curr_body < 0) and \
-               (float(current['open']) > float(prev['close'])) and \
-               (float(current['close']) < float(prev['open']))
-    
-    def _is_marubozu(self, candle: pd.Series) -> bool:
-        """Detect marubozu pattern (no wicks)"""
-        body = abs(float(candle['close']) - float(candle['open']))
-        total_range = float(candle['high']) - float(candle['low'])
-        
-        if total_range == 0:
-            return False
-        
-        return body > (total_range * 0.95)  # Body is 95%+ of range
-    
-    def _is_spinning_top(self, candle: pd.Series) -> bool:
-        """Detect spinning top pattern"""
-        body = abs(float(candle['close']) - float(candle['open']))
-        upper_wick = float(candle['high']) - max(float(candle['open']), float(candle['close']))
-        lower_wick = min(float(candle['open']), float(candle['close'])) - float(candle['low'])
-        total_range = float(candle['high']) - float(candle['low'])
-        
-        if total_range == 0:
-            return False
-        
-        return (body < total_range * 0.3) and (upper_wick > body) and (lower_wick > body)
-    
-    def _is_hanging_man(self, candle: pd.Series, prev: pd.Series) -> bool:
-        """Detect hanging man pattern (bearish reversal)"""
-        body = abs(float(candle['close']) - float(candle['open']))
-        lower_wick = min(float(candle['open']), float(candle['close'])) - float(candle['low'])
-        total_range = float(candle['high']) - float(candle['low'])
-        prev_close = float(prev['close'])
-        curr_close = float(candle['close'])
-        
-        if total_range == 0:
-            return False
-        
-        # Hanging man: small body, long lower wick, at top of uptrend
-        is_at_top = curr_close > prev_close
-        return is_at_top and (lower_wick > 2 * body) and (body < total_range * 0.3)
-    
-    def _is_inverted_hammer(self, candle: pd.Series) -> bool:
-        """Detect inverted hammer pattern"""
-        body = abs(float(candle['close']) - float(candle['open']))
-        upper_wick = float(candle['high']) - max(float(candle['open']), float(candle['close']))
-        lower_wick = min(float(candle['open']), float(candle['close'])) - float(candle['low'])
-        total_range = float(candle['high']) - float(candle['low'])
-        
-        if total_range == 0:
-            return False
-        
-        return (upper_wick > 2 * body) and (lower_wick < body * 0.5) and (body > 0)
-    
-    def _is_three_white_soldiers(self, candles: pd.DataFrame) -> bool:
-        """Detect three white soldiers pattern (bullish)"""
-        if len(candles) < 3:
-            return False
-        
-        bodies = [float(candles.iloc[i]['close']) - float(candles.iloc[i]['open']) 
-                 for i in range(-3, 0)]
-        closes = [float(candles.iloc[i]['close']) for i in range(-3, 0)]
-        
-        return all(b > 0 for b in bodies) and \
-               all(closes[i] > closes[i-1] for i in range(1, 3)) and \
-               all(closes[i] > float(candles.iloc[i-3+i]['open']) for i in range(3))
-    
-    def _is_three_black_crows(self, candles: pd.DataFrame) -> bool:
-        """Detect three black crows pattern (bearish)"""
-        if len(candles) < 3:
-            return False
-        
-        bodies = [float(candles.iloc[i]['close']) - float(candles.iloc[i]['open']) 
-                 for i in range(-3, 0)]
-        closes = [float(candles.iloc[i]['close']) for i in range(-3, 0)]
-        
-        return all(b < 0 for b in bodies) and \
-               all(closes[i] < closes[i-1] for i in range(1, 3)) and \
-               all(closes[i] < float(candles.iloc[i-3+i]['open']) for i in range(3))
-    
-    # Technical indicator calculations
-    
-    def _calculate_ema(self, prices: np.ndarray, period: int) -> float:
-        """Calculate Exponential Moving Average"""
-        if len(prices) < period:
-            return float(np.mean(prices))
-        
-        # Simple EMA calculation
-        multiplier = 2.0 / (period + 1)
-        ema = float(prices[0])
-        for price in prices[1:period]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-        return ema
-    
-    def _calculate_rsi(self, prices: np.ndarray, period: int = 14) -> float:
-        """Calculate Relative Strength Index"""
-        if len(prices) < period + 1:
-            return 50.0  # Neutral
-        
-        deltas = np.diff(prices[-period-1:])
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        
-        avg_gain = np.mean(gains) if len(gains) > 0 else 0.0
-        avg_loss = np.mean(losses) if len(losses) > 0 else 0.0
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return float(rsi)
-    
-    def _calculate_atr(self, ohlcv: pd.DataFrame, period: int = 14) -> float:
-        """Calculate Average True Range"""
-        if len(ohlcv) < 2:
-            return 0.0
-        
-        true_ranges = []
-        for i in range(1, min(period + 1, len(ohlcv))):
-            high = float(ohlcv.iloc[i]['high'])
-            low = float(ohlcv.iloc[i]['low'])
-            prev_close = float(ohlcv.iloc[i-1]['close'])
-            
-            tr1 = high - low
-            tr2 = abs(high - prev_close)
-            tr3 = abs(low - prev_close)
-            true_ranges.append(max(tr1, tr2, tr3))
-        
-        return float(np.mean(true_ranges)) if true_ranges else 0.0
+    def _panel_atr(self, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int) -> np.ndarray:
+        """Mean true range over bars 1..period (the oldest bars) of (bars, symbols) arrays with at least 2 bars"""
+        true_ranges = indicators.true_range(
+            highs[:period + 1], lows[:period + 1], closes[:period + 1]
+        )[1:]
+        return true_ranges.mean(axis=0)
     
     # Default feature methods (for when data is insufficient)
     
@@ -5,6 +5,7 @@ Uses machine learning to identify patterns in successful day trading setups
 import os
 import json
 import numpy as np
+import pandas as pd
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Tuple
 from django.db import models
@@ -27,6 +28,58 @@ except ImportError:
     logger.warning("scikit-learn not available - ML features disabled. Install with: pip install scikit-learn")
 
 
+# Learner inputs, in training order
+FEATURE_NAMES = [
+    'momentum_15m', 'rvol_10m', 'vwap_dist', 'breakout_pct', 'spread_bps',
+    'catalyst_score', 'volume_ratio', 'volume_zscore', 'rsi_14',
+    'is_trend_regime', 'is_range_regime', 'is_high_vol_chop', 'regime_confidence',
+    'is_vol_expansion', 'is_breakout', 'is_three_white_soldiers',
+    'is_engulfing_bull', 'is_engulfing_bear', 'is_hammer', 'is_doji',
+    'vwap_dist_pct', 'macd_hist', 'bb_position', 'trend_strength',
+    'price_above_sma20', 'price_above_sma50', 'sma20_above_sma50',
+    'is_opening_hour', 'is_closing_hour', 'is_midday',
+    'sentiment_score', 'sentiment_volume', 'sentiment_divergence',
+    'score', 'mode_safe', 'side_long', 'hour_of_day', 'day_of_week'
+]
+
+# Map feature names to their alternatives (handle different naming conventions)
+FEATURE_ALIASES = {
+    'momentum_15m': ['momentum_15m', 'momentum15m'],
+    'rvol_10m': ['rvol_10m', 'rvol10m'],
+    'vwap_dist': ['vwap_dist', 'vwapDist'],
+    'breakout_pct': ['breakout_pct', 'breakoutPct'],
+    'spread_bps': ['spread_bps', 'spreadBps'],
+    'catalyst_score': ['catalyst_score', 'catalystScore'],
+    'volume_ratio': ['volume_ratio', 'volumeRatio'],
+    'volume_zscore': ['volume_zscore', 'volumeZscore'],
+    'rsi_14': ['rsi_14', 'rsi14'],
+    'is_trend_regime': ['is_trend_regime', 'isTrendRegime'],
+    'is_range_regime': ['is_range_regime', 'isRangeRegime'],
+    'is_high_vol_chop': ['is_high_vol_chop', 'isHighVolChop'],
+    'regime_confidence': ['regime_confidence', 'regimeConfidence'],
+    'is_vol_expansion': ['is_vol_expansion', 'isVolExpansion'],
+    'is_breakout': ['is_breakout', 'isBreakout'],
+    'is_three_white_soldiers': ['is_three_white_soldiers', 'isThreeWhiteSoldiers'],
+    'is_engulfing_bull': ['is_engulfing_bull', 'isEngulfingBull'],
+    'is_engulfing_bear': ['is_engulfing_bear', 'isEngulfingBear'],
+    'is_hammer': ['is_hammer', 'isHammer'],
+    'is_doji': ['is_doji', 'isDoji'],
+    'vwap_dist_pct': ['vwap_dist_pct', 'vwapDistPct'],
+    'macd_hist': ['macd_hist', 'macdHist'],
+    'bb_position': ['bb_position', 'bbPosition'],
+    'trend_strength': ['trend_strength', 'trendStrength'],
+    'price_above_sma20': ['price_above_sma20', 'priceAboveSma20'],
+    'price_above_sma50': ['price_above_sma50', 'priceAboveSma50'],
+    'sma20_above_sma50': ['sma20_above_sma50', 'sma20AboveSma50'],
+    'is_opening_hour': ['is_opening_hour', 'isOpeningHour'],
+    'is_closing_hour': ['is_closing_hour', 'isClosingHour'],
+    'is_midday': ['is_midday', 'isMidday'],
+    'sentiment_score': ['sentiment_score', 'sentimentScore'],
+    'sentiment_volume': ['sentiment_volume', 'sentimentVolume'],
+    'sentiment_divergence': ['sentiment_divergence', 'sentimentDivergence'],
+}
+
+
 class DayTradingMLearner:
     """
     Machine Learning system that learns from past day trading picks and their outcomes.
@@ -279,18 +332,7 @@ class DayTradingMLearner:
         try:
             # Convert feature dicts to arrays
             # Use consistent feature order
-            feature_names = [
-                'momentum_15m', 'rvol_10m', 'vwap_dist', 'breakout_pct', 'spread_bps',
-                'catalyst_score', 'volume_ratio', 'volume_zscore', 'rsi_14',
-                'is_trend_regime', 'is_range_regime', 'is_high_vol_chop', 'regime_confidence',
-                'is_vol_expansion', 'is_breakout', 'is_three_white_soldiers',
-                'is_engulfing_bull', 'is_engulfing_bear', 'is_hammer', 'is_doji',
-                'vwap_dist_pct', 'macd_hist', 'bb_position', 'trend_strength',
-                'price_above_sma20', 'price_above_sma50', 'sma20_above_sma50',
-                'is_opening_hour', 'is_closing_hour', 'is_midday',
-                'sentiment_score', 'sentiment_volume', 'sentiment_divergence',
-                'score', 'mode_safe', 'side_long', 'hour_of_day', 'day_of_week'
-            ]
+            feature_names = FEATURE_NAMES
             
             X = []
             for feat_dict in X_dicts:
@@ -449,64 +491,16 @@ class DayTradingMLearner:
         
         try:
             # Feature names in same order as training
-            feature_names = [
-                'momentum_15m', 'rvol_10m', 'vwap_dist', 'breakout_pct', 'spread_bps',
-                'catalyst_score', 'volume_ratio', 'volume_zscore', 'rsi_14',
-                'is_trend_regime', 'is_range_regime', 'is_high_vol_chop', 'regime_confidence',
-                'is_vol_expansion', 'is_breakout', 'is_three_white_soldiers',
-                'is_engulfing_bull', 'is_engulfing_bear', 'is_hammer', 'is_doji',
-                'vwap_dist_pct', 'macd_hist', 'bb_position', 'trend_strength',
-                'price_above_sma20', 'price_above_sma50', 'sma20_above_sma50',
-                'is_opening_hour', 'is_closing_hour', 'is_midday',
-                'sentiment_score', 'sentiment_volume', 'sentiment_divergence',
-                'score', 'mode_safe', 'side_long', 'hour_of_day', 'day_of_week'
-            ]
-            
-            # Map feature dict to array (handle different naming conventions)
-            feature_mapping = {
-                'momentum_15m': ['momentum_15m', 'momentum15m'],
-                'rvol_10m': ['rvol_10m', 'rvol10m'],
-                'vwap_dist': ['vwap_dist', 'vwapDist'],
-                'breakout_pct': ['breakout_pct', 'breakoutPct'],
-                'spread_bps': ['spread_bps', 'spreadBps'],
-                'catalyst_score': ['catalyst_score', 'catalystScore'],
-                'volume_ratio': ['volume_ratio', 'volumeRatio'],
-                'volume_zscore': ['volume_zscore', 'volumeZscore'],
-                'rsi_14': ['rsi_14', 'rsi14'],
-                'is_trend_regime': ['is_trend_regime', 'isTrendRegime'],
-                'is_range_regime': ['is_range_regime', 'isRangeRegime'],
-                'is_high_vol_chop': ['is_high_vol_chop', 'isHighVolChop'],
-                'regime_confidence': ['regime_confidence', 'regimeConfidence'],
-                'is_vol_expansion': ['is_vol_expansion', 'isVolExpansion'],
-                'is_breakout': ['is_breakout', 'isBreakout'],
-                'is_three_white_soldiers': ['is_three_white_soldiers', 'isThreeWhiteSoldiers'],
-                'is_engulfing_bull': ['is_engulfing_bull', 'isEngulfingBull'],
-                'is_engulfing_bear': ['is_engulfing_bear', 'isEngulfingBear'],
-                'is_hammer': ['is_hammer', 'isHammer'],
-                'is_doji': ['is_doji', 'isDoji'],
-                'vwap_dist_pct': ['vwap_dist_pct', 'vwapDistPct'],
-                'macd_hist': ['macd_hist', 'macdHist'],
-                'bb_position': ['bb_position', 'bbPosition'],
-                'trend_strength': ['trend_strength', 'trendStrength'],
-                'price_above_sma20': ['price_above_sma20', 'priceAboveSma20'],
-                'price_above_sma50': ['price_above_sma50', 'priceAboveSma50'],
-                'sma20_above_sma50': ['sma20_above_sma50', 'sma20AboveSma50'],
-                'is_opening_hour': ['is_opening_hour', 'isOpeningHour'],
-                'is_closing_hour': ['is_closing_hour', 'isClosingHour'],
-                'is_midday': ['is_midday', 'isMidday'],
-                'sentiment_score': ['sentiment_score', 'sentimentScore'],
-                'sentiment_volume': ['sentiment_volume', 'sentimentVolume'],
-                'sentiment_divergence': ['sentiment_divergence', 'sentimentDivergence'],
-            }
+            feature_names = FEATURE_NAMES
             
             feature_vector = []
             for name in feature_names:
                 value = 0.0
                 if name in features:
                     value = float(features[name])
-                elif name in feature_mapping:
+                elif name in FEATURE_ALIASES:
                     # Try alternative names
-                    for alt_name in feature_mapping[name]:
+                    for alt_name in FEATURE_ALIASES[name]:
                         if alt_name in features:
                             value = float(features[alt_name])
                             break
@@ -540,6 +534,51 @@ class DayTradingMLearner:
             logger.warning(f"Error predicting success probability: {e}, using heuristic")
             return self._heuristic_score(features)
     
+    def predict_success_probabilities(
+        self,
+        features: pd.DataFrame,
+        scores: np.ndarray,
+        mode: str,
+        sides: np.ndarray
+    ) -> np.ndarray:
+        """
+        predict_success_probability for a feature matrix, in one model call.
+        
+        Args:
+            features: One row per pick, columns named like the feature dicts
+            scores: Base score per row
+            mode: 'SAFE' or 'AGGRESSIVE' (same for every row)
+            sides: 'LONG' or 'SHORT' per row
+        """
+        if not ML_AVAILABLE or not self.model or not self.scaler:
+            return self._heuristic_scores(features)
+        
+        try:
+            n_rows = len(features)
+            columns = {}
+            for name in FEATURE_NAMES:
+                source = next((alt for alt in FEATURE_ALIASES.get(name, [name]) if alt in features.columns), None)
+                columns[name] = features[source].to_numpy(dtype=float) if source else np.zeros(n_rows)
+            
+            now = django_timezone.now()
+            columns['score'] = np.asarray(scores, dtype=float)
+            columns['mode_safe'] = np.full(n_rows, 1.0 if mode == 'SAFE' else 0.0)
+            columns['side_long'] = np.where(np.asarray(sides) == 'LONG', 1.0, 0.0)
+            columns['hour_of_day'] = np.full(n_rows, now.hour / 24.0)
+            columns['day_of_week'] = np.full(n_rows, now.weekday() / 7.0)
+            
+            feature_matrix = np.column_stack([columns[name] for name in FEATURE_NAMES])
+            probabilities = self.model.predict(self.scaler.transform(feature_matrix))
+            return np.clip(np.asarray(probabilities, dtype=float), 0.0, 1.0)
+            
+        except Exception as e:
+            logger.warning(f"Error predicting success probabilities: {e}, using heuristic")
+            return self._heuristic_scores(features)
+    
+    def _heuristic_scores(self, features: pd.DataFrame) -> np.ndarray:
+        """_heuristic_score per row"""
+        return np.array([self._heuristic_score(row) for row in features.to_dict('records')], dtype=float)
+    
     def _heuristic_score(self, features: Dict[str, float]) -> float:
         """
         Fallback heuristic score when ML model is not available.
@@ -587,6 +626,19 @@ class DayTradingMLearner:
         
         return float(enhanced_score)
     
+    def enhance_scores_with_ml(
+        self,
+        base_scores: np.ndarray,
+        features: pd.DataFrame,
+        mode: str,
+        sides: np.ndarray
+    ) -> np.ndarray:
+        """enhance_score_with_ml for a feature matrix (see predict_success_probabilities)"""
+        base_scores = np.asarray(base_scores, dtype=float)
+        ml_probs = self.predict_success_probabilities(features, base_scores, mode, sides)
+        normalized_base_scores = np.minimum(base_scores / 10.0, 1.0)
+        return ((normalized_base_scores * 0.4) + (ml_probs * 0.6)) * 10.0
+    
     def get_learning_insights(self) -> Dict:
         """
         Get insights from what the model has learned.
@@ -107,15 +107,7 @@ class DayTradingMLScorer:
                     features['exec_avg_quality_score'] = float(profile.avg_quality_score)
                     avg_slippage_bps = float(profile.avg_slippage_bps)
                     avg_quality_score = float(profile.avg_quality_score)
-                    # Penalize symbols with poor execution quality
-                    if avg_slippage_bps > 25:
-                        exec_quality_penalty = min(exec_quality_penalty, 0.75)
-                    elif avg_slippage_bps > 15:
-                        exec_quality_penalty = min(exec_quality_penalty, 0.85)
-                    if avg_quality_score < 3.5:
-                        exec_quality_penalty = min(exec_quality_penalty, 0.75)
-                    elif avg_quality_score < 4.5:
-                        exec_quality_penalty = min(exec_quality_penalty, 0.85)
+                    exec_quality_penalty = self._execution_penalty(avg_slippage_bps, avg_quality_score)
                     if exec_quality_penalty < 1.0:
                         logger.debug(
                             f"Execution penalty for {symbol}: slippage={avg_slippage_bps:.2f}bps, "
@@ -168,6 +160,83 @@ class DayTradingMLScorer:
         self._record_shadow_predictions(features, base_final, symbol)
         return base_final
     
+    def score_batch(
+        self,
+        features: pd.DataFrame,
+        mode: str = 'SAFE',
+        sides: Optional[np.ndarray] = None,
+        symbols: Optional[List[str]] = None
+    ) -> np.ndarray:
+        """
+        Score many trading opportunities in one call.
+        
+        Vectorized score() for a feature matrix from
+        DayTradingFeatureService.extract_features_batch: the base score, the ML
+        learner enhancement and the execution penalties are each computed once
+        for all rows. LSTM features, RL recommendations and shadow predictions
+        are per-symbol and only applied by score().
+        
+        Args:
+            features: One row of features per opportunity
+            mode: 'SAFE' or 'AGGRESSIVE' (for ML learner)
+            sides: 'LONG' or 'SHORT' per row (defaults to the sign of momentum_15m)
+            symbols: Symbol per row, to apply execution quality penalties as score() does
+        
+        Returns:
+            Scores from 0.0 to 10.0, one per row
+        """
+        n_rows = len(features)
+        if sides is None:
+            momentum = np.asarray(features.get('momentum_15m', 0.0), dtype=float)
+            sides = np.broadcast_to(np.where(momentum > 0, 'LONG', 'SHORT'), (n_rows,))
+        
+        if self.model is not None and self.scaler is not None:
+            base_scores = self._ml_scores(features)
+        else:
+            base_scores = np.broadcast_to(self._rule_based_scores(features), (n_rows,)).astype(float)
+        
+        exec_quality_penalty = self._execution_penalties(symbols) if symbols else np.ones(n_rows)
+        
+        if self.ml_learner and self.ml_learner.model is not None:
+            try:
+                enhanced_scores = self.ml_learner.enhance_scores_with_ml(base_scores, features, mode, sides)
+                return enhanced_scores * exec_quality_penalty
+            except Exception as e:
+                logger.debug(f"ML learner batch enhancement failed: {e}, using base scores")
+        
+        return base_scores * exec_quality_penalty
+    
+    @staticmethod
+    def _execution_penalty(avg_slippage_bps: float, avg_quality_score: float) -> float:
+        """Score multiplier for symbols with poor execution quality"""
+        penalty = 1.0
+        if avg_slippage_bps > 25:
+            penalty = min(penalty, 0.75)
+        elif avg_slippage_bps > 15:
+            penalty = min(penalty, 0.85)
+        if avg_quality_score < 3.5:
+            penalty = min(penalty, 0.75)
+        elif avg_quality_score < 4.5:
+            penalty = min(penalty, 0.85)
+        return penalty
+    
+    def _execution_penalties(self, symbols: List[str]) -> np.ndarray:
+        """_execution_penalty per symbol, from one SymbolExecutionProfile query"""
+        penalties = np.ones(len(symbols))
+        try:
+            from .signal_performance_models import SymbolExecutionProfile
+            upper = [str(symbol).upper() for symbol in symbols]
+            profiles = SymbolExecutionProfile.objects.filter(symbol__in=set(upper), fill_count__gte=5)
+            by_symbol = {
+                profile.symbol: self._execution_penalty(float(profile.avg_slippage_bps), float(profile.avg_quality_score))
+                for profile in profiles
+            }
+            for i, symbol in enumerate(upper):
+                penalties[i] = by_symbol.get(symbol, 1.0)
+        except Exception as e:
+            logger.debug(f"Could not load execution profiles: {e}")
+        return penalties
+    
     def _record_shadow_predictions(self, features: Dict, incumbent_score: float, symbol: str = None):
         """Record shadow model predictions for validation (non-blocking)."""
         if not getattr(settings, 'ENABLE_SHADOW_MODELS', False):
@@ -205,185 +274,160 @@ class DayTradingMLScorer:
             logger.error(f"Error in ML scoring: {e}")
             return self._rule_based_score(features)
     
+    def _ml_scores(self, features: pd.DataFrame) -> np.ndarray:
+        """Score a feature matrix with the trained ML model in one predict call"""
+        try:
+            feature_matrix = features.reindex(columns=self.feature_names, fill_value=0.0).to_numpy(dtype=float)
+            predictions = self.model.predict(self.scaler.transform(feature_matrix))
+            return np.clip(np.asarray(predictions, dtype=float) * 10, 0.0, 10.0)
+        except Exception as e:
+            logger.error(f"Error in batch ML scoring: {e}")
+            return np.broadcast_to(self._rule_based_scores(features), (len(features),)).astype(float)
+    
     def _rule_based_score(self, features: Dict[str, float]) -> float:
         """
         Enhanced rule-based scoring for better performance.
         Optimized to achieve >55% win rate and >0.5% avg return.
         """
+        return float(self._rule_based_scores(features))
+    
+    def _rule_based_scores(self, features) -> np.ndarray:
+        """
+        Rule-based scores for a feature dict (0-d result) or a feature matrix
+        (one score per row). Each elif chain is an np.select with the same
+        thresholds, so both paths share one set of rules.
+        """
+        def feature(name, default):
+            return np.asarray(features.get(name, default), dtype=float)
+        
         score = 0.0
         
         # 1. Momentum (15m) - CRITICAL: Strong momentum = higher win rate
-        momentum_15m = features.get('momentum_15m', 0.0)
-        momentum_strength = abs(momentum_15m)
-        
-        # Strong momentum is the #1 predictor of success
-        if momentum_strength > 0.03:  # > 3% move = very strong
-            score += 3.0
-        elif momentum_strength > 0.02:  # > 2% move = strong
-            score += 2.5
-        elif momentum_strength > 0.01:  # > 1% move = moderate
-            score += 1.5
-        elif momentum_strength > 0.005:  # > 0.5% move = weak
-            score += 0.5
-        else:
-            score -= 1.0  # No momentum = avoid
+        momentum_strength = np.abs(feature('momentum_15m', 0.0))
+        score = score + np.select(
+            [momentum_strength > 0.03,    # > 3% move = very strong
+             momentum_strength > 0.02,    # > 2% move = strong
+             momentum_strength > 0.01,    # > 1% move = moderate
+             momentum_strength > 0.005],  # > 0.5% move = weak
+            [3.0, 2.5, 1.5, 0.5],
+            -1.0  # No momentum = avoid
+        )
         
         # 2. Regime (CRITICAL: Only trade in good regimes)
-        is_trend_regime = features.get('is_trend_regime', 0.0)
-        is_range_regime = features.get('is_range_regime', 0.0)
-        is_high_vol_chop = features.get('is_high_vol_chop', 0.0)
-        regime_confidence = features.get('regime_confidence', 0.5)
-        
-        # Strong penalty for bad regimes
-        if is_high_vol_chop > 0.5:
-            score -= 2.0  # Strong penalty - avoid chop
-            return max(0.0, score)  # Early exit for bad regimes
-        
-        if is_trend_regime > 0.5 and regime_confidence > 0.7:
-            score += 3.0  # Strong trending market = best
-        elif is_trend_regime > 0.5:
-            score += 2.0  # Trending market = good
-        elif is_range_regime > 0.5:
-            score += 0.5  # Range = okay but not great
-        else:
-            score -= 0.5  # Unknown regime = risky
+        is_trend_regime = feature('is_trend_regime', 0.0)
+        is_range_regime = feature('is_range_regime', 0.0)
+        regime_confidence = feature('regime_confidence', 0.5)
+        
+        # Strong penalty for bad regimes - avoid chop, no further rules apply
+        is_high_vol_chop = feature('is_high_vol_chop', 0.0) > 0.5
+        chop_score = np.maximum(0.0, score - 2.0)
+        
+        score = score + np.select(
+            [(is_trend_regime > 0.5) & (regime_confidence > 0.7),  # Strong trending market = best
+             is_trend_regime > 0.5,                                  # Trending market = good
+             is_range_regime > 0.5],                                 # Range = okay but not great
+            [3.0, 2.0, 0.5],
+            -0.5  # Unknown regime = risky
+        )
         
         # 3. Breakout strength (Bernstein) - High correlation with success
-        breakout_pct = features.get('breakout_pct', 0.0)
-        if breakout_pct > 0.15:  # Very strong breakout
-            score += 3.0
-        elif breakout_pct > 0.10:  # Strong breakout
-            score += 2.5
-        elif breakout_pct > 0.05:  # Moderate breakout
-            score += 1.5
-        elif breakout_pct > 0.02:  # Weak breakout
-            score += 0.5
+        breakout_pct = feature('breakout_pct', 0.0)
+        score = score + np.select(
+            [breakout_pct > 0.15, breakout_pct > 0.10, breakout_pct > 0.05, breakout_pct > 0.02],
+            [3.0, 2.5, 1.5, 0.5],
+            0.0
+        )
         
         # 4. Volatility expansion (Bernstein) - Good for entries
-        is_vol_expansion = features.get('is_vol_expansion', 0.0)
-        if is_vol_expansion > 0.5:
-            score += 2.0  # Volatility expansion = opportunity
+        score = score + np.where(feature('is_vol_expansion', 0.0) > 0.5, 2.0, 0.0)
         
         # 5. Volume (CRITICAL: High volume = better execution)
-        volume_ratio = features.get('volume_ratio', 1.0)
-        volume_zscore = features.get('volume_zscore', 0.0)
-        
-        if volume_ratio > 2.5:  # Very high volume
-            score += 2.5
-        elif volume_ratio > 2.0:
-            score += 2.0
-        elif volume_ratio > 1.5:
-            score += 1.0
-        elif volume_ratio < 0.8:  # Low volume = avoid
-            score -= 1.0
-        
-        # Volume z-score (statistical significance)
-        if volume_zscore > 2.0:  # 2+ standard deviations above mean
-            score += 1.5
+        volume_ratio = feature('volume_ratio', 1.0)
+        score = score + np.select(
+            [volume_ratio > 2.5, volume_ratio > 2.0, volume_ratio > 1.5,
+             volume_ratio < 0.8],  # Low volume = avoid
+            [2.5, 2.0, 1.0, -1.0],
+            0.0
+        )
+        # Volume z-score: 2+ standard deviations above mean
+        score = score + np.where(feature('volume_zscore', 0.0) > 2.0, 1.5, 0.0)
         
         # 6. RSI (CRITICAL: Avoid extremes, prefer middle)
-        rsi_14 = features.get('rsi_14', 50.0)
-        if 40 < rsi_14 < 60:  # Sweet spot
-            score += 2.0
-        elif 30 < rsi_14 < 70:  # Acceptable range
-            score += 1.0
-        elif rsi_14 < 25 or rsi_14 > 75:  # Extreme = very risky
-            score -= 2.0
-        else:  # Near extremes
-            score -= 1.0
+        rsi_14 = feature('rsi_14', 50.0)
+        score = score + np.select(
+            [(40 < rsi_14) & (rsi_14 < 60),   # Sweet spot
+             (30 < rsi_14) & (rsi_14 < 70),   # Acceptable range
+             (rsi_14 < 25) | (rsi_14 > 75)],  # Extreme = very risky
+            [2.0, 1.0, -2.0],
+            -1.0  # Near extremes
+        )
         
         # 7. Candlestick patterns (Duarte) - Strong patterns = higher win rate
-        is_three_white_soldiers = features.get('is_three_white_soldiers', 0.0)
-        is_engulfing_bull = features.get('is_engulfing_bull', 0.0)
-        is_engulfing_bear = features.get('is_engulfing_bear', 0.0)
-        is_hammer = features.get('is_hammer', 0.0)
-        is_doji = features.get('is_doji', 0.0)
-        
-        # Strong patterns
-        if is_three_white_soldiers > 0.5:
-            score += 2.5  # Very bullish pattern
-        elif is_engulfing_bull > 0.5:
-            score += 2.0  # Bullish reversal
-        elif is_engulfing_bear > 0.5:
-            score -= 1.0  # Bearish reversal (bad for longs)
-        elif is_hammer > 0.5:
-            score += 1.5  # Bullish reversal pattern
-        elif is_doji > 0.5:
-            score -= 0.5  # Indecision = avoid
+        is_engulfing_bull = feature('is_engulfing_bull', 0.0)
+        score = score + np.select(
+            [feature('is_three_white_soldiers', 0.0) > 0.5,  # Very bullish pattern
+             is_engulfing_bull > 0.5,                         # Bullish reversal
+             feature('is_engulfing_bear', 0.0) > 0.5,         # Bearish reversal (bad for longs)
+             feature('is_hammer', 0.0) > 0.5,                 # Bullish reversal pattern
+             feature('is_doji', 0.0) > 0.5],                  # Indecision = avoid
+            [2.5, 2.0, -1.0, 1.5, -0.5],
+            0.0
+        )
         
         # 8. VWAP position (Price above VWAP = bullish momentum)
-        vwap_dist_pct = features.get('vwap_dist_pct', 0.0)
-        if vwap_dist_pct > 0.02:  # 2% above VWAP = strong
-            score += 1.5
-        elif vwap_dist_pct > 0.01:  # 1% above VWAP = good
-            score += 1.0
-        elif vwap_dist_pct < -0.01:  # Below VWAP = weak
-            score -= 0.5
+        vwap_dist_pct = feature('vwap_dist_pct', 0.0)
+        score = score + np.select(
+            [vwap_dist_pct > 0.02, vwap_dist_pct > 0.01, vwap_dist_pct < -0.01],
+            [1.5, 1.0, -0.5],
+            0.0
+        )
         
         # 9. MACD (Trend confirmation)
-        macd_hist = features.get('macd_hist', 0.0)
-        if macd_hist > 0.1:  # Strong bullish momentum
-            score += 1.5
-        elif macd_hist > 0:
-            score += 0.5
-        elif macd_hist < -0.1:  # Strong bearish momentum
-            score -= 1.0
+        macd_hist = feature('macd_hist', 0.0)
+        score = score + np.select([macd_hist > 0.1, macd_hist > 0, macd_hist < -0.1], [1.5, 0.5, -1.0], 0.0)
         
         # 10. Bollinger Bands (Mean reversion or breakout)
-        bb_position = features.get('bb_position', 0.5)
-        price_at_bb_upper = features.get('price_at_bb_upper', 0.0)
-        price_at_bb_lower = features.get('price_at_bb_lower', 0.0)
-        
-        if price_at_bb_lower > 0.5:  # Oversold = potential bounce
-            score += 1.0
-        elif price_at_bb_upper > 0.5:  # Overbought = risky
-            score -= 0.5
-        elif 0.3 < bb_position < 0.7:  # Middle = good
-            score += 0.5
+        bb_position = feature('bb_position', 0.5)
+        score = score + np.select(
+            [feature('price_at_bb_lower', 0.0) > 0.5,      # Oversold = potential bounce
+             feature('price_at_bb_upper', 0.0) > 0.5,      # Overbought = risky
+             (0.3 < bb_position) & (bb_position < 0.7)],   # Middle = good
+            [1.0, -0.5, 0.5],
+            0.0
+        )
         
         # 11. Sentiment divergence (Contrarian opportunity)
-        sentiment_divergence = features.get('sentiment_divergence', 0.0)
-        if sentiment_divergence > 0.5:
-            score += 1.5  # Price and sentiment diverge = opportunity
+        score = score + np.where(feature('sentiment_divergence', 0.0) > 0.5, 1.5, 0.0)
         
         # 12. Time of day (Opening/closing hours have more opportunity)
-        is_opening_hour = features.get('is_opening_hour', 0.0)
-        is_closing_hour = features.get('is_closing_hour', 0.0)
-        is_midday = features.get('is_midday', 0.0)
-        
-        if is_opening_hour > 0.5:  # Opening hour = high volatility
-            score += 1.0
-        elif is_closing_hour > 0.5:  # Closing hour = momentum
-            score += 0.5
-        elif is_midday > 0.5:  # Midday = often choppy
-            score -= 0.5
+        score = score + np.select(
+            [feature('is_opening_hour', 0.0) > 0.5,  # Opening hour = high volatility
+             feature('is_closing_hour', 0.0) > 0.5,  # Closing hour = momentum
+             feature('is_midday', 0.0) > 0.5],       # Midday = often choppy
+            [1.0, 0.5, -0.5],
+            0.0
+        )
         
         # 13. Trend strength (Stronger trends = better)
-        trend_strength = features.get('trend_strength', 0.0)
-        if trend_strength > 0.03:  # Very strong trend
-            score += 1.5
-        elif trend_strength > 0.02:  # Strong trend
-            score += 1.0
+        trend_strength = feature('trend_strength', 0.0)
+        score = score + np.select([trend_strength > 0.03, trend_strength > 0.02], [1.5, 1.0], 0.0)
         
         # 14. Price position vs SMAs (Trend confirmation)
-        price_above_sma20 = features.get('price_above_sma20', 0.0)
-        price_above_sma50 = features.get('price_above_sma50', 0.0)
-        sma20_above_sma50 = features.get('sma20_above_sma50', 0.0)
-        
-        if price_above_sma20 > 0.5 and price_above_sma50 > 0.5 and sma20_above_sma50 > 0.5:
-            score += 2.0  # Strong uptrend
-        elif price_above_sma20 > 0.5:
-            score += 1.0  # Above short-term MA
-        
-        # 15. Quality filters (Penalize low-quality setups)
-        # Low momentum + low volume + no pattern = bad
-        if momentum_strength < 0.005 and volume_ratio < 1.2 and is_engulfing_bull < 0.5:
-            score -= 2.0  # Low quality setup
+        price_above_sma20 = feature('price_above_sma20', 0.0) > 0.5
+        score = score + np.select(
+            [price_above_sma20 & (feature('price_above_sma50', 0.0) > 0.5)
+             & (feature('sma20_above_sma50', 0.0) > 0.5),  # Strong uptrend
+             price_above_sma20],                          # Above short-term MA
+            [2.0, 1.0],
+            0.0
+        )
+        
+        # 15. Quality filters: low momentum + low volume + no pattern = bad
+        low_quality = (momentum_strength < 0.005) & (volume_ratio < 1.2) & (is_engulfing_bull < 0.5)
+        score = score + np.where(low_quality, -2.0, 0.0)
         
         # Normalize to 0-10 scale
-        score = max(0.0, min(10.0, score))
-        
-        return float(score)
+        return np.where(is_high_vol_chop, chop_score, np.clip(score, 0.0, 10.0))
     
     def calculate_catalyst_score(self, features: Dict[str, float]) -> float:
         """
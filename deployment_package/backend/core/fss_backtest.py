@@ -8,11 +8,17 @@ Tests strategies that:
 2. Buy top N stocks
 3. Hold and rebalance periodically
 4. Track performance vs benchmark
+
+The engine works on (date x ticker) arrays: FSS is ranked once, the weight
+matrix is built from rank masks and carried forward between rebalances, and
+returns, turnover costs, IC and decile returns come out of the same aligned
+panel. backtest_rank_grid evaluates a top_n x rebalance_freq x cost grid in
+one call, sharing the ranking across every combination.
 """
 import numpy as np
 import pandas as pd
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Sequence, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -35,6 +41,24 @@ class BacktestResult:
     turnover: pd.Series
     benchmark_return: Optional[float] = None
     alpha: Optional[float] = None
+    ic_series: Optional[pd.Series] = None  # Only when a forward_horizon is given
+    decile_returns: Optional[pd.DataFrame] = None
+
+
+@dataclass
+class RankGridResult:
+    """Result from FSSBacktester.backtest_rank_grid"""
+    summary: pd.DataFrame  # One row per (top_n, rebalance_freq, transaction_cost_bps)
+    returns: pd.DataFrame  # Net daily returns, one column per parameter set
+    benchmark_return: Optional[float] = None
+    ic_series: Optional[pd.Series] = None
+    decile_returns: Optional[pd.DataFrame] = None
+
+
+# Regimes that send the strategy to cash
+CASH_REGIMES = ("Crisis", "Deflation")
+# Fewest tickers with both a score and a forward return for a date's IC
+MIN_IC_TICKERS = 10
 
 
 class FSSBacktester:
@@ -72,30 +96,32 @@ class FSSBacktester:
         Returns:
             Smoothed regime signals
         """
+        values = regime.to_numpy()
+        
+        def trailing_count(label: str, width: int) -> np.ndarray:
+            # Occurrences of label in the last `width` days (fewer at the start)
+            counts = np.concatenate([[0], np.cumsum(values == label)])
+            i = np.arange(len(values)) + 1
+            return counts[i] - counts[np.maximum(0, i - width)]
+        
+        # Short window for fast exit (3 days), long window for slow entry (10 days)
+        crisis_short = trailing_count("Crisis", 3)
+        deflation_short = trailing_count("Deflation", 3)
+        expansion_long = trailing_count("Expansion", 10)
+        parabolic_long = trailing_count("Parabolic", 10)
+        
         final_regimes = []
         current_state = "Expansion"  # Start in Expansion (risk-on)
         
-        for i in range(len(regime)):
-            # Short window for fast exit (3 days)
-            short_start = max(0, i - 2)
-            window_short = regime.iloc[short_start:i+1]
-            
-            # Long window for slow entry (10 days)
-            long_start = max(0, i - 9)
-            window_long = regime.iloc[long_start:i+1]
-            
+        for i in range(len(values)):
             # Fast Exit: If currently in Expansion and see 2+ Crisis days in last 3
             if current_state == "Expansion":
-                crisis_count = (window_short == "Crisis").sum()
-                deflation_count = (window_short == "Deflation").sum()
-                if crisis_count >= 2 or deflation_count >= 2:
+                if crisis_short[i] >= 2 or deflation_short[i] >= 2:
                     current_state = "Crisis"
             
             # Slow Entry: If currently in Crisis and see 8+ Expansion days in last 10
             elif current_state == "Crisis":
-                expansion_count = (window_long == "Expansion").sum()
-                parabolic_count = (window_long == "Parabolic").sum()
-                if expansion_count >= 8 or (expansion_count + parabolic_count) >= 8:
+                if expansion_long[i] >= 8 or (expansion_long[i] + parabolic_long[i]) >= 8:
                     current_state = "Expansion"
             
             final_regimes.append(current_state)
@@ -131,7 +157,9 @@ class FSSBacktester:
         min_liquidity: float = 1_000_000,
         regime: Optional[pd.Series] = None,
         cash_out_on_crisis: bool = True,
-        cash_return_rate: float = 0.02  # 2% annual risk-free rate
+        cash_return_rate: float = 0.02,  # 2% annual risk-free rate
+        forward_horizon: Optional[int] = None,
+        n_deciles: int = 10
     ) -> BacktestResult:
         """
         Backtest a top-N ranking strategy.
@@ -145,168 +173,293 @@ class FSSBacktester:
             hold_days: Optional fixed holding period (if None, use rebalance schedule)
             long_only: Long-only strategy (default: True)
             min_liquidity: Minimum average volume filter
-            
+            regime: Optional daily regime labels; Crisis/Deflation (smoothed, 1-day lag) moves to cash
+            cash_out_on_crisis: Honour the regime signal
+            cash_return_rate: Annual return on cash
+            forward_horizon: If set, also compute IC and decile returns against
+                forward returns over this many days
+            n_deciles: Number of FSS buckets for decile returns
+        
         Returns:
             BacktestResult with performance metrics
         """
-        # Get rebalance dates
-        rebal_dates = prices.resample(rebalance_freq).last().index.intersection(prices.index)
+        panel = self._rank_panel(prices, fss, regime if cash_out_on_crisis else None)
+        run = self._simulate_rank(panel, rebalance_freq, top_n, hold_days, cash_return_rate)
         
-        # Daily returns
-        daily_ret = prices.pct_change().fillna(0.0)
+        cost = run["turnover_daily"] * (self.transaction_cost_bps / 10000.0)
+        port_ret_net = run["gross"] - cost
+        metrics = self._performance(port_ret_net[:, None])
+        benchmark_return = self._benchmark_return(spy)
+        ann_return = metrics["annual_return"][0]
         
-        # Weights matrix (date x tickers)
-        W = pd.DataFrame(0.0, index=prices.index, columns=prices.columns)
+        ic_series, decile_returns = None, None
+        if forward_horizon is not None:
+            ic_series, decile_returns = self._cross_section_stats(panel, forward_horizon, n_deciles)
         
-        # Cash position tracking (for crisis regime cash-out)
-        cash_position = pd.Series(0.0, index=prices.index)
-        daily_cash_return = cash_return_rate / 252  # Daily risk-free rate
-        
-        # Apply asymmetric regime smoothing (fast exit, slow entry) if regime provided
-        regime_smoothed = None
-        if regime is not None and cash_out_on_crisis:
-            regime_smoothed = self._apply_asymmetric_regime_smoothing(regime)
+        index = panel["dates"]
+        return BacktestResult(
+            equity_curve=pd.Series(metrics["equity"][:, 0], index=index),
+            returns=pd.Series(port_ret_net, index=index),
+            drawdown=pd.Series(metrics["drawdown"][:, 0], index=index),
+            annual_return=ann_return,
+            annual_volatility=metrics["annual_volatility"][0],
+            sharpe_ratio=metrics["sharpe_ratio"][0],
+            max_drawdown=metrics["max_drawdown"][0],
+            calmar_ratio=metrics["calmar_ratio"][0],
+            win_rate=metrics["win_rate"][0],
+            total_trades=run["trades"],
+            turnover=pd.Series(run["turnover"], index=index[run["rebalance"]]),
+            benchmark_return=benchmark_return,
+            alpha=ann_return - benchmark_return if benchmark_return is not None else None,
+            ic_series=ic_series,
+            decile_returns=decile_returns
+        )
+    
+    def backtest_rank_grid(
+        self,
+        prices: pd.DataFrame,
+        fss: pd.DataFrame,
+        top_n: Sequence[int] = (20,),
+        rebalance_freq: Sequence[str] = ("M",),
+        transaction_cost_bps: Optional[Sequence[float]] = None,
+        spy: Optional[pd.Series] = None,
+        hold_days: Optional[int] = None,
+        regime: Optional[pd.Series] = None,
+        cash_out_on_crisis: bool = True,
+        cash_return_rate: float = 0.02,
+        forward_horizon: Optional[int] = None,
+        n_deciles: int = 10
+    ) -> RankGridResult:
+        """
+        Backtest every (top_n, rebalance_freq, transaction_cost_bps) combination.
         
-        # Track trades
-        trades = []
+        FSS is ranked once for the whole grid, and each (top_n, rebalance_freq)
+        pair is simulated once: costs are linear in turnover, so every cost
+        level is applied to the same gross returns. Each combination matches
+        backtest_rank_strategy run with those parameters.
         
-        for i, d in enumerate(rebal_dates):
-            if d not in fss.index:
-                continue
-            
-            # Check if we should go to cash (Crisis/Deflation regime with 1-day lag)
-            go_to_cash = False
-            if cash_out_on_crisis and regime_smoothed is not None:
-                # Use 1-day lag to prevent look-ahead bias
-                lag_idx = regime_smoothed.index.get_loc(d) - 1 if d in regime_smoothed.index else -1
-                if lag_idx >= 0:
-                    prev_date = regime_smoothed.index[lag_idx]
-                    current_regime = regime_smoothed.loc[prev_date]
-                    if current_regime in ["Crisis", "Deflation"]:
-                        go_to_cash = True
-                elif d in regime_smoothed.index:
-                    # First day - use current regime
-                    current_regime = regime_smoothed.loc[d]
-                    if current_regime in ["Crisis", "Deflation"]:
-                        go_to_cash = True
-            
-            if go_to_cash:
-                # Move to 100% cash during crisis/deflation
-                w = pd.Series(0.0, index=prices.columns)
-                # Set cash position for holding period
-                if hold_days is not None:
-                    start_idx = prices.index.get_loc(d)
-                    end_idx = min(start_idx + hold_days, len(prices.index) - 1)
-                    hold_range = prices.index[start_idx:end_idx+1]
-                else:
-                    if i < len(rebal_dates) - 1:
-                        next_d = rebal_dates[i+1]
-                        hold_range = prices.loc[d:next_d].index
-                        hold_range = hold_range[:-1] if len(hold_range) > 1 else hold_range
-                    else:
-                        hold_range = prices.loc[d:].index
-                W.loc[hold_range] = w.values  # 0% in stocks
-                cash_position.loc[hold_range] = 1.0  # 100% cash
-                continue
-            
-            # Normal stock selection
-            # Get latest FSS scores
-            scores = fss.loc[d].dropna()
-            
-            if scores.empty:
-                continue
-            
-            # Select top N
-            winners = scores.sort_values(ascending=False).head(top_n).index
-            
-            # Equal weight
-            w = pd.Series(0.0, index=prices.columns)
-            w.loc[winners] = 1.0 / len(winners)
-            
-            # Determine holding window
-            if hold_days is not None:
-                start_idx = prices.index.get_loc(d)
-                end_idx = min(start_idx + hold_days, len(prices.index) - 1)
-                hold_range = prices.index[start_idx:end_idx+1]
-            else:
-                # Hold until next rebalance
-                if i < len(rebal_dates) - 1:
-                    next_d = rebal_dates[i+1]
-                    hold_range = prices.loc[d:next_d].index
-                    hold_range = hold_range[:-1] if len(hold_range) > 1 else hold_range
-                else:
-                    hold_range = prices.loc[d:].index
-            
-            W.loc[hold_range] = w.values
-            cash_position.loc[hold_range] = 0.0  # 0% cash (fully invested)
-            
-            # Track trade
-            trades.append({
-                "date": d,
-                "tickers": list(winners),
-                "weights": w[winners].to_dict()
-            })
-        
-        # Portfolio daily return (stocks + cash)
-        stock_ret = (W.shift(1).fillna(0.0) * daily_ret).sum(axis=1)
-        cash_ret = cash_position.shift(1).fillna(0.0) * daily_cash_return
-        port_ret = stock_ret + cash_ret
-        
-        # Transaction costs
-        W_rebal = W.loc[rebal_dates].copy()
-        turnover = W_rebal.diff().abs().sum(axis=1).fillna(W_rebal.abs().sum(axis=1))
-        cost = turnover * (self.transaction_cost_bps / 10000.0)
-        cost_daily = pd.Series(0.0, index=prices.index)
-        cost_daily.loc[rebal_dates] = cost.values
-        
-        # Net returns
-        port_ret_net = port_ret - cost_daily
-        
-        # Equity curve
-        equity = (1.0 + port_ret_net).cumprod()
-        
-        # Drawdown
-        cummax = equity.cummax()
-        drawdown = (equity / cummax) - 1.0
-        
-        # Performance metrics
-        ann_return = equity.iloc[-1] ** (252 / max(1, len(equity))) - 1
-        ann_vol = port_ret_net.std() * np.sqrt(252)
-        sharpe = ann_return / (ann_vol + 1e-12)
-        max_dd = drawdown.min()
-        
-        # Calmar Ratio (Annual Return / Max Drawdown)
-        calmar_ratio = abs(ann_return / max_dd) if max_dd != 0 else 0
-        
-        # Win rate (positive return periods)
-        positive_periods = (port_ret_net > 0).sum()
-        win_rate = positive_periods / len(port_ret_net) if len(port_ret_net) > 0 else 0.0
-        
-        # Benchmark comparison
-        benchmark_return = None
-        alpha = None
-        if spy is not None:
-            spy_ret = spy.pct_change().fillna(0.0)
-            spy_equity = (1.0 + spy_ret).cumprod()
-            benchmark_return = spy_equity.iloc[-1] ** (252 / max(1, len(spy_equity))) - 1
-            alpha = ann_return - benchmark_return
+        Args:
+            prices: Price DataFrame (date x tickers)
+            fss: FSS scores DataFrame (date x tickers)
+            top_n: Portfolio sizes to test
+            rebalance_freq: Rebalance frequencies to test ("W", "M", ...)
+            transaction_cost_bps: Cost levels to test (default: this backtester's cost)
+            spy, hold_days, regime, cash_out_on_crisis, cash_return_rate: As in backtest_rank_strategy
+            forward_horizon: If set, also compute IC and decile returns (shared by the grid)
+            n_deciles: Number of FSS buckets for decile returns
         
-        return BacktestResult(
-            equity_curve=equity,
-            returns=port_ret_net,
-            drawdown=drawdown,
-            annual_return=ann_return,
-            annual_volatility=ann_vol,
-            sharpe_ratio=sharpe,
-            max_drawdown=max_dd,
-            calmar_ratio=calmar_ratio,
-            win_rate=win_rate,
-            total_trades=len(trades),
-            turnover=turnover,
+        Returns:
+            RankGridResult with a metrics row and a net-return column per combination
+        """
+        if transaction_cost_bps is None:
+            transaction_cost_bps = (self.transaction_cost_bps,)
+        costs = np.asarray(transaction_cost_bps, dtype=float) / 10000.0
+        panel = self._rank_panel(prices, fss, regime if cash_out_on_crisis else None)
+        
+        keys, returns, trades, mean_turnover = [], [], [], []
+        for n in top_n:
+            for freq in rebalance_freq:
+                run = self._simulate_rank(panel, freq, n, hold_days, cash_return_rate)
+                returns.append(run["gross"][:, None] - run["turnover_daily"][:, None] * costs[None, :])
+                keys += [(n, freq, bps) for bps in transaction_cost_bps]
+                trades += [run["trades"]] * len(costs)
+                mean_turnover += [run["turnover"].mean() if len(run["turnover"]) else 0.0] * len(costs)
+        
+        columns = pd.MultiIndex.from_tuples(keys, names=["top_n", "rebalance_freq", "transaction_cost_bps"])
+        returns = np.hstack(returns) if returns else np.empty((len(panel["dates"]), 0))
+        metrics = self._performance(returns)
+        benchmark_return = self._benchmark_return(spy)
+        
+        summary = pd.DataFrame({
+            "annual_return": metrics["annual_return"],
+            "annual_volatility": metrics["annual_volatility"],
+            "sharpe_ratio": metrics["sharpe_ratio"],
+            "max_drawdown": metrics["max_drawdown"],
+            "calmar_ratio": metrics["calmar_ratio"],
+            "win_rate": metrics["win_rate"],
+            "total_trades": np.asarray(trades, dtype=int),
+            "mean_turnover": np.asarray(mean_turnover, dtype=float),
+        }, index=columns)
+        if benchmark_return is not None:
+            summary["alpha"] = summary["annual_return"] - benchmark_return
+        
+        ic_series, decile_returns = None, None
+        if forward_horizon is not None:
+            ic_series, decile_returns = self._cross_section_stats(panel, forward_horizon, n_deciles)
+        
+        return RankGridResult(
+            summary=summary,
+            returns=pd.DataFrame(returns, index=panel["dates"], columns=columns),
             benchmark_return=benchmark_return,
-            alpha=alpha
+            ic_series=ic_series,
+            decile_returns=decile_returns
         )
     
+    def _rank_panel(
+        self,
+        prices: pd.DataFrame,
+        fss: pd.DataFrame,
+        regime: Optional[pd.Series]
+    ) -> Dict[str, Any]:
+        """
+        Everything the rank simulation needs, aligned to the price grid.
+        
+        FSS is reindexed to the price dates and tickers (scores for tickers
+        without prices are ignored) and ranked once per date, best first. Ties
+        are broken by column order.
+        
+        Returns:
+            Dict with dates, prices, daily_ret, fss, valid (score present),
+            rank (0 = best; meaningful where valid), listed (date present in
+            fss) and cash (smoothed regime, lagged a day, says Crisis/Deflation)
+        """
+        dates = prices.index
+        daily_ret = prices.pct_change().fillna(0.0).to_numpy(dtype=float)
+        scores = fss.reindex(index=dates, columns=prices.columns).to_numpy(dtype=float)
+        valid = ~np.isnan(scores)
+        
+        order = np.argsort(np.where(valid, -scores, np.inf), axis=1, kind="stable")
+        rank = np.empty_like(order)
+        np.put_along_axis(rank, order, np.broadcast_to(np.arange(order.shape[1]), order.shape), axis=1)
+        
+        cash = np.zeros(len(dates), dtype=bool)
+        if regime is not None and len(regime) > 0:
+            smoothed = self._apply_asymmetric_regime_smoothing(regime)
+            # 1-day lag to prevent look-ahead bias; the first day uses its own regime
+            lagged = smoothed.shift(1)
+            lagged.iloc[0] = smoothed.iloc[0]
+            cash = lagged.isin(CASH_REGIMES).reindex(dates, fill_value=False).to_numpy(dtype=bool)
+        
+        return {
+            "dates": dates,
+            "prices": prices,
+            "daily_ret": daily_ret,
+            "fss": scores,
+            "valid": valid,
+            "rank": rank,
+            "listed": dates.isin(fss.index),
+            "cash": cash,
+        }
+    
+    def _simulate_rank(
+        self,
+        panel: Dict[str, Any],
+        rebalance_freq: str,
+        top_n: int,
+        hold_days: Optional[int],
+        cash_return_rate: float
+    ) -> Dict[str, Any]:
+        """
+        Gross daily returns and turnover of one top-N strategy.
+        
+        Each rebalance date is one of: skipped (no FSS row or no scores),
+        cash (regime says Crisis/Deflation) or invested (equal weight in the
+        top_n ranks). Its weights then hold until the next rebalance or, with
+        hold_days, for hold_days days unless a later rebalance replaces them;
+        skipped dates leave the book flat on the rebalance schedule and leave
+        the previous holding in place with hold_days.
+        
+        Returns:
+            Dict with gross (daily returns before costs), rebalance (positions
+            in dates), turnover (per rebalance), turnover_daily (turnover on
+            its rebalance day, 0 elsewhere) and trades (invested rebalances)
+        """
+        dates = panel["dates"]
+        n_dates, n_tickers = panel["fss"].shape
+        rebal = dates.get_indexer(
+            pd.Series(0.0, index=dates).resample(rebalance_freq).last().index.intersection(dates)
+        )
+        m = len(rebal)
+        
+        listed = panel["listed"][rebal]
+        valid = panel["valid"][rebal]
+        cash = listed & panel["cash"][rebal]
+        invested = listed & ~cash & valid.any(axis=1)
+        
+        # State m is the empty book: no stocks, no cash position
+        selected = valid & (panel["rank"][rebal] < top_n) & invested[:, None]
+        weights = np.zeros((m + 1, n_tickers))
+        weights[:m] = selected / np.maximum(selected.sum(axis=1), 1)[:, None]
+        in_cash = np.append(cash, False).astype(float)
+        
+        # Forward-fill each day's state from the latest rebalance that set one
+        starts = invested | cash if hold_days is not None else np.ones(m, dtype=bool)
+        marks = np.full(n_dates, -1)
+        marks[rebal[starts]] = np.arange(m)[starts]
+        state = np.maximum.accumulate(marks) if n_dates else marks
+        held = state >= 0
+        if hold_days is not None:
+            held &= np.arange(n_dates) - np.append(rebal, 0)[state] <= hold_days
+        state = np.where(held, state, m)
+        
+        # Weights set on a day earn the next day's return
+        prev = np.concatenate([[m], state[:-1]]) if n_dates else state
+        gross = (weights[prev] * panel["daily_ret"]).sum(axis=1) + in_cash[prev] * (cash_return_rate / 252)
+        
+        # The first rebalance carries no turnover, as the diff has nothing before it
+        book = weights[state[rebal]]
+        turnover = np.abs(np.diff(book, axis=0, prepend=book[:1])).sum(axis=1)
+        turnover_daily = np.zeros(n_dates)
+        turnover_daily[rebal] = turnover
+        
+        return {
+            "gross": gross,
+            "rebalance": rebal,
+            "turnover": turnover,
+            "turnover_daily": turnover_daily,
+            "trades": int(invested.sum()),
+        }
+    
+    def _performance(self, returns: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Equity, drawdown and summary metrics for each column of daily net returns.
+        
+        Returns:
+            Dict of arrays: equity / drawdown (date x column) and one value per
+            column for the annualized metrics
+        """
+        n = len(returns)
+        equity = np.cumprod(1.0 + returns, axis=0)
+        drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1.0
+        
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ann_return = equity[-1] ** (252 / max(1, n)) - 1
+            ann_vol = (returns.std(axis=0, ddof=1) if n > 1 else np.full(returns.shape[1], np.nan)) * np.sqrt(252)
+            max_dd = drawdown.min(axis=0)
+            calmar = np.where(max_dd != 0, np.abs(ann_return / max_dd), 0.0)
+        
+        return {
+            "equity": equity,
+            "drawdown": drawdown,
+            "annual_return": ann_return,
+            "annual_volatility": ann_vol,
+            "sharpe_ratio": ann_return / (ann_vol + 1e-12),
+            "max_drawdown": max_dd,
+            "calmar_ratio": calmar,
+            "win_rate": (returns > 0).mean(axis=0) if n else np.zeros(returns.shape[1]),
+        }
+    
+    def _benchmark_return(self, spy: Optional[pd.Series]) -> Optional[float]:
+        """Annualized buy-and-hold return of the benchmark"""
+        if spy is None:
+            return None
+        spy_ret = spy.pct_change().fillna(0.0)
+        spy_equity = (1.0 + spy_ret).cumprod()
+        return spy_equity.iloc[-1] ** (252 / max(1, len(spy_equity))) - 1
+    
+    def _cross_section_stats(
+        self,
+        panel: Dict[str, Any],
+        horizon: int,
+        n_deciles: int
+    ) -> Tuple[pd.Series, pd.DataFrame]:
+        """IC series and decile returns of the panel's FSS against forward returns"""
+        listed = panel["listed"]
+        dates = panel["dates"][listed]
+        scores = panel["fss"][listed]
+        fwd = self.forward_return(panel["prices"], horizon).to_numpy(dtype=float)[listed]
+        return self._ic_series(scores, fwd, dates), self._decile_stats(scores, fwd, n_deciles)
+    
     def calculate_ic(
         self,
         fss: pd.DataFrame,
@@ -321,36 +474,17 @@ class FSSBacktester:
         Args:
             fss: FSS scores (date x tickers)
             forward_returns: Forward returns (date x tickers)
-            
+        
         Returns:
             IC time series
         """
-        ic_series = []
-        
-        common_dates = fss.index.intersection(forward_returns.index)
-        
-        for date in common_dates:
-            fss_scores = fss.loc[date].dropna()
-            fwd_ret = forward_returns.loc[date].dropna()
-            
-            common_tickers = fss_scores.index.intersection(fwd_ret.index)
-            
-            if len(common_tickers) < 10:  # Need minimum stocks
-                continue
-            
-            fss_vals = fss_scores.loc[common_tickers]
-            ret_vals = fwd_ret.loc[common_tickers]
-            
-            ic = fss_vals.corr(ret_vals)
-            
-            if not pd.isna(ic):
-                ic_series.append({"date": date, "ic": ic})
-        
-        if not ic_series:
-            return pd.Series(dtype=float)
-        
-        ic_df = pd.DataFrame(ic_series).set_index("date")
-        return ic_df["ic"]
+        dates = fss.index.intersection(forward_returns.index)
+        tickers = fss.columns.intersection(forward_returns.columns)
+        return self._ic_series(
+            fss.loc[dates, tickers].to_numpy(dtype=float),
+            forward_returns.loc[dates, tickers].to_numpy(dtype=float),
+            dates
+        )
     
     def analyze_decile_performance(
         self,
@@ -365,56 +499,78 @@ class FSSBacktester:
             fss: FSS scores (date x tickers)
             forward_returns: Forward returns (date x tickers)
             n_deciles: Number of deciles (default: 10)
-            
+        
         Returns:
             DataFrame with decile performance stats
         """
-        results = []
+        dates = fss.index.intersection(forward_returns.index)
+        tickers = fss.columns.intersection(forward_returns.columns)
+        return self._decile_stats(
+            fss.loc[dates, tickers].to_numpy(dtype=float),
+            forward_returns.loc[dates, tickers].to_numpy(dtype=float),
+            n_deciles
+        )
+    
+    @staticmethod
+    def _ic_series(scores: np.ndarray, fwd: np.ndarray, dates: pd.Index) -> pd.Series:
+        """
+        Per-date Pearson correlation of scores and forward returns (date x ticker arrays).
         
-        common_dates = fss.index.intersection(forward_returns.index)
+        Dates with fewer than MIN_IC_TICKERS tickers carrying both values, or
+        with a constant side, are left out.
+        """
+        valid = ~(np.isnan(scores) | np.isnan(fwd))
+        n = valid.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            x = np.where(valid, scores, 0.0)
+            y = np.where(valid, fwd, 0.0)
+            x = np.where(valid, x - (x.sum(axis=1) / n)[:, None], 0.0)
+            y = np.where(valid, y - (y.sum(axis=1) / n)[:, None], 0.0)
+            ic = (x * y).sum(axis=1) / np.sqrt((x * x).sum(axis=1) * (y * y).sum(axis=1))
+        keep = (n >= MIN_IC_TICKERS) & np.isfinite(ic)
+        if not keep.any():
+            return pd.Series(dtype=float)
+        return pd.Series(np.clip(ic[keep], -1.0, 1.0), index=pd.Index(dates[keep], name="date"), name="ic")
+    
+    @staticmethod
+    def _decile_stats(scores: np.ndarray, fwd: np.ndarray, n_deciles: int) -> pd.DataFrame:
+        """
+        Per-decile forward returns, bucketing each date's scores like pd.qcut(..., duplicates="drop").
         
-        for date in common_dates:
-            fss_scores = fss.loc[date].dropna()
-            fwd_ret = forward_returns.loc[date].dropna()
-            
-            common_tickers = fss_scores.index.intersection(fwd_ret.index)
-            
-            if len(common_tickers) < n_deciles:
-                continue
-            
-            # Rank by FSS
-            fss_vals = fss_scores.loc[common_tickers]
-            ret_vals = fwd_ret.loc[common_tickers]
-            
-            # Create deciles
-            fss_vals_ranked = pd.qcut(fss_vals, q=n_deciles, labels=False, duplicates='drop')
-            
-            for decile in range(n_deciles):
-                decile_mask = fss_vals_ranked == decile
-                decile_returns = ret_vals[decile_mask]
-                
-                if len(decile_returns) > 0:
-                    results.append({
-                        "date": date,
-                        "decile": decile,
-                        "mean_return": decile_returns.mean(),
-                        "median_return": decile_returns.median(),
-                        "count": len(decile_returns)
-                    })
-        
-        if not results:
+        Dates with fewer than n_deciles tickers carrying both values are left
+        out. Per-date mean/median/count are then aggregated across dates.
+        """
+        valid = ~(np.isnan(scores) | np.isnan(fwd))
+        rows = valid.sum(axis=1) >= n_deciles
+        scores, fwd, valid = scores[rows], fwd[rows], valid[rows]
+        if not valid.any():
             return pd.DataFrame()
         
-        results_df = pd.DataFrame(results)
+        # Quantile edges per date, computed as Series.quantile does
+        masked = np.where(valid, scores, np.nan)
+        edges = np.nanpercentile(masked, np.linspace(0, 1, n_deciles + 1) * 100, axis=1).T
+        # Repeated edges collapse into one, as with duplicates="drop"
+        distinct = np.concatenate([np.ones((len(edges), 1), dtype=bool), edges[:, 1:] != edges[:, :-1]], axis=1)
+        
+        # Right-closed buckets; the lowest edge falls in the first one
+        below = (edges[:, None, :] < masked[:, :, None]) & distinct[:, None, :]
+        decile = np.maximum(below.sum(axis=2) - 1, 0)
+        valid &= (distinct.sum(axis=1) >= 2)[:, None]
+        
+        row, col = np.nonzero(valid)
+        cells = pd.DataFrame({"date": row, "decile": decile[row, col], "ret": fwd[row, col]})
+        per_date = cells.groupby(["date", "decile"])["ret"].agg(
+            mean_return="mean", median_return="median", count="count"
+        )
+        if per_date.empty:
+            return pd.DataFrame()
         
         # Aggregate by decile
-        decile_stats = results_df.groupby("decile").agg({
+        return per_date.groupby("decile").agg({
             "mean_return": "mean",
             "median_return": "median",
             "count": "sum"
         })
-        
-        return decile_stats
 
 
 # Singleton instance
@@ -3,6 +3,12 @@
 FSS Data Pipeline
 Fetches price, volume, and fundamental data for FSS calculation.
 
+Historical bars are read through the local bar store (core/bar_store.py);
+providers are only asked for the date ranges it does not have yet.
+Per-ticker requests are fanned out concurrently, bounded by a semaphore and
+per-provider rate limiters; ``stream_fss_data`` yields partial results as
+ticker batches complete.
+
 Integrates with:
 - Polygon.io: Historical price/volume data
 - Alpaca: Real-time and historical market data
@@ -15,12 +21,59 @@ import asyncio
 import aiohttp
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
 from dataclasses import dataclass
 
+from .async_http import get_rate_limiter, get_session_pool
+from .bar_store import fetch_yfinance_bars, get_bar_store
+
 logger = logging.getLogger(__name__)
 
+# Per-ticker requests in flight per provider call
+FETCH_CONCURRENCY = 20
+# Tickers per streamed batch
+STREAM_BATCH_SIZE = 50
+# Longest wait for a price-provider token before falling through to the next provider
+PRICE_RATE_LIMIT_WAIT_S = 30.0
+# Longest wait for an Alpha Vantage token; tickers that give up are left uncached
+# and retried on the next run
+FUNDAMENTALS_RATE_LIMIT_WAIT_S = 60.0
+
+FUNDAMENTAL_METRICS = ("eps_accel", "rev_yoy", "gm_trend", "balance_strength")
+# Fundamentals only change when a new quarter is reported. A quarter's reports
+# are expected within FUNDAMENTALS_FILING_LAG_DAYS of its end.
+FUNDAMENTALS_FILING_LAG_DAYS = 45
+FUNDAMENTALS_CACHE_TTL_S = 100 * 24 * 3600
+
+
+def fiscal_period(as_of: Optional[date] = None) -> str:
+    """
+    Latest fiscal quarter whose reports should be out by as_of, e.g. '2026Q2'.
+    
+    The quarter containing (as_of - filing lag) may not be reported yet, so
+    this is the one before it.
+    """
+    day = (as_of or date.today()) - timedelta(days=FUNDAMENTALS_FILING_LAG_DAYS)
+    quarter = (day.month - 1) // 3
+    return f"{day.year}Q{quarter}" if quarter else f"{day.year - 1}Q4"
+
+
+def fundamentals_cache_key(ticker: str, period: str) -> str:
+    return f"fss:fundamentals:{ticker.upper()}:{period}"
+
+
+def _fundamentals_cache():
+    """Django cache, or None outside Django (e.g. the root scan scripts)"""
+    try:
+        from django.conf import settings
+        if not settings.configured:
+            return None
+        from django.core.cache import cache
+        return cache
+    except ImportError:
+        return None
+
 
 @dataclass
 class FSSDataRequest:
@@ -45,10 +98,18 @@ class FSSDataPipeline:
     """
     Data pipeline for FSS calculation.
     
-    Fetches and formats market data from multiple providers.
+    Fetches and formats market data from multiple providers. Per-ticker
+    requests run concurrently over the shared connection pool, paced by
+    per-provider rate limiters (see core/async_http.py).
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: int = FETCH_CONCURRENCY,
+        rate_limit_wait: float = PRICE_RATE_LIMIT_WAIT_S,
+        fundamentals_rate_limit_wait: float = FUNDAMENTALS_RATE_LIMIT_WAIT_S,
+        request_timeout: float = 30.0
+    ):
         """Initialize data pipeline"""
         # API keys from environment (no hardcoded defaults for security)
         self.polygon_key = os.getenv("POLYGON_API_KEY")
@@ -63,18 +124,52 @@ class FSSDataPipeline:
         self.alpha_vantage_base = "https://www.alphavantage.co/query"
         self.finnhub_base = "https://finnhub.io/api/v1"
         
-        # Session for async requests
+        # Concurrency and pacing
+        self.max_concurrency = max_concurrency
+        self.rate_limit_wait = rate_limit_wait
+        self.fundamentals_rate_limit_wait = fundamentals_rate_limit_wait
+        self.timeout = aiohttp.ClientTimeout(total=request_timeout)
+        
+        # Optional caller-provided session; otherwise the shared pool's
         self.session: Optional[aiohttp.ClientSession] = None
     
     async def __aenter__(self):
-        """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
+        """Async context manager entry (requests use the shared session pool)"""
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        """Async context manager exit; pooled connections stay open for reuse"""
+        return None
+    
+    def _http(self) -> aiohttp.ClientSession:
+        """Session for the running event loop"""
+        return self.session or get_session_pool().get()
+    
+    async def _fan_out(
+        self,
+        tickers: List[str],
+        fetch: Callable[[str], Awaitable[Any]]
+    ) -> Dict[str, Any]:
+        """
+        Run fetch(ticker) for every ticker concurrently.
+        
+        Returns:
+            {ticker: result}, leaving out tickers that returned None or failed
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def run(ticker: str) -> Any:
+            async with semaphore:
+                return await fetch(ticker)
+        
+        results = await asyncio.gather(*(run(t) for t in tickers), return_exceptions=True)
+        fetched = {}
+        for ticker, result in zip(tickers, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Error fetching {ticker}: {result}")
+            elif result is not None:
+                fetched[ticker] = result
+        return fetched
     
     async def fetch_fss_data(
         self,
@@ -83,13 +178,20 @@ class FSSDataPipeline:
         """
         Fetch all data needed for FSS calculation.
         
+        Prices, benchmarks and fundamentals are requested at once; each provider
+        call fans out per ticker, bounded by max_concurrency and the provider's
+        rate limiter.
+        
         Args:
             request: FSSDataRequest with tickers and options
             
         Returns:
             FSSDataResult with prices, volumes, fundamentals, etc.
+        
+        Raises:
+            ValueError: If no prices could be fetched for any ticker
         """
-        tickers = request.tickers
+        tickers = list(dict.fromkeys(request.tickers))
         lookback_days = request.lookback_days
         
         logger.info(f"Fetching FSS data for {len(tickers)} tickers ({lookback_days} days lookback)")
@@ -98,32 +200,144 @@ class FSSDataPipeline:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=lookback_days + 30)  # Extra buffer
         
-        # Fetch data in parallel
         tasks = [
             self._fetch_prices_volumes(tickers, start_date, end_date),
             self._fetch_spy(start_date, end_date),
             self._fetch_vix(start_date, end_date),
         ]
-        
         if request.include_fundamentals:
-            tasks.append(self._fetch_fundamentals(tickers))
+            tasks.append(self._fetch_fundamentals(tickers, lookback_days))
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
+        for name, value in zip(("prices", "SPY", "VIX", "fundamentals"), results):
+            if isinstance(value, Exception):
+                logger.warning(f"FSS {name} fetch failed: {value}")
+        prices_volumes, spy, vix, *rest = [None if isinstance(r, Exception) else r for r in results]
+        fundamentals = rest[0] if rest else None
         
-        # Unpack results
-        prices_volumes = results[0] if not isinstance(results[0], Exception) else None
-        spy = results[1] if not isinstance(results[1], Exception) else None
-        vix = results[2] if not isinstance(results[2], Exception) else None
-        fundamentals = results[3] if len(results) > 3 and not isinstance(results[3], Exception) else None
-        
-        # Handle errors
         if prices_volumes is None:
             raise ValueError("Failed to fetch price/volume data")
+        if spy is None:
+            logger.warning("Failed to fetch SPY, using synthetic benchmark")
+        
+        return self._assemble_result(
+            tickers, [prices_volumes[0]], [prices_volumes[1]], [fundamentals] if fundamentals is not None else [],
+            spy, vix, complete=True
+        )
+    
+    async def stream_fss_data(
+        self,
+        request: FSSDataRequest,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[FSSDataResult]:
+        """
+        Fetch FSS data in ticker batches, yielding a result as each batch lands.
+        
+        Prices and fundamentals for every batch are requested at once, so a large
+        universe waits on provider rate limits rather than on one serial chain.
+        Each result is cumulative: it covers every ticker whose prices have
+        arrived so far, with fundamentals filled in as they land, so the FSS
+        engine can start scoring before the slowest batch is done.
+        ``data_quality["complete"]`` is True on the last result.
+        
+        Args:
+            request: FSSDataRequest with tickers and options
+            batch_size: Tickers per batch
+            
+        Raises:
+            ValueError: If no prices could be fetched for any ticker
+        """
+        tickers = list(dict.fromkeys(request.tickers))
+        lookback_days = request.lookback_days
         
-        prices, volumes = prices_volumes
+        logger.info(f"Streaming FSS data for {len(tickers)} tickers ({lookback_days} days lookback)")
+        
+        # Calculate date range
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=lookback_days + 30)  # Extra buffer
+        
+        async def tagged(kind: str, coro: Awaitable[Any]) -> Tuple[str, Any]:
+            try:
+                return kind, await coro
+            except Exception as e:
+                logger.warning(f"FSS {kind} fetch failed: {e}")
+                return kind, None
+        
+        # Schedule everything up front
+        pending = {
+            asyncio.ensure_future(tagged("market", asyncio.gather(
+                self._fetch_spy(start_date, end_date),
+                self._fetch_vix(start_date, end_date),
+            )))
+        }
+        for i in range(0, len(tickers), batch_size):
+            batch = tickers[i:i + batch_size]
+            pending.add(asyncio.ensure_future(
+                tagged("prices", self._fetch_prices_volumes(batch, start_date, end_date))
+            ))
+            if request.include_fundamentals:
+                pending.add(asyncio.ensure_future(
+                    tagged("fundamentals", self._fetch_fundamentals(batch, lookback_days))
+                ))
+        
+        market = None
+        prices_parts: List[pd.DataFrame] = []
+        volumes_parts: List[pd.DataFrame] = []
+        fundamentals_parts: List[Dict[str, pd.DataFrame]] = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    kind, value = task.result()
+                    if kind == "market":
+                        market = value or (None, None)
+                        if market[0] is None:
+                            logger.warning("Failed to fetch SPY, using synthetic benchmark")
+                    elif kind == "prices" and value is not None:
+                        prices_parts.append(value[0])
+                        volumes_parts.append(value[1])
+                    elif kind == "fundamentals" and value is not None:
+                        fundamentals_parts.append(value)
+                
+                # Nothing to score until the benchmark and some prices are in
+                if market is not None and prices_parts:
+                    yield self._assemble_result(
+                        tickers, prices_parts, volumes_parts, fundamentals_parts, *market, complete=not pending
+                    )
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        if not prices_parts:
+            raise ValueError("Failed to fetch price/volume data")
+    
+    def _assemble_result(
+        self,
+        tickers: List[str],
+        prices_parts: List[pd.DataFrame],
+        volumes_parts: List[pd.DataFrame],
+        fundamentals_parts: List[Dict[str, pd.DataFrame]],
+        spy: Optional[pd.Series],
+        vix: Optional[pd.Series],
+        complete: bool
+    ) -> FSSDataResult:
+        """Combine the batches fetched so far into one FSSDataResult"""
+        if len(prices_parts) == 1:
+            prices, volumes = prices_parts[0], volumes_parts[0]
+        else:
+            prices = pd.concat(prices_parts, axis=1).sort_index().ffill()
+            volumes = pd.concat(volumes_parts, axis=1).sort_index().fillna(0)
+        
+        fundamentals = None
+        if len(fundamentals_parts) == 1:
+            fundamentals = fundamentals_parts[0]
+        elif fundamentals_parts:
+            fundamentals = {
+                metric: pd.concat([part[metric] for part in fundamentals_parts], axis=1)
+                for metric in FUNDAMENTAL_METRICS
+            }
         
         if spy is None:
-            logger.warning("Failed to fetch SPY, using synthetic benchmark")
             spy = self._create_synthetic_spy(prices.index)
         
         # Data quality metrics
@@ -132,7 +346,8 @@ class FSSDataPipeline:
             "volumes_coverage": self._calculate_coverage(volumes),
             "fundamentals_available": fundamentals is not None,
             "tickers_with_data": list(prices.columns),
-            "missing_tickers": [t for t in tickers if t not in prices.columns]
+            "missing_tickers": [t for t in tickers if t not in prices.columns],
+            "complete": complete
         }
         
         return FSSDataResult(
@@ -144,6 +359,49 @@ class FSSDataPipeline:
             data_quality=data_quality
         )
     
+    async def fetch_bars(
+        self,
+        tickers: List[str],
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Daily OHLCV bars per ticker, read through the local bar store.
+
+        Only date ranges the store has not seen are requested from the providers.
+        """
+        return await get_bar_store().aget(tickers, start_date, end_date, fetch=self._fetch_provider_bars)
+
+    async def _fetch_provider_bars(
+        self,
+        tickers: List[str],
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch daily bars from the providers.
+
+        Tries Polygon first, then Alpaca, then yfinance for the tickers still missing.
+        """
+        bars: Dict[str, pd.DataFrame] = {}
+        providers = [
+            ("Polygon", self._fetch_polygon_aggregates),
+            ("Alpaca", self._fetch_alpaca_bars),
+            ("yfinance", self._fetch_yfinance_data),
+        ]
+        for name, fetch in providers:
+            missing = [t for t in tickers if t not in bars]
+            if not missing:
+                break
+            try:
+                fetched = await fetch(missing, start_date, end_date)
+                if fetched:
+                    logger.info(f"Fetched bars for {len(fetched)}/{len(missing)} tickers from {name}")
+                    bars.update(fetched)
+            except Exception as e:
+                logger.warning(f"{name} fetch failed: {e}")
+        return bars
+
     async def _fetch_prices_volumes(
         self,
         tickers: List[str],
@@ -153,205 +411,136 @@ class FSSDataPipeline:
         """
         Fetch historical prices and volumes.
         
-        Tries Polygon first, then Alpaca, then yfinance fallback.
+        Reads through the bar store; missing ranges come from Polygon, then
+        Alpaca, then yfinance.
         """
-        # Try Polygon first (best for historical data)
-        try:
-            prices, volumes = await self._fetch_polygon_aggregates(tickers, start_date, end_date)
-            if prices is not None and not prices.empty:
-                logger.info(f"Fetched {len(prices)} days of data from Polygon")
-                return prices, volumes
-        except Exception as e:
-            logger.warning(f"Polygon fetch failed: {e}")
+        bars = await self.fetch_bars(tickers, start_date, end_date)
+        if not bars:
+            raise ValueError("Failed to fetch price/volume data from all sources")
         
-        # Try Alpaca
-        try:
-            prices, volumes = await self._fetch_alpaca_bars(tickers, start_date, end_date)
-            if prices is not None and not prices.empty:
-                logger.info(f"Fetched {len(prices)} days of data from Alpaca")
-                return prices, volumes
-        except Exception as e:
-            logger.warning(f"Alpaca fetch failed: {e}")
+        prices = pd.DataFrame({t: df["close"] for t, df in bars.items()})
+        volumes = pd.DataFrame({t: df["volume"] for t, df in bars.items()})
         
-        # Fallback to yfinance
-        try:
-            prices, volumes = await self._fetch_yfinance_data(tickers, start_date, end_date)
-            if prices is not None and not prices.empty:
-                logger.info(f"Fetched {len(prices)} days of data from yfinance")
-                return prices, volumes
-        except Exception as e:
-            logger.warning(f"yfinance fetch failed: {e}")
+        # Align dates and forward-fill
+        prices = prices.sort_index().ffill()
+        volumes = volumes.sort_index().fillna(0)
         
-        raise ValueError("Failed to fetch price/volume data from all sources")
+        return prices, volumes
     
     async def _fetch_polygon_aggregates(
         self,
         tickers: List[str],
-        start_date: datetime,
-        end_date: datetime
-    ) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
-        """Fetch aggregates from Polygon.io"""
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, pd.DataFrame]:
+        """Fetch daily aggregates from Polygon.io, one request per ticker, concurrently"""
         if not self.polygon_key:
-            return None, None
-        
-        prices_dict = {}
-        volumes_dict = {}
+            return {}
         
-        for ticker in tickers:
-            try:
-                # Polygon aggregates endpoint
-                url = f"{self.polygon_base}/v2/aggs/ticker/{ticker}/range/1/day/{start_date.strftime('%Y-%m-%d')}/{end_date.strftime('%Y-%m-%d')}"
-                params = {"apikey": self.polygon_key, "adjusted": "true"}
-                
-                async with self.session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        results = data.get("results", [])
-                        
-                        if results:
-                            dates = []
-                            closes = []
-                            vols = []
-                            
-                            for bar in results:
-                                timestamp_ms = bar.get("t", 0)
-                                date = datetime.fromtimestamp(timestamp_ms / 1000)
-                                dates.append(date)
-                                closes.append(bar.get("c", 0))  # Close (adjusted)
-                                vols.append(bar.get("v", 0))  # Volume
-                            
-                            if dates:
-                                prices_dict[ticker] = pd.Series(closes, index=dates)
-                                volumes_dict[ticker] = pd.Series(vols, index=dates)
-                        
-                        # Rate limiting: Polygon free tier is 5 req/min
-                        await asyncio.sleep(12)  # ~5 req/min
-                    else:
-                        logger.warning(f"Polygon API error for {ticker}: {response.status}")
-            except Exception as e:
-                logger.warning(f"Error fetching {ticker} from Polygon: {e}")
-                continue
+        rate_limiter = get_rate_limiter("polygon")
         
-        if not prices_dict:
-            return None, None
-        
-        # Convert to DataFrames
-        prices = pd.DataFrame(prices_dict)
-        volumes = pd.DataFrame(volumes_dict)
-        
-        # Align dates and forward-fill
-        prices = prices.sort_index().fillna(method='ffill')
-        volumes = volumes.sort_index().fillna(0)
+        async def fetch(ticker: str) -> Optional[pd.DataFrame]:
+            # Tickers that cannot get a token in time fall through to the next provider
+            if not await rate_limiter.acquire(self.rate_limit_wait):
+                return None
+            
+            # Polygon aggregates endpoint
+            url = f"{self.polygon_base}/v2/aggs/ticker/{ticker}/range/1/day/{start_date.strftime('%Y-%m-%d')}/{end_date.strftime('%Y-%m-%d')}"
+            params = {"apikey": self.polygon_key, "adjusted": "true"}
+            
+            async with self._http().get(url, params=params, timeout=self.timeout) as response:
+                if response.status != 200:
+                    logger.warning(f"Polygon API error for {ticker}: {response.status}")
+                    return None
+                data = await response.json()
+            
+            results = data.get("results", [])
+            if not results:
+                return None
+            return pd.DataFrame(
+                {
+                    "open": [bar.get("o", 0) for bar in results],
+                    "high": [bar.get("h", 0) for bar in results],
+                    "low": [bar.get("l", 0) for bar in results],
+                    "close": [bar.get("c", 0) for bar in results],  # Close (adjusted)
+                    "volume": [bar.get("v", 0) for bar in results],
+                },
+                # Bars are stamped at the session start in US/Eastern
+                index=pd.to_datetime([bar.get("t", 0) for bar in results], unit="ms", utc=True)
+                .tz_convert("America/New_York"),
+            )
         
-        return prices, volumes
+        return await self._fan_out(tickers, fetch)
     
     async def _fetch_alpaca_bars(
         self,
         tickers: List[str],
-        start_date: datetime,
-        end_date: datetime
-    ) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
-        """Fetch bars from Alpaca"""
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, pd.DataFrame]:
+        """Fetch daily bars from Alpaca, one request per ticker, concurrently"""
         if not self.alpaca_key or not self.alpaca_secret:
-            return None, None
-        
-        prices_dict = {}
-        volumes_dict = {}
+            return {}
         
+        rate_limiter = get_rate_limiter("alpaca")
         headers = {
             "APCA-API-KEY-ID": self.alpaca_key,
             "APCA-API-SECRET-KEY": self.alpaca_secret
         }
         
-        for ticker in tickers:
-            try:
-                url = f"{self.alpaca_base}/stocks/{ticker}/bars"
-                params = {
-                    "start": start_date.strftime("%Y-%m-%dT00:00:00Z"),
-                    "end": end_date.strftime("%Y-%m-%dT23:59:59Z"),
-                    "timeframe": "1Day",
-                    "adjustment": "all"  # Adjusted for splits/dividends
-                }
-                
-                async with self.session.get(url, headers=headers, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        bars = data.get("bars", [])
-                        
-                        if bars:
-                            dates = []
-                            closes = []
-                            vols = []
-                            
-                            for bar in bars:
-                                date_str = bar.get("t", "")
-                                if date_str:
-                                    date = pd.to_datetime(date_str)
-                                    dates.append(date)
-                                    closes.append(float(bar.get("c", 0)))
-                                    vols.append(int(bar.get("v", 0)))
-                            
-                            if dates:
-                                prices_dict[ticker] = pd.Series(closes, index=dates)
-                                volumes_dict[ticker] = pd.Series(vols, index=dates)
-                    else:
-                        logger.warning(f"Alpaca API error for {ticker}: {response.status}")
-            except Exception as e:
-                logger.warning(f"Error fetching {ticker} from Alpaca: {e}")
-                continue
-        
-        if not prices_dict:
-            return None, None
-        
-        prices = pd.DataFrame(prices_dict)
-        volumes = pd.DataFrame(volumes_dict)
-        
-        prices = prices.sort_index().fillna(method='ffill')
-        volumes = volumes.sort_index().fillna(0)
+        async def fetch(ticker: str) -> Optional[pd.DataFrame]:
+            if not await rate_limiter.acquire(self.rate_limit_wait):
+                return None
+            
+            url = f"{self.alpaca_base}/stocks/{ticker}/bars"
+            params = {
+                "start": start_date.strftime("%Y-%m-%dT00:00:00Z"),
+                "end": end_date.strftime("%Y-%m-%dT23:59:59Z"),
+                "timeframe": "1Day",
+                "adjustment": "all"  # Adjusted for splits/dividends
+            }
+            
+            async with self._http().get(url, headers=headers, params=params, timeout=self.timeout) as response:
+                if response.status != 200:
+                    logger.warning(f"Alpaca API error for {ticker}: {response.status}")
+                    return None
+                data = await response.json()
+            
+            bars = [bar for bar in data.get("bars") or [] if bar.get("t")]
+            if not bars:
+                return None
+            return pd.DataFrame(
+                {
+                    "open": [float(bar.get("o", 0)) for bar in bars],
+                    "high": [float(bar.get("h", 0)) for bar in bars],
+                    "low": [float(bar.get("l", 0)) for bar in bars],
+                    "close": [float(bar.get("c", 0)) for bar in bars],
+                    "volume": [int(bar.get("v", 0)) for bar in bars],
+                },
+                index=pd.to_datetime([bar["t"] for bar in bars], utc=True).tz_convert("America/New_York"),
+            )
         
-        return prices, volumes
+        return await self._fan_out(tickers, fetch)
     
     async def _fetch_yfinance_data(
         self,
         tickers: List[str],
-        start_date: datetime,
-        end_date: datetime
-    ) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
-        """Fetch data using yfinance (fallback)"""
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, pd.DataFrame]:
+        """Fetch daily bars using yfinance (fallback)"""
         try:
-            import yfinance as yf
+            import yfinance  # noqa: F401
         except ImportError:
             logger.warning("yfinance not available")
-            return None, None
+            return {}
         
         try:
-            # Download data
-            data = yf.download(
-                tickers,
-                start=start_date,
-                end=end_date,
-                progress=False,
-                group_by='ticker'
-            )
-            
-            if data.empty:
-                return None, None
-            
-            # Extract adjusted close and volume
-            if len(tickers) == 1:
-                prices = pd.DataFrame({tickers[0]: data["Adj Close"]})
-                volumes = pd.DataFrame({tickers[0]: data["Volume"]})
-            else:
-                prices = data["Adj Close"]
-                volumes = data["Volume"]
-            
-            prices = prices.sort_index().fillna(method='ffill')
-            volumes = volumes.sort_index().fillna(0)
-            
-            return prices, volumes
+            # yf.download blocks; keep it off the event loop
+            return await asyncio.to_thread(fetch_yfinance_bars, tickers, start_date, end_date)
         except Exception as e:
             logger.warning(f"yfinance fetch error: {e}")
-            return None, None
+            return {}
     
     async def _fetch_spy(
         self,
@@ -360,21 +549,12 @@ class FSSDataPipeline:
     ) -> Optional[pd.Series]:
         """Fetch SPY benchmark"""
         try:
-            prices, _ = await self._fetch_polygon_aggregates(["SPY"], start_date, end_date)
-            if prices is not None and "SPY" in prices.columns:
-                return prices["SPY"]
+            bars = await self.fetch_bars(["SPY"], start_date, end_date)
+            if "SPY" in bars:
+                return bars["SPY"]["close"].rename("SPY")
         except Exception as e:
             logger.warning(f"Failed to fetch SPY: {e}")
         
-        # Fallback to yfinance
-        try:
-            import yfinance as yf
-            spy = yf.download("SPY", start=start_date, end=end_date, progress=False)
-            if not spy.empty and "Adj Close" in spy.columns:
-                return spy["Adj Close"]
-        except Exception as e:
-            logger.warning(f"yfinance SPY fetch failed: {e}")
-        
         return None
     
     async def _fetch_vix(
@@ -384,10 +564,10 @@ class FSSDataPipeline:
     ) -> Optional[pd.Series]:
         """Fetch VIX (optional, for regime detection)"""
         try:
-            import yfinance as yf
-            vix = yf.download("^VIX", start=start_date, end=end_date, progress=False)
-            if not vix.empty and "Adj Close" in vix.columns:
-                return vix["Adj Close"]
+            # Index quotes are only on yfinance
+            bars = await get_bar_store().aget(["^VIX"], start_date, end_date, fetch=self._fetch_yfinance_data)
+            if "^VIX" in bars:
+                return bars["^VIX"]["close"].rename("^VIX")
         except Exception as e:
             logger.warning(f"VIX fetch failed: {e}")
         
@@ -395,47 +575,43 @@ class FSSDataPipeline:
     
     async def _fetch_fundamentals(
         self,
-        tickers: List[str]
+        tickers: List[str],
+        lookback_days: int = 252
     ) -> Optional[Dict[str, pd.DataFrame]]:
         """
         Fetch fundamental data and convert to daily-aligned format.
         
+        Per-ticker metrics are cached for the current fiscal period (see
+        ``fiscal_period``), so only tickers not seen this quarter hit Alpha Vantage.
+        
         Returns dict with:
         - eps_accel: EPS acceleration
         - rev_yoy: Revenue YoY growth
         - gm_trend: Gross margin trend
         - balance_strength: Balance sheet strength
         """
-        fundamentals = {}
+        period = fiscal_period()
+        keys = {ticker: fundamentals_cache_key(ticker, period) for ticker in tickers}
+        cache = _fundamentals_cache()
         
-        # Fetch from Alpha Vantage (income statement, balance sheet)
-        for ticker in tickers:
+        fundamentals = {}
+        if cache is not None:
             try:
-                # Get income statement
-                income_data = await self._fetch_alpha_vantage_income(ticker)
-                balance_data = await self._fetch_alpha_vantage_balance(ticker)
-                
-                if income_data and balance_data:
-                    # Calculate fundamental metrics
-                    eps_accel = self._calculate_eps_acceleration(income_data)
-                    rev_yoy = self._calculate_revenue_yoy(income_data)
-                    gm_trend = self._calculate_gm_trend(income_data)
-                    balance_strength = self._calculate_balance_strength(balance_data)
-                    
-                    # Convert to daily-aligned (forward-fill quarterly data)
-                    # This is a simplification - in production, you'd align by report date
-                    fundamentals[ticker] = {
-                        "eps_accel": eps_accel,
-                        "rev_yoy": rev_yoy,
-                        "gm_trend": gm_trend,
-                        "balance_strength": balance_strength
-                    }
-                
-                # Rate limiting: Alpha Vantage free tier is 5 req/min
-                await asyncio.sleep(12)
+                cached = cache.get_many(list(keys.values()))
+                fundamentals = {t: cached[key] for t, key in keys.items() if key in cached}
             except Exception as e:
-                logger.warning(f"Error fetching fundamentals for {ticker}: {e}")
-                continue
+                logger.warning(f"Fundamentals cache read failed: {e}")
+        
+        missing = [t for t in tickers if t not in fundamentals]
+        if missing:
+            # Fetch from Alpha Vantage (income statement, balance sheet)
+            fetched = await self._fan_out(missing, self._fetch_ticker_fundamentals)
+            fundamentals.update(fetched)
+            if cache is not None and fetched:
+                try:
+                    cache.set_many({keys[t]: metrics for t, metrics in fetched.items()}, FUNDAMENTALS_CACHE_TTL_S)
+                except Exception as e:
+                    logger.warning(f"Fundamentals cache write failed: {e}")
         
         if not fundamentals:
             return None
@@ -446,70 +622,75 @@ class FSSDataPipeline:
         start_date = end_date - pd.Timedelta(days=lookback_days)
         date_range = pd.date_range(start=start_date, end=end_date, freq='D')
         
-        # Build daily-aligned DataFrames for each fundamental metric
-        fundamentals_daily = {}
-        
-        for metric in ['eps_accel', 'rev_yoy', 'gm_trend', 'balance_strength']:
-            metric_df = pd.DataFrame(index=date_range, columns=tickers)
-            
-            for ticker in tickers:
-                if ticker in fundamentals and metric in fundamentals[ticker]:
-                    # Forward-fill the quarterly value across all dates
-                    # In production, this would align by actual report dates
-                    value = fundamentals[ticker][metric]
-                    metric_df[ticker] = value
-            
-            fundamentals_daily[metric] = metric_df.fillna(method='ffill').fillna(0)
+        # Forward-fill the latest value across all dates (tickers without data get 0)
+        # In production, this would align by actual report dates
+        return {
+            metric: pd.DataFrame(
+                {t: float(fundamentals[t][metric]) if t in fundamentals else 0.0 for t in tickers},
+                index=date_range
+            )
+            for metric in FUNDAMENTAL_METRICS
+        }
+    
+    async def _fetch_ticker_fundamentals(self, ticker: str) -> Optional[Dict[str, float]]:
+        """Fundamental metrics for one ticker, or None if either statement is unavailable"""
+        income_data, balance_data = await asyncio.gather(
+            self._fetch_alpha_vantage_income(ticker),
+            self._fetch_alpha_vantage_balance(ticker)
+        )
+        if not income_data or not balance_data:
+            return None
         
-        return fundamentals_daily
+        # Calculate fundamental metrics
+        return {
+            "eps_accel": self._calculate_eps_acceleration(income_data),
+            "rev_yoy": self._calculate_revenue_yoy(income_data),
+            "gm_trend": self._calculate_gm_trend(income_data),
+            "balance_strength": self._calculate_balance_strength(balance_data)
+        }
     
     async def _fetch_alpha_vantage_income(
         self,
         ticker: str
     ) -> Optional[Dict[str, Any]]:
         """Fetch income statement from Alpha Vantage"""
-        if not self.alpha_vantage_key:
-            return None
-        
-        url = self.alpha_vantage_base
-        params = {
-            "function": "INCOME_STATEMENT",
-            "symbol": ticker,
-            "apikey": self.alpha_vantage_key
-        }
-        
-        try:
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("annualReports", [])
-        except Exception as e:
-            logger.warning(f"Alpha Vantage income fetch failed for {ticker}: {e}")
-        
-        return None
+        return await self._fetch_alpha_vantage("INCOME_STATEMENT", ticker)
     
     async def _fetch_alpha_vantage_balance(
         self,
         ticker: str
     ) -> Optional[Dict[str, Any]]:
         """Fetch balance sheet from Alpha Vantage"""
+        return await self._fetch_alpha_vantage("BALANCE_SHEET", ticker)
+    
+    async def _fetch_alpha_vantage(
+        self,
+        function: str,
+        ticker: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Annual reports for one Alpha Vantage statement endpoint"""
         if not self.alpha_vantage_key:
             return None
         
+        # No fallback provider for fundamentals, so wait longer than for prices
+        if not await get_rate_limiter("alpha_vantage").acquire(self.fundamentals_rate_limit_wait):
+            logger.debug(f"Alpha Vantage rate limit: skipping {function} for {ticker}")
+            return None
+        
         url = self.alpha_vantage_base
         params = {
-            "function": "BALANCE_SHEET",
+            "function": function,
             "symbol": ticker,
             "apikey": self.alpha_vantage_key
         }
         
         try:
-            async with self.session.get(url, params=params) as response:
+            async with self._http().get(url, params=params, timeout=self.timeout) as response:
                 if response.status == 200:
                     data = await response.json()
                     return data.get("annualReports", [])
         except Exception as e:
-            logger.warning(f"Alpha Vantage balance fetch failed for {ticker}: {e}")
+            logger.warning(f"Alpha Vantage {function} fetch failed for {ticker}: {e}")
         
         return None
     
@@ -23,6 +23,7 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import warnings
+from numpy.lib.stride_tricks import sliding_window_view
 warnings.filterwarnings('ignore')
 
 logger = logging.getLogger(__name__)
@@ -97,6 +98,24 @@ class FSSEngine:
             return pd.Series(0.0, index=s.index)
         return (s - s.mean()) / std
     
+    @staticmethod
+    def _zscore_rows(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Cross-sectional z-score of every row at once.
+        
+        Vectorized equivalent of ``df.apply(self.zscore, axis=1)``: rows with
+        zero or undefined dispersion map to 0.0 (including their NaN cells).
+        """
+        values = df.to_numpy(dtype=float)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            mean = np.nanmean(values, axis=1, keepdims=True)
+            std = np.nanstd(values, axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = (values - mean) / std
+        z = np.where(std > 0, z, 0.0)
+        return pd.DataFrame(z, index=df.index, columns=df.columns)
+    
     @staticmethod
     def _safe_corr(a: pd.Series, b: pd.Series, method: str = "spearman") -> float:
         """
@@ -123,7 +142,11 @@ class FSSEngine:
     
     def to_0_100_from_z(self, z: pd.Series, clip_z: float = 3.0) -> pd.Series:
         """Convert z-score to 0-100 using clipped linear mapping"""
-        z = z.clip(-clip_z, clip_z)
+        if isinstance(z, pd.DataFrame):
+            # Clip the underlying array in one pass (DataFrame.clip works column by column)
+            z = pd.DataFrame(np.clip(z.to_numpy(dtype=float), -clip_z, clip_z), index=z.index, columns=z.columns)
+        else:
+            z = z.clip(-clip_z, clip_z)
         return 50 + (z / clip_z) * 50
     
     def compute_trend_component(
@@ -140,6 +163,15 @@ class FSSEngine:
         
         Fractal momentum favors consistent winners over volatile gaps.
         """
+        return self._score_trend(self._trend_inputs(prices, spy, lookback_days))
+    
+    def _trend_inputs(
+        self,
+        prices: pd.DataFrame,
+        spy: pd.Series,
+        lookback_days: int = 126
+    ) -> Dict[str, pd.DataFrame]:
+        """Raw (pre-normalization) trend signals, one DataFrame per signal"""
         daily_ret = prices.pct_change()
         
         # 6M Momentum (126 trading days)
@@ -158,11 +190,18 @@ class FSSEngine:
         above_ma = (prices > ma_50).astype(float)
         trend_stability = above_ma.rolling(lookback_days).mean()
         
-        # Normalize each component cross-sectionally per date
+        return {
+            "trend_sharpe": trend_sharpe,
+            "rel_strength": rel_strength,
+            "trend_stability": trend_stability,
+        }
+    
+    def _score_trend(self, inputs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Normalize raw trend signals cross-sectionally per date and blend into T"""
         T = (
-            0.50 * self.to_0_100_from_z(trend_sharpe.apply(self.zscore, axis=1)) +
-            0.25 * self.to_0_100_from_z(rel_strength.apply(self.zscore, axis=1)) +
-            0.25 * self.to_0_100_from_z(trend_stability.apply(self.zscore, axis=1))
+            0.50 * self.to_0_100_from_z(self._zscore_rows(inputs["trend_sharpe"])) +
+            0.25 * self.to_0_100_from_z(self._zscore_rows(inputs["rel_strength"])) +
+            0.25 * self.to_0_100_from_z(self._zscore_rows(inputs["trend_stability"]))
         )
         
         return T.fillna(50.0)  # Default to neutral (50) if NaN
@@ -191,9 +230,9 @@ class FSSEngine:
         
         # Normalize each component
         F = (
-            0.45 * self.to_0_100_from_z(eps_accel.apply(self.zscore, axis=1)) +
-            0.35 * self.to_0_100_from_z(rev_yoy.apply(self.zscore, axis=1)) +
-            0.20 * self.to_0_100_from_z(gm_trend.apply(self.zscore, axis=1))
+            0.45 * self.to_0_100_from_z(self._zscore_rows(eps_accel)) +
+            0.35 * self.to_0_100_from_z(self._zscore_rows(rev_yoy)) +
+            0.20 * self.to_0_100_from_z(self._zscore_rows(gm_trend))
         )
         
         return F.fillna(50.0)
@@ -212,6 +251,17 @@ class FSSEngine:
         
         VPT captures cumulative volume-weighted price changes (better institutional detection).
         """
+        return self._score_capital_flow(
+            self._capital_flow_inputs(prices, volumes, fundamentals_daily)
+        )
+    
+    def _capital_flow_inputs(
+        self,
+        prices: pd.DataFrame,
+        volumes: pd.DataFrame,
+        fundamentals_daily: Optional[Dict[str, pd.DataFrame]] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """Raw (pre-normalization) capital flow signals, one DataFrame per signal"""
         daily_ret = prices.pct_change()
         
         # Volume Price Trend (VPT): True cumulative volume-weighted price changes
@@ -233,12 +283,20 @@ class FSSEngine:
         else:
             opt_bias = pd.DataFrame(50.0, index=prices.index, columns=prices.columns)
         
-        # Normalize each component
+        return {
+            "vpt": vpt,
+            "vol_break": vol_break,
+            "acc_proxy": acc_proxy,
+            "opt_bias": opt_bias,
+        }
+    
+    def _score_capital_flow(self, inputs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Normalize raw capital flow signals cross-sectionally per date and blend into C"""
         C = (
-            0.30 * self.to_0_100_from_z(vpt.apply(self.zscore, axis=1)) +
-            0.30 * self.to_0_100_from_z(vol_break.apply(self.zscore, axis=1)) +
-            0.25 * self.to_0_100_from_z(acc_proxy.apply(self.zscore, axis=1)) +
-            0.15 * self.to_0_100_from_z(opt_bias.apply(self.zscore, axis=1))
+            0.30 * self.to_0_100_from_z(self._zscore_rows(inputs["vpt"])) +
+            0.30 * self.to_0_100_from_z(self._zscore_rows(inputs["vol_break"])) +
+            0.25 * self.to_0_100_from_z(self._zscore_rows(inputs["acc_proxy"])) +
+            0.15 * self.to_0_100_from_z(self._zscore_rows(inputs["opt_bias"]))
         )
         
         return C.fillna(50.0)
@@ -255,11 +313,17 @@ class FSSEngine:
         Formula:
         R = 0.35 * (1 - Volatility Percentile) + 0.35 * Balance Sheet Strength + 0.30 * Drawdown Resilience
         """
-        # Volatility percentile (lower is better)
+        return self._score_risk(self._risk_inputs(prices, fundamentals_daily, lookback_days))
+    
+    def _risk_inputs(
+        self,
+        prices: pd.DataFrame,
+        fundamentals_daily: Optional[Dict[str, pd.DataFrame]] = None,
+        lookback_days: int = 126
+    ) -> Dict[str, pd.DataFrame]:
+        """Raw (pre-normalization) risk & quality signals, one DataFrame per signal"""
         daily_ret = prices.pct_change()
         vol_20 = daily_ret.rolling(20).std() * np.sqrt(252)  # Annualized
-        vol_pct = vol_20.rank(axis=1, pct=True)  # 0-1, lower vol = lower pct
-        low_vol_score = (1.0 - vol_pct) * 100.0
         
         # Drawdown resilience: current drawdown from rolling high-water mark.
         # dd is already the worst-case percentage below the rolling peak within
@@ -268,7 +332,6 @@ class FSSEngine:
         # recoveries. We negate dd so that a larger drawdown maps to a lower score.
         roll_max = prices.rolling(lookback_days).max()
         dd = (prices / (roll_max + 1e-12)) - 1.0  # Negative values: 0 = at peak, -0.3 = 30% below peak
-        dd_score = self.to_0_100_from_z((-dd).apply(self.zscore, axis=1))
         
         # Balance sheet strength
         if fundamentals_daily and "balance_strength" in fundamentals_daily:
@@ -276,9 +339,23 @@ class FSSEngine:
         else:
             balance_strength = pd.DataFrame(50.0, index=prices.index, columns=prices.columns)
         
+        return {
+            "vol_20": vol_20,
+            "dd": dd,
+            "balance_strength": balance_strength,
+        }
+    
+    def _score_risk(self, inputs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Normalize raw risk signals cross-sectionally per date and blend into R"""
+        # Volatility percentile (lower is better)
+        vol_pct = inputs["vol_20"].rank(axis=1, pct=True)  # 0-1, lower vol = lower pct
+        low_vol_score = (1.0 - vol_pct) * 100.0
+        
+        dd_score = self.to_0_100_from_z(self._zscore_rows(-inputs["dd"]))
+        
         R = (
             0.35 * low_vol_score +
-            0.35 * self.to_0_100_from_z(balance_strength.apply(self.zscore, axis=1)) +
+            0.35 * self.to_0_100_from_z(self._zscore_rows(inputs["balance_strength"])) +
             0.30 * dd_score
         )
         
@@ -308,36 +385,46 @@ class FSSEngine:
         
         spy_sma_200 = spy.rolling(200).mean().iloc[-1]
         spy_current = spy.iloc[-1]
-        is_bull = spy_current > spy_sma_200
         
         if vix is not None and len(vix) >= 252:
-            vix_median = vix.rolling(252).median().iloc[-1]
-            vix_current = vix.iloc[-1]
-            is_low_vol = vix_current < vix_median
+            vol = vix.iloc[-1]
+            vol_median = vix.rolling(252).median().iloc[-1]
         else:
             # Fallback: use price volatility as proxy
-            spy_vol = spy.pct_change().rolling(20).std().iloc[-1] * np.sqrt(252)
-            spy_vol_median = spy.pct_change().rolling(252).std().median() * np.sqrt(252)
-            is_low_vol = spy_vol < spy_vol_median
-        
-        if is_bull and is_low_vol:
-            regime = "Expansion"
-        elif is_bull and not is_low_vol:
-            regime = "Parabolic"
-        elif not is_bull and is_low_vol:
-            regime = "Deflation"
-        else:
-            regime = "Crisis"
+            vol = spy.pct_change().rolling(20).std().iloc[-1] * np.sqrt(252)
+            vol_median = spy.pct_change().rolling(252).std().median() * np.sqrt(252)
         
+        regime, is_bull, is_low_vol = self._classify_regimes(spy_current, spy_sma_200, vol, vol_median)
         confidence = 0.8 if vix is not None else 0.6
         
         return RegimeResult(
-            regime=regime,
-            spy_above_200dma=is_bull,
-            vix_below_median=is_low_vol,
+            regime=regime.item(),
+            spy_above_200dma=bool(is_bull),
+            vix_below_median=bool(is_low_vol),
             confidence=confidence
         )
     
+    @staticmethod
+    def _classify_regimes(spy_level, spy_sma_200, vol, vol_median) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Regime from SPY against its 200-day mean and volatility against its median.
+        
+        Elementwise on scalars or arrays; shared by ``detect_market_regime`` and
+        ``_rolling_regimes``. A NaN mean or median (not enough history) compares
+        False, so it never reads as bull or as low volatility.
+        
+        Returns:
+            (regime names, is_bull, is_low_vol)
+        """
+        is_bull = np.asarray(spy_level > spy_sma_200)
+        is_low_vol = np.asarray(vol < vol_median)
+        regimes = np.select(
+            [is_bull & is_low_vol, is_bull, is_low_vol],
+            ["Expansion", "Parabolic", "Deflation"],
+            "Crisis"
+        )
+        return regimes, is_bull, is_low_vol
+    
     def compute_fss_v3(
         self,
         prices: pd.DataFrame,
@@ -369,15 +456,7 @@ class FSSEngine:
             DataFrame with MultiIndex columns: [component][ticker]
             Components: FSS, T, F, C, R
         """
-        # Detect regime
-        regime_result = self.detect_market_regime(spy, vix)
-        regime = regime_result.regime
-        
-        # Get weights
-        if weights is None and use_regime_weighting:
-            weights = self.regime_weights.get(regime, self.default_weights)
-        elif weights is None:
-            weights = self.default_weights
+        weights = self._select_weights(spy, vix, weights, use_regime_weighting)
         
         # Compute components
         T = self.compute_trend_component(prices, spy)
@@ -385,6 +464,34 @@ class FSSEngine:
         C = self.compute_capital_flow_component(prices, volumes, fundamentals_daily)
         R = self.compute_risk_component(prices, fundamentals_daily)
         
+        return self._combine_components(T, F, C, R, weights, prices)
+    
+    def _select_weights(
+        self,
+        spy: pd.Series,
+        vix: Optional[pd.Series],
+        weights: Optional[Dict[str, float]],
+        use_regime_weighting: bool
+    ) -> Dict[str, float]:
+        """Resolve component weights: explicit > regime-specific > default"""
+        if weights is not None:
+            return weights
+        if use_regime_weighting:
+            # Detect regime
+            regime = self.detect_market_regime(spy, vix).regime
+            return self.regime_weights.get(regime, self.default_weights)
+        return self.default_weights
+    
+    def _combine_components(
+        self,
+        T: pd.DataFrame,
+        F: pd.DataFrame,
+        C: pd.DataFrame,
+        R: pd.DataFrame,
+        weights: Dict[str, float],
+        prices: pd.DataFrame
+    ) -> pd.DataFrame:
+        """Blend component scores into FSS v3.0 and apply interaction logic"""
         # Renormalize weights if F is missing
         w = weights.copy()
         if F.isna().all().all() or F.eq(50.0).all().all():
@@ -398,7 +505,51 @@ class FSSEngine:
         base_fss = sum(w[k] * comp for k, comp in [("T", T), ("F", F), ("C", C), ("R", R)] if k in w)
         
         # Interaction logic: Penalties and synergy boosts (v3.0)
-        # Stack components for vectorized operations
+        aligned = all(
+            comp.index.equals(base_fss.index) and comp.columns.equals(base_fss.columns)
+            for comp in (T, F, C, R)
+        )
+        if aligned:
+            # Same (date x ticker) grid everywhere: apply interactions on the arrays
+            t, f, c = T.to_numpy(dtype=float), F.to_numpy(dtype=float), C.to_numpy(dtype=float)
+            multiplier = (
+                np.where((t > 70) & (c < 40), 0.85, 1.0) *
+                np.where(f < 25, 0.50, 1.0) *
+                np.where((t > 70) & (f > 70), 1.15, 1.0)
+            )
+            fss_v3 = pd.DataFrame(
+                np.clip(base_fss.to_numpy(dtype=float) * multiplier, 0, 100),
+                index=base_fss.index,
+                columns=base_fss.columns
+            )
+            # Stacking drops NaN cells, so fully-missing rows/columns never reappear
+            fss_v3 = fss_v3.dropna(how="all").dropna(axis=1, how="all")
+        else:
+            fss_v3 = self._combine_stacked(T, F, C, R, base_fss)
+        
+        # Combine into MultiIndex DataFrame
+        result = pd.concat(
+            {
+                "FSS": fss_v3,
+                "T": T,
+                "F": F,
+                "C": C,
+                "R": R
+            },
+            axis=1
+        )
+        
+        return result
+    
+    @staticmethod
+    def _combine_stacked(
+        T: pd.DataFrame,
+        F: pd.DataFrame,
+        C: pd.DataFrame,
+        R: pd.DataFrame,
+        base_fss: pd.DataFrame
+    ) -> pd.DataFrame:
+        """Interaction logic over stacked (date, ticker) rows; handles misaligned components"""
         components_stacked = pd.concat(
             {
                 "T": T.stack(),
@@ -429,21 +580,7 @@ class FSSEngine:
         fss_stacked = components_stacked["base_fss"] * distribution_penalty * fund_floor * synergy_boost
         
         # Unstack back to DataFrame
-        fss_v3 = fss_stacked.clip(0, 100).unstack()
-        
-        # Combine into MultiIndex DataFrame
-        result = pd.concat(
-            {
-                "FSS": fss_v3,
-                "T": T,
-                "F": F,
-                "C": C,
-                "R": R
-            },
-            axis=1
-        )
-        
-        return result
+        return fss_stacked.clip(0, 100).unstack()
     
     def compute_fss_v2(
         self,
@@ -886,6 +1023,376 @@ class FSSEngine:
         # Call internal method with simplified DataFrame
         return self._calculate_signal_stability_rating_from_history(history_df)
     
+    # ------------------------------------------------------------------
+    # Panel (all tickers at once) robustness metrics
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _masked_ranks(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Average ranks down each column among the masked-in cells (NaN elsewhere)"""
+        return pd.DataFrame(np.where(mask, values, np.nan)).rank(method="average").to_numpy()
+    
+    @staticmethod
+    def _masked_pearson(x: np.ndarray, y: np.ndarray, axis: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pearson correlation along an axis over cells where both x and y are set.
+        
+        Returns:
+            (corr, n): corr is NaN where it is undefined (constant input or n < 2)
+        """
+        valid = ~(np.isnan(x) | np.isnan(y))
+        n = valid.sum(axis=axis)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            dx = np.where(valid, x, 0.0)
+            dy = np.where(valid, y, 0.0)
+            dx = np.where(valid, dx - np.expand_dims(dx.sum(axis=axis) / n, axis), 0.0)
+            dy = np.where(valid, dy - np.expand_dims(dy.sum(axis=axis) / n, axis), 0.0)
+            vx = (dx * dx).sum(axis=axis)
+            vy = (dy * dy).sum(axis=axis)
+            corr = (dx * dy).sum(axis=axis) / np.sqrt(vx * vy)
+        corr = np.where((n >= 2) & (vx > 0) & (vy > 0), np.clip(corr, -1.0, 1.0), np.nan)
+        return corr, n
+    
+    def _masked_spearman(self, x: np.ndarray, y: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Column-wise ``_safe_corr(..., method="spearman")`` over the masked-in rows"""
+        corr, n = self._masked_pearson(self._masked_ranks(x, mask), self._masked_ranks(y, mask))
+        return np.where(n >= 3, np.nan_to_num(corr, nan=0.0), 0.0)
+    
+    def _panel_history(
+        self,
+        fss_data: pd.DataFrame,
+        prices: pd.DataFrame,
+        tickers: Optional[List[str]],
+        horizon: int = 21
+    ) -> Optional[Dict[str, Any]]:
+        """
+        FSS scores and forward returns for many tickers, laid out per column the
+        way the per-ticker metrics see them.
+        
+        Each ticker's dates with both an FSS score and a price are packed to the
+        top of its column, in date order, so row k is that ticker's k-th
+        observation. Forward returns are taken over ``horizon`` observations.
+        
+        Returns:
+            None if the inputs are unusable, else a dict with
+            tickers (present in both inputs), dates (common index),
+            fss / fwd / rows (packed arrays; rows are positions in dates),
+            n (observations per ticker) and m (observations with a forward return)
+        """
+        if fss_data is None or prices is None or fss_data.empty or prices.empty:
+            return None
+        if not isinstance(fss_data.columns, pd.MultiIndex) or "FSS" not in fss_data.columns.get_level_values(0):
+            return None
+        
+        fss_frame = fss_data["FSS"]
+        present = [t for t in (tickers if tickers is not None else fss_frame.columns)
+                   if t in fss_frame.columns and t in prices.columns]
+        dates = fss_frame.index.intersection(prices.index).sort_values()
+        if not present or dates.empty:
+            return None
+        
+        fss = fss_frame.loc[dates, present].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        px = prices.loc[dates, present].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        valid = ~(np.isnan(fss) | np.isnan(px))
+        
+        # Stable sort puts each column's valid rows first, still in date order
+        rows = np.argsort(~valid, axis=0, kind="stable")
+        fss = np.take_along_axis(fss, rows, axis=0)
+        px = np.take_along_axis(px, rows, axis=0)
+        n = valid.sum(axis=0)
+        m = n - horizon
+        
+        fwd = np.full_like(px, np.nan)
+        if len(px) > horizon:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                fwd[:-horizon] = px[horizon:] / px[:-horizon] - 1
+        position = np.arange(len(dates))[:, None]
+        fwd[position >= m] = np.nan
+        fss[position >= n] = np.nan
+        
+        return {"tickers": present, "dates": dates, "fss": fss, "fwd": fwd, "rows": rows, "n": n, "m": m}
+    
+    def _rolling_regimes(
+        self,
+        spy: pd.Series,
+        regime_window: int,
+        vix: Optional[pd.Series] = None
+    ) -> pd.Series:
+        """
+        ``detect_market_regime`` on the trailing ``regime_window + 1`` SPY bars
+        (and the VIX bars at the same positions) at every date, as
+        ``calculate_regime_robustness`` applies it. Dates without a full window
+        are None.
+        
+        The rolling statistics are taken over whole series, restricted to what
+        falls inside each window: e.g. the 252-bar volatility median needs
+        windows of more than 252 bars and is NaN (never low vol) otherwise.
+        """
+        bars = regime_window + 1
+        regimes = pd.Series(None, index=spy.index, dtype=object)
+        if bars < 200:
+            regimes.iloc[regime_window:] = "Expansion"
+            return regimes
+        
+        returns = spy.pct_change()
+        vol = (returns.rolling(20).std() * np.sqrt(252)).to_numpy()
+        if bars > 252:
+            # A window's first return is undefined, so it holds bars - 252 full 252-bar stds
+            vol_median = (returns.rolling(252).std().rolling(bars - 252).median() * np.sqrt(252)).to_numpy()
+        else:
+            vol_median = np.full(len(spy), np.nan)
+        
+        if vix is not None and bars >= 252:
+            # VIX windows are taken by position and exist where VIX is long enough
+            n = min(len(vix), len(spy))
+            vix_values = np.full(len(spy), np.nan)
+            vix_median = np.full(len(spy), np.nan)
+            vix_values[:n] = vix.to_numpy()[:n]
+            vix_median[:n] = vix.rolling(252).median().to_numpy()[:n]
+            has_vix = np.arange(len(spy)) < len(vix)
+            vol = np.where(has_vix, vix_values, vol)
+            vol_median = np.where(has_vix, vix_median, vol_median)
+        
+        names, _, _ = self._classify_regimes(
+            spy.to_numpy(), spy.rolling(200).mean().to_numpy(), vol, vol_median
+        )
+        regimes.iloc[regime_window:] = names[regime_window:]
+        return regimes
+    
+    def calculate_regime_robustness_panel(
+        self,
+        fss_data: pd.DataFrame,
+        prices: pd.DataFrame,
+        spy: pd.Series,
+        vix: Optional[pd.Series] = None,
+        lookback_days: int = 252,
+        tickers: Optional[List[str]] = None
+    ) -> pd.Series:
+        """
+        Regime Robustness Score for every ticker at once.
+        
+        Same result per ticker as ``calculate_regime_robustness``, but the
+        market regime is detected once per date instead of once per
+        (ticker, date), and per-regime Spearman ICs are computed for all tickers
+        together with rank transforms and masked column sums.
+        
+        Args:
+            fss_data: FSS scores over time (MultiIndex columns)
+            prices: Price DataFrame (date x ticker)
+            spy: SPY benchmark
+            vix: Optional VIX series (regime windows are too short to use it)
+            lookback_days: Historical lookback period
+            tickers: Tickers to score (default: every ticker in fss_data)
+            
+        Returns:
+            Robustness score (0-1) per ticker; 0.5 (neutral) where it cannot be assessed
+        """
+        if tickers is None and fss_data is not None and isinstance(fss_data.columns, pd.MultiIndex):
+            tickers = list(dict.fromkeys(fss_data.columns.get_level_values(1)))
+        result = pd.Series(0.5, index=pd.Index(tickers or [], dtype=object), dtype=float)
+        
+        panel = self._panel_history(fss_data, prices, tickers)
+        if panel is None or spy is None:
+            return result
+        
+        fss, fwd, n, m = panel["fss"], panel["fwd"], panel["n"], panel["m"]
+        position = np.arange(len(fss))[:, None]
+        has_fwd = position < m
+        score = np.full(len(n), 0.5)
+        
+        # Flat and monotonic scores carry no information
+        scores = np.where(has_fwd, fss, np.nan)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            flat = np.nanmax(scores, axis=0) == np.nanmin(scores, axis=0)
+        steps = np.diff(fss, axis=0)
+        in_step = position[1:] < m
+        monotonic = np.all((steps >= 0) | ~in_step, axis=0) | np.all((steps <= 0) | ~in_step, axis=0)
+        
+        # Regime of each observation (one detection per date, shared by all tickers)
+        regime_window = min(200, max(60, len(spy) // 2))
+        regime_names = self._rolling_regimes(spy, regime_window, vix)
+        labels = regime_names[~regime_names.index.duplicated()].reindex(panel["dates"]).to_numpy()
+        names = sorted({label for label in labels if isinstance(label, str)})
+        codes = np.array([names.index(label) if isinstance(label, str) else -1 for label in labels], dtype=int)
+        regime = codes[panel["rows"]]
+        in_history = (position < np.minimum(m, lookback_days)) & (regime >= 0)
+        
+        # Spearman IC per (regime, ticker), shrunk toward 0 for small samples
+        min_samples = 20
+        shrinkage_lambda = 20.0
+        ics = np.full((len(names), len(n)), np.nan)
+        counts = np.zeros((len(names), len(n)))
+        for r in range(len(names)):
+            in_regime = in_history & (regime == r)
+            counts[r] = in_regime.sum(axis=0)
+            ic = self._masked_spearman(fss, fwd, in_regime)
+            ics[r] = np.where(counts[r] >= min_samples, ic * counts[r] / (counts[r] + shrinkage_lambda), np.nan)
+        regimes_seen = (counts > 0).sum(axis=0)
+        
+        # One regime only: fall back to the overall IC sign
+        spy_signs = np.sign(spy.pct_change().dropna().to_numpy())
+        if len(spy_signs) and np.sum(spy_signs[1:] != spy_signs[:-1]) > 0:
+            overall_ic = self._masked_spearman(fss, fwd, has_fwd)
+            single_regime = np.where(overall_ic <= 0, 0.0, 0.5)
+        else:
+            single_regime = np.full(len(n), 0.5)
+        
+        robust = self._combine_regime_ics(ics, counts)
+        
+        score = np.where(regimes_seen < 2, single_regime, robust)
+        score = np.where(in_history.sum(axis=0) < 20, 0.5, score)
+        score = np.where(monotonic, 0.0, score)
+        score = np.where(flat, np.where(n >= 150, 0.0, 0.5), score)
+        score = np.where(n < 60, 0.5, score)
+        
+        result.loc[panel["tickers"]] = score
+        return result
+    
+    def _combine_regime_ics(self, ics: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        ``_calculate_regime_robustness_from_history`` scoring for a
+        (regime x ticker) matrix of shrunk ICs (NaN where a regime is skipped).
+        """
+        target_n = 60.0
+        ic_scale = 0.08
+        disp_k = 6.0
+        eps = 1e-9
+        
+        used = ~np.isnan(ics)
+        k = used.sum(axis=0)
+        ic = np.where(used, ics, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_ic = ic.sum(axis=0) / k
+            abs_mean_ic = np.abs(ic).sum(axis=0) / k
+            disp = np.sqrt((np.where(used, ic - mean_ic, 0.0) ** 2).sum(axis=0) / k)
+            confidence01 = np.where(used, np.clip(counts / target_n, 0.0, 1.0), 0.0).sum(axis=0) / k
+        strength01 = 1.0 - np.exp(-(abs_mean_ic / (ic_scale + eps)))
+        consistency01 = np.exp(-disp_k * disp)
+        
+        # Sign consistency: share of regimes agreeing with the dominant direction
+        positive = (used & (ics > 0)).sum(axis=0)
+        negative = (used & (ics < 0)).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sign01 = np.where(
+                positive + negative > 0,
+                np.where(positive >= negative, positive, negative) / (positive + negative),
+                0.5
+            )
+        
+        robustness = np.clip(
+            0.45 * strength01 + 0.30 * consistency01 + 0.15 * confidence01 + 0.10 * sign01, 0.0, 1.0
+        )
+        return np.where((k == 0) | ~(mean_ic > 0) | ~(abs_mean_ic > eps), 0.0, robustness)
+    
+    def calculate_signal_stability_rating_panel(
+        self,
+        fss_data: pd.DataFrame,
+        prices: pd.DataFrame,
+        lookback_days: int = 126,
+        tickers: Optional[List[str]] = None
+    ) -> pd.Series:
+        """
+        Signal Stability Rating for every ticker at once.
+        
+        Same result per ticker as ``calculate_signal_stability_rating``. The
+        60-day rolling Spearman ICs for all tickers come from one rank transform
+        over a sliding-window view instead of a Python loop per ticker and window.
+        
+        Args:
+            fss_data: FSS scores over time (MultiIndex columns)
+            prices: Price DataFrame (date x ticker)
+            lookback_days: Historical lookback period
+            tickers: Tickers to score (default: every ticker in fss_data)
+            
+        Returns:
+            SSR score (0-1) per ticker; 0.5 (neutral) where it cannot be assessed
+        """
+        if tickers is None and fss_data is not None and isinstance(fss_data.columns, pd.MultiIndex):
+            tickers = list(dict.fromkeys(fss_data.columns.get_level_values(1)))
+        result = pd.Series(0.5, index=pd.Index(tickers or [], dtype=object), dtype=float)
+        
+        panel = self._panel_history(fss_data, prices, tickers)
+        if panel is None:
+            return result
+        
+        n, m = panel["n"], panel["m"]
+        eps = 1e-9
+        window = 60
+        minp = 45
+        
+        # Most recent `lookback_days` observations with a forward return,
+        # right-aligned so every ticker's latest observation is the last row
+        length = np.clip(np.minimum(m, lookback_days), 0, None)
+        row = np.arange(lookback_days)[:, None]
+        source = m - lookback_days + row
+        recent = row >= lookback_days - length
+        source = np.clip(source, 0, max(len(panel["fss"]) - 1, 0))
+        s = np.where(recent, np.take_along_axis(panel["fss"], source, axis=0), np.nan)
+        fwd = np.where(recent, np.take_along_axis(panel["fwd"], source, axis=0), np.nan)
+        
+        # --- Persistence (autocorr) ---
+        acs = []
+        for lag in (5, 10, 20):
+            ac, _ = self._masked_pearson(s[lag:], s[:-lag])
+            acs.append(np.where(length > lag + 10, ac, np.nan))
+        acs = np.array(acs)
+        n_acs = (~np.isnan(acs)).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            persistence01 = np.where(n_acs > 0, np.nansum((acs + 1.0) / 2.0, axis=0) / n_acs, 0.0)
+        
+        # --- Rolling IC (Spearman) ---
+        # NaN padding truncates the first windows like the per-ticker loop does
+        pad = np.full((window - 1, s.shape[1]), np.nan)
+        s_windows = sliding_window_view(np.vstack([pad, s]), window, axis=0)  # (row, ticker, window)
+        fwd_windows = sliding_window_view(np.vstack([pad, fwd]), window, axis=0)
+        shape = s_windows.shape
+        in_window = ~(np.isnan(s_windows) | np.isnan(fwd_windows)).reshape(-1, window).T
+        # One rank transform for every window: a column per (row, ticker)
+        rank_s = self._masked_ranks(s_windows.reshape(-1, window).T, in_window).T.reshape(shape)
+        rank_fwd = self._masked_ranks(fwd_windows.reshape(-1, window).T, in_window).T.reshape(shape)
+        ic, count = self._masked_pearson(rank_s, rank_fwd, axis=2)
+        rolling_ics = np.where(count >= minp, np.nan_to_num(ic, nan=0.0), np.nan)
+        
+        has_ic = ~np.isnan(rolling_ics)
+        n_ics = has_ic.sum(axis=0)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            mean_ic = np.nanmean(rolling_ics, axis=0)
+            std_ic = np.nanstd(rolling_ics, axis=0, ddof=1)
+        snr01 = 1.0 - np.exp(-(np.abs(mean_ic) / (std_ic + eps)))
+        
+        # Sign flips between consecutive non-zero ICs
+        signs = np.sign(np.where(has_ic, rolling_ics, 0.0))
+        nonzero = signs != 0
+        packed = np.take_along_axis(signs, np.argsort(~nonzero, axis=0, kind="stable"), axis=0)
+        n_nonzero = nonzero.sum(axis=0)
+        changes = (packed[1:] != packed[:-1]) & (row[1:] < n_nonzero)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            flip01 = np.where(n_nonzero >= 5, 1.0 - changes.sum(axis=0) / (n_nonzero - 1), 0.5)
+        
+        snr01 = np.where(n_ics >= 12, snr01, 0.0)
+        flip01 = np.where(n_ics >= 12, flip01, 0.0)
+        
+        # --- Volatility stability ---
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            mu = np.nanmean(s, axis=0)
+            sigma = np.nanstd(s, axis=0, ddof=1)
+        vol01 = np.where(np.abs(mu) > eps, np.exp(-1.2 * sigma / (np.abs(mu) + eps)), 0.0)
+        
+        # --- Coverage penalty ---
+        coverage01 = np.minimum(1.0, length / 252)
+        
+        raw = 0.35 * persistence01 + 0.35 * snr01 + 0.15 * vol01 + 0.15 * flip01
+        score = np.clip(raw * coverage01, 0.0, 1.0)
+        score = np.where(length < 80, 0.0, score)
+        score = np.where(n < 60, 0.0, score)
+        score = np.where(n < 40, 0.5, score)
+        
+        result.loc[panel["tickers"]] = score
+        return result
+    
     def get_stock_fss(
         self,
         ticker: str,
@@ -0,0 +1,341 @@
+# core/fss_incremental.py
+"""
+Incremental FSS Engine
+
+Walk-forward style workloads call `FSSEngine.compute_fss_v3` on a sliding
+training window for every rebalance date. Consecutive windows overlap almost
+entirely, so the rolling trend/flow/risk signals are recomputed over the same
+bars again and again.
+
+`IncrementalFSSEngine` keeps those rolling signals as state over the full
+history seen so far and only advances them by the bars added since the last
+call. Scoring a window then just slices the cached signals, patches the
+window's warm-up rows (where the stand-alone computation has not yet filled
+its rolling windows) and runs the usual cross-sectional normalization.
+
+The output of `compute_window(start, end)` matches
+`FSSEngine.compute_fss_v3(prices.loc[start:end], ...)` to floating-point
+precision.
+"""
+import numpy as np
+import pandas as pd
+import logging
+import warnings
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Optional
+
+from .fss_engine import FSSEngine, get_fss_engine
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalFSSEngine:
+    """
+    Rolling-state FSS calculator for overlapping windows.
+
+    Usage:
+        inc = IncrementalFSSEngine()
+        for rebal_date in rebal_dates:
+            inc.advance(prices.loc[:rebal_date], volumes.loc[:rebal_date], spy.loc[:rebal_date], vix)
+            fss_data = inc.compute_window(train_start, rebal_date)
+    """
+
+    # Rolling windows used by FSSEngine.compute_fss_v3 (component defaults)
+    LOOKBACK_DAYS = 126
+    MA_WINDOW = 50
+    FLOW_WINDOW = 20
+    VOL_WINDOW = 20
+
+    # Bars of history needed to extend every rolling signal by one new bar
+    TAIL_ROWS = LOOKBACK_DAYS + MA_WINDOW
+
+    # New bars processed per vectorized block
+    CHUNK_ROWS = 64
+
+    def __init__(self, engine: Optional[FSSEngine] = None):
+        """
+        Initialize incremental engine.
+
+        Args:
+            engine: FSSEngine used for scoring (default: singleton engine)
+        """
+        self.engine = engine or get_fss_engine()
+        self.reset()
+
+    def reset(self):
+        """Drop all cached history and rolling state"""
+        self._prices: Optional[pd.DataFrame] = None
+        self._volumes: Optional[pd.DataFrame] = None
+        self._spy: Optional[pd.Series] = None
+        self._vix: Optional[pd.Series] = None
+        self._spy_ret: Optional[pd.Series] = None
+        self._signals: Dict[str, np.ndarray] = {}
+
+    @property
+    def last_date(self) -> Optional[pd.Timestamp]:
+        """Last bar folded into the rolling state"""
+        return None if self._prices is None or self._prices.empty else self._prices.index[-1]
+
+    def advance(
+        self,
+        prices: pd.DataFrame,
+        volumes: pd.DataFrame,
+        spy: pd.Series,
+        vix: Optional[pd.Series] = None
+    ) -> int:
+        """
+        Fold new bars into the rolling state.
+
+        Frames may contain already-seen history; only bars after `last_date`
+        are processed, so callers can simply pass `prices.loc[:as_of]`.
+
+        Args:
+            prices: DataFrame with date index, ticker columns (adjusted close)
+            volumes: DataFrame with date index, ticker columns (volume)
+            spy: Series with date index (SPY adjusted close)
+            vix: Optional Series with date index (VIX)
+
+        Returns:
+            Number of new price bars processed
+        """
+        if self._prices is not None and list(prices.columns) != list(self._prices.columns):
+            raise ValueError("Ticker universe changed; call reset() before advancing")
+
+        self._advance_benchmarks(spy, vix)
+
+        last = self.last_date
+        new_prices = prices if last is None else prices.loc[prices.index > last]
+        if new_prices.empty:
+            return 0
+        new_volumes = volumes.reindex(index=new_prices.index, columns=new_prices.columns)
+
+        if self._prices is None:
+            n_tail = 0
+            p = new_prices.to_numpy(dtype=float)
+            v = new_volumes.to_numpy(dtype=float)
+        else:
+            n_tail = min(self.TAIL_ROWS, len(self._prices))
+            p = np.vstack([self._prices.to_numpy(dtype=float)[-n_tail:], new_prices.to_numpy(dtype=float)])
+            v = np.vstack([self._volumes.to_numpy(dtype=float)[-n_tail:], new_volumes.to_numpy(dtype=float)])
+
+        # Bound the (rows x tickers x window) temporaries on the first, full-history call
+        chunks = []
+        for lo in range(0, len(new_prices), self.CHUNK_ROWS):
+            hi = min(lo + self.CHUNK_ROWS, len(new_prices))
+            stop = n_tail + hi
+            start = max(0, stop - (hi - lo) - self.TAIL_ROWS)
+            chunks.append(self._rolling_signals(p[start:stop], v[start:stop], hi - lo))
+
+        new_signals = {name: np.vstack([c[name] for c in chunks]) for name in chunks[0]}
+
+        # Running count of bars above the 50-DMA; carried across calls
+        above_cum = np.cumsum(new_signals.pop("above_ma"), axis=0)
+        if "above_ma_cum" in self._signals:
+            above_cum += self._signals["above_ma_cum"][-1]
+        new_signals["above_ma_cum"] = above_cum
+
+        for name, values in new_signals.items():
+            old = self._signals.get(name)
+            self._signals[name] = values if old is None else np.vstack([old, values])
+
+        self._prices = new_prices if self._prices is None else pd.concat([self._prices, new_prices])
+        self._volumes = new_volumes if self._volumes is None else pd.concat([self._volumes, new_volumes])
+
+        return len(new_prices)
+
+    def _advance_benchmarks(self, spy: pd.Series, vix: Optional[pd.Series]):
+        """Append new SPY/VIX observations and extend the SPY momentum series"""
+        if spy is None:
+            raise ValueError("SPY series is required for FSS trend scoring")
+
+        new_spy = spy if self._spy is None else spy.loc[spy.index > self._spy.index[-1]]
+        if not new_spy.empty:
+            if self._spy is None:
+                hist = new_spy
+            else:
+                hist = pd.concat([self._spy.iloc[-self.LOOKBACK_DAYS:], new_spy])
+            new_ret = hist.pct_change(self.LOOKBACK_DAYS).iloc[-len(new_spy):]
+            self._spy = new_spy if self._spy is None else pd.concat([self._spy, new_spy])
+            self._spy_ret = new_ret if self._spy_ret is None else pd.concat([self._spy_ret, new_ret])
+
+        if vix is not None and len(vix) > 0:
+            new_vix = vix if self._vix is None else vix.loc[vix.index > self._vix.index[-1]]
+            if not new_vix.empty:
+                self._vix = new_vix if self._vix is None else pd.concat([self._vix, new_vix])
+
+    @staticmethod
+    def _trailing_windows(values: np.ndarray, window: int, n_rows: int) -> np.ndarray:
+        """
+        (n_rows, n_tickers, window) view of the windows ending at each of the
+        last `n_rows` rows. Positions before the start of `values` are NaN,
+        mirroring pandas' insufficient-history behaviour.
+        """
+        needed = window - 1 + n_rows
+        if len(values) < needed:
+            pad = np.full((needed - len(values), values.shape[1]), np.nan)
+            values = np.vstack([pad, values])
+        return sliding_window_view(values[-needed:], window, axis=0)
+
+    def _rolling_signals(self, p: np.ndarray, v: np.ndarray, n_rows: int) -> Dict[str, np.ndarray]:
+        """
+        Rolling FSS signals for the last `n_rows` rows of a block of history.
+
+        Array versions of the raw inputs in `FSSEngine._trend_inputs`,
+        `_capital_flow_inputs` and `_risk_inputs`; values are exact whenever
+        the block holds TAIL_ROWS bars before the first requested row (or
+        starts the history).
+        """
+        lookback = self.LOOKBACK_DAYS
+        daily_ret = np.full_like(p, np.nan)
+        daily_ret[1:] = p[1:] / p[:-1] - 1.0
+        up_down_vol = np.where(daily_ret > 0, v, -v)
+
+        p_new = p[-n_rows:]
+        v_new = v[-n_rows:]
+        ret_new = daily_ret[-n_rows:]
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+
+            mom_6m = p_new / self._trailing_windows(p, lookback + 1, n_rows)[..., 0] - 1.0
+            ret_std = np.nanstd(self._trailing_windows(daily_ret, lookback, n_rows), axis=-1, ddof=1)
+            trend_sharpe = mom_6m / (ret_std * np.sqrt(lookback) + 1e-12)
+
+            ma_50 = self._trailing_windows(p, self.MA_WINDOW, n_rows).mean(axis=-1)
+
+            vol_avg_20 = self._trailing_windows(v, self.FLOW_WINDOW, n_rows).mean(axis=-1)
+            acc_windows = self._trailing_windows(up_down_vol, self.FLOW_WINDOW, n_rows)
+            acc_proxy = np.where(
+                np.isnan(acc_windows).all(axis=-1), np.nan, np.nansum(acc_windows, axis=-1)
+            )
+
+            vol_20 = self._trailing_windows(daily_ret, self.VOL_WINDOW, n_rows).std(axis=-1, ddof=1) * np.sqrt(252)
+            roll_max = self._trailing_windows(p, lookback, n_rows).max(axis=-1)
+
+        return {
+            "mom_6m": mom_6m,
+            "trend_sharpe": trend_sharpe,
+            "above_ma": (p_new > ma_50).astype(float),
+            "dollar_flow": ret_new * v_new,
+            "vol_break": v_new / (vol_avg_20 + 1e-12),
+            "acc_proxy": acc_proxy,
+            "vol_20": vol_20,
+            "dd": p_new / (roll_max + 1e-12) - 1.0,
+        }
+
+    def _window_signal(self, name: str, s: int, e: int, warmup: int) -> pd.DataFrame:
+        """Cached signal rows [s, e) with the first `warmup` rows blanked out"""
+        values = self._signals[name][s:e].copy()
+        values[:warmup] = np.nan
+        return pd.DataFrame(values, index=self._prices.index[s:e], columns=self._prices.columns)
+
+    def compute_window(
+        self,
+        start,
+        end,
+        fundamentals_daily: Optional[Dict[str, pd.DataFrame]] = None,
+        weights: Optional[Dict[str, float]] = None,
+        use_regime_weighting: bool = True
+    ) -> pd.DataFrame:
+        """
+        Compute FSS v3.0 over the window [start, end] from the rolling state.
+
+        Args:
+            start: First date of the window (inclusive)
+            end: Last date of the window (inclusive); must not exceed `last_date`
+            fundamentals_daily: Optional dict of DataFrames (sliced to the window)
+            weights: Optional custom weights (overrides regime weights if provided)
+            use_regime_weighting: Whether to use regime-specific weights
+
+        Returns:
+            DataFrame with MultiIndex columns: [component][ticker], identical to
+            `FSSEngine.compute_fss_v3` on the same window
+        """
+        if self._prices is None:
+            raise ValueError("No history loaded; call advance() first")
+        if pd.Timestamp(end) > self.last_date:
+            raise ValueError(f"Window end {end} is beyond the last processed bar {self.last_date}")
+
+        prices = self._prices.loc[start:end]
+        volumes = self._volumes.loc[start:end]
+        spy = self._spy.loc[start:end]
+        vix = self._vix.loc[start:end] if self._vix is not None else None
+        if fundamentals_daily:
+            fundamentals_daily = {k: v.loc[start:end] for k, v in fundamentals_daily.items()}
+
+        if prices.empty or prices.isna().any().any() or volumes.isna().any().any():
+            # Gaps make the stand-alone rolling windows depend on the window
+            # start in ways the cached signals cannot reproduce
+            return self.engine.compute_fss_v3(
+                prices=prices,
+                volumes=volumes,
+                spy=spy,
+                vix=vix,
+                fundamentals_daily=fundamentals_daily,
+                weights=weights,
+                use_regime_weighting=use_regime_weighting
+            )
+
+        s = self._prices.index.get_loc(prices.index[0])
+        e = s + len(prices)
+        lookback = self.LOOKBACK_DAYS
+
+        weights = self.engine._select_weights(spy, vix, weights, use_regime_weighting)
+
+        # --- Trend: momentum signals need a full lookback inside the window ---
+        mom_6m = self._window_signal("mom_6m", s, e, lookback)
+        spy_ret = self._spy_ret.loc[start:end].copy()
+        spy_ret.iloc[:lookback] = np.nan
+
+        # Bars above the 50-DMA only count once the window's own 50-DMA exists,
+        # so sum the cached indicator over [max(g - 125, s + 49), g]
+        above_cum = self._signals["above_ma_cum"]
+        above_cum = np.vstack([np.zeros((1, above_cum.shape[1])), above_cum])
+        g = np.arange(s, e)
+        lo = np.maximum(g - lookback + 1, s + self.MA_WINDOW - 1)
+        stability = (above_cum[g + 1] - above_cum[lo]) / lookback
+        stability[: lookback - 1] = np.nan
+
+        T = self.engine._score_trend({
+            "trend_sharpe": self._window_signal("trend_sharpe", s, e, lookback),
+            "rel_strength": mom_6m.sub(spy_ret, axis=0),
+            "trend_stability": pd.DataFrame(stability, index=prices.index, columns=prices.columns),
+        })
+
+        F = self.engine.compute_fundamental_component(fundamentals_daily, prices)
+
+        # --- Capital flow: VPT restarts at the window start; the first bars of
+        # the accumulation proxy use a partial (min_periods=1) window ---
+        dollar_flow = self._window_signal("dollar_flow", s, e, 1)
+        acc_proxy = self._window_signal("acc_proxy", s, e, 0)
+        head_prices = prices.to_numpy(dtype=float)[:self.FLOW_WINDOW]
+        head_volumes = volumes.to_numpy(dtype=float)[:self.FLOW_WINDOW]
+        head_up = np.zeros(head_prices.shape, dtype=bool)
+        head_up[1:] = head_prices[1:] / head_prices[:-1] - 1.0 > 0
+        acc_proxy.iloc[:len(head_prices)] = np.cumsum(np.where(head_up, head_volumes, -head_volumes), axis=0)
+
+        if fundamentals_daily and "opt_bias" in fundamentals_daily:
+            opt_bias = fundamentals_daily["opt_bias"]
+        else:
+            opt_bias = pd.DataFrame(50.0, index=prices.index, columns=prices.columns)
+
+        C = self.engine._score_capital_flow({
+            "vpt": dollar_flow.cumsum(),
+            "vol_break": self._window_signal("vol_break", s, e, self.FLOW_WINDOW - 1),
+            "acc_proxy": acc_proxy,
+            "opt_bias": opt_bias,
+        })
+
+        # --- Risk ---
+        if fundamentals_daily and "balance_strength" in fundamentals_daily:
+            balance_strength = fundamentals_daily["balance_strength"]
+        else:
+            balance_strength = pd.DataFrame(50.0, index=prices.index, columns=prices.columns)
+
+        R = self.engine._score_risk({
+            "vol_20": self._window_signal("vol_20", s, e, self.VOL_WINDOW),
+            "dd": self._window_signal("dd", s, e, lookback - 1),
+            "balance_strength": balance_strength,
+        })
+
+        return self.engine._combine_components(T, F, C, R, weights, prices)
@@ -16,11 +16,11 @@ import asyncio
 import smtplib
 from email.mime.text import MIMEText
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import pandas as pd
 
 from .fss_engine import get_fss_engine
-from .fss_data_pipeline import get_fss_data_pipeline, FSSDataRequest
+from .fss_data_pipeline import get_fss_data_pipeline, FSSDataRequest, FSSDataResult
 from .fss_universe import get_universe_manager
 from .fss_engine import get_safety_filter
 
@@ -68,64 +68,77 @@ class FSSLiveScanner:
     async def scan(
         self,
         tickers: List[str],
-        lookback_days: int = 252
+        lookback_days: int = 252,
+        on_partial: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
         """
         Run daily FSS scan.
         
+        Data is streamed in ticker batches (FSSDataPipeline.stream_fss_data) and
+        the tickers that have arrived are scored while the rest are still being
+        fetched. FSS is ranked cross-sectionally, so those scores are provisional;
+        the returned ranking is computed on the complete universe.
+        
         Args:
             tickers: List of stock symbols to scan
             lookback_days: Days of historical data to fetch
+            on_partial: Optional callback receiving the provisional ranking
+                ({"top_stocks", "scored", "total"}) after each batch is scored
             
         Returns:
             Dictionary with scan results
         """
         logger.info(f"Starting FSS scan for {len(tickers)} tickers")
         
-        # 1. Fetch latest data
+        # 1. Stream the latest data
+        regime_result = None
+        fss_today = pd.Series(dtype=float)
+        safety: Dict[str, Tuple[bool, str]] = {}
+        scored_tickers = 0
         async with self.data_pipeline:
             data_request = FSSDataRequest(
                 tickers=tickers,
                 lookback_days=lookback_days,
                 include_fundamentals=True
             )
-            data_result = await self.data_pipeline.fetch_fss_data(data_request)
+            async for data_result in self.data_pipeline.stream_fss_data(data_request):
+                complete = data_result.data_quality["complete"]
+                if not complete and len(data_result.prices.columns) == scored_tickers:
+                    continue  # Only fundamentals landed; rescore with the next prices batch
+                scored_tickers = len(data_result.prices.columns)
+                
+                # 2. Detect regime (the benchmark is in from the first result on)
+                if regime_result is None:
+                    regime_result = self.fss_engine.detect_market_regime(
+                        data_result.spy,
+                        data_result.vix
+                    )
+                    logger.info(f"Market regime: {regime_result.regime} (confidence: {regime_result.confidence:.2f})")
+                
+                # 3-4. Score every ticker that has arrived so far
+                fss_today = self._latest_fss(data_result)
+                
+                # 5. Safety filters are per ticker: check each one as its batch lands
+                for ticker in data_result.volumes.columns:
+                    if ticker not in safety:
+                        safety[ticker] = self.safety_filter.check_safety(
+                            ticker=ticker,
+                            volumes=data_result.volumes
+                        )
+                
+                if not complete:
+                    logger.info(f"FSS scan: scored {scored_tickers}/{len(tickers)} tickers")
+                    if on_partial is not None:
+                        provisional = self._qualify(fss_today, safety)
+                        top = sorted(provisional.items(), key=lambda item: item[1]["fss_score"], reverse=True)
+                        on_partial({
+                            "top_stocks": dict(top[:self.top_n]),
+                            "scored": scored_tickers,
+                            "total": len(tickers)
+                        })
         
-        # 2. Detect regime
-        regime_result = self.fss_engine.detect_market_regime(
-            data_result.spy,
-            data_result.vix
-        )
         regime = regime_result.regime
-        
-        logger.info(f"Market regime: {regime} (confidence: {regime_result.confidence:.2f})")
-        
-        # 3. Calculate FSS scores
-        fss_data = self.fss_engine.compute_fss_v3(
-            prices=data_result.prices,
-            volumes=data_result.volumes,
-            spy=data_result.spy,
-            vix=data_result.vix,
-            fundamentals_daily=data_result.fundamentals_daily
-        )
-        
-        # 4. Get latest scores
-        latest_date = fss_data.index[-1]
-        fss_today = fss_data["FSS"].loc[latest_date].dropna()
-        
-        # 5. Apply safety filters
-        qualified = {}
-        for ticker in fss_today.index:
-            if ticker in data_result.volumes.columns:
-                safety_passed, safety_reason = self.safety_filter.check_safety(
-                    ticker=ticker,
-                    volumes=data_result.volumes
-                )
-                if safety_passed:
-                    qualified[ticker] = {
-                        "fss_score": float(fss_today[ticker]),
-                        "safety_reason": safety_reason
-                    }
+        qualified = self._qualify(fss_today, safety)
         
         if not qualified:
             logger.warning("No stocks passed safety filters")
@@ -170,6 +183,34 @@ class FSSLiveScanner:
         
         return result
     
+    def _latest_fss(self, data_result: FSSDataResult) -> pd.Series:
+        """FSS on the latest date for every ticker in data_result"""
+        fss_data = self.fss_engine.compute_fss_v3(
+            prices=data_result.prices,
+            volumes=data_result.volumes,
+            spy=data_result.spy,
+            vix=data_result.vix,
+            fundamentals_daily=data_result.fundamentals_daily
+        )
+        latest_date = fss_data.index[-1]
+        return fss_data["FSS"].loc[latest_date].dropna()
+    
+    @staticmethod
+    def _qualify(
+        fss_today: pd.Series,
+        safety: Dict[str, Tuple[bool, str]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Scores of the tickers that passed their safety filters"""
+        qualified = {}
+        for ticker in fss_today.index:
+            safety_passed, safety_reason = safety.get(ticker, (False, ""))
+            if safety_passed:
+                qualified[ticker] = {
+                    "fss_score": float(fss_today[ticker]),
+                    "safety_reason": safety_reason
+                }
+        return qualified
+    
     def _load_prior_top(self) -> pd.DataFrame:
         """Load previous top stocks from file"""
         if os.path.exists(self.prior_top_file):
@@ -1,7 +1,24 @@
 """
 GraphQL DataLoaders: per-request loaders attached to context to avoid N+1.
-Use info.context.loaders.user_loader.load(id) in resolvers when available.
+Use info.context.loaders.user_loader.load(id) in resolvers when available;
+the view runs with DeferredExecutionContext so loads are batched per level.
 """
-from .context import get_loaders_for_context, create_loaders_for_request, GraphQLLoaders
+from .context import (
+    get_loaders_for_context,
+    get_loader,
+    load_related,
+    load_now,
+    create_loaders_for_request,
+    GraphQLLoaders,
+)
+from .execution import DeferredExecutionContext
 
-__all__ = ["get_loaders_for_context", "create_loaders_for_request", "GraphQLLoaders"]
+__all__ = [
+    "get_loaders_for_context",
+    "get_loader",
+    "load_related",
+    "load_now",
+    "create_loaders_for_request",
+    "GraphQLLoaders",
+    "DeferredExecutionContext",
+]
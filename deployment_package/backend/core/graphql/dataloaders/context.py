@@ -1,10 +1,24 @@
 """
 Attach DataLoaders to GraphQL context so resolvers can use the same
 per-request loaders (batch + cache) and avoid N+1.
+
+Per-request loaders run in deferred mode: load() queues the key and returns a
+Deferred, and DeferredExecutionContext dispatches one query per loader per
+level of the query.  The cache lives on the request's context, so it never
+outlives the request.
 """
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 from core.dataloaders import (
+    DataLoader,
+    batch_load_users,
+    batch_load_stocks,
+    batch_load_stocks_by_id,
+    batch_load_income_profiles,
+    batch_load_bank_accounts,
+    batch_load_portfolio_holdings,
+    batch_load_bank_transactions,
+    batch_load_raha_signals,
     get_user_loader,
     get_stock_loader,
     get_income_profile_loader,
@@ -18,7 +32,16 @@ class GraphQLLoaders:
     so resolvers use the same batch/cache for the duration of the request.
     """
 
-    __slots__ = ("user_loader", "stock_loader", "income_profile_loader", "bank_account_loader")
+    __slots__ = (
+        "user_loader",
+        "stock_loader",
+        "stock_by_id_loader",
+        "income_profile_loader",
+        "bank_account_loader",
+        "portfolio_holdings_loader",
+        "bank_transactions_loader",
+        "raha_signals_loader",
+    )
 
     def __init__(
         self,
@@ -26,11 +49,21 @@ class GraphQLLoaders:
         stock_loader=None,
         income_profile_loader=None,
         bank_account_loader=None,
+        stock_by_id_loader=None,
+        portfolio_holdings_loader=None,
+        bank_transactions_loader=None,
+        raha_signals_loader=None,
     ):
         self.user_loader = user_loader or get_user_loader()
         self.stock_loader = stock_loader or get_stock_loader()
         self.income_profile_loader = income_profile_loader or get_income_profile_loader()
         self.bank_account_loader = bank_account_loader or get_bank_account_loader()
+        self.stock_by_id_loader = stock_by_id_loader or DataLoader(batch_load_stocks_by_id)
+        self.portfolio_holdings_loader = portfolio_holdings_loader or DataLoader(batch_load_portfolio_holdings)
+        self.bank_transactions_loader = bank_transactions_loader or DataLoader(batch_load_bank_transactions)
+        self.raha_signals_loader = raha_signals_loader or DataLoader(
+            batch_load_raha_signals, cache_key_fn=lambda s: str(s).upper()
+        )
 
 
 def get_loaders_for_context(context: Any) -> Optional[GraphQLLoaders]:
@@ -43,14 +76,58 @@ def get_loaders_for_context(context: Any) -> Optional[GraphQLLoaders]:
     return getattr(context, "loaders", None)
 
 
+def get_loader(info: Any, name: str) -> Optional[DataLoader]:
+    """Return the named per-request loader for a resolver's info, or None."""
+    loaders = get_loaders_for_context(getattr(info, "context", None))
+    loader = getattr(loaders, name, None) if loaders is not None else None
+    return loader if isinstance(loader, DataLoader) else None
+
+
+def load_now(info: Any, loader_name: str, batch_load_fn, keys: List) -> List:
+    """
+    Load values immediately for code that cannot return a Deferred.
+
+    Goes through the request's loader when one is attached, so repeated calls
+    within a request share its cache; otherwise runs batch_load_fn once.
+    """
+    keys = list(keys)
+    if not keys:
+        return []
+    loader = get_loader(info, loader_name)
+    if loader is None:
+        return list(batch_load_fn(keys))
+    return loader.load_many_now(keys)
+
+
+def load_related(info: Any, instance: Any, field_name: str, loader_name: str):
+    """
+    Resolve a foreign key on a model instance through the request's loader.
+
+    Falls back to plain attribute access when no loader is attached or the
+    related object is already cached on the instance (select_related).
+    """
+    descriptor = getattr(type(instance), field_name, None)
+    loader = get_loader(info, loader_name)
+    if loader is None or not hasattr(descriptor, "is_cached") or descriptor.is_cached(instance):
+        return getattr(instance, field_name)
+    key = getattr(instance, f"{field_name}_id", None)
+    return loader.load(key) if key is not None else None
+
+
 def create_loaders_for_request() -> GraphQLLoaders:
     """
-    Create a GraphQLLoaders instance for a request (uses shared get_*_loader singletons).
-    Attach to context so resolvers use context.loaders.user_loader.load(id) etc.
+    Create a fresh GraphQLLoaders instance for a request (deferred batching,
+    request-scoped cache). Attach to context so resolvers use
+    context.loaders.user_loader.load(id) etc.
     """
+    upper = lambda s: str(s).upper()  # noqa: E731
     return GraphQLLoaders(
-        user_loader=get_user_loader(),
-        stock_loader=get_stock_loader(),
-        income_profile_loader=get_income_profile_loader(),
-        bank_account_loader=get_bank_account_loader(),
+        user_loader=DataLoader(batch_load_users, deferred=True),
+        stock_loader=DataLoader(batch_load_stocks, cache_key_fn=upper, deferred=True),
+        stock_by_id_loader=DataLoader(batch_load_stocks_by_id, deferred=True),
+        income_profile_loader=DataLoader(batch_load_income_profiles, deferred=True),
+        bank_account_loader=DataLoader(batch_load_bank_accounts, deferred=True),
+        portfolio_holdings_loader=DataLoader(batch_load_portfolio_holdings, deferred=True),
+        bank_transactions_loader=DataLoader(batch_load_bank_transactions, deferred=True),
+        raha_signals_loader=DataLoader(batch_load_raha_signals, cache_key_fn=upper, deferred=True),
     )
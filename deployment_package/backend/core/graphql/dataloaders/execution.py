@@ -0,0 +1,107 @@
+"""
+Execution context that lets resolvers return DataLoader Deferreds.
+
+graphql-core 3 only understands plain values and awaitables, so with the sync
+Django view every loader.load() would have to hit the database on its own.
+DeferredExecutionContext lets the executor walk the whole query first (all
+sibling resolvers queue their keys), then dispatches one batch per loader,
+completes the fields waiting on it, and repeats for the next level.
+"""
+from functools import partial
+from typing import Any, Dict
+
+from graphql import ExecutionContext, GraphQLError, located_error
+from graphql.execution.execute import get_field_def
+from graphql.pyutils import Path, Undefined
+from graphql.type import is_non_null_type
+
+from core.dataloaders import Deferred, discard_pending, dispatch_pending
+
+
+class DeferredExecutionContext(ExecutionContext):
+    """ExecutionContext that resolves core.dataloaders.Deferred field results."""
+
+    def execute_operation(self, operation, root_value):
+        try:
+            result = super().execute_operation(operation, root_value)
+            return self._settle(result)
+        finally:
+            discard_pending()
+
+    def execute_fields_serially(self, parent_type, source_value, path, fields):
+        # Mutations: each root field must finish (including its batches)
+        # before the next one starts.
+        results: Dict[str, Any] = {}
+        for response_name, field_nodes in fields.items():
+            field_path = Path(path, response_name, parent_type.name)
+            result = self.execute_field(parent_type, source_value, field_nodes, field_path)
+            if result is Undefined:
+                continue
+            results[response_name] = self._settle(result)
+        return results
+
+    def execute_fields(self, parent_type, source_value, path, fields):
+        results = super().execute_fields(parent_type, source_value, path, fields)
+        if isinstance(results, dict) and any(isinstance(v, Deferred) for v in results.values()):
+            return Deferred.gather(results)
+        return results
+
+    def execute_field(self, parent_type, source, field_nodes, path):
+        result = super().execute_field(parent_type, source, field_nodes, path)
+        if isinstance(result, Deferred):
+            return_type = get_field_def(self.schema, parent_type, field_nodes[0]).type
+            return result.then(None, partial(self._field_error, field_nodes, return_type, path))
+        return result
+
+    def complete_value(self, return_type, field_nodes, info, path, result):
+        if isinstance(result, Deferred):
+            return result.then(partial(self.complete_value, return_type, field_nodes, info, path))
+
+        if is_non_null_type(return_type) and not isinstance(result, Exception):
+            completed = self.complete_value(return_type.of_type, field_nodes, info, path, result)
+            if isinstance(completed, Deferred):
+                return completed.then(partial(self._ensure_non_null, info))
+            return self._ensure_non_null(info, completed)
+
+        return super().complete_value(return_type, field_nodes, info, path, result)
+
+    def complete_list_value(self, return_type, field_nodes, info, path, result):
+        completed = super().complete_list_value(return_type, field_nodes, info, path, result)
+        if not isinstance(completed, list):
+            return completed
+
+        deferred_items = False
+        for index, item in enumerate(completed):
+            if isinstance(item, Deferred):
+                deferred_items = True
+                completed[index] = item.then(
+                    None,
+                    partial(self._field_error, field_nodes, return_type.of_type, path.add_key(index, None)),
+                )
+        return Deferred.gather(completed) if deferred_items else completed
+
+    # ------------------------------------------------------------------
+
+    def _settle(self, result):
+        """Dispatch queued batches until result (and everything below it) is resolved."""
+        if not isinstance(result, Deferred):
+            return result
+        while result.is_pending and dispatch_pending():
+            pass
+        if result.is_pending:
+            raise GraphQLError("DataLoader result was never resolved.")
+        return result.value
+
+    def _field_error(self, field_nodes, return_type, path, raw_error):
+        error = located_error(raw_error, field_nodes, path.as_list())
+        self.handle_field_error(error, return_type, path)
+        return None
+
+    @staticmethod
+    def _ensure_non_null(info, completed):
+        if completed is None:
+            raise TypeError(
+                "Cannot return null for non-nullable field"
+                f" {info.parent_type.name}.{info.field_name}."
+            )
+        return completed
@@ -0,0 +1,133 @@
+"""
+Vectorized Black-Scholes pricing and implied-volatility solver.
+
+Solves IV for a whole option chain at once: every contract runs a
+safeguarded Newton-Raphson step inside a shrinking [lo, hi] bracket and falls
+back to bisection whenever Newton would leave the bracket or vega vanishes.
+Contracts that do not converge (e.g. quotes outside no-arbitrage bounds) are
+flagged rather than silently clamped.
+"""
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.special import ndtr
+
+logger = logging.getLogger(__name__)
+
+SIGMA_LOW = 0.01
+SIGMA_HIGH = 5.0
+SIGMA_START = 0.30
+PRICE_TOLERANCE = 1e-4
+MAX_ITERATIONS = 100
+_MIN_VEGA = 1e-8
+_SQRT_2PI = np.sqrt(2 * np.pi)
+
+
+@dataclass
+class ImpliedVolResult:
+    """Per-contract solver output (arrays aligned with the inputs)"""
+    iv: np.ndarray
+    converged: np.ndarray
+    iterations: int
+
+
+def black_scholes_price_vega(spot, strikes, ttm_years, rate, sigma, is_call):
+    """
+    Black-Scholes prices and raw vega (per 1.00 of vol) for arrays of contracts.
+
+    Args:
+        spot: Underlying price (scalar or array)
+        strikes: Strike prices
+        ttm_years: Time to expiration in years (> 0)
+        rate: Risk-free rate
+        sigma: Volatilities (> 0)
+        is_call: True for calls, False for puts
+
+    Returns:
+        (prices, vegas) arrays
+    """
+    sqrt_t = np.sqrt(ttm_years)
+    d1 = (np.log(spot / strikes) + (rate + 0.5 * sigma ** 2) * ttm_years) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    discounted_strike = strikes * np.exp(-rate * ttm_years)
+    call = spot * ndtr(d1) - discounted_strike * ndtr(d2)
+    put = discounted_strike * ndtr(-d2) - spot * ndtr(-d1)
+    vega = spot * np.exp(-0.5 * d1 ** 2) / _SQRT_2PI * sqrt_t
+    return np.where(is_call, call, put), vega
+
+
+def implied_volatility(
+    prices,
+    spot,
+    strikes,
+    ttm_years,
+    rate: float,
+    is_call,
+    tolerance: float = PRICE_TOLERANCE,
+    max_iterations: int = MAX_ITERATIONS,
+) -> ImpliedVolResult:
+    """
+    Solve Black-Scholes implied volatility for many contracts at once.
+
+    Args:
+        prices: Observed option prices
+        spot: Underlying price (scalar or array)
+        strikes: Strike prices
+        ttm_years: Time to expiration in years
+        rate: Risk-free rate
+        is_call: True for calls, False for puts
+        tolerance: Absolute price error accepted as converged
+        max_iterations: Iteration cap shared by all contracts
+
+    Returns:
+        ImpliedVolResult; non-converged contracts carry the solver's last
+        estimate with converged=False
+    """
+    prices, spot, strikes, ttm_years, is_call = np.broadcast_arrays(
+        np.asarray(prices, dtype=float),
+        np.asarray(spot, dtype=float),
+        np.asarray(strikes, dtype=float),
+        np.asarray(ttm_years, dtype=float),
+        np.asarray(is_call, dtype=bool),
+    )
+    shape = prices.shape
+    sigma = np.full(shape, SIGMA_START)
+    lo = np.full(shape, SIGMA_LOW)
+    hi = np.full(shape, SIGMA_HIGH)
+    converged = np.zeros(shape, dtype=bool)
+    active = (prices > 0) & (spot > 0) & (strikes > 0) & (ttm_years > 0)
+
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        s, k, t, c, target = spot.flat[idx], strikes.flat[idx], ttm_years.flat[idx], is_call.flat[idx], prices.flat[idx]
+        sig = sigma.flat[idx]
+        model, vega = black_scholes_price_vega(s, k, t, rate, sig, c)
+        diff = model - target
+
+        done = np.abs(diff) < tolerance
+        converged.flat[idx[done]] = True
+
+        # Price is increasing in sigma, so the sign of diff tightens the bracket
+        lo_i = np.where(diff < 0, sig, lo.flat[idx])
+        hi_i = np.where(diff > 0, sig, hi.flat[idx])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = sig - diff / vega
+        use_newton = (vega > _MIN_VEGA) & (newton > lo_i) & (newton < hi_i)
+        step = np.where(use_newton, newton, 0.5 * (lo_i + hi_i))
+
+        pending = ~done
+        lo.flat[idx] = lo_i
+        hi.flat[idx] = hi_i
+        sigma.flat[idx[pending]] = step[pending]
+        # A collapsed bracket cannot improve further
+        stuck = pending & (hi_i - lo_i < 1e-10)
+        active.flat[idx[done | stuck]] = False
+
+    if (~converged).any():
+        logger.debug(f"IV solver: {int((~converged).sum())}/{converged.size} contracts did not converge")
+    return ImpliedVolResult(iv=sigma, converged=converged, iterations=iterations)
@@ -0,0 +1,498 @@
+"""
+Shared technical-indicator kernels.
+
+Batch kernels take 1-D ``(bars,)`` or 2-D ``(bars, symbols)`` arrays. They
+compute along axis 0 and return arrays of the input's shape, with NaN during
+warm-up. Recursive smoothers run as C-level linear filters and rolling
+windows use cumulative sums. No kernel loops over bars in Python, except the
+EMA's gap-handling path.
+
+The streaming updaters (``EMAState``, ``RSIState``, ...) keep O(1) state per
+symbol. Bar by bar they reproduce the batch kernels. Each update takes one
+bar as a scalar or as a ``(symbols,)`` vector.
+
+Smoothing methods (``method=``):
+
+- ``'sma'``: simple rolling mean over ``period`` values
+- ``'ema'``: pandas ``ewm(span=period, adjust=False)``, seeded with the first observation
+- ``'wilder'``: the same recursion with alpha = 1 / period
+- ``'wilder_sum'``: Wilder's running total, S_t = S_{t-1} - S_{t-1} / period + x_t
+  (batch only)
+"""
+from collections import deque
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from scipy.signal import lfilter
+
+ArrayLike = Union[np.ndarray, float]
+
+SMOOTHING_METHODS = ('sma', 'ema', 'wilder', 'wilder_sum')
+
+
+# --------------------------------------------------------------------------- #
+# Batch kernels                                                               #
+# --------------------------------------------------------------------------- #
+
+def _as_float(x) -> np.ndarray:
+    return np.asarray(x, dtype=float)
+
+
+def _alpha(span: Optional[float], alpha: Optional[float]) -> float:
+    if (span is None) == (alpha is None):
+        raise ValueError("Pass exactly one of span or alpha")
+    a = 2.0 / (span + 1.0) if alpha is None else float(alpha)
+    if not 0.0 < a <= 1.0:
+        raise ValueError(f"EMA alpha must be in (0, 1], got {a}")
+    return a
+
+
+def shift(x, periods: int = 1) -> np.ndarray:
+    """``Series.shift(periods)`` along axis 0 for periods >= 1"""
+    x = _as_float(x)
+    out = np.full(x.shape, np.nan)
+    if periods < len(x):
+        out[periods:] = x[:len(x) - periods]
+    return out
+
+
+def ema(x, span: Optional[float] = None, alpha: Optional[float] = None) -> np.ndarray:
+    """
+    Exponential moving average, identical to ``ewm(adjust=False).mean()``.
+
+    Leading NaNs stay NaN. A NaN after the first observation carries the
+    previous value forward, and the gap discounts the old weight exactly as
+    pandas does.
+    """
+    x = _as_float(x)
+    a = _alpha(span, alpha)
+    if x.ndim == 1:
+        return _ema_columns(x[:, None], a)[:, 0]
+    return _ema_columns(x.reshape(len(x), -1), a).reshape(x.shape)
+
+
+def _ema_columns(x: np.ndarray, a: float) -> np.ndarray:
+    n, m = x.shape
+    out = np.full((n, m), np.nan)
+    if n == 0:
+        return out
+    missing = np.isnan(x)
+    dense = ~missing.any(axis=0)
+    if dense.any():
+        out[:, dense] = _ema_filter(x[:, dense], a)
+    for j in np.flatnonzero(~dense):
+        col = x[:, j]
+        observed = np.flatnonzero(~missing[:, j])
+        if observed.size == 0:
+            continue
+        first = observed[0]
+        if observed.size == n - first:
+            # Only leading NaNs: filter from the first observation
+            out[first:, j] = _ema_filter(col[first:, None], a)[:, 0]
+        else:
+            out[:, j] = _ema_recurrence(col, a)
+    return out
+
+
+def _ema_filter(x: np.ndarray, a: float) -> np.ndarray:
+    """y_t = (1 - a) y_{t-1} + a x_t with y_0 = x_0, for gap-free columns"""
+    out = np.empty_like(x)
+    out[0] = x[0]
+    if len(x) > 1:
+        out[1:], _ = lfilter([a], [1.0, a - 1.0], x[1:], axis=0, zi=((1.0 - a) * x[0])[None, :])
+    return out
+
+
+def _ema_recurrence(x: np.ndarray, a: float) -> np.ndarray:
+    """pandas' adjust=False / ignore_na=False EWM recursion for a column with gaps"""
+    out = np.empty_like(x)
+    weighted, old_wt = np.nan, 1.0
+    for i, cur in enumerate(x):
+        observed = cur == cur
+        if weighted == weighted:
+            old_wt *= 1.0 - a
+            if observed:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + a * cur) / (old_wt + a)
+                old_wt = 1.0
+        elif observed:
+            weighted = cur
+        out[i] = weighted
+    return out
+
+
+def rolling_sum(x, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """``rolling(window, min_periods).sum()``: NaNs are skipped, NaN below min_periods"""
+    total, count = _rolling_totals(_as_float(x), window)
+    needed = window if min_periods is None else max(min_periods, 1)
+    return np.where(count >= needed, total, np.nan)
+
+
+def sma(x, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """``rolling(window, min_periods).mean()``: NaNs are skipped, NaN below min_periods"""
+    total, count = _rolling_totals(_as_float(x), window)
+    needed = window if min_periods is None else max(min_periods, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(count >= needed, total / count, np.nan)
+
+
+def _rolling_totals(x: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    if window < 1:
+        raise ValueError(f"window must be >= 1, got {window}")
+    valid = ~np.isnan(x)
+    total = np.cumsum(np.where(valid, x, 0.0), axis=0)
+    count = np.cumsum(valid, axis=0)
+    if window < len(x):
+        total[window:] = total[window:] - total[:-window]
+        count[window:] = count[window:] - count[:-window]
+    return total, count
+
+
+def wilder_sum(x, period: int, seed: str = 'sum') -> np.ndarray:
+    """
+    Wilder's running-total smoothing, S_t = S_{t-1} - S_{t-1} / period + x_t.
+
+    The first value sits at index ``period - 1``. It is the sum of the first
+    ``period`` inputs (``seed='sum'``, as Wilder defines it) or their mean
+    (``seed='mean'``, which the legacy TechnicalAnalysisService ADX uses).
+    Inputs must be NaN-free.
+    """
+    x = _as_float(x)
+    out = np.full(x.shape, np.nan)
+    if len(x) < period:
+        return out
+    start = x[:period].sum(axis=0) if seed == 'sum' else x[:period].mean(axis=0)
+    out[period - 1] = start
+    if len(x) > period:
+        decay = 1.0 - 1.0 / period
+        out[period:], _ = lfilter([1.0], [1.0, -decay], x[period:], axis=0, zi=np.expand_dims(decay * start, 0))
+    return out
+
+
+def smooth(x, period: int, method: str = 'ema', min_periods: Optional[int] = None) -> np.ndarray:
+    """Dispatch to the smoothing method named in the module docstring"""
+    if method == 'sma':
+        return sma(x, period, min_periods)
+    if method == 'ema':
+        return ema(x, span=period)
+    if method == 'wilder':
+        return ema(x, alpha=1.0 / period)
+    if method == 'wilder_sum':
+        return wilder_sum(x, period)
+    raise ValueError(f"Unknown smoothing method {method!r}; expected one of {SMOOTHING_METHODS}")
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """Wilder's true range. The first bar has no previous close, so it is high - low."""
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    prev_close = shift(close, 1)
+    return np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+
+
+def directional_movement(high, low) -> Tuple[np.ndarray, np.ndarray]:
+    """(+DM, -DM) per bar; 0 on the first bar and whenever the move does not qualify"""
+    high, low = _as_float(high), _as_float(low)
+    up_move = high - shift(high, 1)
+    down_move = shift(low, 1) - low
+    with np.errstate(invalid='ignore'):
+        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+    return plus_dm, minus_dm
+
+
+def rsi(close, period: int = 14, method: str = 'sma') -> np.ndarray:
+    """
+    Relative Strength Index.
+
+    100 when the average loss is zero; NaN until ``period`` price changes
+    are available (for 'sma').
+    """
+    close = _as_float(close)
+    delta = close - shift(close, 1)
+    with np.errstate(invalid='ignore'):
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = np.where(delta < 0, -delta, 0.0)
+    first_change = np.isnan(delta)
+    gain[first_change] = np.nan
+    loss[first_change] = np.nan
+    avg_gain = smooth(gain, period, method)
+    avg_loss = smooth(loss, period, method)
+    return _rsi_from_averages(avg_gain, avg_loss)
+
+
+def _rsi_from_averages(avg_gain, avg_loss):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+    return np.where(np.isnan(avg_gain) | np.isnan(avg_loss), np.nan, value)
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(MACD line, signal line, histogram) from span-based EMAs"""
+    close = _as_float(close)
+    line = ema(close, span=fast) - ema(close, span=slow)
+    signal_line = ema(line, span=signal)
+    return line, signal_line, line - signal_line
+
+
+def atr(high, low, close, period: int = 14, method: str = 'sma', min_periods: Optional[int] = None) -> np.ndarray:
+    """Average true range"""
+    return smooth(true_range(high, low, close), period, method, min_periods)
+
+
+def directional_index(
+    high, low, close, period: int = 14, method: str = 'ema'
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (+DI, -DI, DX) with +DM, -DM and TR smoothed by ``method``.
+
+    Undefined ratios, where the smoothed TR or the DI sum is zero, are NaN.
+    """
+    plus_dm, minus_dm = directional_movement(high, low)
+    tr_s = smooth(true_range(high, low, close), period, method)
+    tr_s = np.where(tr_s == 0, np.nan, tr_s)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus_di = 100.0 * smooth(plus_dm, period, method) / tr_s
+        minus_di = 100.0 * smooth(minus_dm, period, method) / tr_s
+        di_sum = plus_di + minus_di
+        dx = 100.0 * np.abs(plus_di - minus_di) / np.where(di_sum == 0, np.nan, di_sum)
+    return plus_di, minus_di, dx
+
+
+def adx(high, low, close, period: int = 14, method: str = 'ema') -> np.ndarray:
+    """Average directional index (DX smoothed with the same method)"""
+    _, _, dx = directional_index(high, low, close, period, method)
+    return smooth(dx, period, method)
+
+
+def vwap(high, low, close, volume, window: Optional[int] = None) -> np.ndarray:
+    """
+    Typical-price VWAP: cumulative from the first bar, or over the trailing
+    ``window`` bars. NaN where the traded volume is zero.
+    """
+    high, low, close, volume = _as_float(high), _as_float(low), _as_float(close), _as_float(volume)
+    typical = (high + low + close) / 3.0
+    pv = np.where(np.isnan(typical * volume), 0.0, typical * volume)
+    vol = np.where(np.isnan(volume), 0.0, volume)
+    if window is None:
+        pv_total, vol_total = np.cumsum(pv, axis=0), np.cumsum(vol, axis=0)
+    else:
+        pv_total, vol_total = rolling_sum(pv, window, 1), rolling_sum(vol, window, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(vol_total != 0, pv_total / vol_total, np.nan)
+
+
+# --------------------------------------------------------------------------- #
+# Streaming updaters                                                          #
+# --------------------------------------------------------------------------- #
+
+def _result(value: np.ndarray, scalar: bool) -> ArrayLike:
+    return float(value[0]) if scalar else value
+
+
+class EMAState:
+    """Bar-by-bar ``ema``, including its NaN/gap semantics"""
+
+    def __init__(self, span: Optional[float] = None, alpha: Optional[float] = None):
+        self.alpha = _alpha(span, alpha)
+        self._weighted: Optional[np.ndarray] = None
+        self._old_wt: Optional[np.ndarray] = None
+
+    @property
+    def value(self) -> Optional[np.ndarray]:
+        return self._weighted
+
+    def update(self, x: ArrayLike) -> ArrayLike:
+        scalar = np.ndim(x) == 0
+        x = np.atleast_1d(_as_float(x))
+        if self._weighted is None:
+            self._weighted = np.full(x.shape, np.nan)
+            self._old_wt = np.ones(x.shape)
+        a = self.alpha
+        observed = ~np.isnan(x)
+        started = ~np.isnan(self._weighted)
+
+        self._old_wt = np.where(started, self._old_wt * (1.0 - a), self._old_wt)
+        blend = started & observed & (self._weighted != x)
+        with np.errstate(invalid='ignore'):
+            blended = (self._old_wt * self._weighted + a * x) / (self._old_wt + a)
+        self._weighted = np.where(blend, blended, np.where(~started & observed, x, self._weighted))
+        self._old_wt = np.where(started & observed, 1.0, self._old_wt)
+        return _result(self._weighted.copy(), scalar)
+
+
+class RollingMeanState:
+    """Bar-by-bar ``sma`` with running totals over a ring buffer"""
+
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        if window < 1:
+            raise ValueError(f"window must be >= 1, got {window}")
+        self.window = window
+        self.min_periods = window if min_periods is None else max(min_periods, 1)
+        self._buffer: deque = deque()
+        self._total: Optional[np.ndarray] = None
+        self._count: Optional[np.ndarray] = None
+
+    def update(self, x: ArrayLike) -> ArrayLike:
+        scalar = np.ndim(x) == 0
+        x = np.atleast_1d(_as_float(x))
+        if self._total is None:
+            self._total = np.zeros(x.shape)
+            self._count = np.zeros(x.shape, dtype=int)
+        valid = ~np.isnan(x)
+        entry = np.where(valid, x, 0.0)
+        self._buffer.append((entry, valid))
+        self._total = self._total + entry
+        self._count = self._count + valid
+        if len(self._buffer) > self.window:
+            old_entry, old_valid = self._buffer.popleft()
+            self._total = self._total - old_entry
+            self._count = self._count - old_valid
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(self._count >= self.min_periods, self._total / self._count, np.nan)
+        return _result(mean, scalar)
+
+
+class RollingSumState(RollingMeanState):
+    """Bar-by-bar ``rolling_sum`` (NaNs count as zero once any value is present)"""
+
+    def __init__(self, window: int, min_periods: Optional[int] = 1):
+        super().__init__(window, min_periods)
+
+    def update(self, x: ArrayLike) -> ArrayLike:
+        scalar = np.ndim(x) == 0
+        super().update(x)
+        total = np.where(self._count >= self.min_periods, self._total, np.nan)
+        return _result(total, scalar)
+
+
+def make_smoother(period: int, method: str = 'ema', min_periods: Optional[int] = None):
+    """Streaming counterpart of ``smooth``"""
+    if method == 'sma':
+        return RollingMeanState(period, min_periods)
+    if method == 'ema':
+        return EMAState(span=period)
+    if method == 'wilder':
+        return EMAState(alpha=1.0 / period)
+    raise ValueError(f"No streaming smoother for method {method!r}")
+
+
+class RSIState:
+    """Bar-by-bar ``rsi``"""
+
+    def __init__(self, period: int = 14, method: str = 'sma'):
+        self._gain = make_smoother(period, method)
+        self._loss = make_smoother(period, method)
+        self._prev: Optional[np.ndarray] = None
+
+    def update(self, close: ArrayLike) -> ArrayLike:
+        scalar = np.ndim(close) == 0
+        close = np.atleast_1d(_as_float(close))
+        delta = close - self._prev if self._prev is not None else np.full(close.shape, np.nan)
+        self._prev = close
+        with np.errstate(invalid='ignore'):
+            gain = np.where(np.isnan(delta), np.nan, np.where(delta > 0, delta, 0.0))
+            loss = np.where(np.isnan(delta), np.nan, np.where(delta < 0, -delta, 0.0))
+        value = _rsi_from_averages(self._gain.update(gain), self._loss.update(loss))
+        return _result(value, scalar)
+
+
+class MACDState:
+    """Bar-by-bar ``macd``: returns (line, signal, histogram)"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast = EMAState(span=fast)
+        self._slow = EMAState(span=slow)
+        self._signal = EMAState(span=signal)
+
+    def update(self, close: ArrayLike) -> Tuple[ArrayLike, ArrayLike, ArrayLike]:
+        scalar = np.ndim(close) == 0
+        close = np.atleast_1d(_as_float(close))
+        line = self._fast.update(close) - self._slow.update(close)
+        signal_line = self._signal.update(line)
+        return _result(line, scalar), _result(signal_line, scalar), _result(line - signal_line, scalar)
+
+
+class _TrueRangeState:
+    def __init__(self):
+        self._prev_close: Optional[np.ndarray] = None
+
+    def update(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        prev = self._prev_close if self._prev_close is not None else np.full(close.shape, np.nan)
+        self._prev_close = close
+        return np.fmax(np.fmax(high - low, np.abs(high - prev)), np.abs(low - prev))
+
+
+class ATRState:
+    """Bar-by-bar ``atr``"""
+
+    def __init__(self, period: int = 14, method: str = 'sma', min_periods: Optional[int] = None):
+        self._tr = _TrueRangeState()
+        self._smoother = make_smoother(period, method, min_periods)
+
+    def update(self, high: ArrayLike, low: ArrayLike, close: ArrayLike) -> ArrayLike:
+        scalar = np.ndim(close) == 0
+        high, low, close = (np.atleast_1d(_as_float(v)) for v in (high, low, close))
+        return _result(self._smoother.update(self._tr.update(high, low, close)), scalar)
+
+
+class ADXState:
+    """Bar-by-bar ``adx`` (methods 'ema' and 'wilder')"""
+
+    def __init__(self, period: int = 14, method: str = 'ema'):
+        self._tr = _TrueRangeState()
+        self._tr_s = make_smoother(period, method)
+        self._plus = make_smoother(period, method)
+        self._minus = make_smoother(period, method)
+        self._dx = make_smoother(period, method)
+        self._prev_high: Optional[np.ndarray] = None
+        self._prev_low: Optional[np.ndarray] = None
+
+    def update(self, high: ArrayLike, low: ArrayLike, close: ArrayLike) -> ArrayLike:
+        scalar = np.ndim(close) == 0
+        high, low, close = (np.atleast_1d(_as_float(v)) for v in (high, low, close))
+        if self._prev_high is None:
+            plus_dm = minus_dm = np.zeros(high.shape)
+        else:
+            up_move, down_move = high - self._prev_high, self._prev_low - low
+            with np.errstate(invalid='ignore'):
+                plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+                minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+        self._prev_high, self._prev_low = high, low
+
+        tr_s = self._tr_s.update(self._tr.update(high, low, close))
+        tr_s = np.where(tr_s == 0, np.nan, tr_s)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            plus_di = 100.0 * self._plus.update(plus_dm) / tr_s
+            minus_di = 100.0 * self._minus.update(minus_dm) / tr_s
+            di_sum = plus_di + minus_di
+            dx = 100.0 * np.abs(plus_di - minus_di) / np.where(di_sum == 0, np.nan, di_sum)
+        return _result(self._dx.update(dx), scalar)
+
+
+class VWAPState:
+    """Bar-by-bar ``vwap``; call ``reset()`` at the start of each session"""
+
+    def __init__(self, window: Optional[int] = None):
+        self.window = window
+        self.reset()
+
+    def reset(self) -> None:
+        self._pv = RollingSumState(self.window) if self.window else None
+        self._vol = RollingSumState(self.window) if self.window else None
+        self._pv_total: Optional[np.ndarray] = None
+        self._vol_total: Optional[np.ndarray] = None
+
+    def update(self, high: ArrayLike, low: ArrayLike, close: ArrayLike, volume: ArrayLike) -> ArrayLike:
+        scalar = np.ndim(close) == 0
+        high, low, close, volume = (np.atleast_1d(_as_float(v)) for v in (high, low, close, volume))
+        pv = (high + low + close) / 3.0 * volume
+        pv = np.where(np.isnan(pv), 0.0, pv)
+        vol = np.where(np.isnan(volume), 0.0, volume)
+        if self.window:
+            pv_total, vol_total = self._pv.update(pv), self._vol.update(vol)
+        else:
+            self._pv_total = pv if self._pv_total is None else self._pv_total + pv
+            self._vol_total = vol if self._vol_total is None else self._vol_total + vol
+            pv_total, vol_total = self._pv_total, self._vol_total
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return _result(np.where(vol_total != 0, pv_total / vol_total, np.nan), scalar)
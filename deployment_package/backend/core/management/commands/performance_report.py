@@ -60,6 +60,14 @@ class Command(BaseCommand):
                 self.stdout.write(f"  Cache Hit Rate: {metric['cache_hit_rate']}%")
                 self.stdout.write(f"  Avg DB Queries: {metric['avg_db_queries']}")
         
+        # Rate limiting (this process)
+        if summary['rate_limits']:
+            self.stdout.write(self.style.SUCCESS('\nRate Limits:'))
+            self.stdout.write('-' * 80)
+            for route, counts in sorted(summary['rate_limits'].items()):
+                outcomes = ', '.join(f"{outcome}={count}" for outcome, count in sorted(counts.items()))
+                self.stdout.write(f"  {route}: {outcomes}")
+        
         # Export if requested
         if options['export']:
             json_data = monitor.export_metrics(options['export'])
@@ -29,6 +29,11 @@ class Command(BaseCommand):
             default=None,
             help='Sync for specific user ID only'
         )
+        parser.add_argument(
+            '--refresh-aggregates',
+            action='store_true',
+            help='Also refresh the weekly spending aggregate table from transactions already stored'
+        )
 
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('🔄 Syncing Bank Transactions for ML Training'))
@@ -78,6 +83,16 @@ class Command(BaseCommand):
             
             self.stdout.write(self.style.SUCCESS(f'\n✅ Queued {total_synced} transaction syncs'))
             self.stdout.write('⏳ Transactions are syncing in background. Check back in a few minutes.')
+            
+            if options['refresh_aggregates']:
+                from core.spending_trend_predictor import refresh_weekly_spending
+                
+                stats = refresh_weekly_spending()
+                self.stdout.write(
+                    f'🧮 Refreshed weekly spending aggregates: {stats.weeks_refreshed} weeks, '
+                    f'{stats.transactions} transactions, {stats.rows_written} rows'
+                )
+                self.stdout.write('   Weeks touched by the queued syncs are picked up by the next refresh or training run.')
             self.stdout.write('\n💡 To check transaction count:')
             self.stdout.write('   python manage.py shell')
             self.stdout.write('   >>> from core.banking_models import BankTransaction')
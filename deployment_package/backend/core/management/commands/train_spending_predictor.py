@@ -25,6 +25,11 @@ class Command(BaseCommand):
             default=1000,
             help='Minimum number of transactions required (default: 1000)'
         )
+        parser.add_argument(
+            '--full-rebuild',
+            action='store_true',
+            help='Rebuild every week of the spending aggregate table instead of only new/changed weeks'
+        )
 
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('🚀 Training Spending-Based Predictive Model'))
@@ -38,13 +43,20 @@ class Command(BaseCommand):
         asyncio.set_event_loop(loop)
         
         try:
-            from core.spending_trend_predictor import spending_predictor
+            from core.spending_trend_predictor import refresh_weekly_spending, spending_predictor
+            
+            self.stdout.write('🧮 Refreshing weekly spending aggregates...')
+            stats = refresh_weekly_spending(full=options['full_rebuild'])
+            self.stdout.write(
+                f'   {"Full rebuild" if stats.full_rebuild else "Incremental"}: '
+                f'{stats.weeks_refreshed} weeks, {stats.transactions} transactions, {stats.rows_written} rows'
+            )
             
             self.stdout.write(f'📊 Using {lookback_months} months of historical data')
             self.stdout.write('Training baseline XGBoost model with spending features only...')
             
             results = loop.run_until_complete(
-                spending_predictor.train_baseline_model(lookback_months)
+                spending_predictor.train_baseline_model(lookback_months, min_transactions=min_transactions)
             )
             
             if 'error' in results:
@@ -22,6 +22,12 @@ from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Symbols per Polygon snapshot request in get_stock_quotes
+QUOTE_BATCH_SIZE = 250
+
+# Per-symbol fallback quote requests in flight at once
+QUOTE_CONCURRENCY = 10
+
 
 class DataProvider(Enum):
     """Supported data providers"""
@@ -97,6 +103,10 @@ class MarketDataAPIService:
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the shared aiohttp session, if one is open."""
         if self.session is not None:
             await self.session.close()
             self.session = None
@@ -183,6 +193,15 @@ class MarketDataAPIService:
         api_key.request_count += 1
         return True
 
+    def _ensure_session(self) -> None:
+        """Create the shared aiohttp session if needed."""
+        if self.session is None:
+            # Use production-safe SSL context
+            from core.security_utils import get_ssl_context
+            ssl_context = get_ssl_context()
+            connector = aiohttp.TCPConnector(ssl=ssl_context)
+            self.session = aiohttp.ClientSession(connector=connector)
+
     def _get_cache_key(self, provider: str, symbol: str, data_type: str) -> str:
         """
         Generate a cache key. Currently uses provider/symbol/data_type + hour,
@@ -216,14 +235,7 @@ class MarketDataAPIService:
             Stock quote data or None if error.
         """
         try:
-            # Ensure we have an aiohttp session
-            if self.session is None:
-                ssl_context = ssl.create_default_context()
-                # Use production-safe SSL context
-                from core.security_utils import get_ssl_context
-                ssl_context = get_ssl_context()
-                connector = aiohttp.TCPConnector(ssl=ssl_context)
-                self.session = aiohttp.ClientSession(connector=connector)
+            self._ensure_session()
 
             # Cache check
             cache_key = self._get_cache_key(
@@ -268,6 +280,65 @@ class MarketDataAPIService:
             logger.error("Error fetching stock quote for %s: %s", symbol, e)
             return None
 
+    async def get_stock_quotes(
+        self,
+        symbols: List[str],
+        batch_size: int = QUOTE_BATCH_SIZE,
+        max_concurrency: int = QUOTE_CONCURRENCY,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get real-time quotes for many symbols.
+
+        Cached quotes are used first; the rest are fetched from the Polygon
+        snapshot endpoint, batch_size symbols per request. Symbols still
+        missing go through the get_stock_quote fallback chain concurrently.
+
+        Args:
+            symbols: Stock symbols
+            batch_size: Symbols per Polygon snapshot request
+            max_concurrency: Fallback quote requests in flight at once
+
+        Returns:
+            {symbol: quote} for the symbols a quote was found for.
+        """
+        quotes: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        for symbol in dict.fromkeys(symbols):
+            cache_key = self._get_cache_key("auto", symbol, "quote")
+            if self._is_cache_valid(cache_key):
+                quotes[symbol] = self.cache[cache_key][1]
+            else:
+                missing.append(symbol)
+        if not missing:
+            return quotes
+
+        try:
+            self._ensure_session()
+            if DataProvider.POLYGON in self.api_keys:
+                for start in range(0, len(missing), batch_size):
+                    if not self._check_rate_limit(DataProvider.POLYGON):
+                        break
+                    batch = await self._fetch_polygon_snapshot(missing[start:start + batch_size])
+                    now = time.time()
+                    for symbol, quote in batch.items():
+                        self.cache[self._get_cache_key("auto", symbol, "quote")] = (now, quote)
+                    quotes.update(batch)
+        except Exception as e:
+            logger.error("Error fetching batched stock quotes: %s", e)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fallback(symbol: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.get_stock_quote(symbol)
+
+        remaining = [symbol for symbol in missing if symbol not in quotes]
+        results = await asyncio.gather(*(fallback(symbol) for symbol in remaining))
+        for symbol, quote in zip(remaining, results):
+            if quote:
+                quotes[symbol] = quote
+        return quotes
+
     async def _fetch_quote_from_provider(
         self,
         symbol: str,
@@ -495,6 +566,59 @@ class MarketDataAPIService:
                 logger.error("Error parsing IEX quote for %s: %s", symbol, e)
                 return None
 
+    async def _fetch_polygon_snapshot(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch quotes for several symbols in one Polygon snapshot request.
+
+        /v2/snapshot/locale/us/markets/stocks/tickers?tickers=A,B,... (Starter+).
+        Returns {} when the plan or request does not allow it.
+        """
+        api_key = self.api_keys.get(DataProvider.POLYGON)
+        if not api_key or self.session is None or not symbols:
+            return {}
+
+        url = "https://api.polygon.io/v2/snapshot/locale/us/markets/stocks/tickers"
+        params = {
+            "tickers": ",".join(symbols),
+            "apiKey": api_key.key,
+        }
+
+        async with self.session.get(url, params=params) as response:
+            if response.status != 200:
+                logger.debug("Polygon snapshot HTTP %d for %d symbols", response.status, len(symbols))
+                return {}
+            data = await response.json()
+
+        quotes: Dict[str, Dict[str, Any]] = {}
+        for snapshot in data.get("tickers") or []:
+            try:
+                symbol = snapshot["ticker"]
+                day = snapshot.get("day") or {}
+                price = float(
+                    (snapshot.get("lastTrade") or {}).get("p")
+                    or day.get("c")
+                    or (snapshot.get("prevDay") or {}).get("c")
+                    or 0
+                )
+                if price <= 0:
+                    continue
+                quotes[symbol] = {
+                    "symbol": symbol,
+                    "price": price,
+                    "open": float(day.get("o", 0)),
+                    "high": float(day.get("h", 0)),
+                    "low": float(day.get("l", 0)),
+                    "change": float(snapshot.get("todaysChange", 0)),
+                    "change_percent": float(snapshot.get("todaysChangePerc", 0)),
+                    "volume": int(day.get("v", 0)),
+                    "vwap": float(day.get("vw", 0)),
+                    "provider": "polygon",
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
+            except Exception as e:
+                logger.error("Error parsing Polygon snapshot for %s: %s", snapshot.get("ticker"), e)
+        return quotes
+
     # -------------------------------------------------------------------------
     # Public API: Historical data
     # -------------------------------------------------------------------------
@@ -799,6 +923,14 @@ class MarketDataAPIService:
         """Clear all cached data."""
         self.cache.clear()
 
+    def prune_cache(self) -> int:
+        """Drop entries older than cache_duration; returns how many were removed."""
+        cutoff = time.time() - self.cache_duration
+        expired = [key for key, (cache_time, _) in self.cache.items() if cache_time <= cutoff]
+        for key in expired:
+            del self.cache[key]
+        return len(expired)
+
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         return {
@@ -0,0 +1,90 @@
+"""
+Precompiled keyword matching for merchant, description and category strings.
+
+Spending analytics map transactions to tickers and categories by testing which
+keywords of a mapping table occur in a string. Doing that with one ``key in
+text`` test per key per transaction dominates training-data preparation, so:
+
+- KeywordMatcher compiles the table into one regex that reports, in a single
+  scan, every keyword occurring in the string;
+- results are memoized per string, and find_many classifies a whole column by
+  matching each distinct string once.
+
+Matching is plain, case-sensitive substring containment, exactly what the
+``key in text`` loops tested; callers upper-case text the way they did before.
+"""
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+# Distinct strings remembered per matcher before the memo is reset
+MATCH_CACHE_SIZE = 200_000
+
+
+class KeywordMatcher:
+    """
+    Finds which of a fixed set of keywords occur in a string.
+
+    The keywords are compiled into a single lookahead alternation, longest
+    first, so each position of the text reports the longest keyword starting
+    there. Any other keyword occurring at that position is a prefix of it, and
+    each reported keyword is expanded to every keyword it contains, so the
+    result is the same set the per-keyword substring tests would give.
+
+    Args:
+        keywords: Keywords to look for (duplicates and empty strings ignored)
+        cache_size: Distinct strings memoized before the memo is reset
+    """
+
+    def __init__(self, keywords: Iterable[str], cache_size: int = MATCH_CACHE_SIZE):
+        self.keywords = tuple(dict.fromkeys(k for k in keywords if k))
+        ordered = sorted(self.keywords, key=len, reverse=True)
+        self._pattern = re.compile('(?=(' + '|'.join(map(re.escape, ordered)) + '))') if ordered else None
+        self._contains = {k: frozenset(other for other in self.keywords if other in k) for k in self.keywords}
+        self._cache: Dict[str, FrozenSet[str]] = {}
+        self._cache_size = cache_size
+
+    def find(self, text: Optional[str]) -> FrozenSet[str]:
+        """Keywords occurring in text"""
+        if not text or self._pattern is None:
+            return frozenset()
+        found = self._cache.get(text)
+        if found is None:
+            hits = set(self._pattern.findall(text))
+            found = frozenset().union(*(self._contains[k] for k in hits)) if hits else frozenset()
+            if len(self._cache) >= self._cache_size:
+                self._cache.clear()
+            self._cache[text] = found
+        return found
+
+    def find_many(self, texts: Sequence[Optional[str]]) -> List[FrozenSet[str]]:
+        """``find`` for a column of strings, matching each distinct value once"""
+        codes, uniques = pd.factorize(pd.Series(texts, dtype=object), use_na_sentinel=True)
+        found = [self.find(text) for text in uniques]
+        empty = frozenset()
+        return [found[code] if code >= 0 else empty for code in codes]
+
+
+class CategoryMatcher:
+    """
+    First category of an ordered {category: [keywords]} table with a keyword in a string.
+
+    Equivalent to walking the table in order and returning the first category
+    where ``any(keyword in text for keyword in keywords)``.
+    """
+
+    def __init__(self, table: Dict[str, Sequence[str]], cache_size: int = MATCH_CACHE_SIZE):
+        self.categories = list(table)
+        self._rank: Dict[str, int] = {}
+        for rank, keywords in enumerate(table.values()):
+            for keyword in keywords:
+                self._rank.setdefault(keyword, rank)
+        self.matcher = KeywordMatcher(self._rank, cache_size=cache_size)
+
+    def match(self, text: Optional[str]) -> Optional[str]:
+        """Matching category, or None"""
+        found = self.matcher.find(text)
+        if not found:
+            return None
+        return self.categories[min(self._rank[k] for k in found)]
@@ -0,0 +1,35 @@
+"""
+Migration 0066 — Add SpendingWeeklyAggregate table
+"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0065_net_worth_snapshots"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SpendingWeeklyAggregate",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("week_start",        models.DateField()),
+                ("ticker",            models.CharField(max_length=20)),
+                ("total_spending",    models.DecimalField(max_digits=18, decimal_places=2, default=0)),
+                ("user_count",        models.IntegerField(default=0)),
+                ("transaction_count", models.IntegerField(default=0)),
+                ("built_at",          models.DateTimeField()),
+            ],
+            options={
+                "db_table": "spending_weekly_aggregates",
+                "ordering": ["week_start", "ticker"],
+                "unique_together": {("week_start", "ticker")},
+            },
+        ),
+        migrations.AddIndex(
+            model_name="spendingweeklyaggregate",
+            index=models.Index(fields=["built_at"], name="spending_agg_built_at_idx"),
+        ),
+    ]
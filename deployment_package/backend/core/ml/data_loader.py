@@ -3,6 +3,8 @@ data_loader.py
 ==============
 Fetches adjusted daily OHLCV data via yfinance and attaches SPY/QQQ
 as market-context columns.  All data is split/dividend-adjusted.
+Bars are read through the local bar store (core/bar_store.py), so repeat
+runs only download the days they have not seen.
 
 Design rules
 ------------
@@ -22,6 +24,8 @@ from typing import Dict
 import numpy as np
 import pandas as pd
 
+from ..bar_store import fetch_yfinance_bars, get_bar_store
+
 logger = logging.getLogger(__name__)
 
 # Minimum rows required before we consider a ticker usable
@@ -64,7 +68,7 @@ class DataLoader:
             Index: DatetimeIndex (UTC midnight, trading days only).
         """
         try:
-            import yfinance as yf
+            import yfinance  # noqa: F401
         except ImportError as exc:
             raise ImportError("yfinance is required: pip install yfinance>=0.2.0") from exc
 
@@ -74,22 +78,14 @@ class DataLoader:
 
         logger.info("Fetching %d tickers from %s to %s", len(all_tickers), start_date, end_date)
 
-        # Batch download is much faster than per-ticker calls
-        raw = yf.download(
-            tickers=all_tickers,
-            start=start_date,
-            end=end_date,
-            auto_adjust=True,       # adjusts for splits + dividends
-            progress=False,
-            threads=True,
-        )
-
-        if raw.empty:
-            raise ValueError(f"yfinance returned no data for {all_tickers}")
+        # Read through the local bar store: only date ranges it has not seen are
+        # downloaded, in one batched (split/dividend-adjusted) yfinance call.
+        # end_date is exclusive here, the store's end is inclusive.
+        last_day = pd.Timestamp(end_date) - pd.Timedelta(days=1)
+        dfs = get_bar_store().get(all_tickers, start_date, last_day, fetch=fetch_yfinance_bars)
 
-        # yfinance returns a MultiIndex columns df when multiple tickers are requested
-        # Normalise to {ticker: single-level-df}
-        dfs = self._split_by_ticker(raw, all_tickers)
+        if not dfs:
+            raise ValueError(f"yfinance returned no data for {all_tickers}")
 
         # Build context columns from SPY / QQQ and sector ETFs
         spy_df = dfs.get("SPY")
@@ -103,18 +99,17 @@ class DataLoader:
                 continue
 
             df = dfs[ticker].copy()
-            df.columns = [c.lower() for c in df.columns]  # normalise column names
 
             # Attach market context
             if spy_df is not None:
-                df["spy_close"] = spy_df["Close"].reindex(df.index)
-                df["spy_volume"] = spy_df["Volume"].reindex(df.index)
+                df["spy_close"] = spy_df["close"].reindex(df.index)
+                df["spy_volume"] = spy_df["volume"].reindex(df.index)
             else:
                 df["spy_close"] = np.nan
                 df["spy_volume"] = np.nan
 
             if qqq_df is not None:
-                df["qqq_close"] = qqq_df["Close"].reindex(df.index)
+                df["qqq_close"] = qqq_df["close"].reindex(df.index)
             else:
                 df["qqq_close"] = np.nan
 
@@ -122,8 +117,8 @@ class DataLoader:
             for etf in _SECTOR_ETFS:
                 sec_df = sector_dfs.get(etf)
                 col = f"{etf.lower()}_close"
-                if sec_df is not None and "Close" in sec_df.columns:
-                    df[col] = sec_df["Close"].reindex(df.index)
+                if sec_df is not None and "close" in sec_df.columns:
+                    df[col] = sec_df["close"].reindex(df.index)
                 else:
                     df[col] = np.nan
 
@@ -145,26 +140,3 @@ class DataLoader:
 
         logger.info("DataLoader: loaded %d/%d tickers successfully", len(results), len(tickers))
         return results
-
-    # ------------------------------------------------------------------
-    # Internal helpers
-    # ------------------------------------------------------------------
-
-    @staticmethod
-    def _split_by_ticker(raw: pd.DataFrame, tickers: list[str]) -> Dict[str, pd.DataFrame]:
-        """Split a multi-ticker yfinance DataFrame into per-ticker DataFrames."""
-        if isinstance(raw.columns, pd.MultiIndex):
-            result = {}
-            for ticker in tickers:
-                try:
-                    df = raw.xs(ticker, axis=1, level=1).copy()
-                    df = df.dropna(how="all")
-                    if not df.empty:
-                        result[ticker] = df
-                except KeyError:
-                    logger.debug("Ticker %s not found in downloaded data", ticker)
-            return result
-        else:
-            # Single ticker — yfinance returns flat columns
-            assert len(tickers) == 1
-            return {tickers[0]: raw.copy()}
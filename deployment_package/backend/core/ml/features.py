@@ -38,6 +38,8 @@ import logging
 import numpy as np
 import pandas as pd
 
+from .. import indicators
+
 logger = logging.getLogger(__name__)
 
 # Canonical list of feature names produced by build_features().
@@ -76,7 +78,16 @@ FEATURE_NAMES: list[str] = [
 # Earnings features are appended in train.py (FEATURE_NAMES + EARNINGS_FEATURE_NAMES) when building the full X matrix.
 
 
-def build_features(df: pd.DataFrame) -> pd.DataFrame:
+# build_features() forward-fills up to this many rows, so the tail computation
+# needs that many extra rows in front of the ones it returns.
+_FFILL_LIMIT = 5
+
+# ADX is a recursive EMA (alpha = 2/15): starting it this many rows early
+# leaves a seed error of ~(13/15)^300, far below float precision.
+_ADX_WARMUP = 300
+
+
+def build_features(df: pd.DataFrame, last_n: int | None = None) -> pd.DataFrame:
     """
     Build the canonical feature matrix from a single-ticker OHLCV DataFrame.
 
@@ -86,52 +97,124 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
         Must contain columns: open, high, low, close, volume
         Optional (added by DataLoader): spy_close, spy_volume, qqq_close
         Index: DatetimeIndex
+    last_n : int | None
+        If given, only the trailing *last_n* rows are computed (see
+        build_latest_features).  Use at inference; training needs every row.
 
     Returns
     -------
     pd.DataFrame
-        Columns: exactly FEATURE_NAMES, same DatetimeIndex as input.
+        Columns: exactly FEATURE_NAMES, same DatetimeIndex as input
+        (or its last *last_n* entries).
         Rows with insufficient history (warm-up period) are NaN — callers
         should dropna() or align with the target series which already drops NaN.
     """
+    if last_n is not None:
+        return build_latest_features(df, last_n=last_n)
+
     _validate_input(df)
 
-    feat = pd.DataFrame(index=df.index)
+    # Forward-fill at most 5 consecutive NaNs (e.g. holidays, halts)
+    # then leave remaining NaN for the caller to handle
+    feat = _compute_features(df, start=0).ffill(limit=_FFILL_LIMIT)
+
+    logger.debug(
+        "build_features: %d rows, %d features, %.1f%% non-null",
+        len(feat), len(feat.columns),
+        feat.notna().values.mean() * 100,
+    )
+
+    return feat
+
+
+def build_latest_features(df: pd.DataFrame, last_n: int = 1) -> pd.DataFrame:
+    """
+    Compute build_features() for the trailing *last_n* rows only.
+
+    Live scoring only needs the most recent row, but a full build runs every
+    rolling window over the whole 252+ row history.  Both modes share the
+    kernels in _compute_features(); here they are started at the first row
+    the ffill can reach, so each rolling window only sees the rows it needs.
+
+    Matches build_features(df).iloc[-last_n:] to floating-point precision
+    (see core/tests/test_ml_features_tail.py).
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Same input as build_features().
+    last_n : int
+        Number of trailing rows to return.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns: exactly FEATURE_NAMES, index df.index[-last_n:].
+    """
+    _validate_input(df)
+    if last_n < 1:
+        raise ValueError("build_latest_features: last_n must be >= 1")
+
+    n = len(df)
+    last_n = min(last_n, n)
+    # First row we need feature values for (extra rows feed the ffill)
+    start = max(0, n - last_n - _FFILL_LIMIT)
+
+    feat = _compute_features(df, start=start)
+    return feat.iloc[start:].ffill(limit=_FFILL_LIMIT).iloc[-last_n:]
+
+
+def _compute_features(df: pd.DataFrame, start: int) -> pd.DataFrame:
+    """
+    Feature kernels shared by build_features() and build_latest_features().
+
+    Every rolling statistic is evaluated from row *start* onwards only
+    (start=0 is the full history).  Rows before *start* are undefined.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        feat = _feature_arrays(df, start)
+    # Column order matches FEATURE_NAMES exactly
+    return pd.DataFrame({name: feat[name] for name in FEATURE_NAMES}, index=df.index)
+
 
-    close = df["close"]
-    high = df["high"]
-    low = df["low"]
-    volume = df["volume"].replace(0, np.nan)  # 0-volume days → NaN, not division by zero
+def _feature_arrays(df: pd.DataFrame, start: int) -> dict[str, np.ndarray]:
+    n = len(df)
+    feat: dict[str, np.ndarray] = {}
+
+    close = df["close"].to_numpy(dtype=float)
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
+    volume = _nan_zero(df["volume"].to_numpy(dtype=float))  # 0-volume days → NaN, not division by zero
 
     # ------------------------------------------------------------------
     # Momentum: log-returns over multiple horizons
     # log(P_t / P_{t-w}) uses only past prices — strictly causal
     # ------------------------------------------------------------------
     for w, name in [(21, "mom_21d"), (63, "mom_63d"), (126, "mom_126d")]:
-        feat[name] = np.log(close / close.shift(w))
+        feat[name] = np.log(close / _shift(close, w))
 
     # ------------------------------------------------------------------
     # Trend: distance from moving averages
     # SMA is computed on past closes only; dist = (close / SMA) - 1
     # ------------------------------------------------------------------
-    feat["dist_sma_50"] = close / close.rolling(50).mean() - 1.0
-    feat["dist_sma_200"] = close / close.rolling(200).mean() - 1.0
+    feat["dist_sma_50"] = close / _rolling(close, 50, 50, start, "mean") - 1.0
+    feat["dist_sma_200"] = close / _rolling(close, 200, 200, start, "mean") - 1.0
 
     # ADX-14 (Wilder's directional movement)
-    feat["adx_14"] = _compute_adx(high, low, close, period=14)
+    feat["adx_14"] = _adx(high, low, close, start, period=14)
 
     # ------------------------------------------------------------------
     # Volatility
     # ------------------------------------------------------------------
-    daily_log_ret = np.log(close / close.shift(1))
+    daily_log_ret = np.log(close / _shift(close, 1))
 
     # Realised vol (annualised)
-    feat["rvol_20d"] = daily_log_ret.rolling(20, min_periods=10).std() * np.sqrt(252)
-    feat["rvol_60d"] = daily_log_ret.rolling(60, min_periods=20).std() * np.sqrt(252)
+    feat["rvol_20d"] = _rolling(daily_log_ret, 20, 10, start, "std") * np.sqrt(252)
+    feat["rvol_60d"] = _rolling(daily_log_ret, 60, 20, start, "std") * np.sqrt(252)
 
     # ATR% = Average True Range / close (normalises by price level)
-    tr = _true_range(high, low, close)
-    atr = tr.rolling(14, min_periods=5).mean()
+    tr = indicators.true_range(high, low, close)
+    atr = _rolling(tr, 14, 5, start, "mean")
     feat["atr_pct"] = atr / close
 
     # ------------------------------------------------------------------
@@ -147,20 +230,21 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
     # ------------------------------------------------------------------
 
     # VPT-20: recent price-weighted volume flow (stationary, comparable cross-sectionally)
-    vol_avg_20 = volume.rolling(20, min_periods=5).mean().replace(0, np.nan)
+    # The 20-day sums below need the ratio from 19 rows before start.
+    vol_avg_20 = _nan_zero(_rolling(volume, 20, 5, max(0, start - 19), "mean"))
     vol_norm_ratio = volume / vol_avg_20  # normalise by average to be comparable across stocks
-    vpt_20 = (daily_log_ret * vol_norm_ratio).rolling(20, min_periods=10).sum()
+    vpt_20 = _rolling(daily_log_ret * vol_norm_ratio, 20, 10, start, "sum")
     feat["vpt_zscore"] = vpt_20  # XS z-score applied in train.py; raw signal here is fine
 
     # OBV slope: linear trend of 10-day OBV direction (positive = accumulation)
-    direction = np.sign(daily_log_ret).fillna(0)
-    obv_10 = (direction * vol_norm_ratio).rolling(10, min_periods=5).sum()
+    direction = np.nan_to_num(np.sign(daily_log_ret), nan=0.0)
+    obv_10 = _rolling(direction * vol_norm_ratio, 10, 5, start, "sum")
     feat["obv_zscore"] = obv_10  # same — XS z-score applied at training time
 
     # Volume z-score: how unusual is today's dollar-volume vs 20-day average?
     dollar_vol = close * volume
-    vol_mean = dollar_vol.rolling(20, min_periods=10).mean()
-    vol_std = dollar_vol.rolling(20, min_periods=10).std().replace(0, np.nan)
+    vol_mean = _rolling(dollar_vol, 20, 10, start, "mean")
+    vol_std = _nan_zero(_rolling(dollar_vol, 20, 10, start, "std"))
     feat["vol_zscore_20d"] = (dollar_vol - vol_mean) / vol_std
 
     # ------------------------------------------------------------------
@@ -169,24 +253,26 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
     # ------------------------------------------------------------------
     spy_close = df.get("spy_close")
     qqq_close = df.get("qqq_close")
+    spy = spy_close.to_numpy(dtype=float) if spy_close is not None else None
 
-    if spy_close is not None and spy_close.notna().sum() > 30:
-        spy_log_ret = np.log(spy_close / spy_close.shift(1))
-        feat["spy_mom_21d"] = np.log(spy_close / spy_close.shift(21))
-        feat["spy_mom_63d"] = np.log(spy_close / spy_close.shift(63))  # regime: medium-term trend
-        feat["spy_rvol_20d"] = spy_log_ret.rolling(20, min_periods=10).std() * np.sqrt(252)
+    if spy is not None and spy_close.notna().sum() > 30:
+        spy_log_ret = np.log(spy / _shift(spy, 1))
+        feat["spy_mom_21d"] = np.log(spy / _shift(spy, 21))
+        feat["spy_mom_63d"] = np.log(spy / _shift(spy, 63))  # regime: medium-term trend
+        feat["spy_rvol_20d"] = _rolling(spy_log_ret, 20, 10, start, "std") * np.sqrt(252)
         # VIX proxy: 20D SPY realised vol scaled to "VIX-like" 0-100 units
         feat["vix_proxy"] = feat["spy_rvol_20d"] * 100.0
     else:
-        feat["spy_mom_21d"] = np.nan
-        feat["spy_mom_63d"] = np.nan
-        feat["spy_rvol_20d"] = np.nan
-        feat["vix_proxy"] = np.nan
+        feat["spy_mom_21d"] = np.full(n, np.nan)
+        feat["spy_mom_63d"] = np.full(n, np.nan)
+        feat["spy_rvol_20d"] = np.full(n, np.nan)
+        feat["vix_proxy"] = np.full(n, np.nan)
 
     if qqq_close is not None and qqq_close.notna().sum() > 30:
-        feat["qqq_mom_21d"] = np.log(qqq_close / qqq_close.shift(21))
+        qqq = qqq_close.to_numpy(dtype=float)
+        feat["qqq_mom_21d"] = np.log(qqq / _shift(qqq, 21))
     else:
-        feat["qqq_mom_21d"] = np.nan
+        feat["qqq_mom_21d"] = np.full(n, np.nan)
 
     # ------------------------------------------------------------------
     # Alpha signals — high-information features that capture stock-specific
@@ -198,14 +284,14 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
     #    20 days (market microstructure + short-term overreaction).
     #    Negative sign: we SELL the last week's gain as a predictor of reversal.
     #    Causal: log(P_t / P_{t-5}) uses only past prices.
-    feat["rev_1w"] = -np.log(close / close.shift(5))
+    feat["rev_1w"] = -np.log(close / _shift(close, 5))
 
     # 2. 52-week high proximity
     #    Distance of today's close from the trailing 252-day high.
     #    Values in (-∞, 0]: 0 means AT the 52-week high.
     #    Stocks near 52-week highs show momentum continuation (George & Hwang 2004).
     #    Causal: rolling max over past 252 closes only.
-    rolling_max_252 = close.rolling(252, min_periods=126).max()
+    rolling_max_252 = _rolling(close, 252, 126, start, "max")
     feat["high_52w_prox"] = np.log(close / rolling_max_252)
 
     # 3. Idiosyncratic volatility (residual vol after removing SPY market beta)
@@ -214,9 +300,9 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
     #    as a negative predictor or risk control.
     #    Method: rolling 60-day OLS beta → idio_ret = ret - beta * spy_ret
     #            idio_vol = std(idio_ret) over 20 days
-    if spy_close is not None and spy_close.notna().sum() > 60:
-        spy_log_ret_for_beta = np.log(spy_close / spy_close.shift(1))
-        feat["idio_vol"] = _idio_vol(daily_log_ret, spy_log_ret_for_beta, window=60)
+    if spy is not None and spy_close.notna().sum() > 60:
+        spy_log_ret_for_beta = np.log(spy / _shift(spy, 1))
+        feat["idio_vol"] = _idio_vol(daily_log_ret, spy_log_ret_for_beta, window=60, start=start)
     else:
         # Fallback: use rvol_20d when SPY data unavailable
         feat["idio_vol"] = feat["rvol_20d"]
@@ -227,30 +313,15 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
     #    Empirically: high positive-skew stocks are overpriced (investors love lotteries)
     #    and tend to underperform — useful contrarian signal.
     #    Causal: computed from past 20 daily log-returns only.
-    feat["ret_skew_20d"] = daily_log_ret.rolling(20, min_periods=10).skew()
+    feat["ret_skew_20d"] = _rolling(daily_log_ret, 20, 10, start, "skew")
 
     # 5. Volatility ratio: short-term vol / long-term vol
     #    > 1: vol is expanding (regime change, event risk, earnings)
     #    < 1: vol is contracting (quiet trending market)
     #    Normalised: we divide by rvol_60d so the signal is scale-free.
-    rvol_5d = daily_log_ret.rolling(5, min_periods=3).std() * np.sqrt(252)
-    rvol_60d_raw = daily_log_ret.rolling(60, min_periods=20).std() * np.sqrt(252)
-    feat["vol_ratio"] = rvol_5d / rvol_60d_raw.replace(0, np.nan)
-
-    # ------------------------------------------------------------------
-    # Final validation: ensure column order matches FEATURE_NAMES exactly
-    # ------------------------------------------------------------------
-    feat = feat[FEATURE_NAMES]
-
-    # Forward-fill at most 5 consecutive NaNs (e.g. holidays, halts)
-    # then leave remaining NaN for the caller to handle
-    feat = feat.ffill(limit=5)
-
-    logger.debug(
-        "build_features: %d rows, %d features, %.1f%% non-null",
-        len(feat), len(feat.columns),
-        feat.notna().values.mean() * 100,
-    )
+    rvol_5d = _rolling(daily_log_ret, 5, 3, start, "std") * np.sqrt(252)
+    rvol_60d_raw = feat["rvol_60d"]
+    feat["vol_ratio"] = rvol_5d / _nan_zero(rvol_60d_raw)
 
     return feat
 
@@ -268,45 +339,6 @@ def _validate_input(df: pd.DataFrame) -> None:
         raise ValueError("build_features: DataFrame must have a DatetimeIndex")
 
 
-def _true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
-    """Wilder's True Range."""
-    prev_close = close.shift(1)
-    tr = pd.concat([
-        high - low,
-        (high - prev_close).abs(),
-        (low - prev_close).abs(),
-    ], axis=1).max(axis=1)
-    return tr
-
-
-def _compute_adx(
-    high: pd.Series,
-    low: pd.Series,
-    close: pd.Series,
-    period: int = 14,
-) -> pd.Series:
-    """
-    Wilder's Average Directional Index (ADX).
-    Returns values in [0, 100]; higher = stronger trend.
-    """
-    tr = _true_range(high, low, close)
-    up_move = high - high.shift(1)
-    down_move = low.shift(1) - low
-
-    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
-    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
-
-    plus_dm_s = pd.Series(plus_dm, index=high.index).ewm(span=period, adjust=False).mean()
-    minus_dm_s = pd.Series(minus_dm, index=high.index).ewm(span=period, adjust=False).mean()
-    atr_s = tr.ewm(span=period, adjust=False).mean().replace(0, np.nan)
-
-    plus_di = 100 * plus_dm_s / atr_s
-    minus_di = 100 * minus_dm_s / atr_s
-    dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di).replace(0, np.nan)
-    adx = dx.ewm(span=period, adjust=False).mean()
-    return adx
-
-
 def _rolling_zscore(series: pd.Series, window: int = 252) -> pd.Series:
     """
     Z-score of a cumulative series over a rolling window.
@@ -318,11 +350,12 @@ def _rolling_zscore(series: pd.Series, window: int = 252) -> pd.Series:
 
 
 def _idio_vol(
-    stock_ret: pd.Series,
-    market_ret: pd.Series,
+    stock_ret: np.ndarray,
+    market_ret: np.ndarray,
     window: int = 60,
     idio_window: int = 20,
-) -> pd.Series:
+    start: int = 0,
+) -> np.ndarray:
     """
     Idiosyncratic volatility: annualised std of residuals after removing
     the rolling OLS market beta.
@@ -335,29 +368,68 @@ def _idio_vol(
 
     Parameters
     ----------
-    stock_ret : pd.Series
+    stock_ret : np.ndarray
         Daily log-returns of the stock.
-    market_ret : pd.Series
+    market_ret : np.ndarray
         Daily log-returns of the market (e.g. SPY).
     window : int
         Rolling window (in days) for beta estimation.
     idio_window : int
         Rolling window for computing the std of residuals.
+    start : int
+        First row to compute; earlier rows are NaN (see _rolling).
 
     Returns
     -------
-    pd.Series
-        Annualised idiosyncratic volatility, same index as stock_ret.
+    np.ndarray
+        Annualised idiosyncratic volatility, aligned with stock_ret.
     """
     min_p = max(20, window // 3)
 
     # Rolling covariance and market variance → rolling beta
-    cov = stock_ret.rolling(window, min_periods=min_p).cov(market_ret)
-    var_m = market_ret.rolling(window, min_periods=min_p).var().replace(0, np.nan)
-    beta = cov / var_m  # rolling OLS beta
+    # (the residual std needs beta from idio_window-1 rows before start)
+    lo = max(0, start - idio_window - window + 2)
+    stock, market = pd.Series(stock_ret[lo:]), pd.Series(market_ret[lo:])
+    cov = stock.rolling(window, min_periods=min_p).cov(market)
+    var_m = market.rolling(window, min_periods=min_p).var().replace(0, np.nan)
+    beta = (cov / var_m).to_numpy()  # rolling OLS beta
 
     # Idiosyncratic return = stock return - systematic return
-    idio_ret = stock_ret - beta * market_ret
+    idio_ret = np.full(len(stock_ret), np.nan)
+    idio_ret[lo:] = stock_ret[lo:] - beta * market_ret[lo:]
 
     # Annualised std of idiosyncratic return
-    return idio_ret.rolling(idio_window, min_periods=max(5, idio_window // 2)).std() * np.sqrt(252)
+    return _rolling(idio_ret, idio_window, max(5, idio_window // 2), start, "std") * np.sqrt(252)
+
+
+# -- start-offset kernels ----------------------------------------------------
+
+def _shift(x: np.ndarray, periods: int) -> np.ndarray:
+    """Series.shift(periods) on an array."""
+    return indicators.shift(x, periods)
+
+
+def _nan_zero(x: np.ndarray) -> np.ndarray:
+    """Series.replace(0, np.nan) on an array."""
+    return np.where(x == 0, np.nan, x)
+
+
+def _rolling(x: np.ndarray, window: int, min_periods: int, start: int, how: str) -> np.ndarray:
+    """
+    Series(x).rolling(window, min_periods=min_periods).<how>() for rows start.. only.
+
+    Only the window-1 rows before *start* are fed to pandas, so rows from
+    *start* onwards get their full-history values and earlier rows are NaN.
+    """
+    lo = max(0, start - window + 1)
+    out = np.full(len(x), np.nan)
+    out[lo:] = getattr(pd.Series(x[lo:]).rolling(window, min_periods=min_periods), how)().to_numpy()
+    return out
+
+
+def _adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, start: int, period: int = 14) -> np.ndarray:
+    """indicators.adx() for rows start.., seeded _ADX_WARMUP rows earlier."""
+    lo = max(0, start - _ADX_WARMUP)
+    out = np.full(len(close), np.nan)
+    out[lo:] = indicators.adx(high[lo:], low[lo:], close[lo:], period=period)
+    return out
@@ -10,7 +10,9 @@ Design goals
 * Models are saved alongside a human-readable metadata dict (trained_at,
   fold metrics, feature count) so you can audit what's running in prod.
 * Inference is a single function call: ModelRegistry.predict(ticker_df)
-  → returns a raw vol-adjusted return prediction.
+  → returns a raw vol-adjusted return prediction.  Universe scoring uses
+  ModelRegistry.score_universe(tickers) / predict_batch(frames), which fetch
+  once and call model.predict once on the stacked feature matrix.
 
 Storage layout
 --------------
@@ -22,6 +24,15 @@ day_trading_predictor.pkl files:
         day_trading_predictor.pkl
         ...
 
+Caching
+-------
+Bundles are cached per process, keyed by name.  Every load() stats the file
+and only unpickles it again when its mtime/size changed *and* its content hash
+differs from the cached copy, so scoring a stock list reads the .pkl once.
+ModelRegistry.cache_stats() reports hits / misses / reloads, and
+ModelRegistry.warm_up() pre-loads bundles at worker start-up (wired into the
+WSGI/ASGI entry points and Celery's worker_process_init).
+
 Bundle schema
 -------------
     {
@@ -39,8 +50,11 @@ Bundle schema
 
 from __future__ import annotations
 
+import hashlib
 import logging
-from datetime import datetime, timezone
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
@@ -58,6 +72,28 @@ _MODEL_DIR = Path(__file__).parent.parent / "ml_models"
 _DEFAULT_NAME = "production_r2"
 
 
+@dataclass
+class _CachedBundle:
+    bundle: dict
+    signature: tuple[int, int]  # (st_mtime_ns, st_size) of the .pkl when cached
+    digest: str                 # sha256 of the .pkl contents
+
+
+# Process-wide bundle cache (name -> _CachedBundle).  A single lock is enough:
+# hits only hold it for a dict lookup, and reloads are rare.
+_BUNDLE_CACHE: dict[str, _CachedBundle] = {}
+_CACHE_LOCK = threading.RLock()
+_CACHE_STATS = {"hits": 0, "misses": 0, "reloads": 0}
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
 class ModelRegistry:
     """Save, load, and serve the production LightGBM model."""
 
@@ -132,6 +168,7 @@ class ModelRegistry:
         }
 
         joblib.dump(bundle, path)
+        ModelRegistry.clear_cache(name)
         logger.info("ModelRegistry.save: wrote %s (%.1f MB)", path, path.stat().st_size / 1e6)
         return path
 
@@ -140,10 +177,18 @@ class ModelRegistry:
     # ------------------------------------------------------------------
 
     @staticmethod
-    def load(name: str = _DEFAULT_NAME) -> dict:
+    def load(name: str = _DEFAULT_NAME, use_cache: bool = True) -> dict:
         """
         Load a saved model bundle.
 
+        Parameters
+        ----------
+        name : str
+            Filename stem (without .pkl).
+        use_cache : bool
+            Serve the process-wide cached bundle unless the file changed on disk.
+            The cached dict is shared — callers must not mutate it.
+
         Returns
         -------
         dict with keys: model, feature_names, trained_at, model_type, horizon, fold_metrics
@@ -154,12 +199,87 @@ class ModelRegistry:
                 f"No model found at {path}.  "
                 "Run ml.train.run_pipeline() first to train and save the model."
             )
+        if not use_cache:
+            return ModelRegistry._read_bundle(path, name)
+
+        st = path.stat()
+        signature = (st.st_mtime_ns, st.st_size)
+
+        with _CACHE_LOCK:
+            cached = _BUNDLE_CACHE.get(name)
+            if cached is not None and cached.signature == signature:
+                _CACHE_STATS["hits"] += 1
+                return cached.bundle
+
+            # File was touched or replaced: only unpickle if the contents changed
+            digest = _file_digest(path)
+            if cached is not None and cached.digest == digest:
+                cached.signature = signature
+                _CACHE_STATS["hits"] += 1
+                return cached.bundle
+
+            bundle = ModelRegistry._read_bundle(path, name)
+            _CACHE_STATS["misses"] += 1
+            if cached is not None:
+                _CACHE_STATS["reloads"] += 1
+                logger.info("ModelRegistry.load: %s changed on disk — reloaded", name)
+            _BUNDLE_CACHE[name] = _CachedBundle(bundle=bundle, signature=signature, digest=digest)
+            return bundle
+
+    @staticmethod
+    def _read_bundle(path: Path, name: str) -> dict:
         bundle = joblib.load(path)
         logger.debug(
             "ModelRegistry.load: loaded %s (trained_at=%s)", name, bundle.get("trained_at")
         )
         return bundle
 
+    # ------------------------------------------------------------------
+    # Cache management
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def cache_stats() -> dict:
+        """Hit/miss/reload counters and the names currently cached in this process."""
+        with _CACHE_LOCK:
+            return {**_CACHE_STATS, "cached": sorted(_BUNDLE_CACHE)}
+
+    @staticmethod
+    def clear_cache(name: str | None = None) -> None:
+        """Drop one cached bundle (or all of them when name is None)."""
+        with _CACHE_LOCK:
+            if name is None:
+                _BUNDLE_CACHE.clear()
+            else:
+                _BUNDLE_CACHE.pop(name, None)
+
+    @staticmethod
+    def warm_up(names: list[str] | None = None) -> dict[str, bool]:
+        """
+        Pre-load bundles into the process cache (call at worker start-up).
+
+        Missing or unreadable bundles are logged and skipped — warm-up never
+        raises, so it is safe to call unconditionally from server entry points.
+
+        Returns
+        -------
+        dict mapping each name to whether it is now cached.
+        """
+        loaded: dict[str, bool] = {}
+        for name in names or [_DEFAULT_NAME]:
+            if not ModelRegistry.exists(name):
+                logger.info("ModelRegistry.warm_up: %s not trained yet — skipping", name)
+                loaded[name] = False
+                continue
+            try:
+                ModelRegistry.load(name)
+                loaded[name] = True
+            except Exception as exc:
+                logger.warning("ModelRegistry.warm_up: could not load %s: %s", name, exc)
+                loaded[name] = False
+        logger.info("ModelRegistry.warm_up: %s", loaded)
+        return loaded
+
     # ------------------------------------------------------------------
     # Predict
     # ------------------------------------------------------------------
@@ -189,11 +309,118 @@ class ModelRegistry:
         bundle = ModelRegistry.load(name)
         model = bundle["model"]
         expected_features = bundle["feature_names"]
-        xs_mean: "pd.Series | None" = bundle.get("xs_mean")
-        xs_std: "pd.Series | None" = bundle.get("xs_std")
 
         # Build full feature matrix, take only the most recent row
-        feat = build_features(ticker_df)
+        X = ModelRegistry._latest_features(ticker_df, expected_features)  # shape (1, n_features)
+        X = ModelRegistry._normalise(X, bundle)
+
+        if X.isnull().any(axis=1).values[0]:
+            n_null = X.isnull().sum().sum()
+            logger.warning(
+                "ModelRegistry.predict: %d feature(s) are NaN on the most recent row — "
+                "model will use LightGBM's native NaN handling", n_null
+            )
+
+        pred = model.predict(X.values)
+        return float(pred[0])
+
+    @staticmethod
+    def predict_batch(
+        ticker_frames: dict[str, pd.DataFrame],
+        name: str = _DEFAULT_NAME,
+    ) -> dict[str, float]:
+        """
+        Predict for many tickers with a single model.predict call.
+
+        Builds the most recent feature row per ticker, stacks them into one
+        (n_tickers, n_features) matrix, applies the stored XS normalisation in
+        one matrix op and predicts once.  Equivalent to calling predict() per
+        ticker, without the per-call load/normalise/predict overhead.
+
+        Parameters
+        ----------
+        ticker_frames : dict[str, pd.DataFrame]
+            Ticker → OHLCV history (as returned by DataLoader.fetch).
+
+        Returns
+        -------
+        dict[str, float]
+            Ticker → raw vol-adjusted prediction.  Tickers whose features could
+            not be built are logged and omitted.
+        """
+        bundle = ModelRegistry.load(name)
+        model = bundle["model"]
+        expected_features = bundle["feature_names"]
+
+        rows: list[pd.DataFrame] = []
+        tickers: list[str] = []
+        for ticker, ticker_df in ticker_frames.items():
+            try:
+                rows.append(ModelRegistry._latest_features(ticker_df, expected_features))
+                tickers.append(ticker)
+            except Exception as exc:
+                logger.warning("ModelRegistry.predict_batch: skipping %s: %s", ticker, exc)
+
+        if not rows:
+            return {}
+
+        X = pd.concat(rows)
+        X.index = tickers
+        X = ModelRegistry._normalise(X, bundle)
+
+        n_null_rows = int(X.isnull().any(axis=1).sum())
+        if n_null_rows:
+            logger.warning(
+                "ModelRegistry.predict_batch: %d ticker(s) have NaN features on the most recent row — "
+                "model will use LightGBM's native NaN handling", n_null_rows
+            )
+
+        preds = model.predict(X.values)
+        return {ticker: float(p) for ticker, p in zip(tickers, preds)}
+
+    @staticmethod
+    def score_universe(
+        tickers: list[str],
+        name: str = _DEFAULT_NAME,
+        lookback_days: int = 730,
+    ) -> dict[str, float]:
+        """
+        Fetch and score a whole ticker universe in one pass.
+
+        All tickers plus the SPY/QQQ/sector-ETF context series are downloaded in
+        a single DataLoader.fetch call, then scored with predict_batch().
+
+        Parameters
+        ----------
+        tickers : list[str]
+            Symbols to score.
+        lookback_days : int
+            Calendar days of history to fetch (features need 252+ trading days).
+
+        Returns
+        -------
+        dict[str, float]
+            Ticker → raw vol-adjusted prediction.  Tickers without enough
+            history are omitted.
+        """
+        from .data_loader import DataLoader
+
+        tickers = list(dict.fromkeys(t for t in tickers if t))
+        if not tickers:
+            return {}
+
+        start_date = (datetime.now(timezone.utc) - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+        frames = DataLoader().fetch(tickers, start_date=start_date)
+        return ModelRegistry.predict_batch(frames, name=name)
+
+    # ------------------------------------------------------------------
+    # Inference helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _latest_features(ticker_df: pd.DataFrame, expected_features: list[str]) -> pd.DataFrame:
+        """Most recent feature row for one ticker, in the bundle's feature order."""
+        feat = build_features(ticker_df, last_n=1)  # tail-only: skips the full-history rolling windows
 
         # If model was trained with earnings features, add them (0 when not available at inference)
         for f in EARNINGS_FEATURE_NAMES:
@@ -205,30 +432,32 @@ class ModelRegistry:
         if missing:
             raise ValueError(f"ModelRegistry.predict: missing features: {missing}")
 
-        X = feat[expected_features].iloc[[-1]].copy()  # shape (1, n_features)
+        return feat[expected_features].iloc[[-1]].copy()
 
-        # Apply stored cross-sectional z-score normalisation so inference features
-        # are on the same scale as training features.  Without this the model sees
-        # raw feature values at inference while it was trained on z-scored values.
-        if xs_mean is not None and xs_std is not None:
-            X = (X - xs_mean[expected_features]) / xs_std[expected_features].replace(0, np.nan)
-            X = X.fillna(0.0)
-        else:
+    @staticmethod
+    def _normalise(X: pd.DataFrame, bundle: dict) -> pd.DataFrame:
+        """
+        Apply the stored cross-sectional z-score normalisation to X.
+
+        Inference features must be on the same scale as training features —
+        without this the model sees raw values while it was trained on z-scores.
+        """
+        xs_mean: "pd.Series | None" = bundle.get("xs_mean")
+        xs_std: "pd.Series | None" = bundle.get("xs_std")
+        if xs_mean is None or xs_std is None:
             logger.warning(
                 "ModelRegistry.predict: no XS normalisation params found in bundle — "
                 "features may be on a different scale from training. "
                 "Retrain with run_pipeline() to fix."
             )
+            return X
 
-        if X.isnull().any(axis=1).values[0]:
-            n_null = X.isnull().sum().sum()
-            logger.warning(
-                "ModelRegistry.predict: %d feature(s) are NaN on the most recent row — "
-                "model will use LightGBM's native NaN handling", n_null
-            )
-
-        pred = model.predict(X.values)
-        return float(pred[0])
+        cols = list(X.columns)
+        mean = xs_mean[cols].to_numpy(dtype=float)
+        std = xs_std[cols].to_numpy(dtype=float)
+        std = np.where(std == 0, np.nan, std)
+        Z = (X.to_numpy(dtype=float) - mean) / std
+        return pd.DataFrame(np.where(np.isnan(Z), 0.0, Z), index=X.index, columns=cols)
 
     # ------------------------------------------------------------------
     # Metadata
@@ -236,7 +465,7 @@ class ModelRegistry:
 
     @staticmethod
     def metadata(name: str = _DEFAULT_NAME) -> dict:
-        """Return the bundle metadata without loading the full model object."""
+        """Return the bundle metadata (everything except the model object)."""
         bundle = ModelRegistry.load(name)
         return {k: v for k, v in bundle.items() if k != "model"}
 
@@ -244,3 +473,21 @@ class ModelRegistry:
     def exists(name: str = _DEFAULT_NAME) -> bool:
         """Check whether a saved model exists."""
         return (_MODEL_DIR / f"{name}.pkl").exists()
+
+
+def warm_up_from_settings() -> dict[str, bool]:
+    """
+    Warm the bundle cache using Django settings.
+
+    Honours ML_WARM_MODELS (on/off) and ML_WARM_MODEL_NAMES; used by the
+    WSGI/ASGI entry points and the Celery worker_process_init hook.
+    """
+    try:
+        from django.conf import settings
+
+        if not getattr(settings, "ML_WARM_MODELS", True):
+            return {}
+        names = getattr(settings, "ML_WARM_MODEL_NAMES", None) or [_DEFAULT_NAME]
+    except Exception:
+        names = [_DEFAULT_NAME]
+    return ModelRegistry.warm_up(list(names))
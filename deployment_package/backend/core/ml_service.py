@@ -243,7 +243,7 @@ class MLService:
             return self.score_stocks_ml(stocks, market_conditions, user_profile)
 
         try:
-            import yfinance as yf
+            import yfinance as yf  # noqa: F401  (DataLoader.fetch needs it)
         except ImportError:
             logger.warning("yfinance not installed — cannot run production ML scoring")
             return self.score_stocks_ml(stocks, market_conditions, user_profile)
@@ -260,31 +260,24 @@ class MLService:
             fold_ic = None
             horizon = 20
 
-        for stock in stocks:
-            symbol = stock.get("symbol", stock.get("ticker", ""))
+        # One batched download (tickers + SPY/QQQ/sector context) and one
+        # model.predict call for the whole list, instead of two downloads and a
+        # predict per stock.
+        symbols = [s.get("symbol", s.get("ticker", "")) for s in stocks]
+        try:
+            predictions = self._model_registry.score_universe([s for s in symbols if s])
+        except Exception as exc:
+            logger.warning("Batched production scoring failed: %s", exc)
+            predictions = {}
+
+        for stock, symbol in zip(stocks, symbols):
             if not symbol:
                 continue
 
             try:
-                # Fetch recent history for this ticker (need 252+ rows for features)
-                ticker_df = yf.download(
-                    symbol, period="2y", auto_adjust=True, progress=False
-                )
-                if ticker_df.empty or len(ticker_df) < 100:
+                if symbol not in predictions:
                     raise ValueError(f"Insufficient history for {symbol}")
-
-                # Normalise column names (yfinance returns Title Case)
-                ticker_df.columns = [c.lower() for c in ticker_df.columns]
-
-                # Attach SPY as cross-asset context
-                spy_df = yf.download("SPY", period="2y", auto_adjust=True, progress=False)
-                if not spy_df.empty:
-                    spy_df.columns = [c.lower() for c in spy_df.columns]
-                    ticker_df["spy_close"] = spy_df["close"].reindex(ticker_df.index)
-                    ticker_df["spy_volume"] = spy_df["volume"].reindex(ticker_df.index)
-
-                # Get prediction from registry
-                raw_pred = self._model_registry.predict(ticker_df)
+                raw_pred = predictions[symbol]
 
                 # Map vol-adjusted prediction to 0-10 score.
                 # Vol-adjusted returns typically range ±2.0 (±2σ), so:
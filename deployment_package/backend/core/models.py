@@ -424,6 +424,9 @@ class StockMoment(models.Model):
 # Import net worth snapshot model so Django detects it for migrations
 from .net_worth_models import NetWorthSnapshot  # noqa: F401
 
+# Import weekly spending aggregates (spending predictor training table)
+from .spending_aggregate_models import SpendingWeeklyAggregate  # noqa: F401
+
 # Import paper trading models so Django can detect them for migrations
 from .paper_trading_models import (
     PaperTradingAccount,
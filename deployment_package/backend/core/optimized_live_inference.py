@@ -246,29 +246,25 @@ class OptimizedLiveInference:
         """
         cache_key = f"features_{symbol}"
         
-        # Try aggressive caching service first (memory + Redis)
-        cached = self.caching_service.get_cached(cache_key, ttl=1)
-        if cached is not None:
-            return cached
-        
-        # Fallback to local price cache
-        local_cached = self.price_cache.get(cache_key)
-        if local_cached and (time.time() - local_cached['timestamp']) < self.cache_ttl:
-            return local_cached['data']
-        
-        # Fetch fresh
-        lstm_input, alt_data_df = await self.data_fetcher.get_hybrid_features(
-            symbol, use_alpaca=True
-        )
-        
-        # Cache in both layers
-        self.caching_service.set_cached(cache_key, (lstm_input, alt_data_df), ttl=1)
-        self.price_cache[cache_key] = {
-            'data': (lstm_input, alt_data_df),
-            'timestamp': time.time()
-        }
+        async def fetch_features():
+            # Fallback to local price cache
+            local_cached = self.price_cache.get(cache_key)
+            if local_cached and (time.time() - local_cached['timestamp']) < self.cache_ttl:
+                return local_cached['data']
+            
+            # Fetch fresh
+            lstm_input, alt_data_df = await self.data_fetcher.get_hybrid_features(
+                symbol, use_alpaca=True
+            )
+            self.price_cache[cache_key] = {
+                'data': (lstm_input, alt_data_df),
+                'timestamp': time.time()
+            }
+            return lstm_input, alt_data_df
         
-        return lstm_input, alt_data_df
+        # Aggressive caching service (memory + Redis); concurrent signals for the
+        # same symbol share a single feature fetch
+        return await self.caching_service.aget_or_compute(cache_key, fetch_features, ttl=1)
     
     async def generate_signals_batch_optimized(
         self,
@@ -0,0 +1,204 @@
+"""
+Columnar, indexed option chain for candidate generation.
+
+Contracts are grouped into one ``ChainSlice`` per (expiry, option type). Each
+slice holds NumPy columns sorted by strike, plus a delta-sorted index, so the
+lookups strategy generation needs are binary searches instead of list scans:
+
+- nearest strike to a target (optionally within a tolerance)
+- every contract whose delta falls in a band
+- every (i, j) pair whose strikes differ by a given width, vectorized
+
+The original contract dicts are kept (``slice.records``) so callers can read
+any extra fields without copying them into columns.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+OPTION_TYPES = ("call", "put")
+
+
+@dataclass
+class ChainSlice:
+    """All contracts for one expiry and option type, sorted by strike"""
+    expiry: str
+    option_type: str
+    strikes: np.ndarray
+    deltas: np.ndarray
+    bids: np.ndarray
+    asks: np.ndarray
+    records: List[Dict[str, Any]]
+    dte: Optional[int] = None
+    # Positions into the strike-sorted columns, ordered by delta (NaN deltas excluded)
+    delta_order: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        if self.delta_order is None:
+            known = np.flatnonzero(~np.isnan(self.deltas))
+            self.delta_order = known[np.argsort(self.deltas[known], kind="stable")]
+
+    def __len__(self) -> int:
+        return self.strikes.size
+
+    def nearest(self, strike: float, tolerance: Optional[float] = None) -> Optional[int]:
+        """
+        Position of the contract whose strike is closest to ``strike``.
+
+        Args:
+            strike: Target strike
+            tolerance: Reject matches further away than this (strictly less than)
+
+        Returns:
+            Index into the slice, or None
+        """
+        idx = self.nearest_many(np.array([strike], dtype=float), tolerance)[0]
+        return None if idx < 0 else int(idx)
+
+    def nearest_many(self, targets: np.ndarray, tolerance: Optional[float] = None) -> np.ndarray:
+        """Vectorized ``nearest``: -1 where no strike is within tolerance. Ties go to the lower strike."""
+        targets = np.asarray(targets, dtype=float)
+        if self.strikes.size == 0:
+            return np.full(targets.shape, -1)
+        right = np.clip(np.searchsorted(self.strikes, targets), 0, self.strikes.size - 1)
+        left = np.clip(right - 1, 0, self.strikes.size - 1)
+        pick = np.where(
+            np.abs(self.strikes[left] - targets) <= np.abs(self.strikes[right] - targets), left, right
+        )
+        if tolerance is not None:
+            pick = np.where(np.abs(self.strikes[pick] - targets) < tolerance, pick, -1)
+        return pick
+
+    def delta_band(self, low: float, high: float) -> np.ndarray:
+        """Strike-sorted positions of contracts with low <= delta <= high"""
+        ordered = self.deltas[self.delta_order]
+        start = np.searchsorted(ordered, low, side="left")
+        stop = np.searchsorted(ordered, high, side="right")
+        return np.sort(self.delta_order[start:stop])
+
+    def width_pairs(
+        self, widths: Iterable[float], tolerance: float, direction: int = 1
+    ) -> List[Tuple[float, np.ndarray, np.ndarray]]:
+        """
+        For each width, all (anchor, wing) pairs with wing strike ~ anchor strike + direction * width.
+
+        Returns:
+            List of (width, anchor_positions, wing_positions)
+        """
+        pairs = []
+        anchors = np.arange(self.strikes.size)
+        for width in widths:
+            wings = self.nearest_many(self.strikes + direction * width, tolerance)
+            valid = (wings >= 0) & (wings != anchors)
+            pairs.append((width, anchors[valid], wings[valid]))
+        return pairs
+
+    def leg(self, i: int, is_long: bool, quantity: int = 1) -> Dict[str, Any]:
+        """Router leg dict for the contract at position i"""
+        return {
+            "strike": float(self.strikes[i]),
+            "option_type": self.option_type,
+            "bid": self.records[i].get("bid") or 0,
+            "ask": self.records[i].get("ask") or 0,
+            "is_long": is_long,
+            "quantity": quantity,
+            "expiration": self.expiry,
+        }
+
+
+class OptionChain:
+    """
+    Option chain indexed by (expiry, option type).
+
+    Build it with ``OptionChain.build(chain)``, which accepts either of the
+    chain shapes used in this codebase:
+
+    - a flat list of contract dicts ({strike, option_type, bid, ask, delta,
+      expiration_date?, days_to_expiration?})
+    - a nested {expiry: {strike: {'call'|'put': contract}}} mapping
+    """
+
+    def __init__(self, slices: Dict[Tuple[str, str], ChainSlice]):
+        self._slices = slices
+
+    @classmethod
+    def build(cls, chain: Union["OptionChain", List[Dict], Dict, None]) -> "OptionChain":
+        if isinstance(chain, OptionChain):
+            return chain
+        if isinstance(chain, dict):
+            return cls.from_nested(chain)
+        return cls.from_records(chain or [])
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "OptionChain":
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for record in records:
+            option_type = str(record.get("option_type") or record.get("type") or "").lower()
+            if option_type not in OPTION_TYPES or record.get("strike") is None:
+                continue
+            expiry = str(record.get("expiration_date") or record.get("expiration") or record.get("expiry") or "")
+            groups.setdefault((expiry, option_type), []).append(record)
+        return cls({key: _make_slice(key, rows) for key, rows in groups.items()})
+
+    @classmethod
+    def from_nested(cls, nested: Dict[str, Dict[Any, Dict[str, Dict[str, Any]]]]) -> "OptionChain":
+        records = []
+        for expiry, by_strike in nested.items():
+            for strike, by_type in (by_strike or {}).items():
+                for option_type, contract in (by_type or {}).items():
+                    if contract:
+                        records.append({
+                            **contract,
+                            "strike": contract.get("strike", strike),
+                            "option_type": option_type,
+                            "expiration_date": expiry,
+                        })
+        return cls.from_records(records)
+
+    def __len__(self) -> int:
+        return sum(len(s) for s in self._slices.values())
+
+    @property
+    def expiries(self) -> List[str]:
+        return sorted({expiry for expiry, _ in self._slices})
+
+    def slice(self, expiry: str, option_type: str) -> Optional[ChainSlice]:
+        return self._slices.get((expiry, option_type))
+
+    def slices(self, option_type: str) -> List[ChainSlice]:
+        """All slices of one option type, in expiry order"""
+        return [self._slices[(e, option_type)] for e in self.expiries if (e, option_type) in self._slices]
+
+
+def _column(rows: List[Dict[str, Any]], field: str, default: float) -> np.ndarray:
+    values = []
+    for row in rows:
+        value = row.get(field)
+        try:
+            values.append(default if value is None else float(value))
+        except (TypeError, ValueError):
+            values.append(default)
+    return np.array(values, dtype=float)
+
+
+def _make_slice(key: Tuple[str, str], rows: List[Dict[str, Any]]) -> ChainSlice:
+    strikes = _column(rows, "strike", np.nan)
+    # Stable sort keeps the provider's order among duplicate strikes
+    order = np.argsort(strikes, kind="stable")
+    order = order[~np.isnan(strikes[order])]
+    rows = [rows[i] for i in order]
+    dte = rows[0].get("days_to_expiration") if rows else None
+    return ChainSlice(
+        expiry=key[0],
+        option_type=key[1],
+        strikes=strikes[order],
+        deltas=_column(rows, "delta", np.nan),
+        bids=_column(rows, "bid", 0.0),
+        asks=_column(rows, "ask", 0.0),
+        records=rows,
+        dte=int(dte) if dte is not None else None,
+    )
@@ -0,0 +1,223 @@
+"""
+Concurrent option-quote fetching from Polygon.
+
+The old code made one blocking request per contract. This fetcher builds a
+chain's quotes within a single round-trip window:
+
+1. On plans that include it, one paginated request to the chain snapshot
+   (``/v3/snapshot/options/{underlying}``) returns quotes for every contract.
+2. Contracts the snapshot did not cover fall back to the previous-day
+   aggregates (``/v2/aggs/ticker/{contract}/prev``). These requests are sent
+   concurrently, bounded by a semaphore and paced by the plan's token bucket.
+
+All requests share keep-alive sessions from ``core.async_http``.
+"""
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import aiohttp
+
+from .async_http import (
+    ClientSessionPool,
+    TokenBucket,
+    get_provider_plan,
+    get_rate_limiter,
+    get_session_pool,
+    run_sync,
+)
+
+logger = logging.getLogger(__name__)
+
+POLYGON_BASE_URL = 'https://api.polygon.io'
+SNAPSHOT_PAGE_LIMIT = 250
+SNAPSHOT_MAX_PAGES = 20
+DEFAULT_MAX_CONCURRENCY = 20
+DEFAULT_RATE_LIMIT_WAIT_S = 2.0
+DEFAULT_CHAIN_TIMEOUT_S = 30.0
+
+# (bid, ask, volume, last_price), the tuple OptionsAnalysisService has always used
+Quote = Tuple[float, float, int, float]
+EMPTY_QUOTE: Quote = (0.0, 0.0, 0, 0.0)
+
+# Plans whose entitlements include option snapshots
+_SNAPSHOT_PLANS = {'starter', 'developer', 'advanced'}
+
+
+def quote_from_prev_agg(agg: Dict[str, Any]) -> Quote:
+    """Quote from a previous-day aggregate, estimating a 2% bid/ask spread around the close"""
+    last_price = float(agg.get('c', 0) or 0)
+    volume = int(agg.get('v', 0) or 0)
+    spread = last_price * 0.02
+    return max(0.0, last_price - spread / 2), last_price + spread / 2, volume, last_price
+
+
+def quote_from_snapshot(snapshot: Dict[str, Any]) -> Quote:
+    """Quote from a chain-snapshot entry"""
+    last_quote = snapshot.get('last_quote') or {}
+    day = snapshot.get('day') or {}
+    bid = float(last_quote.get('bid', 0) or 0)
+    ask = float(last_quote.get('ask', 0) or 0)
+    last_price = float(
+        day.get('close') or (snapshot.get('last_trade') or {}).get('price') or last_quote.get('midpoint') or 0
+    )
+    return bid, ask, int(day.get('volume', 0) or 0), last_price
+
+
+class PolygonOptionsFetcher:
+    """
+    Async Polygon option-quote client with bounded concurrency.
+
+    Sync callers use the ``*_sync`` methods, which run on the shared
+    background loop so pooled connections are reused across requests.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = POLYGON_BASE_URL,
+        plan: Optional[str] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limiter: Optional[TokenBucket] = None,
+        session_pool: Optional[ClientSessionPool] = None,
+        rate_limit_wait: float = DEFAULT_RATE_LIMIT_WAIT_S,
+        request_timeout: float = 5.0,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.plan = (plan or get_provider_plan('polygon')).lower()
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter or get_rate_limiter('polygon', self.plan)
+        self.session_pool = session_pool or get_session_pool()
+        self.rate_limit_wait = rate_limit_wait
+        self.timeout = aiohttp.ClientTimeout(total=request_timeout)
+        self.snapshots_supported = self.plan in _SNAPSHOT_PLANS
+
+    async def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Tuple[int, Optional[Dict]]:
+        """GET a JSON document, returning (status, body); status 0 means the request never completed"""
+        if not await self.rate_limiter.acquire(self.rate_limit_wait):
+            return 429, None
+        params = {**(params or {}), 'apiKey': self.api_key}
+        try:
+            async with self.session_pool.get().get(url, params=params, timeout=self.timeout) as response:
+                if response.status != 200:
+                    return response.status, None
+                return 200, await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.debug(f"Polygon request failed for {url}: {e}")
+            return 0, None
+
+    async def fetch_chain_snapshot(self, underlying: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Snapshot of every contract on an underlying, keyed by contract ticker.
+
+        Returns:
+            Snapshot entries, or None when the plan has no snapshot access
+        """
+        if not self.snapshots_supported:
+            return None
+
+        url = f"{self.base_url}/v3/snapshot/options/{underlying.upper()}"
+        params: Optional[Dict[str, Any]] = {'limit': SNAPSHOT_PAGE_LIMIT}
+        snapshots: Dict[str, Dict[str, Any]] = {}
+        for _ in range(SNAPSHOT_MAX_PAGES):
+            status, data = await self._get_json(url, params)
+            if status in (401, 403):
+                # Not entitled; stop trying for the lifetime of this fetcher
+                logger.info(f"Polygon plan '{self.plan}' has no options snapshot access; using per-contract quotes")
+                self.snapshots_supported = False
+                return None
+            if data is None:
+                break
+            for entry in data.get('results') or []:
+                ticker = (entry.get('details') or {}).get('ticker')
+                if ticker:
+                    snapshots[ticker] = entry
+            # next_url already carries the cursor and limit
+            url, params = data.get('next_url'), None
+            if not url:
+                break
+        return snapshots or None
+
+    async def fetch_prev_aggs(self, tickers: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Previous-day aggregate bar for each contract, fetched concurrently.
+
+        Contracts without data are omitted. After the first 429 response, no
+        further requests are sent.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        rate_limited = asyncio.Event()
+        results: Dict[str, Dict[str, Any]] = {}
+
+        async def fetch(ticker: str) -> None:
+            async with semaphore:
+                if rate_limited.is_set():
+                    return
+                status, data = await self._get_json(
+                    f"{self.base_url}/v2/aggs/ticker/{ticker}/prev", {'adjusted': 'true'}
+                )
+            if status == 429:
+                rate_limited.set()
+            elif data and data.get('results'):
+                results[ticker] = data['results'][0]
+
+        unique = list(dict.fromkeys(t for t in tickers if t))
+        await asyncio.gather(*(fetch(t) for t in unique))
+        if rate_limited.is_set():
+            logger.warning(
+                f"Polygon rate limit reached; got aggregates for {len(results)}/{len(unique)} contracts"
+            )
+        return results
+
+    async def fetch_quotes(self, underlying: str, tickers: Iterable[str]) -> Dict[str, Quote]:
+        """
+        Quote for each contract ticker. Contracts with no data are omitted.
+
+        Args:
+            underlying: Underlying symbol, used for the chain snapshot
+            tickers: Option contract tickers (e.g. 'O:AAPL250117C00150000')
+        """
+        tickers = list(dict.fromkeys(t for t in tickers if t))
+        quotes: Dict[str, Quote] = {}
+
+        snapshots = await self.fetch_chain_snapshot(underlying) or {}
+        for ticker in tickers:
+            snapshot = snapshots.get(ticker)
+            if snapshot is not None:
+                quotes[ticker] = quote_from_snapshot(snapshot)
+
+        missing = [t for t in tickers if t not in quotes]
+        if missing:
+            for ticker, agg in (await self.fetch_prev_aggs(missing)).items():
+                quotes[ticker] = quote_from_prev_agg(agg)
+        return quotes
+
+    def fetch_quotes_sync(
+        self, underlying: str, tickers: Iterable[str], timeout: float = DEFAULT_CHAIN_TIMEOUT_S
+    ) -> Dict[str, Quote]:
+        return run_sync(self.fetch_quotes(underlying, list(tickers)), timeout)
+
+    def fetch_prev_aggs_sync(
+        self, tickers: Iterable[str], timeout: float = DEFAULT_CHAIN_TIMEOUT_S
+    ) -> Dict[str, Dict[str, Any]]:
+        return run_sync(self.fetch_prev_aggs(list(tickers)), timeout)
+
+    def fetch_chain_snapshot_sync(
+        self, underlying: str, timeout: float = DEFAULT_CHAIN_TIMEOUT_S
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        return run_sync(self.fetch_chain_snapshot(underlying), timeout)
+
+
+_fetchers: Dict[str, PolygonOptionsFetcher] = {}
+_fetchers_lock = threading.Lock()
+
+
+def get_polygon_options_fetcher(api_key: str) -> PolygonOptionsFetcher:
+    """Shared fetcher per API key (keeps the snapshot-entitlement discovery)"""
+    with _fetchers_lock:
+        fetcher = _fetchers.get(api_key)
+        if fetcher is None:
+            fetcher = _fetchers[api_key] = PolygonOptionsFetcher(api_key)
+        return fetcher
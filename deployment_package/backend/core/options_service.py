@@ -18,6 +18,8 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
+from .options_quote_fetcher import EMPTY_QUOTE, get_polygon_options_fetcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -919,6 +921,11 @@ class OptionsAnalysisService:
                 logger.info(f"No options contracts found for {symbol}")
                 return None
             
+            # Fetch quotes for the whole chain concurrently
+            quotes = self._get_option_quotes(
+                symbol, [c.get('ticker', '') for c in results if c.get('expiration_date')]
+            )
+            
             # Group contracts by expiration date
             options_by_expiry: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
             expiration_dates = set()
@@ -936,9 +943,8 @@ class OptionsAnalysisService:
                 contract_type = contract.get('contract_type', '').lower()
                 strike = contract.get('strike_price', 0)
                 
-                # Get quotes for this contract (if available)
                 contract_ticker = contract.get('ticker', '')
-                bid, ask, volume, last_price = self._get_option_quote(contract_ticker)
+                bid, ask, volume, last_price = quotes.get(contract_ticker, EMPTY_QUOTE)
                 
                 option_data = {
                     'symbol': symbol,
@@ -983,9 +989,8 @@ class OptionsAnalysisService:
                     all_calls.extend(options_by_expiry[exp]['calls'])
                     all_puts.extend(options_by_expiry[exp]['puts'])
             
-            # Calculate Greeks for all contracts
-            for contract in all_calls + all_puts:
-                self._calculate_greeks(contract, underlying_price)
+            # Calculate IV and Greeks for all contracts in one vectorized pass
+            self._calculate_chain_greeks(all_calls + all_puts, underlying_price)
             
             # Sort by strike for easier display
             all_calls = sorted(all_calls, key=lambda x: (x['expiration_date'], x['strike']))
@@ -1012,53 +1017,23 @@ class OptionsAnalysisService:
             logger.warning(f"Error fetching real options chain from Polygon for {symbol}: {e}")
             return None
     
-    def _get_option_quote(self, contract_ticker: str) -> tuple:
+    def _get_option_quotes(self, symbol: str, contract_tickers: List[str]) -> Dict[str, tuple]:
         """
-        Get bid, ask, volume, and last price for an options contract from Polygon
+        Get (bid, ask, volume, last price) for many contracts at once.
+
+        Uses Polygon's chain snapshot where the plan allows it, otherwise
+        concurrent rate-limited per-contract requests. Contracts without
+        data are omitted.
         """
-        if not self.polygon_api_key:
-            return 0.0, 0.0, 0, 0.0
+        if not self.polygon_api_key or not contract_tickers:
+            return {}
         
         try:
-            import requests
-            # Get previous day's close for the option
-            url = f"https://api.polygon.io/v2/aggs/ticker/{contract_ticker}/prev"
-            params = {'adjusted': 'true', 'apiKey': self.polygon_api_key}
-            response = requests.get(url, params=params, timeout=5)
-            
-            if response.ok:
-                data = response.json()
-                results = data.get('results', [])
-                if results and len(results) > 0:
-                    last_price = float(results[0].get('c', 0))  # close price
-                    volume = int(results[0].get('v', 0))
-                    # Estimate bid/ask spread (typically 1-2% for liquid options)
-                    spread = last_price * 0.02
-                    bid = max(0, last_price - spread / 2)
-                    ask = last_price + spread / 2
-                    return bid, ask, volume, last_price
-            
-            # Fallback: try to get snapshot if available
-            url = f"https://api.polygon.io/v2/snapshot/option/{contract_ticker}"
-            params = {'apiKey': self.polygon_api_key}
-            response = requests.get(url, params=params, timeout=5)
-            
-            if response.ok:
-                data = response.json()
-                # Polygon snapshot format may vary
-                if 'results' in data and len(data['results']) > 0:
-                    result = data['results'][0]
-                    bid = float(result.get('bid', 0))
-                    ask = float(result.get('ask', 0))
-                    last_price = float(result.get('last_quote', {}).get('last', 0))
-                    volume = int(result.get('day', {}).get('v', 0))
-                    return bid, ask, volume, last_price
-            
-            return 0.0, 0.0, 0, 0.0
-            
+            fetcher = get_polygon_options_fetcher(self.polygon_api_key)
+            return fetcher.fetch_quotes_sync(symbol, contract_tickers)
         except Exception as e:
-            logger.debug(f"Could not get quote for {contract_ticker}: {e}")
-            return 0.0, 0.0, 0, 0.0
+            logger.warning(f"Could not fetch option quotes for {symbol}: {e}")
+            return {}
     
     def _calculate_intrinsic_value(self, underlying_price: float, strike: float, option_type: str) -> float:
         """Calculate intrinsic value of an option"""
@@ -1082,106 +1057,116 @@ class OptionsAnalysisService:
         """
         Calculate Greeks using the Black-Scholes model.
 
+        Single-contract wrapper over _calculate_chain_greeks.
+        """
+        self._calculate_chain_greeks([contract], underlying_price)
+
+    def _calculate_chain_greeks(self, contracts: List[Dict[str, Any]], underlying_price: float):
+        """
+        Calculate Black-Scholes IV and Greeks for a whole chain in one pass.
+
         This provides accurate, real Greeks calculations based on:
         - Current underlying price (real from Finnhub/Polygon)
         - Strike price (real from Polygon)
         - Time to expiration (real from contract data)
-        - Implied volatility (estimated from market price or historical vol)
+        - Implied volatility (solved from market price for all contracts at once)
         - Risk-free rate (current Treasury rate approximation)
+
+        Results are written back into the contract dicts; contracts whose IV
+        had to be solved also get 'iv_converged'.
         """
+        if not contracts:
+            return
         try:
-            import math
-            from scipy.stats import norm
+            import numpy as np
+            from scipy.special import ndtr
 
-            strike = float(contract.get('strike', 0))
-            option_type = contract.get('option_type', 'call').lower()
-            days_to_exp = contract.get('days_to_expiration', 30)
-
-            # Get market price for IV calculation
-            market_price = contract.get('last_price', 0) or contract.get('ask', 0)
-
-            if days_to_exp <= 0:
-                days_to_exp = 1
-            if strike <= 0 or underlying_price <= 0:
-                self._set_default_greeks(contract, option_type)
-                return
-
-            # Time to expiration in years
-            T = days_to_exp / 365.0
-            S = underlying_price  # Spot price
-            K = strike            # Strike price
+            S = float(underlying_price)
             r = self._risk_free_rate  # Configurable via set_risk_free_rate() or RISK_FREE_RATE env var
+            option_types = [str(c.get('option_type', 'call')).lower() for c in contracts]
+            K = np.array([float(c.get('strike', 0) or 0) for c in contracts])
+            days = np.array([c.get('days_to_expiration', 30) for c in contracts], dtype=float)
+            days = np.where(days <= 0, 1.0, days)
+            T = days / 365.0  # Time to expiration in years
+            is_call = np.array([t == 'call' for t in option_types])
+            # Get market price for IV calculation
+            market_price = np.array(
+                [float(c.get('last_price', 0) or c.get('ask', 0) or 0) for c in contracts]
+            )
+            quoted_iv = np.array([float(c.get('implied_volatility', 0) or 0) for c in contracts])
 
-            # Estimate implied volatility from market price, or use historical estimate
-            iv = contract.get('implied_volatility', 0)
-            if iv <= 0 or iv > 5:  # Invalid IV, estimate it
-                iv = self._estimate_implied_volatility(S, K, T, r, market_price, option_type)
-
-            sigma = iv  # Volatility
-
-            # Prevent division by zero
-            if T <= 0 or sigma <= 0:
-                self._set_default_greeks(contract, option_type)
-                return
-
-            sqrt_T = math.sqrt(T)
-
-            # Black-Scholes d1 and d2
-            d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
-            d2 = d1 - sigma * sqrt_T
-
-            # Standard normal PDF and CDF
-            N_d1 = norm.cdf(d1)
-            N_d2 = norm.cdf(d2)
-            N_neg_d1 = norm.cdf(-d1)
-            N_neg_d2 = norm.cdf(-d2)
-            n_d1 = norm.pdf(d1)  # PDF for gamma/vega calculations
-
-            # Calculate Greeks based on option type
-            if option_type == 'call':
-                # Delta: Rate of change of option price with respect to underlying
-                delta = N_d1
-
-                # Theta: Time decay (per day, negative for long options)
-                theta = (-(S * n_d1 * sigma) / (2 * sqrt_T)
-                        - r * K * math.exp(-r * T) * N_d2) / 365
-
-                # Rho: Sensitivity to interest rate changes
-                rho = K * T * math.exp(-r * T) * N_d2 / 100
-            else:  # put
-                # Delta for puts is negative
-                delta = N_d1 - 1  # or equivalently: -N_neg_d1
-
-                # Theta for puts
-                theta = (-(S * n_d1 * sigma) / (2 * sqrt_T)
-                        + r * K * math.exp(-r * T) * N_neg_d2) / 365
+            valid = (K > 0) & (S > 0)
 
-                # Rho for puts
-                rho = -K * T * math.exp(-r * T) * N_neg_d2 / 100
+            # Use quoted IV when sane, otherwise estimate it
+            needs_iv = valid & ((quoted_iv <= 0) | (quoted_iv > 5))
+            iv = quoted_iv.copy()
+            converged = np.ones(len(contracts), dtype=bool)
+            if needs_iv.any():
+                est_iv, est_converged = self._estimate_implied_volatility_array(
+                    S, K[needs_iv], T[needs_iv], r, market_price[needs_iv], is_call[needs_iv]
+                )
+                iv[needs_iv] = est_iv
+                converged[needs_iv] = est_converged
 
-            # Gamma: Rate of change of delta (same for calls and puts)
-            gamma = n_d1 / (S * sigma * sqrt_T)
+            # Invalid contracts get placeholder inputs and are replaced by defaults below
+            with np.errstate(all='ignore'):
+                sigma = np.where(valid & (iv > 0), iv, 1.0)
+                sqrt_T = np.sqrt(T)
+                safe_K = np.where(valid, K, 1.0)
 
-            # Vega: Sensitivity to volatility (same for calls and puts)
-            # Expressed per 1% change in volatility
-            vega = S * n_d1 * sqrt_T / 100
+                # Black-Scholes d1 and d2
+                d1 = (np.log(max(S, 1e-12) / safe_K) + (r + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
+                d2 = d1 - sigma * sqrt_T
 
-            # Store calculated Greeks
-            contract['delta'] = round(delta, 4)
-            contract['gamma'] = round(gamma, 4)
-            contract['theta'] = round(theta, 4)
-            contract['vega'] = round(vega, 4)
-            contract['rho'] = round(rho, 4)
-            contract['implied_volatility'] = round(iv, 4)
+                # Standard normal PDF and CDF
+                N_d1 = ndtr(d1)
+                N_d2 = ndtr(d2)
+                N_neg_d2 = ndtr(-d2)
+                n_d1 = np.exp(-0.5 * d1 ** 2) / np.sqrt(2 * np.pi)  # PDF for gamma/vega calculations
+                discount = np.exp(-r * T)
+                theta_decay = -(S * n_d1 * sigma) / (2 * sqrt_T)
+
+                # Calls: delta N(d1); puts: N(d1) - 1 (negative)
+                delta = np.where(is_call, N_d1, N_d1 - 1)
+                # Theta: time decay per day
+                theta = np.where(
+                    is_call,
+                    theta_decay - r * K * discount * N_d2,
+                    theta_decay + r * K * discount * N_neg_d2,
+                ) / 365
+                # Rho: sensitivity to interest rate changes
+                rho = np.where(is_call, K * T * discount * N_d2, -K * T * discount * N_neg_d2) / 100
+                # Gamma and vega (per 1% vol) are the same for calls and puts
+                gamma = n_d1 / (S * sigma * sqrt_T)
+                vega = S * n_d1 * sqrt_T / 100
+
+            usable = valid & (iv > 0)
+            for values in (delta, gamma, theta, vega, rho):
+                usable &= np.isfinite(values)
+
+            for i, contract in enumerate(contracts):
+                if not usable[i]:
+                    self._set_default_greeks(contract, option_types[i])
+                    continue
+                # Store calculated Greeks
+                contract['delta'] = round(float(delta[i]), 4)
+                contract['gamma'] = round(float(gamma[i]), 4)
+                contract['theta'] = round(float(theta[i]), 4)
+                contract['vega'] = round(float(vega[i]), 4)
+                contract['rho'] = round(float(rho[i]), 4)
+                contract['implied_volatility'] = round(float(iv[i]), 4)
+                if needs_iv[i]:
+                    contract['iv_converged'] = bool(converged[i])
 
             logger.debug(
-                f"Calculated Greeks for {contract.get('contract_symbol', 'N/A')}: "
-                f"Δ={delta:.3f} Γ={gamma:.4f} Θ={theta:.4f} V={vega:.3f} ρ={rho:.4f} IV={iv:.2%}"
+                f"Calculated Greeks for {len(contracts)} contracts "
+                f"({int(needs_iv.sum())} IVs solved, {int((needs_iv & ~converged).sum())} not converged)"
             )
 
         except Exception as e:
             logger.warning(f"Error calculating Black-Scholes Greeks: {e}")
-            self._set_default_greeks(contract, contract.get('option_type', 'call'))
+            for contract in contracts:
+                self._set_default_greeks(contract, contract.get('option_type', 'call'))
 
     def _set_default_greeks(self, contract: Dict[str, Any], option_type: str):
         """Set sensible default Greeks when calculation fails."""
@@ -1202,65 +1187,50 @@ class OptionsAnalysisService:
         option_type: str
     ) -> float:
         """
-        Estimate implied volatility using Newton-Raphson method.
+        Estimate implied volatility for one contract.
 
-        If market price is not available, falls back to historical volatility estimate.
+        Scalar wrapper over _estimate_implied_volatility_array.
         """
         try:
-            import math
-            from scipy.stats import norm
-
-            # If no market price, estimate based on moneyness and time
-            if market_price <= 0:
-                # Base volatility estimate from moneyness
-                moneyness = S / K
-                if moneyness > 1.1:  # Deep ITM
-                    return 0.25
-                elif moneyness < 0.9:  # Deep OTM
-                    return 0.35
-                else:  # ATM
-                    return 0.30
-
-            # Newton-Raphson iteration to find IV
-            sigma = 0.30  # Initial guess
-            max_iterations = 100
-            tolerance = 0.0001
-
-            for i in range(max_iterations):
-                # Calculate option price with current sigma
-                sqrt_T = math.sqrt(T)
-                d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
-                d2 = d1 - sigma * sqrt_T
-
-                if option_type == 'call':
-                    price = S * norm.cdf(d1) - K * math.exp(-r * T) * norm.cdf(d2)
-                else:
-                    price = K * math.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
-
-                # Calculate vega for Newton-Raphson update
-                vega = S * norm.pdf(d1) * sqrt_T
+            iv, _ = self._estimate_implied_volatility_array(
+                S, [K], [T], r, [market_price], [option_type == 'call']
+            )
+            return float(iv[0])
+        except Exception as e:
+            logger.debug(f"IV estimation failed: {e}, using default")
+            return 0.30  # Default 30% volatility
 
-                if vega < 0.0001:  # Avoid division by zero
-                    break
+    def _estimate_implied_volatility_array(self, S, K, T, r, market_price, is_call):
+        """
+        Estimate implied volatilities with the batched safeguarded Newton solver.
 
-                # Price difference
-                diff = market_price - price
+        Contracts without a market price fall back to a moneyness-based
+        estimate. Converged IVs are clamped to [5%, 300%], the rest to
+        [10%, 200%].
 
-                if abs(diff) < tolerance:
-                    return max(0.05, min(sigma, 3.0))  # Clamp between 5% and 300%
+        Returns:
+            (iv, converged) arrays
+        """
+        import numpy as np
+        from .implied_volatility import implied_volatility
 
-                # Newton-Raphson update
-                sigma = sigma + diff / vega
+        K = np.asarray(K, dtype=float)
+        market_price = np.asarray(market_price, dtype=float)
+        result = implied_volatility(market_price, S, K, T, r, is_call)
 
-                # Keep sigma in reasonable bounds
-                sigma = max(0.01, min(sigma, 5.0))
+        iv = np.where(
+            result.converged,
+            np.clip(result.iv, 0.05, 3.0),
+            np.clip(result.iv, 0.10, 2.0),
+        )
 
-            return max(0.10, min(sigma, 2.0))  # Return reasonable IV
+        # If no market price, estimate based on moneyness and time
+        moneyness = S / np.where(K > 0, K, np.nan)
+        by_moneyness = np.where(moneyness > 1.1, 0.25, np.where(moneyness < 0.9, 0.35, 0.30))
+        no_price = market_price <= 0
+        iv = np.where(no_price, by_moneyness, iv)
+        return iv, result.converged & ~no_price
 
-        except Exception as e:
-            logger.debug(f"IV estimation failed: {e}, using default")
-            return 0.30  # Default 30% volatility
-    
     def _get_real_unusual_flow(
         self,
         symbol: str,
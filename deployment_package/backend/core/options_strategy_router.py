@@ -13,10 +13,11 @@ Expected output format is designed for the Flight Manual UI template.
 
 import logging
 import json
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import numpy as np
 
+from .option_chain import OptionChain
 from .options_valuation_engine import (
     TradeValuation,
     OptionLeg,
@@ -26,6 +27,9 @@ from .options_valuation_engine import (
 
 logger = logging.getLogger(__name__)
 
+# Wing legs must sit within this many points of the target strike
+WING_STRIKE_TOLERANCE = 2.0
+
 
 class StrategyRouter:
     """
@@ -55,7 +59,7 @@ class StrategyRouter:
     def route_regime(
         self,
         regime: str,
-        option_chain: List[Dict],
+        option_chain: Union[List[Dict], Dict, OptionChain],
         iv: float,
         days_to_expiration: int,
         portfolio_state: Optional[Dict] = None
@@ -65,7 +69,8 @@ class StrategyRouter:
         
         Args:
             regime: Current market regime (e.g., "CRASH_PANIC")
-            option_chain: List of available options with strikes, bid/ask
+            option_chain: Available options: a list of contract dicts, a
+                {expiry: {strike: {type: contract}}} mapping, or an OptionChain
             iv: Implied volatility (0-1 scale, e.g., 0.25 = 25%)
             days_to_expiration: DTE for the chain
             portfolio_state: Optional current portfolio state for risk fit
@@ -87,12 +92,15 @@ class StrategyRouter:
         
         logger.info(f"🎯 Routing {regime}: {len(eligible_strategies)} strategies eligible")
         
+        # Index the chain once; every strategy generator shares it
+        chain = OptionChain.build(option_chain)
+        
         # Step 2: Generate candidates for each strategy
         candidates = []
         for strategy_name in eligible_strategies:
             strategy_candidates = self._generate_candidates(
                 strategy_name,
-                option_chain,
+                chain,
                 iv,
                 days_to_expiration,
                 playbook
@@ -138,7 +146,7 @@ class StrategyRouter:
     def _generate_candidates(
         self,
         strategy_name: str,
-        option_chain: List[Dict],
+        chain: OptionChain,
         iv: float,
         dte: int,
         playbook: Dict
@@ -148,7 +156,7 @@ class StrategyRouter:
         
         Args:
             strategy_name: Strategy type (e.g., "IRON_CONDOR")
-            option_chain: Available options
+            chain: Indexed option chain
             iv: Implied volatility
             dte: Days to expiration
             playbook: Regime playbook (contains target Greeks)
@@ -170,23 +178,23 @@ class StrategyRouter:
         # Strategy-specific candidate generation
         if strategy_name == "IRON_CONDOR":
             candidates = self._generate_iron_condors(
-                option_chain, iv, dte, target_delta
+                chain, iv, dte, target_delta
             )
         elif strategy_name == "BULL_CALL_SPREAD":
             candidates = self._generate_bull_call_spreads(
-                option_chain, iv, dte, target_delta
+                chain, iv, dte, target_delta
             )
         elif strategy_name == "BULL_PUT_SPREAD":
             candidates = self._generate_bull_put_spreads(
-                option_chain, iv, dte, target_delta
+                chain, iv, dte, target_delta
             )
         elif strategy_name == "CASH_SECURED_PUT":
             candidates = self._generate_cash_secured_puts(
-                option_chain, iv, dte, target_delta
+                chain, iv, dte, target_delta
             )
         elif strategy_name == "COVERED_CALL":
             candidates = self._generate_covered_calls(
-                option_chain, iv, dte, target_delta
+                chain, iv, dte, target_delta
             )
         # Add more strategies as needed
         
@@ -201,7 +209,7 @@ class StrategyRouter:
     
     def _generate_iron_condors(
         self,
-        option_chain: List[Dict],
+        chain: OptionChain,
         iv: float,
         dte: int,
         target_delta: float
@@ -212,105 +220,54 @@ class StrategyRouter:
         Iron Condor = Short Put Spread + Short Call Spread
         Structure: Long Put, Short Put, Short Call, Long Call
         
+        Every short put / short call pair in the ~15-25 delta bands is
+        combined with wings at each width, for every expiry.
+        
         Delta target: Usually 0.10-0.20 (slightly bullish or neutral)
         Max profit: Credit collected
         Max loss: Width of spreads - credit
         """
         candidates = []
         
-        # Filter puts and calls from chain
-        puts = [o for o in option_chain if o["option_type"] == "put"]
-        calls = [o for o in option_chain if o["option_type"] == "call"]
-        
-        if len(puts) < 2 or len(calls) < 2:
-            return candidates
-        
-        # Generate multiple condor widths (20pt, 25pt, 30pt)
-        for width in [20, 25, 30]:
-            # Find put legs (short put ~15-20 delta, long put further OTM)
-            short_puts = [p for p in puts 
-                         if p.get("delta", 0) >= -0.25 and p.get("delta", 0) <= -0.15]
-            if not short_puts:
-                continue
-            
-            short_put = short_puts[0]
-            short_put_strike = short_put["strike"]
-            long_put_strike = short_put_strike - width
-            
-            long_put = next(
-                (p for p in puts if abs(p["strike"] - long_put_strike) < 2),
-                None
-            )
-            
-            if not long_put:
+        for expiry in chain.expiries:
+            puts = chain.slice(expiry, "put")
+            calls = chain.slice(expiry, "call")
+            if puts is None or calls is None or len(puts) < 2 or len(calls) < 2:
                 continue
             
-            # Find call legs (short call ~15-20 delta, long call further OTM)
-            short_calls = [c for c in calls 
-                          if c.get("delta", 0) >= 0.15 and c.get("delta", 0) <= 0.25]
-            if not short_calls:
+            short_puts = puts.delta_band(-0.25, -0.15)
+            short_calls = calls.delta_band(0.15, 0.25)
+            if short_puts.size == 0 or short_calls.size == 0:
                 continue
             
-            short_call = short_calls[0]
-            short_call_strike = short_call["strike"]
-            long_call_strike = short_call_strike + width
-            
-            long_call = next(
-                (c for c in calls if abs(c["strike"] - long_call_strike) < 2),
-                None
-            )
-            
-            if not long_call:
-                continue
-            
-            # Build the structure
-            candidate = {
-                "structure": "Iron Condor",
-                "legs": [
-                    {
-                        "strike": long_put_strike,
-                        "option_type": "put",
-                        "bid": long_put.get("bid", 0),
-                        "ask": long_put.get("ask", 0),
-                        "is_long": True,
-                        "quantity": 1,
-                    },
-                    {
-                        "strike": short_put_strike,
-                        "option_type": "put",
-                        "bid": short_put.get("bid", 0),
-                        "ask": short_put.get("ask", 0),
-                        "is_long": False,
-                        "quantity": 1,
-                    },
-                    {
-                        "strike": short_call_strike,
-                        "option_type": "call",
-                        "bid": short_call.get("bid", 0),
-                        "ask": short_call.get("ask", 0),
-                        "is_long": False,
-                        "quantity": 1,
-                    },
-                    {
-                        "strike": long_call_strike,
-                        "option_type": "call",
-                        "bid": long_call.get("bid", 0),
-                        "ask": long_call.get("ask", 0),
-                        "is_long": True,
-                        "quantity": 1,
-                    },
-                ],
-                "width": width,
-                "profit_zone": (short_put_strike, short_call_strike),
-            }
-            
-            candidates.append(candidate)
+            # Generate multiple condor widths (20pt, 25pt, 30pt)
+            for width in [20, 25, 30]:
+                long_puts = puts.nearest_many(puts.strikes[short_puts] - width, tolerance=WING_STRIKE_TOLERANCE)
+                long_calls = calls.nearest_many(calls.strikes[short_calls] + width, tolerance=WING_STRIKE_TOLERANCE)
+                put_sides = [(s, l) for s, l in zip(short_puts, long_puts) if l >= 0]
+                call_sides = [(s, l) for s, l in zip(short_calls, long_calls) if l >= 0]
+                
+                for short_put, long_put in put_sides:
+                    for short_call, long_call in call_sides:
+                        candidates.append({
+                            "structure": "Iron Condor",
+                            "legs": [
+                                puts.leg(long_put, is_long=True),
+                                puts.leg(short_put, is_long=False),
+                                calls.leg(short_call, is_long=False),
+                                calls.leg(long_call, is_long=True),
+                            ],
+                            "width": width,
+                            "profit_zone": (float(puts.strikes[short_put]), float(calls.strikes[short_call])),
+                            "expiration": expiry,
+                            "dte": puts.dte,
+                        })
         
         return candidates
     
     def _generate_bull_call_spreads(
         self,
-        option_chain: List[Dict],
+        chain: OptionChain,
         iv: float,
         dte: int,
         target_delta: float
@@ -327,58 +284,33 @@ class StrategyRouter:
         """
         candidates = []
         
-        calls = [o for o in option_chain if o["option_type"] == "call"]
-        if len(calls) < 2:
-            return candidates
-        
-        # Find call spreads with various widths
-        for width in [10, 15, 20, 25]:
-            for i, long_call in enumerate(calls):
-                short_call = next(
-                    (c for c in calls 
-                     if abs(c["strike"] - (long_call["strike"] + width)) < 2),
-                    None
-                )
-                
-                if short_call:
-                    candidate = {
+        for calls in chain.slices("call"):
+            if len(calls) < 2:
+                continue
+            
+            # Find call spreads with various widths
+            for width, long_calls, short_calls in calls.width_pairs(
+                [10, 15, 20, 25], tolerance=WING_STRIKE_TOLERANCE, direction=1
+            ):
+                for long_call, short_call in zip(long_calls, short_calls):
+                    candidates.append({
                         "structure": "Bull Call Spread",
                         "legs": [
-                            {
-                                "strike": long_call["strike"],
-                                "option_type": "call",
-                                "bid": long_call.get("bid", 0),
-                                "ask": long_call.get("ask", 0),
-                                "is_long": True,
-                                "quantity": 1,
-                            },
-                            {
-                                "strike": short_call["strike"],
-                                "option_type": "call",
-                                "bid": short_call.get("bid", 0),
-                                "ask": short_call.get("ask", 0),
-                                "is_long": False,
-                                "quantity": 1,
-                            },
+                            calls.leg(long_call, is_long=True),
+                            calls.leg(short_call, is_long=False),
                         ],
                         "width": width,
-                        "long_strike": long_call["strike"],
-                        "short_strike": short_call["strike"],
-                    }
-                    
-                    candidates.append(candidate)
-                    
-                    if len(candidates) >= 5:  # Limit candidates
-                        break
-            
-            if len(candidates) >= 5:
-                break
+                        "long_strike": float(calls.strikes[long_call]),
+                        "short_strike": float(calls.strikes[short_call]),
+                        "expiration": calls.expiry,
+                        "dte": calls.dte,
+                    })
         
         return candidates
     
     def _generate_bull_put_spreads(
         self,
-        option_chain: List[Dict],
+        chain: OptionChain,
         iv: float,
         dte: int,
         target_delta: float
@@ -387,57 +319,32 @@ class StrategyRouter:
         # Similar pattern to bull call spreads but with puts
         candidates = []
         
-        puts = [o for o in option_chain if o["option_type"] == "put"]
-        if len(puts) < 2:
-            return candidates
-        
-        for width in [10, 15, 20, 25]:
-            for short_put in puts:
-                long_put = next(
-                    (p for p in puts 
-                     if abs(p["strike"] - (short_put["strike"] - width)) < 2),
-                    None
-                )
-                
-                if long_put and short_put["strike"] > long_put["strike"]:
-                    candidate = {
+        for puts in chain.slices("put"):
+            if len(puts) < 2:
+                continue
+            
+            for width, short_puts, long_puts in puts.width_pairs(
+                [10, 15, 20, 25], tolerance=WING_STRIKE_TOLERANCE, direction=-1
+            ):
+                for short_put, long_put in zip(short_puts, long_puts):
+                    candidates.append({
                         "structure": "Bull Put Spread",
                         "legs": [
-                            {
-                                "strike": short_put["strike"],
-                                "option_type": "put",
-                                "bid": short_put.get("bid", 0),
-                                "ask": short_put.get("ask", 0),
-                                "is_long": False,
-                                "quantity": 1,
-                            },
-                            {
-                                "strike": long_put["strike"],
-                                "option_type": "put",
-                                "bid": long_put.get("bid", 0),
-                                "ask": long_put.get("ask", 0),
-                                "is_long": True,
-                                "quantity": 1,
-                            },
+                            puts.leg(short_put, is_long=False),
+                            puts.leg(long_put, is_long=True),
                         ],
                         "width": width,
-                        "short_strike": short_put["strike"],
-                        "long_strike": long_put["strike"],
-                    }
-                    
-                    candidates.append(candidate)
-                    
-                    if len(candidates) >= 5:
-                        break
-            
-            if len(candidates) >= 5:
-                break
+                        "short_strike": float(puts.strikes[short_put]),
+                        "long_strike": float(puts.strikes[long_put]),
+                        "expiration": puts.expiry,
+                        "dte": puts.dte,
+                    })
         
         return candidates
     
     def _generate_cash_secured_puts(
         self,
-        option_chain: List[Dict],
+        chain: OptionChain,
         iv: float,
         dte: int,
         target_delta: float
@@ -450,37 +357,24 @@ class StrategyRouter:
         """
         candidates = []
         
-        puts = [o for o in option_chain if o["option_type"] == "put"]
-        
         # Select puts with delta ~10-20% (OTM, lower risk)
-        for put in puts:
-            if -0.25 <= put.get("delta", 0) <= -0.10:
-                candidate = {
+        for puts in chain.slices("put"):
+            for i in puts.delta_band(-0.25, -0.10):
+                strike = float(puts.strikes[i])
+                candidates.append({
                     "structure": "Cash Secured Put",
-                    "legs": [
-                        {
-                            "strike": put["strike"],
-                            "option_type": "put",
-                            "bid": put.get("bid", 0),
-                            "ask": put.get("ask", 0),
-                            "is_long": False,
-                            "quantity": 1,
-                        },
-                    ],
-                    "strike": put["strike"],
-                    "capital_requirement": put["strike"] * 100,  # Full width secured
-                }
-                
-                candidates.append(candidate)
-                
-                if len(candidates) >= 5:
-                    break
+                    "legs": [puts.leg(i, is_long=False)],
+                    "strike": strike,
+                    "capital_requirement": strike * 100,  # Full width secured
+                    "expiration": puts.expiry,
+                    "dte": puts.dte,
+                })
         
         return candidates
     
     def _generate_covered_calls(
         self,
-        option_chain: List[Dict],
+        chain: OptionChain,
         iv: float,
         dte: int,
         target_delta: float
@@ -493,32 +387,18 @@ class StrategyRouter:
         """
         candidates = []
         
-        calls = [o for o in option_chain if o["option_type"] == "call"]
-        
         # Select calls with delta ~20-30% (OTM)
-        for call in calls:
-            if 0.20 <= call.get("delta", 0) <= 0.40:
-                candidate = {
+        for calls in chain.slices("call"):
+            for i in calls.delta_band(0.20, 0.40):
+                candidates.append({
                     "structure": "Covered Call",
-                    "legs": [
-                        {
-                            "strike": call["strike"],
-                            "option_type": "call",
-                            "bid": call.get("bid", 0),
-                            "ask": call.get("ask", 0),
-                            "is_long": False,
-                            "quantity": 1,
-                        },
-                    ],
-                    "strike": call["strike"],
+                    "legs": [calls.leg(i, is_long=False)],
+                    "strike": float(calls.strikes[i]),
                     "requires_stock": True,
                     "stock_requirement": 100,  # Per contract
-                }
-                
-                candidates.append(candidate)
-                
-                if len(candidates) >= 5:
-                    break
+                    "expiration": calls.expiry,
+                    "dte": calls.dte,
+                })
         
         return candidates
     
@@ -550,15 +430,15 @@ class StrategyRouter:
         
         scored = []
         
-        for candidate in candidates:
-            # Value the trade using Black-Scholes
-            valuation = self.valuation.value_spread(
-                legs=[
+        # Value every candidate with one Black-Scholes pass over all legs
+        valuations = self.valuation.value_spreads(
+            [
+                [
                     OptionLeg(
                         symbol=self.symbol,
                         option_type=OptionType[leg["option_type"].upper()],
                         strike=leg["strike"],
-                        expiration="",
+                        expiration=leg.get("expiration", ""),
                         price=(leg["bid"] + leg["ask"]) / 2,
                         bid=leg["bid"],
                         ask=leg["ask"],
@@ -566,11 +446,14 @@ class StrategyRouter:
                         quantity=leg.get("quantity", 1)
                     )
                     for leg in candidate["legs"]
-                ],
-                ttm_days=dte,
-                volatility=iv if iv > 0 else 0.25,  # Fallback if IV unavailable
-            )
-            
+                ]
+                for candidate in candidates
+            ],
+            ttm_days=[candidate.get("dte") or dte for candidate in candidates],
+            volatility=iv if iv > 0 else 0.25,  # Fallback if IV unavailable
+        )
+        
+        for candidate, valuation in zip(candidates, valuations):
             # Sub-scores (normalized 0-100)
             ev_score = self._normalize_score(
                 valuation["expected_value"],
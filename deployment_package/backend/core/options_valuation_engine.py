@@ -19,6 +19,7 @@ Efficiency = EV / Max_Loss (how much profit per $ risked)
 
 import math
 import numpy as np
+from scipy.special import ndtr
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
@@ -117,6 +118,9 @@ class BlackScholesCalculator:
     
     Implements the standard Black-Scholes model for European options.
     American options are approximated using Whaley's correction.
+    
+    greeks_array() prices whole chains in one NumPy pass; the per-leg
+    methods are thin wrappers over it.
     """
     
     # Risk-free rate (treasury yield, typically 4-5% as of 2026)
@@ -133,9 +137,9 @@ class BlackScholesCalculator:
         self.spot = spot
         self.rate = rate
     
-    def _d1(self, strike: float, ttm_years: float, volatility: float) -> float:
+    def _d1(self, strike, ttm_years, volatility):
         """
-        Calculate d1 from Black-Scholes model.
+        Calculate d1 from Black-Scholes model (scalars or arrays).
         
         Args:
             strike: Strike price
@@ -143,100 +147,138 @@ class BlackScholesCalculator:
             volatility: Implied volatility (annualized)
         
         Returns:
-            d1 value
+            d1 value (0 where ttm_years <= 0 or volatility <= 0)
         """
-        if ttm_years <= 0 or volatility <= 0:
-            return 0.0
-        
-        numerator = math.log(self.spot / strike) + (
-            self.rate + 0.5 * volatility ** 2
-        ) * ttm_years
-        denominator = volatility * math.sqrt(ttm_years)
-        
-        return numerator / denominator
+        strike, ttm_years, volatility = np.broadcast_arrays(
+            np.asarray(strike, dtype=float),
+            np.asarray(ttm_years, dtype=float),
+            np.asarray(volatility, dtype=float),
+        )
+        valid = (ttm_years > 0) & (volatility > 0)
+        t = np.where(valid, ttm_years, 1.0)
+        v = np.where(valid, volatility, 1.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            d1 = (np.log(self.spot / strike) + (self.rate + 0.5 * v ** 2) * t) / (v * np.sqrt(t))
+        d1 = np.where(valid, d1, 0.0)
+        return d1 if d1.ndim else float(d1)
     
-    def _d2(self, strike: float, ttm_years: float, volatility: float) -> float:
-        """Calculate d2 from Black-Scholes model."""
-        if ttm_years <= 0 or volatility <= 0:
-            return 0.0
-        
-        d1 = self._d1(strike, ttm_years, volatility)
-        return d1 - volatility * math.sqrt(ttm_years)
+    def _d2(self, strike, ttm_years, volatility):
+        """Calculate d2 from Black-Scholes model (scalars or arrays)."""
+        ttm_years = np.asarray(ttm_years, dtype=float)
+        volatility = np.asarray(volatility, dtype=float)
+        valid = (ttm_years > 0) & (volatility > 0)
+        d2 = self._d1(strike, ttm_years, volatility) - np.where(
+            valid, volatility * np.sqrt(np.where(valid, ttm_years, 0.0)), 0.0
+        )
+        return d2 if np.ndim(d2) else float(d2)
     
-    def calculate_call_greeks(
+    def greeks_array(
         self,
-        strike: float,
-        ttm_days: int,
-        volatility: float
-    ) -> Greeks:
+        strikes,
+        ttm_days,
+        volatilities,
+        is_call,
+    ) -> Dict[str, np.ndarray]:
         """
-        Calculate Greeks for a call option.
+        Greeks for a vector of legs in one pass.
+        
+        Inputs broadcast against each other, so a whole chain (or several
+        expiries) can share a scalar IV/TTM or carry per-leg values.
         
         Args:
-            strike: Strike price
+            strikes: Strike prices
             ttm_days: Days to expiration
-            volatility: Implied volatility (0-1 scale, e.g., 0.25 = 25% IV)
+            volatilities: Implied volatilities (0-1 scale)
+            is_call: True for calls, False for puts
         
         Returns:
-            Greeks object with delta, gamma, theta, vega, rho
+            Dict of arrays: delta, gamma, theta (per day), vega (per 1% IV), rho (per 1% rate)
         """
-        if ttm_days <= 0:
-            # Expired option
-            return Greeks(
-                delta=1.0 if self.spot > strike else 0.0,
-                gamma=0.0,
-                theta=0.0,
-                vega=0.0,
-                rho=0.0
-            )
+        strikes, ttm_days, volatilities, is_call = np.broadcast_arrays(
+            np.asarray(strikes, dtype=float),
+            np.asarray(ttm_days, dtype=float),
+            np.asarray(volatilities, dtype=float),
+            np.asarray(is_call, dtype=bool),
+        )
+        live = ttm_days > 0
+        has_vol = live & (volatilities > 0)
         
-        ttm_years = ttm_days / 365.0
+        ttm_years = np.where(live, ttm_days, 0.0) / 365.0
+        sqrt_t = np.sqrt(ttm_years)
+        discount = np.exp(-self.rate * ttm_years)
         
-        d1 = self._d1(strike, ttm_years, volatility)
-        d2 = self._d2(strike, ttm_years, volatility)
+        d1 = np.asarray(self._d1(strikes, ttm_years, volatilities))
+        d2 = np.asarray(self._d2(strikes, ttm_years, volatilities))
+        n_d1 = ndtr(d1)
+        n_d2 = ndtr(d2)
+        density = np.exp(-0.5 * d1 ** 2)
         
-        # Greeks
-        delta = math.exp(-self.rate * ttm_years) * math.cdf(d1)
+        delta = np.where(is_call, discount * n_d1, -discount * (1 - n_d1))
         
         # Gamma (same for calls and puts)
-        gamma = (
-            math.exp(-self.rate * ttm_years) *
-            (1 / (self.spot * volatility * math.sqrt(2 * math.pi * ttm_years))) *
-            math.exp(-0.5 * d1 ** 2)
-        )
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gamma = discount * (1 / (self.spot * volatilities * np.sqrt(2 * math.pi * ttm_years))) * density
+        gamma = np.where(has_vol, gamma, 0.0)
         
         # Theta (per day)
-        theta_component1 = (
-            -(self.spot * math.exp(-self.rate * ttm_years) *
-              (1 / math.sqrt(2 * math.pi)) * math.exp(-0.5 * d1 ** 2) *
-              volatility) / (2 * math.sqrt(ttm_years))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            theta_component1 = -(
+                self.spot * discount * (1 / math.sqrt(2 * math.pi)) * density * volatilities
+            ) / (2 * sqrt_t)
+        theta_component2 = np.where(
+            is_call,
+            self.rate * strikes * discount * n_d2,
+            -self.rate * strikes * discount * (1 - n_d2),
         )
-        theta_component2 = (
-            self.rate * strike * math.exp(-self.rate * ttm_years) *
-            math.cdf(d2)
-        )
-        theta = (theta_component1 - theta_component2) / 365.0  # Per day
-        
-        # Vega (per 1% change in IV, convert to per 0.01 change)
-        vega = (
-            self.spot * math.exp(-self.rate * ttm_years) *
-            (1 / math.sqrt(2 * math.pi)) * math.exp(-0.5 * d1 ** 2) *
-            math.sqrt(ttm_years) / 100.0
+        theta = np.where(is_call, theta_component1 - theta_component2, theta_component1 + theta_component2) / 365.0
+        
+        # Vega (per 1% change in IV)
+        vega = self.spot * discount * (1 / math.sqrt(2 * math.pi)) * density * sqrt_t / 100.0
+        
+        # Rho (per 1% change in rate; negative for puts)
+        rho = np.where(
+            is_call,
+            strikes * ttm_years * discount * n_d2,
+            -strikes * ttm_years * discount * (1 - n_d2),
+        ) / 100.0
+        
+        # Expired options: intrinsic delta only
+        expired_delta = np.where(
+            is_call,
+            (self.spot > strikes).astype(float),
+            -(self.spot < strikes).astype(float),
         )
+        zero = np.zeros_like(delta)
+        return {
+            "delta": np.where(live, delta, expired_delta),
+            "gamma": np.where(live, gamma, zero),
+            "theta": np.where(live, theta, zero),
+            "vega": np.where(live, vega, zero),
+            "rho": np.where(live, rho, zero),
+        }
+    
+    def _greeks(self, strike: float, ttm_days: int, volatility: float, is_call: bool) -> Greeks:
+        arrays = self.greeks_array(strike, ttm_days, volatility, is_call)
+        return Greeks(**{name: float(values) for name, values in arrays.items()})
+    
+    def calculate_call_greeks(
+        self,
+        strike: float,
+        ttm_days: int,
+        volatility: float
+    ) -> Greeks:
+        """
+        Calculate Greeks for a call option.
         
-        # Rho (per 1% change in rate)
-        rho = (
-            strike * ttm_years * math.exp(-self.rate * ttm_years) *
-            math.cdf(d2) / 100.0
-        )
+        Args:
+            strike: Strike price
+            ttm_days: Days to expiration
+            volatility: Implied volatility (0-1 scale, e.g., 0.25 = 25% IV)
         
-        return Greeks(
-            delta=delta,
-            gamma=gamma,
-            theta=theta,
-            vega=vega,
-            rho=rho
-        )
+        Returns:
+            Greeks object with delta, gamma, theta, vega, rho
+        """
+        return self._greeks(strike, ttm_days, volatility, True)
     
     def calculate_put_greeks(
         self,
@@ -255,63 +297,7 @@ class BlackScholesCalculator:
         Returns:
             Greeks object (note: delta is negative)
         """
-        if ttm_days <= 0:
-            # Expired option
-            return Greeks(
-                delta=-1.0 if self.spot < strike else 0.0,
-                gamma=0.0,
-                theta=0.0,
-                vega=0.0,
-                rho=0.0
-            )
-        
-        ttm_years = ttm_days / 365.0
-        
-        d1 = self._d1(strike, ttm_years, volatility)
-        d2 = self._d2(strike, ttm_years, volatility)
-        
-        # Greeks
-        delta = -math.exp(-self.rate * ttm_years) * (1 - math.cdf(d1))
-        
-        # Gamma (same for calls and puts)
-        gamma = (
-            math.exp(-self.rate * ttm_years) *
-            (1 / (self.spot * volatility * math.sqrt(2 * math.pi * ttm_years))) *
-            math.exp(-0.5 * d1 ** 2)
-        )
-        
-        # Theta (per day)
-        theta_component1 = (
-            -(self.spot * math.exp(-self.rate * ttm_years) *
-              (1 / math.sqrt(2 * math.pi)) * math.exp(-0.5 * d1 ** 2) *
-              volatility) / (2 * math.sqrt(ttm_years))
-        )
-        theta_component2 = (
-            -self.rate * strike * math.exp(-self.rate * ttm_years) *
-            (1 - math.cdf(d2))
-        )
-        theta = (theta_component1 + theta_component2) / 365.0  # Per day
-        
-        # Vega (same as call)
-        vega = (
-            self.spot * math.exp(-self.rate * ttm_years) *
-            (1 / math.sqrt(2 * math.pi)) * math.exp(-0.5 * d1 ** 2) *
-            math.sqrt(ttm_years) / 100.0
-        )
-        
-        # Rho (negative for puts)
-        rho = (
-            -strike * ttm_years * math.exp(-self.rate * ttm_years) *
-            (1 - math.cdf(d2)) / 100.0
-        )
-        
-        return Greeks(
-            delta=delta,
-            gamma=gamma,
-            theta=theta,
-            vega=vega,
-            rho=rho
-        )
+        return self._greeks(strike, ttm_days, volatility, False)
 
 
 class ProbabilityCalculator:
@@ -322,6 +308,52 @@ class ProbabilityCalculator:
     to estimate the probability that an option expires ITM.
     """
     
+    @staticmethod
+    def probability_itm_array(
+        spot: float,
+        strikes,
+        ttm_days,
+        volatilities,
+        is_call,
+        rate: float = 0.045
+    ) -> np.ndarray:
+        """
+        ITM probabilities for a vector of legs in one pass.
+        
+        Args:
+            spot: Current spot price
+            strikes: Strike prices
+            ttm_days: Days to expiration
+            volatilities: Implied volatilities (0-1 scale)
+            is_call: True for calls, False for puts
+            rate: Risk-free rate
+        
+        Returns:
+            Array of probabilities 0-1 that each leg expires ITM
+        """
+        strikes, ttm_days, volatilities, is_call = np.broadcast_arrays(
+            np.asarray(strikes, dtype=float),
+            np.asarray(ttm_days, dtype=float),
+            np.asarray(volatilities, dtype=float),
+            np.asarray(is_call, dtype=bool),
+        )
+        live = ttm_days > 0
+        ttm_years = np.where(live, ttm_days, 0.0) / 365.0
+        
+        # Use Black-Scholes d2 as proxy for ITM probability; zero IV is a
+        # deterministic forward (d2 = +/-inf)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            d2 = (
+                (np.log(spot / strikes) + (rate - 0.5 * volatilities ** 2) * ttm_years) /
+                (volatilities * np.sqrt(ttm_years))
+            )
+        d2 = np.nan_to_num(d2, nan=0.0)
+        prob_call = ndtr(d2)
+        prob_itm = np.where(is_call, prob_call, 1.0 - prob_call)
+        
+        expired = np.where(is_call, spot > strikes, spot < strikes).astype(float)
+        return np.where(live, prob_itm, expired)
+    
     @staticmethod
     def probability_call_itm(
         spot: float,
@@ -343,19 +375,9 @@ class ProbabilityCalculator:
         Returns:
             Probability 0-1 that call expires ITM
         """
-        if ttm_days <= 0:
-            return 1.0 if spot > strike else 0.0
-        
-        ttm_years = ttm_days / 365.0
-        
-        # Use Black-Scholes d2 as proxy for ITM probability
-        d2 = (
-            (math.log(spot / strike) + (rate - 0.5 * volatility ** 2) * ttm_years) /
-            (volatility * math.sqrt(ttm_years))
-        )
-        
-        prob_itm = math.cdf(d2)
-        return prob_itm
+        return float(ProbabilityCalculator.probability_itm_array(
+            spot, strike, ttm_days, volatility, True, rate
+        ))
     
     @staticmethod
     def probability_put_itm(
@@ -368,18 +390,9 @@ class ProbabilityCalculator:
         """
         Calculate probability that a put expires in-the-money.
         """
-        if ttm_days <= 0:
-            return 1.0 if spot < strike else 0.0
-        
-        ttm_years = ttm_days / 365.0
-        
-        d2 = (
-            (math.log(spot / strike) + (rate - 0.5 * volatility ** 2) * ttm_years) /
-            (volatility * math.sqrt(ttm_years))
-        )
-        
-        prob_itm = 1.0 - math.cdf(d2)
-        return prob_itm
+        return float(ProbabilityCalculator.probability_itm_array(
+            spot, strike, ttm_days, volatility, False, rate
+        ))
 
 
 class TradeValuation:
@@ -401,6 +414,58 @@ class TradeValuation:
         self.bs_calc = BlackScholesCalculator(spot)
         self.prob_calc = ProbabilityCalculator()
     
+    def value_legs(
+        self,
+        legs: List[OptionLeg],
+        ttm_days,
+        volatility
+    ) -> List[Dict]:
+        """
+        Value many option legs in one vectorized Black-Scholes pass.
+        
+        Args:
+            legs: OptionLeg objects
+            ttm_days: Days to expiration (scalar or one per leg)
+            volatility: Implied volatility (scalar or one per leg)
+        
+        Returns:
+            List of leg valuation dicts (see value_single_leg)
+        """
+        if not legs:
+            return []
+        
+        strikes = np.array([leg.strike for leg in legs], dtype=float)
+        is_call = np.array([leg.option_type == OptionType.CALL for leg in legs])
+        is_long = np.array([leg.is_long for leg in legs])
+        
+        greeks = self.bs_calc.greeks_array(strikes, ttm_days, volatility, is_call)
+        prob_itm = self.prob_calc.probability_itm_array(
+            self.spot, strikes, ttm_days, volatility, is_call
+        )
+        
+        # Short position = negative Greeks
+        sign = np.where(is_long, 1.0, -1.0)
+        greeks = {name: values * sign for name, values in greeks.items()}
+        
+        # PoP depends on position type: long call / short put win when ITM
+        pop = np.where(is_long == is_call, prob_itm, 1.0 - prob_itm)
+        
+        valuations = []
+        for i, leg in enumerate(legs):
+            valuations.append({
+                "symbol": leg.symbol,
+                "strike": leg.strike,
+                "option_type": leg.option_type.value,
+                "position": "long" if leg.is_long else "short",
+                "entry_cost": leg.mid_price * 100 * leg.quantity,
+                "mid_price": leg.mid_price,
+                "greeks": {name: float(values[i]) for name, values in greeks.items()},
+                "probability_of_profit": float(pop[i]),
+                "probability_itm": float(prob_itm[i]),
+                "liquidity_score": leg.liquidity_score,
+            })
+        return valuations
+    
     def value_single_leg(
         self,
         leg: OptionLeg,
@@ -418,57 +483,7 @@ class TradeValuation:
         Returns:
             Dict with greeks, PoP, entry cost, etc.
         """
-        # Calculate Greeks
-        if leg.option_type == OptionType.CALL:
-            greeks = self.bs_calc.calculate_call_greeks(leg.strike, ttm_days, volatility)
-            prob_itm = self.prob_calc.probability_call_itm(
-                self.spot, leg.strike, ttm_days, volatility
-            )
-        else:  # PUT
-            greeks = self.bs_calc.calculate_put_greeks(leg.strike, ttm_days, volatility)
-            prob_itm = self.prob_calc.probability_put_itm(
-                self.spot, leg.strike, ttm_days, volatility
-            )
-        
-        # Adjust Greeks for position direction
-        if not leg.is_long:
-            # Short position = negative Greeks
-            greeks = Greeks(
-                delta=-greeks.delta,
-                gamma=-greeks.gamma,
-                theta=-greeks.theta,
-                vega=-greeks.vega,
-                rho=-greeks.rho
-            )
-        
-        # PoP depends on position type
-        if leg.is_long:
-            # Long call: wins if spot > strike at expiration
-            pop = prob_itm if leg.option_type == OptionType.CALL else (1.0 - prob_itm)
-        else:
-            # Short call: wins if spot <= strike at expiration
-            pop = (1.0 - prob_itm) if leg.option_type == OptionType.CALL else prob_itm
-        
-        entry_cost = leg.mid_price * 100 * leg.quantity
-        
-        return {
-            "symbol": leg.symbol,
-            "strike": leg.strike,
-            "option_type": leg.option_type.value,
-            "position": "long" if leg.is_long else "short",
-            "entry_cost": entry_cost,
-            "mid_price": leg.mid_price,
-            "greeks": {
-                "delta": greeks.delta,
-                "gamma": greeks.gamma,
-                "theta": greeks.theta,
-                "vega": greeks.vega,
-                "rho": greeks.rho,
-            },
-            "probability_of_profit": pop,
-            "probability_itm": prob_itm,
-            "liquidity_score": leg.liquidity_score,
-        }
+        return self.value_legs([leg], ttm_days, volatility)[0]
     
     def value_spread(
         self,
@@ -490,15 +505,46 @@ class TradeValuation:
         Returns:
             Dict with aggregated metrics and individual leg details
         """
-        leg_valuations = []
+        return self.value_spreads([legs], ttm_days, volatility)[0]
+    
+    def value_spreads(
+        self,
+        spreads: List[List[OptionLeg]],
+        ttm_days,
+        volatility
+    ) -> List[Dict]:
+        """
+        Value many spreads with a single Black-Scholes pass over all legs.
+        
+        Args:
+            spreads: One list of OptionLeg objects per spread
+            ttm_days: Days to expiration (scalar or one per spread)
+            volatility: Implied volatility (scalar or one per spread)
+        
+        Returns:
+            List of spread valuation dicts (see value_spread)
+        """
+        sizes = [len(legs) for legs in spreads]
+        # Per-spread TTM/IV fan out to their legs
+        leg_ttm = np.repeat(np.broadcast_to(np.asarray(ttm_days, dtype=float), len(spreads)), sizes)
+        leg_vol = np.repeat(np.broadcast_to(np.asarray(volatility, dtype=float), len(spreads)), sizes)
+        all_valuations = self.value_legs(
+            [leg for legs in spreads for leg in legs], leg_ttm, leg_vol
+        )
+        
+        results = []
+        offset = 0
+        for legs, size in zip(spreads, sizes):
+            results.append(self._aggregate_spread(legs, all_valuations[offset:offset + size]))
+            offset += size
+        return results
+    
+    def _aggregate_spread(self, legs: List[OptionLeg], leg_valuations: List[Dict]) -> Dict:
+        """Combine per-leg valuations into spread-level metrics"""
         total_greeks = Greeks(delta=0, gamma=0, theta=0, vega=0, rho=0)
         total_entry_cost = 0.0
         
-        # Value each leg and aggregate
-        for leg in legs:
-            leg_val = self.value_single_leg(leg, ttm_days, volatility)
-            leg_valuations.append(leg_val)
-            
+        for leg_val in leg_valuations:
             # Accumulate Greeks
             g = leg_val["greeks"]
             total_greeks.delta += g["delta"]
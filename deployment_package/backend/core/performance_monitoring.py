@@ -12,6 +12,8 @@ from django.utils import timezone
 from collections import defaultdict
 import json
 
+from .rate_limiting import get_rate_limit_metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -113,12 +115,14 @@ class PerformanceMonitor:
             'overall_cache_hit_rate': round(overall_cache_hit_rate, 2),
             'avg_query_time_ms': round(avg_query_time, 2),
             'query_types': len(metrics),
-            'metrics': metrics
+            'metrics': metrics,
+            'rate_limits': get_rate_limit_metrics().snapshot()
         }
     
     def reset(self):
         """Reset all metrics"""
         self.metrics.clear()
+        get_rate_limit_metrics().reset()
     
     def export_metrics(self, filepath: Optional[str] = None) -> str:
         """Export metrics to JSON"""
@@ -212,6 +216,11 @@ def log_performance_metrics():
                 f"    {query_name}: {metric['avg_time_ms']}ms avg "
                 f"({metric['cache_hit_rate']}% cache hit rate)"
             )
+    
+    if summary['rate_limits']:
+        logger.info("  Rate Limits:")
+        for route, counts in sorted(summary['rate_limits'].items()):
+            logger.info(f"    {route}: {counts}")
 
 
 # Middleware for automatic performance monitoring
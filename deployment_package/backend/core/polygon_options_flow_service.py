@@ -15,6 +15,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 import requests
 
+from .options_quote_fetcher import get_polygon_options_fetcher, quote_from_snapshot
+
 logger = logging.getLogger(__name__)
 
 
@@ -163,66 +165,80 @@ class PolygonOptionsFlowService:
 
     def _get_options_snapshots(self, symbol: str, contracts: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
         """
-        Get options data with volume from Polygon using free tier endpoints.
+        Get options data with volume from Polygon.
 
-        Uses /v2/aggs/ticker/{ticker}/prev for previous day's aggregates
-        which is available on the free tier.
+        Uses the chain snapshot (real OI, IV and Greeks) when the plan allows
+        it. Otherwise it falls back to /v2/aggs/ticker/{ticker}/prev for the
+        previous day's aggregates, which the free tier supports. Those are
+        fetched concurrently and paced by the plan's rate limit.
         """
         if not self.polygon_api_key:
             return {}
 
-        snapshots = {}
-
-        # Limit to top contracts to stay within rate limits (5 req/min on free tier)
-        limited_contracts = contracts[:25]  # Process up to 25 contracts
-
-        # Batch fetch - get prev day data for each contract
-        for contract in limited_contracts:
-            ticker = contract.get('ticker', '')
-            if not ticker:
-                continue
-
-            try:
-                url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/prev"
-                params = {
-                    'adjusted': 'true',
-                    'apiKey': self.polygon_api_key
+        fetcher = get_polygon_options_fetcher(self.polygon_api_key)
+        try:
+            chain = fetcher.fetch_chain_snapshot_sync(symbol)
+            if chain:
+                snapshots = {
+                    ticker: self._snapshot_from_chain_entry(entry)
+                    for ticker, entry in chain.items()
                 }
+                logger.info(f"Got snapshot data for {len(snapshots)} options contracts for {symbol}")
+                return snapshots
 
-                response = self.session.get(url, params=params, timeout=5)
-                if response.ok:
-                    data = response.json()
-                    results = data.get('results', [])
-                    if results:
-                        r = results[0]
-                        snapshots[ticker] = {
-                            'volume': int(r.get('v', 0)),
-                            'open_interest': 0,  # Not available in free tier
-                            'last_price': float(r.get('c', 0)),
-                            'open': float(r.get('o', 0)),
-                            'high': float(r.get('h', 0)),
-                            'low': float(r.get('l', 0)),
-                            'vwap': float(r.get('vw', 0)),
-                            'bid': float(r.get('c', 0)) * 0.98,  # Estimate
-                            'ask': float(r.get('c', 0)) * 1.02,  # Estimate
-                            'implied_volatility': 0,  # Will be calculated
-                            'delta': 0,
-                            'gamma': 0,
-                            'theta': 0,
-                            'vega': 0,
-                            'transactions': int(r.get('n', 0)),  # Number of trades
-                        }
-                elif response.status_code == 429:
-                    logger.warning("Polygon rate limit reached while fetching aggregates for %s", symbol)
-                    break
-
-            except Exception as e:
-                logger.debug(f"Error fetching data for {ticker}: {e}")
-                continue
+            # Limit to top contracts to stay within rate limits (5 req/min on free tier)
+            limited_contracts = contracts[:25]  # Process up to 25 contracts
+            aggs = fetcher.fetch_prev_aggs_sync(c.get('ticker', '') for c in limited_contracts)
+        except Exception as e:
+            logger.warning(f"Error fetching options data for {symbol}: {e}")
+            return {}
+
+        snapshots = {}
+        for ticker, r in aggs.items():
+            snapshots[ticker] = {
+                'volume': int(r.get('v', 0)),
+                'open_interest': 0,  # Not available in free tier
+                'last_price': float(r.get('c', 0)),
+                'open': float(r.get('o', 0)),
+                'high': float(r.get('h', 0)),
+                'low': float(r.get('l', 0)),
+                'vwap': float(r.get('vw', 0)),
+                'bid': float(r.get('c', 0)) * 0.98,  # Estimate
+                'ask': float(r.get('c', 0)) * 1.02,  # Estimate
+                'implied_volatility': 0,  # Will be calculated
+                'delta': 0,
+                'gamma': 0,
+                'theta': 0,
+                'vega': 0,
+                'transactions': int(r.get('n', 0)),  # Number of trades
+            }
 
         logger.info(f"Got volume data for {len(snapshots)} options contracts for {symbol}")
         return snapshots
 
+    def _snapshot_from_chain_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a /v3/snapshot/options chain entry to the snapshot shape used here"""
+        bid, ask, volume, last_price = quote_from_snapshot(entry)
+        day = entry.get('day') or {}
+        greeks = entry.get('greeks') or {}
+        return {
+            'volume': volume,
+            'open_interest': int(entry.get('open_interest', 0) or 0),
+            'last_price': last_price,
+            'open': float(day.get('open', 0) or 0),
+            'high': float(day.get('high', 0) or 0),
+            'low': float(day.get('low', 0) or 0),
+            'vwap': float(day.get('vwap', 0) or 0),
+            'bid': bid,
+            'ask': ask,
+            'implied_volatility': float(entry.get('implied_volatility', 0) or 0),
+            'delta': float(greeks.get('delta', 0) or 0),
+            'gamma': float(greeks.get('gamma', 0) or 0),
+            'theta': float(greeks.get('theta', 0) or 0),
+            'vega': float(greeks.get('vega', 0) or 0),
+            'transactions': int(day.get('transactions', 0) or 0),
+        }
+
     def _enrich_contracts_with_snapshots(
         self,
         contracts: List[Dict[str, Any]],
@@ -21,6 +21,9 @@ class PortfolioHoldingType(graphene.ObjectType):
 
     def resolve_stock(self, info):
         # Handle both dict and model object
+        if isinstance(self, Portfolio):
+            from .graphql.dataloaders import load_related
+            return load_related(info, self, 'stock', 'stock_by_id_loader')
         if hasattr(self, 'stock'):
             return self.stock
         return self.get('stock')
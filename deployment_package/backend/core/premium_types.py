@@ -2116,6 +2116,25 @@ class PremiumMutations(graphene.ObjectType):
 
                 cache.set(cache_key, sector_stocks, 900)
 
+            stocks_by_symbol = {}
+            holdings_by_stock = {}
+            if not dry_run:
+                # One query each for the picked stocks and the user's holdings,
+                # instead of a lookup per trade
+                from .dataloaders import batch_load_portfolio_holdings, batch_load_stocks
+                from .graphql.dataloaders import get_loader, load_now
+
+                pick_symbols = sorted(
+                    {pick["symbol"] for picks in sector_stocks.values() for pick in picks}
+                )
+                stocks_by_symbol = dict(
+                    zip(pick_symbols, load_now(info, "stock_loader", batch_load_stocks, pick_symbols))
+                )
+                holdings = load_now(
+                    info, "portfolio_holdings_loader", batch_load_portfolio_holdings, [portfolio.user_id]
+                )[0]
+                holdings_by_stock = {holding.stock_id: holding for holding in holdings or []}
+
             # Apply top 3 rebalance suggestions
             for suggestion in recommendations["rebalance_suggestions"][:3]:
                 action_text = suggestion["action"]
@@ -2191,23 +2210,22 @@ class PremiumMutations(graphene.ObjectType):
                         )
 
                         if not dry_run:
-                            try:
-                                stock_obj = Stock.objects.only(
-                                    "id", "symbol"
-                                ).get(symbol=symbol)
-                                PortfolioService.add_holding_to_portfolio(
-                                    user=portfolio.user,
-                                    stock_id=stock_obj.id,
-                                    shares=shares,
-                                    portfolio_name=portfolio_name
-                                    or "AI Rebalanced Portfolio",
-                                    current_price=price,
-                                )
-                            except Stock.DoesNotExist:
+                            stock_obj = stocks_by_symbol.get(symbol)
+                            if stock_obj is None:
                                 logger.warning(
                                     "Stock %s not found in DB", symbol
                                 )
                                 continue
+                            holding = PortfolioService.add_holding_to_portfolio(
+                                user=portfolio.user,
+                                stock_id=stock_obj.id,
+                                shares=shares,
+                                portfolio_name=portfolio_name
+                                or "AI Rebalanced Portfolio",
+                                current_price=price,
+                            )
+                            if holding is not None:
+                                holdings_by_stock[stock_obj.id] = holding
 
                         total_cost += trade_value * 0.001
 
@@ -2233,26 +2251,27 @@ class PremiumMutations(graphene.ObjectType):
                         )
 
                         if not dry_run:
-                            try:
-                                stock_obj = Stock.objects.get(symbol=symbol)
-                                holding = Portfolio.objects.filter(
-                                    user=portfolio.user,
-                                    stock=stock_obj,
-                                ).first()
-                                if holding:
-                                    if holding.shares <= shares:
-                                        holding.delete()
-                                    else:
-                                        holding.shares -= shares
-                                        holding.save()
-                            except Stock.DoesNotExist:
+                            stock_obj = stocks_by_symbol.get(symbol)
+                            if stock_obj is None:
                                 logger.warning(
                                     "Stock %s not found in DB for sell", symbol
                                 )
                                 continue
+                            holding = holdings_by_stock.get(stock_obj.id)
+                            if holding:
+                                if holding.shares <= shares:
+                                    holding.delete()
+                                    holdings_by_stock.pop(stock_obj.id, None)
+                                else:
+                                    holding.shares -= shares
+                                    holding.save()
 
                         total_cost += trade_value * 0.001
 
+            holdings_loader = None if dry_run else get_loader(info, "portfolio_holdings_loader")
+            if holdings_loader is not None:
+                holdings_loader.clear(portfolio.user_id)
+
             diversification_score = (
                 recommendations.get("portfolio_analysis", {}).get(
                     "diversification_score", 0
@@ -28,6 +28,14 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Intraday data fan-out for day-trading picks
+INTRADAY_FETCH_CONCURRENCY = 10
+INTRADAY_BATCH_TIMEOUT_S = 30.0
+INTRADAY_REQUEST_TIMEOUT_S = 5.0
+INTRADAY_RATE_LIMIT_WAIT_S = 1.0
+# Bars are cached per symbol and 1-minute bar close
+INTRADAY_CACHE_TTL_S = 60
+
 
 User = get_user_model()
 
@@ -184,9 +192,14 @@ def resolve_chat_messages(self, info, session_id):
 
 def resolve_user(self, info, id):
     """Get a user by ID (using DataLoader to prevent N+1)"""
+    from .graphql.dataloaders import get_loader
     from .dataloaders import get_user_loader
-    user_loader = get_user_loader()
-    return user_loader.load(id)
+    try:
+        user_id = int(id)
+    except (TypeError, ValueError):
+        return None
+    user_loader = get_loader(info, "user_loader") or get_user_loader()
+    return user_loader.load(user_id)
 
 
 def resolve_user_posts(self, info, user_id):
@@ -301,75 +314,148 @@ def _generate_picks_for_symbols(
     mode: str,
     quality_threshold: float
 ) -> list:
-    """Generate picks for a list of symbols"""
-    picks = []
+    """
+    Generate picks for a list of symbols.
 
-    for symbol in symbols[:50]:  # Limit to 50 symbols for performance
-        try:
-            # Get OHLCV data (tries real data first, falls back to mock)
-            # Note: This is a synchronous function, so we need to handle async
-            # For now, we'll use a workaround to call async function
-            import asyncio
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
+    Intraday data for all symbols is fetched concurrently, so latency follows
+    the slowest symbol rather than the sum of all of them. The symbols whose
+    bars arrived are then featurized and scored together in one batch.
+    """
+    from .async_http import run_sync
 
-            ohlcv_1m, ohlcv_5m = loop.run_until_complete(_get_intraday_data(symbol))
+    symbols = list(dict.fromkeys(symbols))[:50]  # Limit to 50 symbols for performance
+    bars = {}
 
-            if ohlcv_1m is None or ohlcv_5m is None:
-                continue
+    async def collect():
+        async for symbol, ohlcv_1m, ohlcv_5m in _iter_intraday_data(symbols):
+            if ohlcv_1m is not None and ohlcv_5m is not None:
+                bars[symbol] = (ohlcv_1m, ohlcv_5m)
 
-            # Extract features
-            features = feature_service.extract_all_features(
-                ohlcv_1m, ohlcv_5m, symbol
-            )
+    try:
+        run_sync(collect(), INTRADAY_BATCH_TIMEOUT_S)
+    except Exception as e:
+        # Score whatever arrived before the deadline
+        logger.warning(f"Intraday data fetch incomplete ({len(bars)}/{len(symbols)} symbols): {e!r}")
 
-            # Determine side first (needed for ML scoring)
-            momentum = features.get('momentum_15m', 0.0)
-            side = 'LONG' if momentum > 0 else 'SHORT'
+    # Picks come back in universe order
+    ready = [symbol for symbol in symbols if symbol in bars]
+    return _score_intraday_batch(ready, bars, feature_service, ml_scorer, mode, quality_threshold)
 
-            # Score with ML (pass mode and side for ML learner)
-            score = ml_scorer.score(features, mode=mode, side=side)
 
-            # Filter by quality threshold
-            if score < quality_threshold:
-                continue
+def _score_intraday_batch(
+    symbols: list,
+    bars: dict,
+    feature_service: 'DayTradingFeatureService',
+    ml_scorer: 'DayTradingMLScorer',
+    mode: str,
+    quality_threshold: float
+) -> list:
+    """Extract features and score all symbols at once; falls back to one symbol at a time"""
+    if not symbols:
+        return []
+    try:
+        from .day_trading_feature_service import stack_ohlcv
 
-            # Calculate risk metrics
-            current_price = float(ohlcv_5m.iloc[-1]['close'])
-            risk_metrics = feature_service.calculate_risk_metrics(
-                features, mode, current_price
-            )
+        features = feature_service.extract_features_batch(
+            stack_ohlcv({symbol: bars[symbol][0] for symbol in symbols}),
+            stack_ohlcv({symbol: bars[symbol][1] for symbol in symbols}),
+            symbols=symbols,
+        )
+        # Determine side first (needed for ML scoring)
+        sides = ['LONG' if momentum > 0 else 'SHORT' for momentum in features['momentum_15m']]
+        scores = ml_scorer.score_batch(features, mode=mode, sides=sides)
+        rows = features.to_dict('records')
+    except Exception as e:
+        logger.warning(f"Batch scoring failed, scoring {len(symbols)} symbols one at a time: {e}")
+        picks = (
+            _score_intraday_symbol(symbol, *bars[symbol], feature_service, ml_scorer, mode, quality_threshold)
+            for symbol in symbols
+        )
+        return [pick for pick in picks if pick]
 
-            # Calculate catalyst score
-            catalyst_score = ml_scorer.calculate_catalyst_score(features)
+    picks = []
+    for symbol, row, side, score in zip(symbols, rows, sides, scores):
+        # Filter by quality threshold
+        if score < quality_threshold:
+            continue
+        try:
+            picks.append(_build_intraday_pick(
+                symbol, row, side, float(score), bars[symbol][1], feature_service, ml_scorer, mode
+            ))
+        except Exception as e:
+            logger.warning(f"Error processing {symbol}: {e}")
+    return picks
 
-            # Create pick
-            pick = {
-                'symbol': symbol,
-                'side': side,
-                'score': score,
-                'features': {
-                    'momentum15m': features.get('momentum_15m', 0.0),
-                    'rvol10m': features.get('realized_vol_10', 0.0),
-                    'vwapDist': features.get('vwap_dist_pct', 0.0),
-                    'breakoutPct': features.get('breakout_pct', 0.0),
-                    'spreadBps': features.get('spread_bps', 5.0),
-                    'catalystScore': catalyst_score
-                },
-                'risk': risk_metrics,
-                'notes': _generate_pick_notes(symbol, features, side, score)
-            }
 
-            picks.append(pick)
+def _score_intraday_symbol(
+    symbol: str,
+    ohlcv_1m,
+    ohlcv_5m,
+    feature_service: 'DayTradingFeatureService',
+    ml_scorer: 'DayTradingMLScorer',
+    mode: str,
+    quality_threshold: float
+) -> Optional[dict]:
+    """Extract features and score one symbol; None if it misses the quality threshold"""
+    try:
+        # Extract features
+        features = feature_service.extract_all_features(
+            ohlcv_1m, ohlcv_5m, symbol
+        )
 
-        except Exception as e:
-            logger.warning(f"Error processing {symbol}: {e}")
-            continue
+        # Determine side first (needed for ML scoring)
+        momentum = features.get('momentum_15m', 0.0)
+        side = 'LONG' if momentum > 0 else 'SHORT'
 
-    return picks
+        # Score with ML (pass mode and side for ML learner)
+        score = ml_scorer.score(features, mode=mode, side=side)
+
+        # Filter by quality threshold
+        if score < quality_threshold:
+            return None
+
+        return _build_intraday_pick(symbol, features, side, score, ohlcv_5m, feature_service, ml_scorer, mode)
+
+    except Exception as e:
+        logger.warning(f"Error processing {symbol}: {e}")
+        return None
+
+
+def _build_intraday_pick(
+    symbol: str,
+    features: dict,
+    side: str,
+    score: float,
+    ohlcv_5m,
+    feature_service: 'DayTradingFeatureService',
+    ml_scorer: 'DayTradingMLScorer',
+    mode: str
+) -> dict:
+    """Pick dict for a scored symbol: risk metrics, catalyst score and notes"""
+    # Calculate risk metrics
+    current_price = float(ohlcv_5m.iloc[-1]['close'])
+    risk_metrics = feature_service.calculate_risk_metrics(
+        features, mode, current_price
+    )
+
+    # Calculate catalyst score
+    catalyst_score = ml_scorer.calculate_catalyst_score(features)
+
+    return {
+        'symbol': symbol,
+        'side': side,
+        'score': score,
+        'features': {
+            'momentum15m': features.get('momentum_15m', 0.0),
+            'rvol10m': features.get('realized_vol_10', 0.0),
+            'vwapDist': features.get('vwap_dist_pct', 0.0),
+            'breakoutPct': features.get('breakout_pct', 0.0),
+            'spreadBps': features.get('spread_bps', 5.0),
+            'catalystScore': catalyst_score
+        },
+        'risk': risk_metrics,
+        'notes': _generate_pick_notes(symbol, features, side, score)
+    }
 
 
 def _get_static_universe(mode):
@@ -1418,7 +1504,79 @@ def _get_mock_day_trading_picks(limit=20):
     return picks
 
 
+def _intraday_cache_key(symbol: str, now: Optional[datetime] = None) -> str:
+    bar_close = (now or datetime.now()).replace(second=0, microsecond=0)
+    return f"intraday_bars:{symbol.upper()}:{bar_close:%Y%m%d%H%M}"
+
+
+async def _iter_intraday_data(symbols: list, max_concurrency: int = INTRADAY_FETCH_CONCURRENCY):
+    """
+    Intraday data for many symbols, fetched concurrently.
+
+    Cached symbols are served first, from a single cache round trip. The rest
+    are fetched with at most ``max_concurrency`` in flight.
+
+    Yields:
+        (symbol, ohlcv_1m, ohlcv_5m) in completion order
+    """
+    from django.core.cache import cache
+
+    keys = {symbol: _intraday_cache_key(symbol) for symbol in symbols}
+    try:
+        cached = cache.get_many(list(keys.values()))
+    except Exception as e:
+        logger.debug(f"Intraday cache unavailable: {e}")
+        cached = {}
+
+    missing = []
+    for symbol in symbols:
+        if keys[symbol] in cached:
+            yield (symbol, *cached[keys[symbol]])
+        else:
+            missing.append(symbol)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(symbol):
+        async with semaphore:
+            ohlcv_1m, ohlcv_5m = await _load_intraday_data(symbol, keys[symbol])
+        return symbol, ohlcv_1m, ohlcv_5m
+
+    for next_done in asyncio.as_completed([fetch(symbol) for symbol in missing]):
+        yield await next_done
+
+
 async def _get_intraday_data(symbol: str):
+    """
+    Get intraday OHLCV data for a symbol, cached until the next 1-minute bar closes.
+    """
+    from django.core.cache import cache
+
+    cache_key = _intraday_cache_key(symbol)
+    try:
+        cached = cache.get(cache_key)
+    except Exception as e:
+        logger.debug(f"Intraday cache unavailable: {e}")
+        cached = None
+    if cached is not None:
+        return cached
+    return await _load_intraday_data(symbol, cache_key)
+
+
+async def _load_intraday_data(symbol: str, cache_key: str):
+    """Fetch intraday data and cache it under ``cache_key`` (failures are not cached)"""
+    from django.core.cache import cache
+
+    ohlcv_1m, ohlcv_5m = await _fetch_intraday_data(symbol)
+    if ohlcv_1m is not None and ohlcv_5m is not None:
+        try:
+            cache.set(cache_key, (ohlcv_1m, ohlcv_5m), INTRADAY_CACHE_TTL_S)
+        except Exception as e:
+            logger.debug(f"Could not cache intraday data for {symbol}: {e}")
+    return ohlcv_1m, ohlcv_5m
+
+
+async def _fetch_intraday_data(symbol: str):
     """
     Get intraday OHLCV data for a symbol from real market data sources.
     Falls back to mock data if real data is unavailable.
@@ -1550,6 +1708,7 @@ async def _fetch_polygon_intraday(symbol: str, service) -> Optional[tuple]:
     """Fetch real intraday data from Polygon.io"""
     try:
         from .market_data_api_service import DataProvider
+        from .async_http import get_provider_plan, get_rate_limiter, get_session_pool
         import aiohttp
         from datetime import datetime, timedelta
 
@@ -1557,18 +1716,27 @@ async def _fetch_polygon_intraday(symbol: str, service) -> Optional[tuple]:
         if DataProvider.POLYGON not in service.api_keys:
             return None
 
+        # Stay within the plan's request budget; fall through to Alpaca instead of queueing
+        rate_limiter = get_rate_limiter('polygon', get_provider_plan('polygon'))
+        if not await rate_limiter.acquire(INTRADAY_RATE_LIMIT_WAIT_S):
+            logger.debug(f"Polygon rate budget exhausted; skipping intraday fetch for {symbol}")
+            return None
+
         api_key = service.api_keys[DataProvider.POLYGON].key
-        session = service.session or aiohttp.ClientSession()
+        session = get_session_pool().get()
 
         # Get today's date and yesterday for intraday data
         today = datetime.now()
         yesterday = today - timedelta(days=1)
+        start_date = yesterday.strftime('%Y-%m-%d')
+        end_date = today.strftime('%Y-%m-%d')
 
         # Fetch 1-minute bars for today
-        url = f"https://api.polygon.io/v2/aggs/ticker/{symbol}/range/1/minute/{start_date}/{end_date}?adjusted=true&sort=asc&limit=50000&apiKey={api_key}"
+        url = f"https://api.polygon.io/v2/aggs/ticker/{symbol}/range/1/minute/{start_date}/{end_date}"
         params = {'adjusted': 'true', 'sort': 'asc', 'limit': 50000, 'apiKey': api_key}
+        timeout = aiohttp.ClientTimeout(total=INTRADAY_REQUEST_TIMEOUT_S)
 
-        async with session.get(url, params=params) as response:
+        async with session.get(url, params=params, timeout=timeout) as response:
             if response.status == 200:
                 data = await response.json()
                 if data.get('status') == 'OK' and data.get('resultsCount', 0) > 0:
@@ -1614,6 +1782,7 @@ async def _fetch_alpaca_intraday(symbol: str, service) -> Optional[tuple]:
         import os
         import aiohttp
         from datetime import datetime, timedelta
+        from .async_http import get_session_pool
 
         # Check for Alpaca credentials
         alpaca_key = os.getenv('ALPACA_API_KEY')
@@ -1622,7 +1791,7 @@ async def _fetch_alpaca_intraday(symbol: str, service) -> Optional[tuple]:
         if not alpaca_key or not alpaca_secret:
             return None
 
-        session = service.session or aiohttp.ClientSession()
+        session = get_session_pool().get()
 
         # Get today's date
         today = datetime.now()
@@ -1642,7 +1811,8 @@ async def _fetch_alpaca_intraday(symbol: str, service) -> Optional[tuple]:
             'APCA-API-SECRET-KEY': alpaca_secret
         }
 
-        async with session.get(url, params=params, headers=headers) as response:
+        timeout = aiohttp.ClientTimeout(total=INTRADAY_REQUEST_TIMEOUT_S)
+        async with session.get(url, params=params, headers=headers, timeout=timeout) as response:
             if response.status == 200:
                 data = await response.json()
                 if data.get('bars'):
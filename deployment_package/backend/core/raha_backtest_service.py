@@ -5,15 +5,18 @@ Runs historical backtests using real historical data and PaperTradingService
 import logging
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, List, Any, Optional
 from datetime import date, timedelta, datetime
 from decimal import Decimal
-import asyncio
 
 from .raha_models import RAHABacktestRun, StrategyVersion
 from .paper_trading_service import PaperTradingService
 from .raha_strategy_engine import RAHAStrategyEngine
-from .fss_data_pipeline import FSSDataPipeline, FSSDataRequest
+from .async_http import run_sync
+from .fss_data_pipeline import FSSDataPipeline
+from .raha_query_cache import invalidate_cache_tags
+from .cache_tags import strategy_tag, user_tag
 
 logger = logging.getLogger(__name__)
 
@@ -116,6 +119,8 @@ class RAHABacktestService:
             from django.utils import timezone
             backtest.completed_at = timezone.now()
             backtest.save()
+            # Backtest lists/metrics for this user and strategy are now stale
+            invalidate_cache_tags(user_tag(backtest.user_id), strategy_tag(backtest.strategy_version_id))
             
             logger.info(f"Backtest {backtest_run_id} completed successfully")
             logger.info(f"Results: Win Rate={metrics.get('win_rate', 0):.2%}, Sharpe={metrics.get('sharpe_ratio', 0):.2f}, Max DD={metrics.get('max_drawdown', 0):.2%}")
@@ -152,78 +157,17 @@ class RAHABacktestService:
         Returns:
             DataFrame with OHLCV data
         """
+        async def fetch():
+            async with self.data_pipeline:
+                return await self.data_pipeline.fetch_bars([symbol], start_date, end_date)
+
         try:
-            # Calculate lookback days
-            days = (end_date - start_date).days
-            
-            # Use FSSDataPipeline to fetch data
-            request = FSSDataRequest(
-                tickers=[symbol],
-                lookback_days=days + 30,  # Extra buffer
-                include_fundamentals=False
-            )
-            
-            # Run async fetch
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    # If loop is running, create new one
-                    import nest_asyncio
-                    nest_asyncio.apply()
-                    result = loop.run_until_complete(self.data_pipeline.fetch_fss_data(request))
-                else:
-                    result = loop.run_until_complete(self.data_pipeline.fetch_fss_data(request))
-            except RuntimeError:
-                # No event loop, create new one
-                result = asyncio.run(self.data_pipeline.fetch_fss_data(request))
-            
-            if result and result.prices is not None and not result.prices.empty:
-                # Convert to OHLCV format
-                prices_df = result.prices
-                volumes_df = result.volumes
-                
-                # Filter by date range
-                prices_df = prices_df[(prices_df.index.date >= start_date) & (prices_df.index.date <= end_date)]
-                
-                if prices_df.empty:
-                    return None
-                
-                # Create OHLCV DataFrame
-                ohlcv = pd.DataFrame({
-                    'open': prices_df[symbol] * 0.998,  # Approximate open (use close as proxy)
-                    'high': prices_df[symbol] * 1.002,  # Approximate high
-                    'low': prices_df[symbol] * 0.998,   # Approximate low
-                    'close': prices_df[symbol],
-                    'volume': volumes_df[symbol] if symbol in volumes_df.columns else 0
-                })
-                
-                # If we have real OHLCV data, use it (from Alpaca/Polygon)
-                # For now, use close price as proxy for all OHLCV
-                ohlcv['open'] = ohlcv['close'].shift(1).fillna(ohlcv['close'])
-                ohlcv['high'] = ohlcv[['open', 'close']].max(axis=1) * 1.001
-                ohlcv['low'] = ohlcv[['open', 'close']].min(axis=1) * 0.999
-                
-                return ohlcv
-            
-            # Fallback: Try yfinance
-            try:
-                import yfinance as yf
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(start=start_date, end=end_date)
-                
-                if not hist.empty:
-                    ohlcv = pd.DataFrame({
-                        'open': hist['Open'],
-                        'high': hist['High'],
-                        'low': hist['Low'],
-                        'close': hist['Close'],
-                        'volume': hist['Volume']
-                    })
-                    return ohlcv
-            except Exception as e:
-                logger.warning(f"yfinance fallback failed: {e}")
-            
-            return None
+            # Real OHLCV from the bar store; providers only fill the ranges it is missing
+            bars = run_sync(fetch())
+            ohlcv = bars.get(symbol)
+            if ohlcv is None or ohlcv.empty:
+                return None
+            return ohlcv
             
         except Exception as e:
             logger.error(f"Error fetching historical data: {e}", exc_info=True)
@@ -233,7 +177,8 @@ class RAHABacktestService:
         self,
         symbol: str,
         historical_data: pd.DataFrame,
-        strategy_version: StrategyVersion
+        strategy_version: StrategyVersion,
+        vectorized: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Generate trading signals from historical data.
@@ -242,10 +187,114 @@ class RAHABacktestService:
             symbol: Stock symbol
             historical_data: Historical OHLCV DataFrame
             strategy_version: Strategy version to use
+            vectorized: Compute indicators once per series (default) instead of
+                re-evaluating them on a growing slice for every bar
         
         Returns:
             List of signal dictionaries
         """
+        if not vectorized:
+            return self._generate_signals_iterative(symbol, historical_data, strategy_version)
+        
+        try:
+            signal_arrays = self._generate_signal_arrays(historical_data, strategy_version.logic_ref)
+            return self._signals_from_arrays(historical_data.index, signal_arrays)
+        except Exception as e:
+            logger.error(f"Error generating signals: {e}", exc_info=True)
+            return []
+    
+    def _generate_signal_arrays(
+        self,
+        historical_data: pd.DataFrame,
+        logic_ref: str
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized equivalent of calling `_generate_signal_for_data_point` for every bar.
+        
+        Indicators are evaluated once over the whole series with trailing windows,
+        so the cost is O(n) in bar count rather than O(n^2).
+        
+        Args:
+            historical_data: Historical OHLCV DataFrame
+            logic_ref: Strategy logic reference
+        
+        Returns:
+            Dict of equal-length arrays: 'action' (1 = BUY, -1 = SELL, 0 = none),
+            'price' and 'confidence'
+        """
+        closes = historical_data['close'].to_numpy(dtype=float)
+        n = len(closes)
+        action = np.zeros(n, dtype=np.int8)
+        confidence = np.zeros(n, dtype=float)
+        
+        if n == 0 or not ('ORB' in logic_ref or 'MOMENTUM' in logic_ref):
+            return {'action': action, 'price': closes, 'confidence': confidence}
+        
+        # Indicator value for the trailing window ending at each bar (NaN until filled)
+        sma_20 = np.full(n, np.nan)
+        if n >= 20:
+            sma_20[19:] = sliding_window_view(closes, 20).mean(axis=1)
+        
+        # RSI approximation over the last 14 closes (13 changes); no losses or
+        # no gains maps to the neutral 50, as in the per-bar implementation
+        rsi = np.full(n, 50.0)
+        if n >= 14:
+            changes = np.diff(closes)
+            gains = sliding_window_view(np.where(changes > 0, changes, 0.0), 13).sum(axis=1)
+            losses = sliding_window_view(np.where(changes < 0, -changes, 0.0), 13).sum(axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rs = np.where(losses > 0, gains / losses, 0.0)
+                rsi[13:] = np.where(rs > 0, 100 - (100 / (1 + rs)), 50.0)
+        
+        # The per-bar path sees history up to and including the bar for a
+        # DatetimeIndex, and only the bars before it otherwise
+        history_len = np.arange(1, n + 1)
+        if not isinstance(historical_data.index, pd.DatetimeIndex):
+            sma_20 = np.concatenate([[np.nan], sma_20[:-1]])
+            rsi = np.concatenate([[50.0], rsi[:-1]])
+            history_len = history_len - 1
+        
+        ready = history_len >= 20
+        buy = ready & (closes > sma_20) & (rsi < 70)
+        sell = ready & ~buy & (closes < sma_20) & (rsi > 30)
+        
+        action[buy] = 1
+        action[sell] = -1
+        confidence[buy | sell] = 0.75
+        
+        return {'action': action, 'price': closes, 'confidence': confidence}
+    
+    @staticmethod
+    def _signals_from_arrays(
+        index: pd.Index,
+        signal_arrays: Dict[str, np.ndarray]
+    ) -> List[Dict[str, Any]]:
+        """Convert signal arrays into the signal dicts consumed by `_execute_backtest_trades`"""
+        action = signal_arrays['action']
+        prices = signal_arrays['price']
+        confidence = signal_arrays['confidence']
+        
+        return [
+            {
+                'action': 'BUY' if action[i] > 0 else 'SELL',
+                'price': prices[i],
+                'confidence': confidence[i],
+                'timestamp': index[i]
+            }
+            for i in np.flatnonzero(action)
+        ]
+    
+    def _generate_signals_iterative(
+        self,
+        symbol: str,
+        historical_data: pd.DataFrame,
+        strategy_version: StrategyVersion
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate signals bar by bar via `_generate_signal_for_data_point`.
+        
+        Reference implementation for the vectorized path; quadratic in bar count.
+        """
         signals = []
         
         try:
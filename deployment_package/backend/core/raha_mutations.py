@@ -11,6 +11,8 @@ from .raha_models import (
     Strategy, StrategyVersion, UserStrategySettings, RAHASignal, RAHABacktestRun
 )
 from .raha_queries import _normalize_uuid
+from .raha_query_cache import invalidate_cache_tags
+from .cache_tags import symbol_tag, user_tag
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import date
@@ -59,6 +61,7 @@ class EnableStrategy(graphene.Mutation):
                     'max_concurrent_positions': max_concurrent_positions,
                 }
             )
+            invalidate_cache_tags(user_tag(user.id))
             
             return EnableStrategy(
                 user_strategy_settings=settings,
@@ -104,6 +107,7 @@ class DisableStrategy(graphene.Mutation):
             )
             settings.enabled = False
             settings.save()
+            invalidate_cache_tags(user_tag(user.id))
             
             return DisableStrategy(
                 success=True,
@@ -162,6 +166,7 @@ class RunBacktest(graphene.Mutation):
                 parameters=parameters or {},
                 status='PENDING'
             )
+            invalidate_cache_tags(user_tag(user.id))
             
             # Queue backtest job (async with Celery if available)
             try:
@@ -273,6 +278,7 @@ class GenerateRAHASignals(graphene.Mutation):
                     meta=signal_data.get('meta', {})
                 )
                 signals.append(signal)
+            invalidate_cache_tags(user_tag(user.id), symbol_tag(symbol))
             
             return GenerateRAHASignals(
                 signals=signals,
@@ -41,7 +41,10 @@ except ImportError:
     StrategyBlend = None
     NotificationPreferences = None
     AutoTradingSettings = None
-from .raha_query_cache import get_cache_key, cache_query_result, get_cached_query_result, CACHE_TIMEOUTS
+from .raha_query_cache import (
+    get_cache_key, cache_query_result, get_cached_query_result, get_or_compute_query_result,
+    query_cache_tags, CACHE_TIMEOUTS
+)
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -450,7 +453,10 @@ class RAHAQueries(graphene.ObjectType):
         
         # Cache first page only
         if offset == 0:
-            cache_query_result(cache_key, result, timeout=CACHE_TIMEOUTS['raha_signals'])
+            cache_query_result(
+                cache_key, result, timeout=CACHE_TIMEOUTS['raha_signals'],
+                tags=query_cache_tags(strategy_version_id, symbol)
+            )
         
         return result
 
@@ -534,7 +540,10 @@ class RAHAQueries(graphene.ObjectType):
         
         # Cache first page only
         if offset == 0:
-            cache_query_result(cache_key, result, timeout=CACHE_TIMEOUTS['user_backtests'])
+            cache_query_result(
+                cache_key, result, timeout=CACHE_TIMEOUTS['user_backtests'],
+                tags=query_cache_tags(strategy_version_id)
+            )
         
         return result
     
@@ -639,7 +648,10 @@ class RAHAQueries(graphene.ObjectType):
                 )
                 
                 # Cache result
-                cache_query_result(cache_key, metrics_result, timeout=CACHE_TIMEOUTS['raha_metrics'])
+                cache_query_result(
+                    cache_key, metrics_result, timeout=CACHE_TIMEOUTS['raha_metrics'],
+                    tags=query_cache_tags(strategy_version_id)
+                )
                 
                 return metrics_result
             
@@ -673,7 +685,10 @@ class RAHAQueries(graphene.ObjectType):
             )
             
             # Cache result
-            cache_query_result(cache_key, metrics_result, timeout=CACHE_TIMEOUTS['raha_metrics'])
+            cache_query_result(
+                cache_key, metrics_result, timeout=CACHE_TIMEOUTS['raha_metrics'],
+                tags=query_cache_tags(strategy_version_id)
+            )
             
             return metrics_result
         except Exception as e:
@@ -686,26 +701,25 @@ class RAHAQueries(graphene.ObjectType):
         if not user or not getattr(user, "is_authenticated", False):
             return []
         
-        # Check cache
         cache_key = get_cache_key('strategy_dashboard', user.id)
-        cached_result = get_cached_query_result(cache_key)
-        if cached_result is not None:
-            logger.debug(f"Cache hit for strategy_dashboard (user={user.id})")
-            return cached_result
         
-        try:
+        def build_dashboard():
             from .raha_dashboard_service import RAHADashboardService
             service = RAHADashboardService()
             dashboard_data = service.get_strategy_dashboard_data(user)
             
             # Convert to JSON strings for GraphQL
             import json
-            result = [json.dumps(item) for item in dashboard_data]
-            
-            # Cache result
-            cache_query_result(cache_key, result, timeout=CACHE_TIMEOUTS['strategy_dashboard'])
-            
-            return result
+            return [json.dumps(item) for item in dashboard_data]
+        
+        try:
+            # Concurrent requests share one build; the previous dashboard is served while it refreshes
+            return get_or_compute_query_result(
+                cache_key,
+                build_dashboard,
+                timeout=CACHE_TIMEOUTS['strategy_dashboard'],
+                stale_timeout=CACHE_TIMEOUTS['strategy_dashboard'],
+            )
         except Exception as e:
             logger.error(f"Error resolving strategy dashboard: {e}", exc_info=True)
             return []
@@ -763,7 +777,10 @@ class RAHAQueries(graphene.ObjectType):
             result = [json.dumps(item) for item in models_data]
             
             # Cache result
-            cache_query_result(cache_key, result, timeout=CACHE_TIMEOUTS['ml_models'])
+            cache_query_result(
+                cache_key, result, timeout=CACHE_TIMEOUTS['ml_models'],
+                tags=query_cache_tags(strategy_version_id)
+            )
             
             return result
         except Exception as e:
@@ -5,13 +5,19 @@ Implements caching for expensive RAHA GraphQL queries to improve performance
 import logging
 import hashlib
 import json
-from typing import Any, Optional
+import re
+from typing import Any, Callable, Iterable, List, Optional
 from django.core.cache import cache
 from django.contrib.auth import get_user_model
 
+from . import single_flight
+from .cache_tags import get_tag_registry, strategy_tag, symbol_tag, user_tag
+
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+_USER_KEY_RE = re.compile(r'^[^:]+:user_([^:]+):')
+
 
 def get_cache_key(prefix: str, user_id: int, **kwargs) -> str:
     """
@@ -38,26 +44,59 @@ def get_cache_key(prefix: str, user_id: int, **kwargs) -> str:
     return key_str
 
 
+def query_cache_tags(
+    strategy_version_id: Optional[Any] = None,
+    symbol: Optional[str] = None
+) -> List[str]:
+    """
+    Extra invalidation tags for a query result (the user tag is implicit).
+    
+    Args:
+        strategy_version_id: Strategy version the result is filtered by
+        symbol: Symbol the result is filtered by
+    
+    Returns:
+        List of tags
+    """
+    tags = []
+    if strategy_version_id:
+        tags.append(strategy_tag(strategy_version_id))
+    if symbol:
+        tags.append(symbol_tag(symbol))
+    return tags
+
+
 def cache_query_result(
     cache_key: str,
     result: Any,
     timeout: int = 300,
-    version: Optional[int] = None
+    version: Optional[int] = None,
+    tags: Optional[Iterable[str]] = None
 ) -> bool:
     """
     Cache a query result.
     
+    Keys built by get_cache_key are always tagged with their user, so
+    invalidate_cache_tags(user_tag(id)) drops every cached query for a user.
+    
     Args:
         cache_key: Cache key
         result: Result to cache (must be JSON-serializable)
         timeout: Cache timeout in seconds (default: 5 minutes)
         version: Optional cache version
+        tags: Additional invalidation tags (see query_cache_tags)
     
     Returns:
         True if cached successfully, False otherwise
     """
     try:
         cache.set(cache_key, result, timeout=timeout, version=version)
+        all_tags = list(tags or ())
+        match = _USER_KEY_RE.match(cache_key)
+        if match:
+            all_tags.append(user_tag(match.group(1)))
+        if all_tags:
+            get_tag_registry().register(cache_key, all_tags, timeout)
         return True
     except Exception as e:
         logger.warning(f"Failed to cache query result: {e}")
@@ -85,11 +124,74 @@ def get_cached_query_result(
         return None
 
 
+def get_or_compute_query_result(
+    cache_key: str,
+    compute: Callable[[], Any],
+    timeout: int = 300,
+    tags: Optional[Iterable[str]] = None,
+    stale_timeout: int = 0,
+    distributed: bool = False
+) -> Any:
+    """
+    Get a cached query result, computing it once per key on a miss.
+    
+    Concurrent requests for the same key share one computation; with
+    stale_timeout > 0 the previous result is served while one request
+    refreshes it.
+    
+    Args:
+        cache_key: Cache key
+        compute: Zero-argument function producing the result
+        timeout: Seconds the result is fresh
+        tags: Additional invalidation tags (see query_cache_tags)
+        stale_timeout: Seconds a stale result may be served during refresh
+        distributed: Also coalesce across workers with a Redis lock
+    
+    Returns:
+        Cached or freshly computed result
+    """
+    from .aggressive_caching_service import get_aggressive_caching_service
+    
+    service = get_aggressive_caching_service()
+    return single_flight.get_or_compute(
+        cache_key,
+        compute,
+        get=get_cached_query_result,
+        set=lambda key, value, ttl: cache_query_result(key, value, timeout=ttl, tags=tags),
+        ttl=timeout,
+        stale_ttl=stale_timeout,
+        lock=service.lock if distributed else None,
+        flight=service.flight,
+    )
+
+
+def invalidate_cache_tags(*tags: str) -> int:
+    """
+    Invalidate every cached query registered under the given tags.
+    
+    Only the tag sets are read, so this is safe on hot paths. Goes through
+    the AggressiveCachingService, so this process' memory tier is cleared
+    too (the pub/sub bus only reaches peers) - e.g. kelly:symbol:* entries.
+    
+    Args:
+        tags: Tags such as user_tag(42), strategy_tag(version_id), symbol_tag('AAPL')
+    
+    Returns:
+        Number of entries invalidated
+    """
+    from .aggressive_caching_service import get_aggressive_caching_service
+    
+    count = get_aggressive_caching_service().invalidate_tags(*tags)
+    logger.debug(f"Invalidated {count} cached queries for tags {tags}")
+    return count
+
+
 def invalidate_cache_pattern(pattern: str) -> int:
     """
-    Invalidate cache entries matching a pattern.
-    Note: This is a simple implementation. For production, consider using
-    Redis with SCAN for pattern matching.
+    Invalidate cache entries matching a glob pattern.
+    
+    With django-redis this SCANs the keyspace; prefer invalidate_cache_tags
+    where a tag fits.
     
     Args:
         pattern: Cache key pattern (e.g., 'raha_signals:user_*')
@@ -97,11 +199,18 @@ def invalidate_cache_pattern(pattern: str) -> int:
     Returns:
         Number of entries invalidated
     """
-    # For LocMemCache, we can't easily pattern match
-    # For Redis, we'd use SCAN with pattern matching
-    # For now, this is a placeholder
-    logger.info(f"Cache invalidation requested for pattern: {pattern}")
-    return 0
+    if not hasattr(cache, 'delete_pattern'):
+        # LocMemCache and friends cannot enumerate keys
+        logger.info(f"Cache backend has no pattern delete; skipped invalidation of {pattern}")
+        return 0
+    try:
+        count = cache.delete_pattern(pattern) or 0
+        from .aggressive_caching_service import get_aggressive_caching_service
+        get_aggressive_caching_service().invalidation_bus.publish(patterns=[pattern])
+        return count
+    except Exception as e:
+        logger.warning(f"Failed to invalidate cache pattern {pattern}: {e}")
+        return 0
 
 
 # Cache timeout constants (in seconds)
@@ -11,6 +11,7 @@ from decimal import Decimal
 
 from .raha_models import StrategyVersion
 from .day_trading_feature_service import DayTradingFeatureService
+from . import indicators
 
 logger = logging.getLogger(__name__)
 
@@ -90,24 +91,8 @@ class RAHAStrategyEngine:
             if len(df) < period + 1:
                 return None
             
-            high = df['high'].values
-            low = df['low'].values
-            close = df['close'].values
-            
-            tr_list = []
-            for i in range(1, len(df)):
-                tr = max(
-                    high[i] - low[i],
-                    abs(high[i] - close[i-1]),
-                    abs(low[i] - close[i-1])
-                )
-                tr_list.append(tr)
-            
-            if len(tr_list) < period:
-                return None
-            
-            atr = np.mean(tr_list[-period:])
-            return float(atr)
+            true_ranges = indicators.true_range(df['high'].values, df['low'].values, df['close'].values)
+            return float(np.mean(true_ranges[-period:]))
         except Exception as e:
             logger.warning(f"Error calculating ATR: {e}")
             return None
@@ -118,9 +103,8 @@ class RAHAStrategyEngine:
             if len(df) == 0:
                 return None
             
-            typical_price = (df['high'] + df['low'] + df['close']) / 3
-            vwap = (typical_price * df['volume']).sum() / df['volume'].sum()
-            return float(vwap)
+            vwap = indicators.vwap(df['high'].values, df['low'].values, df['close'].values, df['volume'].values)
+            return float(vwap[-1])
         except Exception as e:
             logger.warning(f"Error calculating VWAP: {e}")
             return None
@@ -131,21 +115,7 @@ class RAHAStrategyEngine:
             if len(df) < period + 1:
                 return None
             
-            close = df['close'].values
-            deltas = np.diff(close)
-            
-            gains = np.where(deltas > 0, deltas, 0)
-            losses = np.where(deltas < 0, -deltas, 0)
-            
-            avg_gain = np.mean(gains[-period:])
-            avg_loss = np.mean(losses[-period:])
-            
-            if avg_loss == 0:
-                return 100.0
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            return float(rsi)
+            return float(indicators.rsi(df['close'].values, period)[-1])
         except Exception as e:
             logger.warning(f"Error calculating RSI: {e}")
             return None
@@ -195,22 +165,8 @@ class RAHAStrategyEngine:
             if len(df) < slow + signal:
                 return None, None, None
             
-            close = df['close'].values
-            
-            # Calculate EMAs
-            ema_fast = pd.Series(close).ewm(span=fast, adjust=False).mean()
-            ema_slow = pd.Series(close).ewm(span=slow, adjust=False).mean()
-            
-            # MACD line
-            macd_line = ema_fast - ema_slow
-            
-            # Signal line (EMA of MACD)
-            signal_line = macd_line.ewm(span=signal, adjust=False).mean()
-            
-            # Histogram
-            histogram = macd_line - signal_line
-            
-            return macd_line, signal_line, histogram
+            # Callers index the results with .iloc
+            return tuple(pd.Series(values) for values in indicators.macd(df['close'].values, fast, slow, signal))
         except Exception as e:
             logger.warning(f"Error calculating MACD: {e}")
             return None, None, None
@@ -1,17 +1,173 @@
 """
 Rate Limiting Middleware
 Provides rate limiting for API endpoints to prevent abuse
+
+Counting uses a sliding-window counter: one counter per key per fixed window,
+with the rate over the last `window` seconds estimated as the current
+window's count plus the previous window's count weighted by how much of it
+still overlaps. On Redis each request is one MULTI/EXEC round trip (INCR,
+EXPIRE NX, GET previous), so concurrent requests never race or undercount.
+Without Redis the cache's atomic add/incr is used instead.
+
+A per-process guard in front of Redis rejects keys this process alone has
+already seen over the limit in the current window, so floods are shed
+without a network hop.
+
+Per-route outcomes are counted in a module-level registry
+(get_rate_limit_metrics), logged periodically and included in the
+performance summary of core/performance_monitoring.py.
 """
+import json
+import math
+import threading
 import time
 import logging
 import os
-from typing import Dict, Optional
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
 from django.core.cache import cache
 from django.http import JsonResponse
 from django.utils.deprecation import MiddlewareMixin
 
+from .cache_tags import get_default_redis_client
+
 logger = logging.getLogger(__name__)
 
+RATE_LIMIT_KEY_PREFIX = 'rate_limit'
+
+# Keys tracked by the in-process flood guard before it is reset
+LOCAL_GUARD_MAX_KEYS = 10_000
+
+# Largest auth request body parsed for the username
+AUTH_BODY_MAX_BYTES = 4096
+
+# Seconds between rate limit metrics log lines, per process
+METRICS_LOG_INTERVAL = 300
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of counting one request against a limit"""
+    allowed: bool
+    count: float  # Estimated requests in the last window, this one included
+    retry_after: int
+
+
+class SlidingWindowLimiter:
+    """
+    Atomic sliding-window counter shared by all workers.
+
+    Uses the raw Redis client when available, otherwise the cache's atomic
+    ``add``/``incr`` (enough for a single host with LocMemCache).
+    """
+
+    def __init__(self, redis_client=None, cache_backend=None, clock: Callable[[], float] = time.time):
+        self.redis = redis_client
+        self.cache = cache_backend or cache
+        self.clock = clock
+
+    def hit(self, key: str, limit: int, window: int) -> RateLimitDecision:
+        """Count one request for key and decide whether it is within limit per window seconds"""
+        now = self.clock()
+        index = int(now // window)
+        current_key = f"{RATE_LIMIT_KEY_PREFIX}:{key}:{index}"
+        previous_key = f"{RATE_LIMIT_KEY_PREFIX}:{key}:{index - 1}"
+
+        if self.redis is not None:
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.incr(self.cache.make_key(current_key))
+            # Counters live for two windows: their own and the next one's lookback
+            pipe.expire(self.cache.make_key(current_key), 2 * window, nx=True)
+            pipe.get(self.cache.make_key(previous_key))
+            current, _, previous = pipe.execute()
+        else:
+            self.cache.add(current_key, 0, timeout=2 * window)
+            current = self.cache.incr(current_key)
+            previous = self.cache.get(previous_key)
+
+        elapsed = now / window - index
+        count = int(current) + int(previous or 0) * (1.0 - elapsed)
+        if count <= limit:
+            return RateLimitDecision(True, count, 0)
+        return RateLimitDecision(False, count, max(1, math.ceil((1.0 - elapsed) * window)))
+
+
+class LocalFloodGuard:
+    """
+    Per-process request counts per key and fixed window.
+
+    A process's own count is a lower bound on the shared count, so once it
+    passes the limit the request can be rejected without asking Redis.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time, max_keys: int = LOCAL_GUARD_MAX_KEYS):
+        self.clock = clock
+        self.max_keys = max_keys
+        self._counts: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window: int) -> Optional[int]:
+        """Count one request; return seconds until the window ends if it is certainly over limit"""
+        now = self.clock()
+        index = int(now // window)
+        with self._lock:
+            seen_index, count = self._counts.get(key, (index, 0))
+            count = count + 1 if seen_index == index else 1
+            if len(self._counts) >= self.max_keys and key not in self._counts:
+                self._counts.clear()
+            self._counts[key] = (index, count)
+        if count > limit:
+            return max(1, math.ceil((index + 1) * window - now))
+        return None
+
+
+class RateLimitMetrics:
+    """
+    Per-route limiter outcomes in this process: allowed / limited / shed (by
+    the local guard) / errors.
+
+    A snapshot is logged every log_interval seconds, from whichever request
+    crosses the interval.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, log_interval: float = METRICS_LOG_INTERVAL):
+        self.clock = clock
+        self.log_interval = log_interval
+        self._counts: Dict[str, Counter] = defaultdict(Counter)
+        self._lock = threading.Lock()
+        self._next_log = clock() + log_interval
+
+    def record(self, route: str, outcome: str) -> None:
+        with self._lock:
+            self._counts[route][outcome] += 1
+            now = self.clock()
+            if now < self._next_log:
+                return
+            self._next_log = now + self.log_interval
+            snapshot = self._snapshot()
+        logger.info(f"Rate limit metrics: {json.dumps(snapshot, sort_keys=True)}")
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Per-route counters since start-up (or the last reset)"""
+        with self._lock:
+            return self._snapshot()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+    def _snapshot(self) -> Dict[str, Dict[str, int]]:
+        return {route: dict(counts) for route, counts in self._counts.items()}
+
+
+_rate_limit_metrics = RateLimitMetrics()
+
+
+def get_rate_limit_metrics() -> RateLimitMetrics:
+    """The process-wide rate limit metrics registry"""
+    return _rate_limit_metrics
+
 
 class RateLimitMiddleware(MiddlewareMixin):
     """
@@ -53,6 +209,26 @@ class RateLimitMiddleware(MiddlewareMixin):
     # Default rate limit for unlisted endpoints
     DEFAULT_LIMIT = {'limit': 100, 'window': 60}  # 100 per minute
     
+    # Endpoints limited per IP + username rather than per IP
+    AUTH_PATHS = [
+        '/api/auth/login',
+        '/api/auth/signup',
+        '/api/auth/alpaca/initiate',
+    ]
+    
+    def __init__(self, get_response, limiter: Optional[SlidingWindowLimiter] = None,
+                 guard: Optional[LocalFloodGuard] = None, metrics: Optional[RateLimitMetrics] = None):
+        super().__init__(get_response)
+        self.limiter = limiter
+        self.guard = guard if guard is not None else LocalFloodGuard()
+        self.metrics = metrics if metrics is not None else get_rate_limit_metrics()
+    
+    def get_limiter(self) -> SlidingWindowLimiter:
+        """Shared-state limiter, created on first use (Redis behind the default cache if available)"""
+        if self.limiter is None:
+            self.limiter = SlidingWindowLimiter(redis_client=get_default_redis_client())
+        return self.limiter
+    
     def get_client_ip(self, request) -> str:
         """
         Get client IP address from request (proxy-safe).
@@ -105,12 +281,41 @@ class RateLimitMiddleware(MiddlewareMixin):
             # Not behind a trusted proxy - use REMOTE_ADDR directly
             return immediate_ip or 'unknown'
     
-    def get_rate_limit(self, path: str) -> Dict:
-        """Get rate limit configuration for path"""
+    def get_route(self, path: str) -> Tuple[str, Dict]:
+        """Matching RATE_LIMITS pattern (or 'default') and its rate limit configuration"""
         for pattern, limit in self.RATE_LIMITS.items():
             if pattern in path:
-                return limit
-        return self.DEFAULT_LIMIT
+                return pattern, limit
+        return 'default', self.DEFAULT_LIMIT
+    
+    def get_rate_limit(self, path: str) -> Dict:
+        """Get rate limit configuration for path"""
+        return self.get_route(path)[1]
+    
+    def get_auth_username(self, request) -> Optional[str]:
+        """
+        Username/email from a POSTed auth request, if any.
+        
+        URL-encoded forms use the already-parsed request.POST; JSON bodies are
+        only parsed when small, so oversized bodies are never decoded here.
+        """
+        if request.method != 'POST':
+            return None
+        try:
+            if request.content_type == 'application/x-www-form-urlencoded':
+                data = request.POST
+            elif request.content_type == 'application/json':
+                if int(request.META.get('CONTENT_LENGTH') or 0) > AUTH_BODY_MAX_BYTES:
+                    return None
+                data = json.loads(request.body)
+            else:
+                return None
+        except Exception:
+            return None
+        if not isinstance(data, dict):
+            return None
+        username = data.get('email') or data.get('username')
+        return username if isinstance(username, str) else None
     
     def check_rate_limit(self, request) -> Optional[JsonResponse]:
         """
@@ -121,62 +326,51 @@ class RateLimitMiddleware(MiddlewareMixin):
         """
         path = request.path
         ip = self.get_client_ip(request)
-        rate_limit = self.get_rate_limit(path)
+        route, rate_limit = self.get_route(path)
         
         # For auth endpoints, add username/device to rate limit key
         # This prevents IP rotation attacks
-        is_auth_endpoint = any(auth_path in path for auth_path in [
-            '/api/auth/login',
-            '/api/auth/signup',
-            '/api/auth/alpaca/initiate',
-        ])
-        
-        if is_auth_endpoint:
-            # Try to get username from request body or headers
-            username = None
-            try:
-                # For POST requests, try to get username from body
-                if request.method == 'POST' and hasattr(request, 'body'):
-                    import json
-                    try:
-                        body_data = json.loads(request.body)
-                        username = body_data.get('email') or body_data.get('username')
-                    except (json.JSONDecodeError, AttributeError):
-                        pass
-            except Exception:
-                pass
-            
+        is_auth_endpoint = any(auth_path in path for auth_path in self.AUTH_PATHS)
+        
+        username = self.get_auth_username(request) if is_auth_endpoint else None
+        if username:
             # Normalize username for rate limit key (lowercase, strip whitespace)
-            if username:
-                username_normalized = username.lower().strip()
-                cache_key = f'rate_limit:{ip}:{username_normalized}:{path}'
-            else:
-                # Fallback to IP-only if username not available
-                cache_key = f'rate_limit:{ip}:{path}'
+            cache_key = f'{ip}:{username.lower().strip()}:{path}'
         else:
-            # Non-auth endpoints: IP-only rate limiting
-            cache_key = f'rate_limit:{ip}:{path}'
-        
-        # Get current count
-        current_count = cache.get(cache_key, 0)
-        
-        if current_count >= rate_limit['limit']:
-            logger.warning(f"Rate limit exceeded for {ip} on {path} (key: {cache_key})")
-            return JsonResponse({
-                'error': 'Rate limit exceeded',
-                'message': f'Too many requests. Limit: {rate_limit["limit"]} per {rate_limit["window"]} seconds',
-                'retry_after': rate_limit['window']
-            }, status=429)
-        
-        # Increment count
-        cache.set(
-            cache_key,
-            current_count + 1,
-            timeout=rate_limit['window']
-        )
+            # Non-auth endpoints (or no username): IP-only rate limiting
+            cache_key = f'{ip}:{path}'
+        
+        # Shed obvious floods in-process, without a round trip
+        retry_after = self.guard.hit(cache_key, rate_limit['limit'], rate_limit['window'])
+        if retry_after is not None:
+            self.metrics.record(route, 'shed')
+            return self._limited_response(rate_limit, retry_after)
         
+        try:
+            decision = self.get_limiter().hit(cache_key, rate_limit['limit'], rate_limit['window'])
+        except Exception as e:
+            # Fail open: a limiter outage must not take the API down with it
+            logger.error(f"Rate limiter unavailable for {route}: {e}")
+            self.metrics.record(route, 'errors')
+            return None
+        
+        if not decision.allowed:
+            logger.warning(f"Rate limit exceeded for {ip} on {path} (key: {cache_key}, count: {decision.count:.1f})")
+            self.metrics.record(route, 'limited')
+            return self._limited_response(rate_limit, decision.retry_after)
+        
+        self.metrics.record(route, 'allowed')
         return None
     
+    def _limited_response(self, rate_limit: Dict, retry_after: int) -> JsonResponse:
+        response = JsonResponse({
+            'error': 'Rate limit exceeded',
+            'message': f'Too many requests. Limit: {rate_limit["limit"]} per {rate_limit["window"]} seconds',
+            'retry_after': retry_after
+        }, status=429)
+        response['Retry-After'] = str(retry_after)
+        return response
+    
     def process_request(self, request):
         """Process request and check rate limits"""
         # Skip rate limiting for admin and static files
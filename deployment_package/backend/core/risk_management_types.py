@@ -4,6 +4,7 @@ GraphQL types and resolvers for risk management calculations
 import graphene
 from .graphql_utils import get_user_from_context
 from django.core.cache import cache
+from .cache_tags import get_tag_registry, symbol_tag, user_tag
 
 
 class PositionSizeType(graphene.ObjectType):
@@ -323,7 +324,9 @@ class RiskManagementQueries(graphene.ObjectType):
                             'avg_win': float(kelly_result.avg_win),
                             'avg_loss': float(kelly_result.avg_loss),
                         }
-                        cache.set(symbol_cache_key, kelly_result_data, 3600)  # 1 hour TTL
+                        caching_service.set_cached(
+                            symbol_cache_key, kelly_result_data, 3600, tags=[symbol_tag(symbol)]
+                        )  # 1 hour TTL
                         logger.debug(f"Portfolio Kelly: Cached Kelly calculation for {symbol}")
                     
                     # Weight by position value
@@ -377,6 +380,7 @@ class RiskManagementQueries(graphene.ObjectType):
             
             # Cache the portfolio-level result (5 minute TTL)
             cache.set(cache_key, result_data, 300)  # 5 minutes TTL
+            get_tag_registry().register(cache_key, [user_tag(user.id)], 300)
             
             return PortfolioKellyMetricsType(**result_data)
             
@@ -502,6 +506,7 @@ class RiskManagementQueries(graphene.ObjectType):
                             'avg_win': float(kelly_result.avg_win),
                             'avg_loss': float(kelly_result.avg_loss),
                         }, 3600)  # 1 hour TTL
+                        get_tag_registry().register(symbol_cache_key, [symbol_tag(symbol)], 3600)
                         logger.debug(f"Position Size Kelly: Cached calculation for {symbol}")
                     
                     # Use recommended fraction (conservative Kelly)
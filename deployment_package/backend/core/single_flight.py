@@ -0,0 +1,412 @@
+"""
+Single-flight request coalescing for cached computations.
+
+When a popular key expires, every concurrent caller would otherwise recompute
+it. ``get_or_compute`` / ``aget_or_compute`` make sure that:
+
+1. Only one computation per key runs per process; other callers (threads or
+   coroutines) wait for and share its result.
+2. Optionally, only one worker across the fleet computes it: the leader takes a
+   short Redis lock (``SET NX PX``) and peers poll the cache for its result.
+3. Optionally, a stale value is served while one caller refreshes it in the
+   background (stale-while-revalidate).
+
+The cache itself is abstracted as ``get(key)`` / ``set(key, value, ttl)``
+callables so the same logic fronts AggressiveCachingService and the RAHA
+query cache.
+"""
+import asyncio
+import logging
+import math
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from django.core.cache import cache as default_cache
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY_PREFIX = 'sflock'
+DEFAULT_LOCK_TIMEOUT = 30.0
+_POLL_START = 0.05
+_POLL_MAX = 0.5
+
+_MISS, _FRESH, _STALE = 'miss', 'fresh', 'stale'
+_ENVELOPE_MARKER = '__swr__'
+
+
+class SingleFlight:
+    """
+    Per-process call de-duplication.
+
+    ``do`` coalesces threads, ``ado`` coalesces coroutines on the same event
+    loop. Errors raised by the leader are re-raised in every waiter.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, '_Call'] = {}
+        self._async_calls: Dict[Tuple[int, str], asyncio.Future] = {}
+        self.stats = {'computations': 0, 'coalesced': 0, 'stale_served': 0}
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls or any(k == key for _, k in self._async_calls)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats['computations'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.value
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        while True:
+            with self._lock:
+                future = self._async_calls.get(flight_key)
+                leader = future is None
+                if leader:
+                    future = self._async_calls[flight_key] = loop.create_future()
+                    self.stats['computations'] += 1
+                else:
+                    self.stats['coalesced'] += 1
+
+            if leader:
+                break
+            try:
+                # Shielded so a cancelled waiter does not cancel the shared result
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    continue  # Leader was cancelled; take over
+                raise
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._async_calls.pop(flight_key, None)
+
+
+class _Call:
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class DistributedLock:
+    """
+    Best-effort cross-worker lock with an owner token and expiry.
+
+    Uses ``SET NX PX`` on the raw Redis client when available, otherwise the
+    cache's atomic ``add`` (enough for a single host with LocMemCache).
+    """
+
+    def __init__(self, redis_client=None, cache_backend=None):
+        self.redis = redis_client
+        self.cache = cache_backend or default_cache
+
+    def _key(self, name: str) -> str:
+        return f"{LOCK_KEY_PREFIX}:{name}"
+
+    def acquire(self, name: str, timeout: float = DEFAULT_LOCK_TIMEOUT) -> Optional[str]:
+        token = uuid.uuid4().hex
+        try:
+            if self.redis is not None:
+                acquired = self.redis.set(
+                    self.cache.make_key(self._key(name)), token, nx=True, px=max(1, int(timeout * 1000))
+                )
+            else:
+                acquired = self.cache.add(self._key(name), token, timeout=max(1, math.ceil(timeout)))
+        except Exception as e:
+            # Lock backend down: fall back to per-process coalescing only
+            logger.warning(f"Single-flight lock unavailable for {name}: {e}")
+            return token
+        return token if acquired else None
+
+    def release(self, name: str, token: str) -> None:
+        try:
+            if self.redis is None:
+                if self.cache.get(self._key(name)) == token:
+                    self.cache.delete(self._key(name))
+                return
+            # Compare-and-delete so an expired lock re-taken by a peer is left alone
+            key = self.cache.make_key(self._key(name))
+            with self.redis.pipeline() as pipe:
+                pipe.watch(key)
+                current = pipe.get(key)
+                if current is not None and _decode(current) == token:
+                    pipe.multi()
+                    pipe.delete(key)
+                    pipe.execute()
+                else:
+                    pipe.unwatch()
+        except Exception as e:
+            logger.debug(f"Single-flight lock release failed for {name}: {e}")
+
+    def is_locked(self, name: str) -> bool:
+        try:
+            if self.redis is not None:
+                return bool(self.redis.exists(self.cache.make_key(self._key(name))))
+            return self.cache.get(self._key(name)) is not None
+        except Exception:
+            return False
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def wrap_stale(value: Any, ttl: float) -> Dict[str, Any]:
+    """Envelope recording when a stale-while-revalidate value stops being fresh"""
+    return {_ENVELOPE_MARKER: 1, 'value': value, 'fresh_until': time.time() + ttl}
+
+
+def _unwrap(entry: Any) -> Tuple[Any, str]:
+    if entry is None:
+        return None, _MISS
+    if isinstance(entry, dict) and entry.get(_ENVELOPE_MARKER) == 1:
+        state = _FRESH if time.time() < entry['fresh_until'] else _STALE
+        return entry['value'], state
+    return entry, _FRESH
+
+
+def _store(set_fn: Callable, key: str, value: Any, ttl: float, stale_ttl: float) -> None:
+    if value is None:
+        return  # None means "miss" to every cache helper here
+    if stale_ttl > 0:
+        set_fn(key, wrap_stale(value, ttl), int(ttl + stale_ttl))
+    else:
+        set_fn(key, value, ttl)
+
+
+# Shared per-process state
+default_flight = SingleFlight()
+_refresh_executor: Optional[ThreadPoolExecutor] = None
+_refresh_executor_lock = threading.Lock()
+_background_tasks: set = set()
+
+
+def _get_refresh_executor() -> ThreadPoolExecutor:
+    global _refresh_executor
+    with _refresh_executor_lock:
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='swr-refresh')
+        return _refresh_executor
+
+
+def get_or_compute(
+    key: str,
+    compute: Callable[[], Any],
+    *,
+    get: Callable[[str], Any],
+    set: Callable[[str, Any, int], Any],
+    ttl: int,
+    stale_ttl: int = 0,
+    lock: Optional[DistributedLock] = None,
+    lock_timeout: float = DEFAULT_LOCK_TIMEOUT,
+    flight: Optional[SingleFlight] = None,
+) -> Any:
+    """
+    Return the cached value for key, computing it at most once per process
+    (and once per fleet when ``lock`` is given).
+
+    Args:
+        key: Cache key
+        compute: Zero-argument function producing the value
+        get: Cache read, returning None on miss
+        set: Cache write taking (key, value, ttl)
+        ttl: Seconds the value is fresh
+        stale_ttl: Extra seconds a stale value may be served while refreshing
+        lock: Cross-worker lock; None for per-process coalescing only
+        lock_timeout: Upper bound on a peer's computation before we compute too
+        flight: SingleFlight instance (defaults to the process-wide one)
+
+    Returns:
+        The cached or freshly computed value
+    """
+    flight = flight or default_flight
+    value, state = _unwrap(get(key))
+    if state == _FRESH:
+        return value
+
+    def load():
+        # A peer may have filled the key while we queued for the flight
+        current, current_state = _unwrap(get(key))
+        if current_state == _FRESH:
+            return current
+
+        token = None
+        if lock is not None:
+            token = lock.acquire(key, lock_timeout)
+            if token is None:
+                if current_state == _STALE:
+                    return current  # Peer is refreshing; keep serving stale
+                waited = _wait_for_peer(key, get, lock, lock_timeout)
+                if waited is not None:
+                    return waited
+        try:
+            result = compute()
+            _store(set, key, result, ttl, stale_ttl)
+            return result
+        finally:
+            if token is not None:
+                lock.release(key, token)
+
+    if state == _STALE:
+        if not flight.in_flight(key):
+            _get_refresh_executor().submit(_background_refresh, flight, key, load)
+        flight.stats['stale_served'] += 1
+        return value
+
+    return flight.do(key, load)
+
+
+def _background_refresh(flight: SingleFlight, key: str, load: Callable[[], Any]) -> None:
+    from django.db import close_old_connections
+    try:
+        flight.do(key, load)
+    except Exception as e:
+        logger.warning(f"Background refresh failed for {key}: {e}")
+    finally:
+        close_old_connections()
+
+
+def _wait_for_peer(key: str, get: Callable[[str], Any], lock: DistributedLock, timeout: float) -> Any:
+    """Poll for a peer worker's result until it lands or its lock goes away"""
+    deadline = time.monotonic() + timeout
+    delay = _POLL_START
+    while time.monotonic() < deadline:
+        time.sleep(delay)
+        value, state = _unwrap(get(key))
+        if state != _MISS:
+            return value
+        if not lock.is_locked(key):
+            return None
+        delay = min(delay * 2, _POLL_MAX)
+    return None
+
+
+async def aget_or_compute(
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    *,
+    get: Callable[[str], Any],
+    set: Callable[[str, Any, int], Any],
+    ttl: int,
+    stale_ttl: int = 0,
+    lock: Optional[DistributedLock] = None,
+    lock_timeout: float = DEFAULT_LOCK_TIMEOUT,
+    flight: Optional[SingleFlight] = None,
+) -> Any:
+    """
+    Async counterpart of get_or_compute for coroutine computations.
+
+    ``get``/``set``/``lock`` are the same sync callables; their blocking Redis
+    I/O runs in a worker thread so the event loop is not stalled.
+    """
+    from asgiref.sync import sync_to_async
+
+    flight = flight or default_flight
+    aget = sync_to_async(get, thread_sensitive=False)
+    aset = sync_to_async(set, thread_sensitive=False)
+
+    value, state = _unwrap(await aget(key))
+    if state == _FRESH:
+        return value
+
+    async def load():
+        current, current_state = _unwrap(await aget(key))
+        if current_state == _FRESH:
+            return current
+
+        token = None
+        if lock is not None:
+            token = await sync_to_async(lock.acquire, thread_sensitive=False)(key, lock_timeout)
+            if token is None:
+                if current_state == _STALE:
+                    return current
+                waited = await _await_peer(key, aget, lock, lock_timeout)
+                if waited is not None:
+                    return waited
+        try:
+            result = await compute()
+            if result is not None:
+                if stale_ttl > 0:
+                    await aset(key, wrap_stale(result, ttl), int(ttl + stale_ttl))
+                else:
+                    await aset(key, result, ttl)
+            return result
+        finally:
+            if token is not None:
+                await sync_to_async(lock.release, thread_sensitive=False)(key, token)
+
+    if state == _STALE:
+        if not flight.in_flight(key):
+            task = asyncio.ensure_future(_abackground_refresh(flight, key, load))
+            _background_tasks.add(task)  # Keep a reference until it finishes
+            task.add_done_callback(_background_tasks.discard)
+        flight.stats['stale_served'] += 1
+        return value
+
+    return await flight.ado(key, load)
+
+
+async def _abackground_refresh(flight: SingleFlight, key: str, load: Callable[[], Awaitable[Any]]) -> None:
+    try:
+        await flight.ado(key, load)
+    except Exception as e:
+        logger.warning(f"Background refresh failed for {key}: {e}")
+
+
+async def _await_peer(key: str, aget: Callable[[str], Awaitable[Any]], lock: DistributedLock, timeout: float) -> Any:
+    from asgiref.sync import sync_to_async
+
+    deadline = time.monotonic() + timeout
+    delay = _POLL_START
+    while time.monotonic() < deadline:
+        await asyncio.sleep(delay)
+        value, state = _unwrap(await aget(key))
+        if state != _MISS:
+            return value
+        if not await sync_to_async(lock.is_locked, thread_sensitive=False)(key):
+            return None
+        delay = min(delay * 2, _POLL_MAX)
+    return None
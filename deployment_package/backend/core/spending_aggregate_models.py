@@ -0,0 +1,44 @@
+"""
+Weekly Spending Aggregate Model
+===============================
+Persisted (week, ticker) spending aggregates that feed the spending-based
+predictive model.
+
+Built incrementally from BankTransaction by
+`core.spending_trend_predictor.refresh_weekly_spending`: only weeks with
+transactions added or changed since the last build are recomputed, so a
+retrain no longer re-reads the full transaction history.
+
+Fields
+------
+week_start         : Monday of the week (pandas 'W' period start)
+ticker             : Ticker the spending was mapped to
+total_spending     : Sum of absolute debit amounts mapped to the ticker
+user_count         : Distinct users behind that spending
+transaction_count  : Transactions mapped to the ticker
+built_at           : Start time of the build that wrote the row (refresh watermark)
+"""
+
+from django.db import models
+
+
+class SpendingWeeklyAggregate(models.Model):
+    """Weekly spending mapped to one ticker."""
+
+    week_start        = models.DateField()
+    ticker            = models.CharField(max_length=20)
+    total_spending    = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    user_count        = models.IntegerField(default=0)
+    transaction_count = models.IntegerField(default=0)
+    built_at          = models.DateTimeField()
+
+    class Meta:
+        db_table = 'spending_weekly_aggregates'
+        unique_together = [('week_start', 'ticker')]
+        ordering = ['week_start', 'ticker']
+        indexes = [
+            models.Index(fields=['built_at'], name='spending_agg_built_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.ticker} week of {self.week_start}: ${self.total_spending:,.0f}"
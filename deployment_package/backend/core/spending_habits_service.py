@@ -12,6 +12,7 @@ from typing import Dict, List, Any, Optional
 from decimal import Decimal
 import logging
 from .banking_models import BankTransaction, BankAccount
+from .merchant_matcher import CategoryMatcher
 from .models import IncomeProfile
 
 logger = logging.getLogger(__name__)
@@ -385,38 +386,43 @@ class SpendingHabitsService:
             self.logger.error(f"Error analyzing spending habits for user {user_id}: {e}", exc_info=True)
             return await self._get_default_analysis_async(user_id)
     
+    # Fallback when neither merchant nor description names a category
+    TRANSACTION_CATEGORY_MAPPING = {
+        'FOOD': 'Food & Dining',
+        'TRAVEL': 'Travel',
+        'SHOPPING': 'Shopping',
+        'ENTERTAINMENT': 'Entertainment',
+        'HEALTHCARE': 'Healthcare',
+        'TRANSPORTATION': 'Transportation',
+        'UTILITIES': 'Utilities',
+        'EDUCATION': 'Education',
+    }
+    
     def _match_transaction_category(self, transaction) -> str:
         """Match a single transaction to a spending category (optimized helper)"""
-        description_upper = transaction.description.upper()
-        merchant_upper = (transaction.merchant_name or '').upper()
-        category_upper = (transaction.category or '').upper()
-        
-        # Check merchant name first
-        for category, keywords in self.SPENDING_CATEGORIES.items():
-            if any(keyword in merchant_upper for keyword in keywords):
-                return category
+        matcher = self._category_matcher()
         
-        # Check description if no merchant match
-        for category, keywords in self.SPENDING_CATEGORIES.items():
-            if any(keyword in description_upper for keyword in keywords):
-                return category
+        # Check merchant name first, then description
+        matched = matcher.match((transaction.merchant_name or '').upper()) or matcher.match(transaction.description.upper())
+        if matched:
+            return matched
         
         # Check transaction category
+        category_upper = (transaction.category or '').upper()
         if category_upper:
-            category_mapping = {
-                'FOOD': 'Food & Dining',
-                'TRAVEL': 'Travel',
-                'SHOPPING': 'Shopping',
-                'ENTERTAINMENT': 'Entertainment',
-                'HEALTHCARE': 'Healthcare',
-                'TRANSPORTATION': 'Transportation',
-                'UTILITIES': 'Utilities',
-                'EDUCATION': 'Education',
-            }
-            return category_mapping.get(category_upper, 'Other')
+            return self.TRANSACTION_CATEGORY_MAPPING.get(category_upper, 'Other')
         
         return 'Other'
     
+    @classmethod
+    def _category_matcher(cls) -> CategoryMatcher:
+        """SPENDING_CATEGORIES compiled once per class; memoizes per merchant/description string"""
+        matcher = cls.__dict__.get('_compiled_categories')
+        if matcher is None:
+            matcher = CategoryMatcher(cls.SPENDING_CATEGORIES)
+            cls._compiled_categories = matcher
+        return matcher
+    
     def _categorize_transactions(self, transactions) -> Dict[str, Decimal]:
         """Categorize transactions by spending category (legacy method - kept for compatibility)"""
         spending_by_category = {}
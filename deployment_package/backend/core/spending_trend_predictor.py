@@ -7,10 +7,14 @@ Week 1 Implementation: Baseline model with spending features only
 import logging
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional, Any
-from datetime import datetime, timedelta
+from dataclasses import dataclass, asdict
+from decimal import Decimal
+from itertools import islice
+from typing import Dict, FrozenSet, List, Tuple, Optional, Any
+from datetime import date, datetime, timedelta
 from django.utils import timezone
-from django.db.models import Sum, Q, Count
+from django.db import transaction
+from django.db.models import Sum, Q, Count, Max
 from django.core.cache import cache
 import warnings
 warnings.filterwarnings('ignore')
@@ -25,13 +29,27 @@ except ImportError:
     XGBOOST_AVAILABLE = False
     logging.warning("XGBoost not available - install with: pip install xgboost")
 
+from . import single_flight
 from .banking_models import BankTransaction
+from .cache_tags import get_default_redis_client
+from .merchant_matcher import KeywordMatcher
 from .models import Stock
+from .spending_aggregate_models import SpendingWeeklyAggregate
 from .market_data_manager import get_market_data_service
 from asgiref.sync import sync_to_async
 
 logger = logging.getLogger(__name__)
 
+# Transactions fetched per database round trip when building weekly aggregates
+TRAINING_CHUNK_SIZE = 5000
+
+# Columns streamed from BankTransaction for weekly aggregation
+TRAINING_TRANSACTION_FIELDS = ('transaction_date', 'merchant_name', 'description', 'category', 'amount', 'user_id')
+
+# Only one weekly aggregate refresh runs at a time across workers
+WEEKLY_SPENDING_LOCK = 'spending_weekly_aggregate_refresh'
+WEEKLY_SPENDING_LOCK_TIMEOUT_S = 3600.0
+
 # Mapping: Spending categories/merchants → Stock tickers/sectors
 SPENDING_TO_STOCKS = {
     # Technology
@@ -93,6 +111,264 @@ SPENDING_TO_SECTORS = {
     'Utilities': 'Utilities',
 }
 
+_STOCK_KEY_MATCHER = KeywordMatcher(SPENDING_TO_STOCKS)
+_SECTOR_KEY_MATCHER = KeywordMatcher(SPENDING_TO_SECTORS)
+
+
+def match_spending_tickers(
+    merchants: List[str],
+    descriptions: List[str],
+    categories: List[str]
+) -> List[Tuple[str, ...]]:
+    """
+    Tickers for each transaction from its (upper-cased) merchant, description and category.
+    
+    A SPENDING_TO_STOCKS key found in any of the three contributes its tickers;
+    if none is found, SPENDING_TO_SECTORS keys found in the category or merchant
+    do. Each distinct string is scanned once, and each distinct combination
+    resolved once.
+    
+    Returns:
+        Sorted ticker tuple per transaction (empty if nothing matched)
+    """
+    m_codes, m_uniques = pd.factorize(pd.Series(merchants, dtype=object), use_na_sentinel=False)
+    d_codes, d_uniques = pd.factorize(pd.Series(descriptions, dtype=object), use_na_sentinel=False)
+    c_codes, c_uniques = pd.factorize(pd.Series(categories, dtype=object), use_na_sentinel=False)
+    if not len(m_codes):
+        return []
+    
+    # Classify each distinct (merchant, description, category) combination once
+    combo_codes, combos = pd.factorize(pd.MultiIndex.from_arrays([m_codes, d_codes, c_codes]))
+    resolved: Dict[FrozenSet[str], Tuple[str, ...]] = {}
+    combo_tickers = []
+    for m, d, c in combos:
+        keys = _STOCK_KEY_MATCHER.find(m_uniques[m]) | _STOCK_KEY_MATCHER.find(d_uniques[d]) | _STOCK_KEY_MATCHER.find(c_uniques[c])
+        if not keys:
+            # If no direct match, try sector mapping
+            keys = _SECTOR_KEY_MATCHER.find(c_uniques[c]) | _SECTOR_KEY_MATCHER.find(m_uniques[m])
+        tickers = resolved.get(keys)
+        if tickers is None:
+            tickers = resolved[keys] = tuple(sorted({t for key in keys for t in SPENDING_TO_STOCKS.get(key, [])}))
+        combo_tickers.append(tickers)
+    return [combo_tickers[code] for code in combo_codes]
+
+
+def week_start(day: date) -> date:
+    """Monday of the week containing day (pandas 'W' period start)"""
+    return day - timedelta(days=day.weekday())
+
+
+class WeeklySpendingAccumulator:
+    """
+    Incremental (week, ticker) spending totals.
+    
+    Fed chunks of transactions in transaction_date order; weeks before the
+    latest one seen can no longer change, so they are handed back by
+    pop_closed_weeks and dropped from memory. Peak memory is one open week
+    of accumulators rather than the whole transaction history.
+    """
+    
+    def __init__(self):
+        # week -> ticker -> [total_spending, user ids, transaction count]
+        self._weeks: Dict[date, Dict[str, list]] = {}
+        self._latest: Optional[date] = None
+    
+    def add(self, rows: List[Tuple]) -> None:
+        """Add (transaction_date, merchant, description, category, amount, user_id) rows"""
+        if not rows:
+            return
+        dates, merchants, descriptions, categories, amounts, user_ids = zip(*rows)
+        matched = match_spending_tickers(
+            [(m or '').upper() for m in merchants],
+            [(d or '').upper() for d in descriptions],
+            [(c or '').upper() for c in categories],
+        )
+        for day, amount, user_id, tickers in zip(dates, amounts, user_ids, matched):
+            if not tickers:
+                continue
+            week = week_start(day)
+            if self._latest is None or week > self._latest:
+                self._latest = week
+            by_ticker = self._weeks.setdefault(week, {})
+            amount = abs(amount)
+            for ticker in tickers:
+                acc = by_ticker.get(ticker)
+                if acc is None:
+                    acc = by_ticker[ticker] = [Decimal('0'), set(), 0]
+                acc[0] += amount
+                acc[1].add(user_id)
+                acc[2] += 1
+    
+    def pop_closed_weeks(self) -> List[Tuple[date, str, Decimal, int, int]]:
+        """Remove and return the rows of every week before the latest one seen"""
+        closed = [week for week in self._weeks if week < self._latest]
+        return self._pop(sorted(closed))
+    
+    def pop_all(self) -> List[Tuple[date, str, Decimal, int, int]]:
+        """Remove and return the rows of every remaining week"""
+        return self._pop(sorted(self._weeks))
+    
+    def _pop(self, weeks: List[date]) -> List[Tuple[date, str, Decimal, int, int]]:
+        rows = []
+        for week in weeks:
+            for ticker, (total, users, count) in sorted(self._weeks.pop(week).items()):
+                rows.append((week, ticker, total, len(users), count))
+        return rows
+
+
+@dataclass
+class SpendingAggregateStats:
+    """Outcome of a weekly spending aggregate refresh"""
+    full_rebuild: bool = False
+    skipped: bool = False
+    weeks_refreshed: int = 0
+    transactions: int = 0
+    rows_written: int = 0
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _training_transactions():
+    """Transactions that count as spending for the predictor"""
+    return BankTransaction.objects.filter(
+        transaction_type='DEBIT',
+        status='POSTED',
+        transaction_date__isnull=False
+    )
+
+
+def refresh_weekly_spending(full: bool = False, chunk_size: int = TRAINING_CHUNK_SIZE) -> SpendingAggregateStats:
+    """
+    Bring the SpendingWeeklyAggregate table up to date with BankTransaction.
+    
+    Only weeks containing a transaction created or updated since the previous
+    build are recomputed (all weeks on the first build, or when full=True).
+    Transactions are streamed in transaction_date order with
+    values_list(...).iterator(), and each week is written as soon as it closes.
+    
+    The delete and rewrite run in one database transaction, so a refresh that
+    fails midway leaves the previous table and its built_at watermark intact.
+    Refreshes are serialized with a cross-worker lock; one that finds the lock
+    held returns at once with skipped=True.
+    
+    Deleted transactions do not mark their week dirty, and a transaction whose
+    transaction_date is edited only marks its new week dirty (the week it left
+    keeps counting it); run a full rebuild after removing accounts or
+    back-dating transactions.
+    
+    Args:
+        full: Discard the table and rebuild every week
+        chunk_size: Transactions fetched and classified per round trip
+        
+    Returns:
+        SpendingAggregateStats
+    """
+    lock = single_flight.DistributedLock(get_default_redis_client())
+    token = lock.acquire(WEEKLY_SPENDING_LOCK, WEEKLY_SPENDING_LOCK_TIMEOUT_S)
+    if token is None:
+        logger.info("Weekly spending aggregate refresh already running elsewhere; skipping")
+        return SpendingAggregateStats(skipped=True)
+    try:
+        return _refresh_weekly_spending(full, chunk_size)
+    finally:
+        lock.release(WEEKLY_SPENDING_LOCK, token)
+
+
+def _refresh_weekly_spending(full: bool, chunk_size: int) -> SpendingAggregateStats:
+    started = timezone.now()
+    stats = SpendingAggregateStats()
+    transactions = _training_transactions()
+    
+    watermark = None if full else SpendingWeeklyAggregate.objects.aggregate(Max('built_at'))['built_at__max']
+    if watermark is None:
+        stats.full_rebuild = True
+        stale = SpendingWeeklyAggregate.objects.all()
+    else:
+        changed_days = BankTransaction.objects.filter(
+            updated_at__gte=watermark,
+            transaction_date__isnull=False
+        ).values_list('transaction_date', flat=True).distinct()
+        dirty_weeks = sorted({week_start(day) for day in changed_days})
+        if not dirty_weeks:
+            logger.info("Weekly spending aggregates are up to date")
+            return stats
+        
+        # One date range per run of consecutive dirty weeks
+        ranges = Q()
+        run_start = previous = dirty_weeks[0]
+        for week in dirty_weeks[1:] + [None]:
+            if week is not None and week - previous == timedelta(weeks=1):
+                previous = week
+                continue
+            ranges |= Q(transaction_date__gte=run_start, transaction_date__lt=previous + timedelta(weeks=1))
+            run_start = previous = week
+        transactions = transactions.filter(ranges)
+        stale = SpendingWeeklyAggregate.objects.filter(week_start__in=dirty_weeks)
+        stats.weeks_refreshed = len(dirty_weeks)
+    
+    with transaction.atomic():
+        stale.delete()
+        rows = transactions.order_by('transaction_date').values_list(
+            *TRAINING_TRANSACTION_FIELDS
+        ).iterator(chunk_size=chunk_size)
+        accumulator = WeeklySpendingAccumulator()
+        written_weeks = set()
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            stats.transactions += len(chunk)
+            accumulator.add(chunk)
+            stats.rows_written += _write_weekly_spending(accumulator.pop_closed_weeks(), started, written_weeks)
+        stats.rows_written += _write_weekly_spending(accumulator.pop_all(), started, written_weeks)
+    if stats.full_rebuild:
+        stats.weeks_refreshed = len(written_weeks)
+    
+    logger.info(f"Refreshed weekly spending aggregates: {stats.as_dict()}")
+    return stats
+
+
+def _write_weekly_spending(rows: List[Tuple], built_at: datetime, written_weeks: set) -> int:
+    if not rows:
+        return 0
+    SpendingWeeklyAggregate.objects.bulk_create([
+        SpendingWeeklyAggregate(
+            week_start=week,
+            ticker=ticker,
+            total_spending=total,
+            user_count=user_count,
+            transaction_count=count,
+            built_at=built_at,
+        )
+        for week, ticker, total, user_count, count in rows
+    ], batch_size=1000)
+    written_weeks.update(row[0] for row in rows)
+    return len(rows)
+
+
+def load_weekly_spending(start_date: date, end_date: date) -> pd.DataFrame:
+    """
+    Persisted weekly spending for the weeks overlapping [start_date, end_date].
+    
+    Returns:
+        DataFrame with columns: date, ticker, total_spending, user_count
+    """
+    rows = list(SpendingWeeklyAggregate.objects.filter(
+        week_start__gte=week_start(start_date),
+        week_start__lte=end_date
+    ).order_by('week_start', 'ticker').values_list('week_start', 'ticker', 'total_spending', 'user_count'))
+    if not rows:
+        return pd.DataFrame()
+    
+    weeks, tickers, totals, user_counts = zip(*rows)
+    return pd.DataFrame({
+        'date': pd.to_datetime(weeks),
+        'ticker': tickers,
+        'total_spending': np.asarray(totals, dtype=float),
+        'user_count': np.asarray(user_counts, dtype=np.int64),
+    })
+
 
 class SpendingTrendPredictor:
     """
@@ -112,42 +388,49 @@ class SpendingTrendPredictor:
     async def prepare_training_data(
         self,
         lookback_months: int = 36,
-        min_users_per_ticker: int = 5
+        min_users_per_ticker: int = 5,
+        min_transactions: int = 1000
     ) -> Tuple[pd.DataFrame, pd.Series]:
         """
         Prepare training data from real spending and stock price data
         
+        Weekly spending per ticker comes from the persisted
+        SpendingWeeklyAggregate table, which is refreshed first for weeks
+        with new or changed transactions only.
+        
         Args:
             lookback_months: How many months of historical data to use
             min_users_per_ticker: Minimum users spending in category to include ticker
+            min_transactions: Minimum transactions in the lookback window to train
             
         Returns:
             (features_df, targets_series) - Features and target returns
         """
         logger.info(f"Preparing training data: {lookback_months} months lookback")
         
-        # Step 1: Get all spending transactions (last 24-36 months)
+        # Step 1: Count spending transactions (last 24-36 months)
         end_date = timezone.now().date()
         start_date = end_date - timedelta(days=lookback_months * 30)
         
         # Use sync_to_async for Django ORM queries
-        transactions_qs = await sync_to_async(list)(
-            BankTransaction.objects.filter(
-                transaction_type='DEBIT',
+        transaction_count = await sync_to_async(
+            _training_transactions().filter(
                 transaction_date__gte=start_date,
-                transaction_date__lte=end_date,
-                status='POSTED'
-            ).select_related('user').order_by('transaction_date')
-        )
+                transaction_date__lte=end_date
+            ).count
+        )()
         
-        logger.info(f"Found {len(transactions_qs)} transactions")
+        logger.info(f"Found {transaction_count} transactions")
         
-        if len(transactions_qs) < 1000:
-            logger.warning("Not enough transactions for training - need at least 1000")
+        if transaction_count < min_transactions:
+            logger.warning(f"Not enough transactions for training - need at least {min_transactions}")
             return pd.DataFrame(), pd.Series()
         
-        # Step 2: Aggregate spending by category/merchant → map to tickers
-        spending_by_ticker = self._aggregate_spending_by_ticker(transactions_qs)
+        # Step 2: Aggregate spending by category/merchant → map to tickers (new weeks only)
+        await sync_to_async(refresh_weekly_spending)()
+        spending_by_ticker = await sync_to_async(load_weekly_spending)(start_date, end_date)
+        if spending_by_ticker.empty:
+            logger.warning("No spending data matched to tickers")
         
         # Step 3: Create weekly/monthly % change features
         spending_features = self._create_spending_change_features(spending_by_ticker)
@@ -165,66 +448,6 @@ class SpendingTrendPredictor:
         logger.info(f"Prepared {len(aligned_data[0])} training samples with {len(aligned_data[0].columns)} features")
         return aligned_data
     
-    def _aggregate_spending_by_ticker(self, transactions) -> pd.DataFrame:
-        """
-        Aggregate spending by ticker based on merchant/category mapping
-        Returns DataFrame with columns: date, ticker, total_spending, user_count
-        """
-        spending_data = []
-        
-        # Group by week for efficiency
-        for transaction in transactions:
-            date = transaction.transaction_date or transaction.posted_date
-            merchant = (transaction.merchant_name or '').upper()
-            category = (transaction.category or '').upper()
-            description = (transaction.description or '').upper()
-            amount = abs(float(transaction.amount))
-            
-            # Find matching tickers
-            matched_tickers = set()
-            
-            # Check merchant name
-            for key, tickers in SPENDING_TO_STOCKS.items():
-                if key in merchant or key in description:
-                    matched_tickers.update(tickers)
-            
-            # Check category
-            for key, tickers in SPENDING_TO_STOCKS.items():
-                if key in category:
-                    matched_tickers.update(tickers)
-            
-            # If no direct match, try sector mapping
-            if not matched_tickers:
-                for cat_key, sector in SPENDING_TO_SECTORS.items():
-                    if cat_key in category or cat_key in merchant:
-                        # Get all stocks in that sector (simplified - in production, use actual sector data)
-                        matched_tickers.update(SPENDING_TO_STOCKS.get(cat_key, []))
-            
-            # Add spending for each matched ticker
-            for ticker in matched_tickers:
-                spending_data.append({
-                    'date': date,
-                    'ticker': ticker,
-                    'amount': amount,
-                    'user_id': transaction.user_id
-                })
-        
-        if not spending_data:
-            logger.warning("No spending data matched to tickers")
-            return pd.DataFrame()
-        
-        df = pd.DataFrame(spending_data)
-        
-        # Aggregate by week and ticker
-        df['week'] = pd.to_datetime(df['date']).dt.to_period('W').dt.start_time
-        weekly_spending = df.groupby(['week', 'ticker']).agg({
-            'amount': 'sum',
-            'user_id': 'nunique'
-        }).reset_index()
-        weekly_spending.columns = ['date', 'ticker', 'total_spending', 'user_count']
-        
-        return weekly_spending
-    
     def _create_spending_change_features(self, spending_df: pd.DataFrame) -> pd.DataFrame:
         """
         Create weekly/monthly % change features from spending data
@@ -437,7 +660,7 @@ class SpendingTrendPredictor:
         
         return aligned_features, aligned_targets
     
-    async def train_baseline_model(self, lookback_months: int = 36) -> Dict[str, Any]:
+    async def train_baseline_model(self, lookback_months: int = 36, min_transactions: int = 1000) -> Dict[str, Any]:
         """
         Train baseline XGBoost model using only spending features
         Returns model performance metrics
@@ -449,7 +672,7 @@ class SpendingTrendPredictor:
         logger.info("Training baseline spending-based predictive model...")
         
         # Prepare training data
-        features_df, targets = await self.prepare_training_data(lookback_months)
+        features_df, targets = await self.prepare_training_data(lookback_months, min_transactions=min_transactions)
         
         if features_df.empty or targets.empty:
             logger.error("No training data available")
@@ -45,9 +45,12 @@ import logging
 import re
 from dataclasses import dataclass, field
 from datetime import date, timedelta
+from functools import lru_cache
 from statistics import median, stdev
 from typing import Optional
 
+from .merchant_matcher import MATCH_CACHE_SIZE, CategoryMatcher
+
 logger = logging.getLogger(__name__)
 
 # ── Tuning knobs ──────────────────────────────────────────────────────────────
@@ -102,6 +105,8 @@ CATEGORY_KEYWORDS = {
     "Subscriptions":  ["subscription", "monthly", "annual", "membership"],
 }
 
+_CATEGORY_MATCHER = CategoryMatcher(CATEGORY_KEYWORDS)
+
 
 # ── Data containers ───────────────────────────────────────────────────────────
 
@@ -357,19 +362,28 @@ class SubscriptionDetector:
 
 # ── Pure helper functions ─────────────────────────────────────────────────────
 
+_CARD_NOISE_RE   = re.compile(r'[*#]\S*')
+_TRAILING_ID_RE  = re.compile(r'\s+\d{4,}$')
+_FILLER_WORDS_RE = re.compile(r'\b(inc|llc|ltd|corp|co|the|www|com|net|org)\b')
+_PUNCTUATION_RE  = re.compile(r'[^\w\s]')
+_WHITESPACE_RE   = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=MATCH_CACHE_SIZE)
 def _normalise_merchant(raw: str) -> str:
     """
     Lowercase, strip card/transaction noise, collapse whitespace.
     e.g. "NETFLIX.COM*XXXXX" → "netflix"
+    Memoized: the same raw merchant strings recur across charges and users.
     """
     s = raw.lower()
     # Strip trailing noise: *xxxxx, #12345, trailing digits after space
-    s = re.sub(r'[*#]\S*', '', s)
-    s = re.sub(r'\s+\d{4,}$', '', s)
+    s = _CARD_NOISE_RE.sub('', s)
+    s = _TRAILING_ID_RE.sub('', s)
     # Remove common prefixes/suffixes that add no info
-    s = re.sub(r'\b(inc|llc|ltd|corp|co|the|www|com|net|org)\b', '', s)
-    s = re.sub(r'[^\w\s]', ' ', s)
-    s = re.sub(r'\s+', ' ', s).strip()
+    s = _FILLER_WORDS_RE.sub('', s)
+    s = _PUNCTUATION_RE.sub(' ', s)
+    s = _WHITESPACE_RE.sub(' ', s).strip()
     return s
 
 
@@ -425,11 +439,7 @@ def _to_monthly(amount: float, cadence_days: int) -> float:
 
 def _classify_merchant(merchant_key: str) -> str:
     """Map normalised merchant key to a category string."""
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        for kw in keywords:
-            if kw in merchant_key:
-                return category
-    return "Subscriptions"
+    return _CATEGORY_MATCHER.match(merchant_key) or "Subscriptions"
 
 
 def _is_likely_unused(merchant_key: str, amount: float, cadence_days: int) -> bool:
@@ -8,6 +8,8 @@ from typing import Dict, List, Any, Optional, Tuple
 import logging
 from datetime import datetime, timedelta
 
+from . import indicators
+
 logger = logging.getLogger(__name__)
 
 
@@ -266,37 +268,20 @@ class TechnicalAnalysisService:
         """Calculate RSI"""
         if len(prices) < period + 1:
             return 50.0
-        deltas = np.diff(prices)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        avg_gains = np.mean(gains[-period:])
-        avg_losses = np.mean(losses[-period:])
-        if avg_losses == 0:
-            return 100.0
-        rs = avg_gains / avg_losses
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return float(indicators.rsi(prices, period)[-1])
 
     def _calculate_macd(self, prices: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[float, float, float]:
         """Calculate MACD"""
         if len(prices) < slow:
             return 0.0, 0.0, 0.0
-        ema_fast = self._calculate_ema(prices, fast)
-        ema_slow = self._calculate_ema(prices, slow)
-        macd_line = ema_fast - ema_slow
-        macd_signal = self._calculate_ema(np.array([macd_line]), signal)
-        macd_histogram = macd_line - macd_signal
-        return macd_line, macd_signal, macd_histogram
+        macd_line, macd_signal, macd_histogram = indicators.macd(prices, fast, slow, signal)
+        return float(macd_line[-1]), float(macd_signal[-1]), float(macd_histogram[-1])
 
     def _calculate_ema(self, prices: np.ndarray, period: int) -> float:
         """Calculate Exponential Moving Average"""
         if len(prices) < period:
             return prices[-1]
-        alpha = 2 / (period + 1)
-        ema = prices[0]
-        for price in prices[1:]:
-            ema = alpha * price + (1 - alpha) * ema
-        return ema
+        return float(indicators.ema(prices, span=period)[-1])
 
     def _calculate_stochastic(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> Tuple[float, float]:
         """Calculate Stochastic Oscillator"""
@@ -335,15 +320,9 @@ class TechnicalAnalysisService:
         """Calculate Average True Range"""
         if len(high) < 2:
             return 0.0
-        true_ranges = []
-        for i in range(1, len(high)):
-            tr1 = high[i] - low[i]
-            tr2 = abs(high[i] - close[i - 1])
-            tr3 = abs(low[i] - close[i - 1])
-            true_ranges.append(max(tr1, tr2, tr3))
-        if len(true_ranges) < period:
-            return np.mean(true_ranges)
-        return np.mean(true_ranges[-period:])
+        # The first bar has no previous close; it is left out
+        true_ranges = indicators.true_range(high, low, close)[1:]
+        return float(np.mean(true_ranges[-period:]))
 
     def _calculate_historical_volatility(self, prices: np.ndarray, period: int = 252) -> float:
         """Calculate historical volatility (annualized)"""
@@ -411,35 +390,19 @@ class TechnicalAnalysisService:
             close = data['close'].values
             if len(high) < period + 1:
                 return 25.0
-            # Directional Movement calculation
-            plus_dm = np.zeros(len(high))
-            minus_dm = np.zeros(len(high))
-            tr_arr = np.zeros(len(high))
-            for i in range(1, len(high)):
-                up_move = high[i] - high[i - 1]
-                down_move = low[i - 1] - low[i]
-                plus_dm[i] = up_move if (up_move > down_move and up_move > 0) else 0.0
-                minus_dm[i] = down_move if (down_move > up_move and down_move > 0) else 0.0
-                tr_arr[i] = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
-            # Smoothed averages (Wilder's method)
-            atr = np.mean(tr_arr[1:period + 1])
-            plus_di_val = np.mean(plus_dm[1:period + 1])
-            minus_di_val = np.mean(minus_dm[1:period + 1])
-            dx_values = []
-            for i in range(period + 1, len(high)):
-                atr = atr - (atr / period) + tr_arr[i]
-                plus_di_val = plus_di_val - (plus_di_val / period) + plus_dm[i]
-                minus_di_val = minus_di_val - (minus_di_val / period) + minus_dm[i]
-                if atr > 0:
-                    plus_di = 100.0 * plus_di_val / atr
-                    minus_di = 100.0 * minus_di_val / atr
-                else:
-                    plus_di = 0.0
-                    minus_di = 0.0
+            # Directional movement and true range, skipping the first bar (no previous bar)
+            plus_dm, minus_dm = (dm[1:] for dm in indicators.directional_movement(high, low))
+            tr_arr = indicators.true_range(high, low, close)[1:]
+            # Wilder running totals, seeded with the mean of the first `period` bars
+            atr = indicators.wilder_sum(tr_arr, period, seed='mean')[period:]
+            plus_di_val = indicators.wilder_sum(plus_dm, period, seed='mean')[period:]
+            minus_di_val = indicators.wilder_sum(minus_dm, period, seed='mean')[period:]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                plus_di = np.where(atr > 0, 100.0 * plus_di_val / atr, 0.0)
+                minus_di = np.where(atr > 0, 100.0 * minus_di_val / atr, 0.0)
                 di_sum = plus_di + minus_di
-                dx = (abs(plus_di - minus_di) / di_sum * 100.0) if di_sum > 0 else 0.0
-                dx_values.append(dx)
-            if not dx_values:
+                dx_values = np.where(di_sum > 0, np.abs(plus_di - minus_di) / di_sum * 100.0, 0.0)
+            if not dx_values.size:
                 return 25.0
             if len(dx_values) >= period:
                 adx = np.mean(dx_values[-period:])
@@ -0,0 +1,135 @@
+"""
+Tests for the bounded memory tier of AggressiveCachingService.
+"""
+import threading
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from core.aggressive_caching_service import AggressiveCachingService, MemoryCacheTier
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMemoryCacheTier(SimpleTestCase):
+    def test_lru_eviction_by_entry_count(self):
+        tier = MemoryCacheTier(max_entries=3)
+        for key in ('a:1', 'a:2', 'a:3'):
+            tier.set(key, key, ttl=60)
+        tier.get('a:1')  # a:1 becomes most recently used
+        tier.set('b:1', 'b', ttl=60)
+
+        self.assertEqual(tier.keys(), ['a:3', 'a:1', 'b:1'])
+        self.assertEqual(tier.get_stats()['prefixes']['a']['evictions'], 1)
+
+    def test_byte_limit_and_oversized_values(self):
+        tier = MemoryCacheTier(max_entries=100, max_bytes=2_000)
+        for i in range(10):
+            tier.set(f'blob:{i}', b'x' * 500, ttl=60)
+
+        self.assertLessEqual(tier.size_bytes, 2_000)
+        self.assertLess(len(tier), 10)
+        self.assertIsNotNone(tier.get('blob:9'))
+        self.assertFalse(tier.set('blob:huge', b'x' * 5_000, ttl=60))
+        self.assertIsNone(tier.get('blob:huge'))
+
+    def test_lazy_and_periodic_expiry(self):
+        clock = FakeClock()
+        with patch('core.aggressive_caching_service.time.monotonic', clock):
+            tier = MemoryCacheTier(sweep_interval=30)
+            tier.set('kelly:AAPL', 1, ttl=10)
+            tier.set('kelly:MSFT', 2, ttl=10)
+            tier.set('fss:AAPL', 3, ttl=120)
+
+            clock.now += 11
+            self.assertIsNone(tier.get('kelly:AAPL'))  # lazy expiry on read
+            self.assertEqual(len(tier), 2)
+
+            clock.now += 30  # next access triggers the periodic sweep
+            self.assertEqual(tier.get('fss:AAPL'), 3)
+            self.assertEqual(tier.keys(), ['fss:AAPL'])
+            self.assertEqual(tier.get_stats()['prefixes']['kelly']['expirations'], 2)
+
+    def test_sizing_does_not_serialize_on_set(self):
+        tier = MemoryCacheTier(max_entries=100, max_bytes=1_000_000)
+        rows = [{'symbol': f'S{i}', 'score': i * 0.5} for i in range(1_000)]
+        with patch('core.aggressive_caching_service.pickle.dumps', side_effect=AssertionError):
+            self.assertTrue(tier.set('fss:universe', rows, ttl=60))
+            self.assertTrue(tier.set('fss:known', b'payload', ttl=60, size=4_096))
+            tier.get('fss:universe')
+
+        self.assertGreater(tier.size_bytes, 4_096 + 1_000 * 64)  # items are counted, not just the list
+        self.assertGreater(tier.measure_bytes(), 0)  # explicit accounting pickles
+
+    def test_nested_payloads_are_sized_and_evicted(self):
+        def universe(n):
+            return [
+                {'symbol': f'S{i}', 'scores': {f'f{j}': j * 0.1 for j in range(20)},
+                 'history': [{'day': j, 'close': 100.0 + j} for j in range(20)]}
+                for i in range(n)
+            ]
+
+        tier = MemoryCacheTier(max_entries=100, max_bytes=8_000_000)
+        self.assertTrue(tier.set('fss:universe:0', universe(500), ttl=60))
+        self.assertGreater(tier.size_bytes, 2_000_000)  # nested dicts count, not just the top-level list
+
+        tier.set('fss:universe:1', universe(500), ttl=60)
+        self.assertLessEqual(tier.size_bytes, 8_000_000)
+        self.assertIsNone(tier.get('fss:universe:0'))
+        self.assertIsNotNone(tier.get('fss:universe:1'))
+        self.assertFalse(tier.set('fss:universe:big', universe(2_000), ttl=60))
+
+    def test_concurrent_access_keeps_limits(self):
+        tier = MemoryCacheTier(max_entries=50)
+
+        def worker(n):
+            for i in range(500):
+                tier.set(f'w{n}:{i % 80}', i, ttl=60)
+                tier.get(f'w{n}:{(i * 7) % 80}')
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertLessEqual(len(tier), 50)
+        self.assertEqual(tier.size_bytes, sum(tier._entries[k][2] for k in tier.keys()))
+
+
+@override_settings(CACHES=LOCMEM)
+class TestAggressiveCachingServiceMemoryTier(SimpleTestCase):
+    def test_stats_per_prefix_across_layers(self):
+        service = AggressiveCachingService(memory_max_entries=10)
+        service.set_cached('kelly:AAPL', {'f': 0.1}, ttl=300)
+        service.get_cached('kelly:AAPL')
+        service.get_cached('fss:MSFT')
+
+        service.memory_cache.clear()
+        self.assertEqual(service.get_cached('kelly:AAPL'), {'f': 0.1})  # served by Redis layer
+
+        stats = service.get_stats()
+        self.assertEqual(stats['prefix_stats']['kelly']['memory_hits'], 1)
+        self.assertEqual(stats['prefix_stats']['kelly']['redis_hits'], 1)
+        self.assertEqual(stats['prefix_stats']['fss']['redis_misses'], 1)
+        self.assertEqual(stats['memory_cache_size'], 1)
+        self.assertEqual(stats['memory_cache_limits']['max_entries'], 10)
+        self.assertNotIn('memory_cache_serialized_bytes', stats)
+        self.assertGreater(service.get_stats(deep=True)['memory_cache_serialized_bytes'], 0)
+
+    def test_invalidate_pattern_clears_memory_tier(self):
+        service = AggressiveCachingService()
+        service.set_cached('kelly:AAPL', 1)
+        service.set_cached('kelly:MSFT', 2)
+        service.set_cached('fss:AAPL', 3)
+
+        self.assertEqual(service.invalidate_pattern('kelly:*'), 2)
+        self.assertEqual(service.memory_cache.keys(), ['fss:AAPL'])
@@ -0,0 +1,141 @@
+"""
+Tests for bulk Yodlee transaction ingestion: insert/update/unchanged diffing,
+chunked upserts, constraint fallback and paged fetching.
+"""
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from core.banking_models import BankAccount, BankProviderAccount, BankTransaction
+from core.banking_sync import sync_transaction_pages
+from core.yodlee_client import YodleeClient
+
+User = get_user_model()
+
+
+def yodlee_txn(txn_id, amount=-10.0, merchant=None, day=1, status='POSTED'):
+    return {
+        'id': txn_id,
+        'amount': {'amount': amount, 'currency': 'USD'},
+        'description': {'original': f'Purchase {txn_id}'},
+        'merchant': {'name': merchant or f'Store {txn_id}'},
+        'category': 'Shopping',
+        'postDate': f'2025-01-{day:02d}',
+        'transactionDate': f'2025-01-{day:02d}',
+        'status': status,
+    }
+
+
+class TransactionSyncTestCase(TestCase):
+    """Tests for sync_transaction_pages"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='sync@example.com', password='testpass123', name='Sync User')
+        provider_account = BankProviderAccount.objects.create(
+            user=self.user, provider_account_id='123', provider_name='Test Bank'
+        )
+        self.bank_account = BankAccount.objects.create(
+            user=self.user,
+            provider_account=provider_account,
+            yodlee_account_id='acc_456',
+            provider='Test Bank',
+            name='Checking Account',
+            account_type='CHECKING',
+        )
+
+    def test_inserts_updates_and_skips_unchanged_rows(self):
+        pages = [[yodlee_txn(i, day=1 + i % 28) for i in range(120)]]
+        stats = sync_transaction_pages(self.bank_account, iter(pages), batch_size=50)
+
+        self.assertEqual((stats.inserted, stats.updated, stats.unchanged), (120, 0, 0))
+        self.assertEqual(BankTransaction.objects.filter(bank_account=self.bank_account).count(), 120)
+        txn = BankTransaction.objects.get(yodlee_transaction_id='7')
+        self.assertEqual(txn.amount, Decimal('10.00'))
+        self.assertEqual(txn.transaction_type, 'DEBIT')
+        self.assertEqual(txn.user, self.user)
+
+        # Second sync: two rows changed upstream, one is new, the rest are untouched
+        page = [yodlee_txn(i, day=1 + i % 28) for i in range(120)]
+        page[3] = yodlee_txn(3, amount=-12.5, day=4)
+        page[7] = yodlee_txn(7, day=8, status='CANCELLED')
+        page.append(yodlee_txn(500, day=2))
+        stats = sync_transaction_pages(self.bank_account, [page[:60], page[60:]])
+
+        self.assertEqual(stats.as_dict(), {'inserted': 1, 'updated': 2, 'unchanged': 118, 'skipped': 0, 'pages': 2})
+        self.assertEqual(BankTransaction.objects.get(yodlee_transaction_id='3').amount, Decimal('12.50'))
+        self.assertEqual(BankTransaction.objects.get(yodlee_transaction_id='7').status, 'CANCELLED')
+        self.assertEqual(BankTransaction.objects.filter(bank_account=self.bank_account).count(), 121)
+
+    def test_queries_scale_with_batches_not_rows(self):
+        page = [yodlee_txn(i, day=1 + i % 28) for i in range(300)]
+
+        # One diff query plus one upsert per batch (each inside a savepoint),
+        # against two queries per row for update_or_create
+        with self.assertNumQueries(1 + 6 * 3):
+            sync_transaction_pages(self.bank_account, [page], batch_size=50)
+
+        with self.assertNumQueries(1):
+            stats = sync_transaction_pages(self.bank_account, [page], batch_size=50)
+        self.assertEqual(stats.unchanged, 300)
+
+    def test_pages_are_consumed_lazily(self):
+        seen = []
+
+        def pages():
+            for n in range(3):
+                # The previous page is already stored when the next one is requested
+                seen.append(BankTransaction.objects.filter(bank_account=self.bank_account).count())
+                yield [yodlee_txn(f'{n}-{i}', day=1 + i, merchant=f'M{n}') for i in range(5)]
+
+        stats = sync_transaction_pages(self.bank_account, pages())
+        self.assertEqual(seen, [0, 5, 10])
+        self.assertEqual(stats.inserted, 15)
+
+    def test_rows_rejected_by_the_dedup_constraint_are_skipped(self):
+        # Same account, posted_date, amount and merchant as an existing row
+        sync_transaction_pages(self.bank_account, [[yodlee_txn('a', merchant='Cafe', day=3)]])
+        page = [yodlee_txn('b', merchant='Cafe', day=3), yodlee_txn('c', merchant='Deli', day=3)]
+
+        stats = sync_transaction_pages(self.bank_account, [page])
+
+        self.assertEqual((stats.inserted, stats.skipped), (1, 1))
+        self.assertEqual(
+            sorted(BankTransaction.objects.values_list('yodlee_transaction_id', flat=True)), ['a', 'c']
+        )
+
+
+class TransactionPagingTestCase(TestCase):
+    """Tests for YodleeClient.iter_transaction_pages"""
+
+    @patch('core.yodlee_client.requests.get')
+    def test_follows_skip_and_top_until_a_short_page(self, mock_get):
+        def respond(url, headers=None, params=None, timeout=None):
+            response = MagicMock(status_code=200)
+            start = params['skip']
+            response.json.return_value = {
+                'transaction': [{'id': i} for i in range(start, min(start + params['top'], 7))]
+            }
+            return response
+
+        mock_get.side_effect = respond
+        client = YodleeClient()
+        with patch.object(client, '_get_user_token_headers', return_value={}):
+            pages = list(client.iter_transaction_pages('user', account_id='acc', page_size=3))
+            flat = client.get_transactions('user', account_id='acc')
+
+        self.assertEqual([[t['id'] for t in page] for page in pages], [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual([call.kwargs['params']['skip'] for call in mock_get.call_args_list[:3]], [0, 3, 6])
+        self.assertEqual(len(flat), 7)
+
+    @patch('core.yodlee_client.requests.get')
+    def test_failed_page_raises_for_the_task_to_retry(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=500, text='error')
+        mock_get.return_value.raise_for_status.side_effect = Exception('500 Server Error')
+        client = YodleeClient()
+
+        with patch.object(client, '_get_user_token_headers', return_value={}):
+            with self.assertRaises(Exception):
+                list(client.iter_transaction_pages('user'))
+            self.assertEqual(client.get_transactions('user'), [])
@@ -127,8 +127,8 @@ class BankingTasksTestCase(TestCase):
             'merchant': {'name': 'Test Store'},
             'status': 'POSTED',
         }
-        # Set return_value properly - get_transactions should return a list
-        mock_client.get_transactions = MagicMock(return_value=[yodlee_transaction_data])
+        # The task streams pages: one page holding the transaction
+        mock_client.iter_transaction_pages = MagicMock(return_value=iter([[yodlee_transaction_data]]))
         mock_client_class.return_value = mock_client
         # Patch normalize_transaction at the module level to use real method
         with patch('core.banking_tasks.YodleeClient.normalize_transaction', RealYodleeClient.normalize_transaction):
@@ -155,8 +155,8 @@ class BankingTasksTestCase(TestCase):
     def test_sync_transactions_task_empty(self, mock_client_class):
         """Test transaction sync with no new transactions"""
         mock_client = MagicMock()
-        # Set return_value properly
-        mock_client.get_transactions = MagicMock(return_value=[])
+        # No pages
+        mock_client.iter_transaction_pages = MagicMock(return_value=iter([]))
         mock_client_class.return_value = mock_client
         
         # For bound tasks, use .run() method instead of calling directly
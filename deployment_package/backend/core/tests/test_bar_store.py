@@ -0,0 +1,127 @@
+"""
+Tests for the local bar store: incremental top-up, retry of failed symbols,
+re-adjustment detection, and multi-symbol slicing.
+"""
+import asyncio
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.bar_store import BarStore
+from core.fss_data_pipeline import FSSDataPipeline
+
+
+def make_bars(start, end, scale=1.0):
+    # Closes depend only on the date, so overlapping fetches agree
+    index = pd.bdate_range(start, end).tz_localize("America/New_York")
+    close = (index.day + 100 * index.month).to_numpy(dtype=float) * scale
+    return pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1000.0}, index=index
+    )
+
+
+class FakeProvider:
+    def __init__(self, failing=(), scale=1.0):
+        self.failing = set(failing)
+        self.scale = scale
+        self.calls = []
+
+    def __call__(self, symbols, start, end):
+        self.calls.append((tuple(symbols), start, end))
+        return {s: make_bars(start, end, self.scale) for s in symbols if s not in self.failing}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BarStore(str(tmp_path))
+
+
+def test_top_up_fetches_only_missing_ranges(store):
+    provider = FakeProvider()
+    bars = store.get(["AAPL", "MSFT"], date(2025, 1, 2), date(2025, 1, 31), fetch=provider)
+
+    assert provider.calls == [(("AAPL", "MSFT"), date(2025, 1, 2), date(2025, 1, 31))]
+    assert len(bars["AAPL"]) == 22
+    assert bars["AAPL"].index[0] == pd.Timestamp("2025-01-02")
+    assert list(bars["AAPL"].columns) == ["open", "high", "low", "close", "volume"]
+
+    # Fully covered: served from disk
+    store.get(["MSFT", "AAPL"], date(2025, 1, 6), date(2025, 1, 24), fetch=provider)
+    assert len(provider.calls) == 1
+
+    # Extending the window fetches the new days only, starting from the last
+    # stored bar so a re-adjustment can be detected
+    bars = store.get(["AAPL", "MSFT"], date(2025, 1, 2), date(2025, 2, 14), fetch=provider)
+    assert provider.calls[1:] == [(("AAPL", "MSFT"), date(2025, 1, 31), date(2025, 2, 14))]
+    assert bars["MSFT"].index.is_unique and len(bars["MSFT"]) == 32
+    assert store.coverage("AAPL") == [(date(2025, 1, 2), date(2025, 2, 14))]
+
+
+def test_failed_symbols_are_retried_and_weekend_gaps_skipped(store):
+    provider = FakeProvider(failing={"BAD"})
+    bars = store.get(["AAPL", "BAD"], date(2025, 1, 6), date(2025, 1, 10), fetch=provider)
+    assert list(bars) == ["AAPL"]
+    assert store.coverage("BAD") == []
+
+    provider.failing.clear()
+    store.get(["AAPL", "BAD"], date(2025, 1, 6), date(2025, 1, 12), fetch=provider)
+    # AAPL is only missing Saturday and Sunday
+    assert provider.calls[1:] == [(("BAD",), date(2025, 1, 6), date(2025, 1, 12))]
+
+
+def test_readjusted_history_is_refetched_in_full(store):
+    store.get(["AAPL"], date(2025, 1, 2), date(2025, 1, 31), fetch=FakeProvider())
+
+    # A 2:1 split halves every adjusted close, including the stored ones
+    provider = FakeProvider(scale=0.5)
+    bars = store.get(["AAPL"], date(2025, 1, 2), date(2025, 2, 7), fetch=provider)
+
+    assert [call[1:] for call in provider.calls] == [
+        (date(2025, 1, 31), date(2025, 2, 7)),
+        (date(2025, 1, 2), date(2025, 2, 7)),
+    ]
+    expected = make_bars(date(2025, 1, 2), date(2025, 2, 7), scale=0.5)["Close"].to_numpy()
+    np.testing.assert_allclose(bars["AAPL"]["close"].to_numpy(), expected)
+
+
+def test_read_and_panel_slice_across_symbols(store):
+    store.write("AAPL", make_bars(date(2025, 1, 2), date(2025, 1, 31)), date(2025, 1, 2), date(2025, 1, 31))
+    store.write("MSFT", make_bars(date(2025, 1, 15), date(2025, 2, 14)), date(2025, 1, 15), date(2025, 2, 14))
+
+    window = store.read("AAPL", date(2025, 1, 10), date(2025, 1, 16))
+    assert list(window.index.day) == [10, 13, 14, 15, 16]
+    assert window["close"].iloc[0] == 110.0
+
+    panel = store.panel(["AAPL", "MSFT", "NONE"], date(2025, 1, 27), date(2025, 2, 4))
+    assert list(panel.columns) == ["AAPL", "MSFT"]
+    assert len(panel) == 7
+    assert panel["AAPL"].isna().sum() == 2 and panel["MSFT"].notna().all()
+
+    # Rewriting a range replaces its rows
+    store.write("AAPL", make_bars(date(2025, 1, 6), date(2025, 1, 10), 2.0), date(2025, 1, 6), date(2025, 1, 10))
+    assert store.read("AAPL", date(2025, 1, 6), date(2025, 1, 6))["close"].iloc[0] == 212.0
+    assert len(store.read("AAPL")) == 22
+
+
+def test_fss_pipeline_falls_back_per_symbol_through_the_store(store):
+    pipeline = FSSDataPipeline()
+    polygon = AsyncMock(return_value={"AAPL": make_bars(date(2025, 1, 6), date(2025, 1, 10))})
+    alpaca = AsyncMock(return_value={})
+    yfinance = AsyncMock(return_value={"MSFT": make_bars(date(2025, 1, 6), date(2025, 1, 10))})
+
+    with patch("core.fss_data_pipeline.get_bar_store", return_value=store), \
+            patch.object(pipeline, "_fetch_polygon_aggregates", polygon), \
+            patch.object(pipeline, "_fetch_alpaca_bars", alpaca), \
+            patch.object(pipeline, "_fetch_yfinance_data", yfinance):
+        prices, volumes = asyncio.run(
+            pipeline._fetch_prices_volumes(["AAPL", "MSFT"], date(2025, 1, 6), date(2025, 1, 10))
+        )
+        asyncio.run(pipeline._fetch_prices_volumes(["AAPL", "MSFT"], date(2025, 1, 6), date(2025, 1, 10)))
+
+    assert alpaca.await_args.args[0] == ["MSFT"] and yfinance.await_args.args[0] == ["MSFT"]
+    assert polygon.await_count == 1
+    assert list(prices.columns) == ["AAPL", "MSFT"] and prices.shape == (5, 2)
+    assert (volumes == 1000.0).all().all()
@@ -0,0 +1,205 @@
+"""
+Tests for tag-based cache invalidation and cross-process memory-tier invalidation.
+
+The default cache is django-redis on top of fakeredis, so tag sets, cached
+values and pub/sub all go through one in-memory Redis server.
+"""
+import time
+from unittest.mock import patch
+
+import fakeredis
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django_redis import get_redis_connection
+
+from core import cache_tags
+from core import aggressive_caching_service as acs_module
+from core.aggressive_caching_service import AggressiveCachingService
+from core.cache_tags import CacheTagRegistry, strategy_tag, symbol_tag, user_tag
+from core.raha_query_cache import (
+    cache_query_result, get_cache_key, get_cached_query_result, invalidate_cache_pattern,
+    invalidate_cache_tags, query_cache_tags,
+)
+
+FAKE_REDIS_CACHES = {
+    'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': 'redis://cache-tags-test:6379/0',
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'CONNECTION_POOL_KWARGS': {'connection_class': fakeredis.FakeConnection},
+        },
+    }
+}
+
+
+def wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+@override_settings(CACHES=FAKE_REDIS_CACHES)
+class FakeRedisTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.redis = get_redis_connection('default')
+        self.redis.flushdb()
+        cache_tags._tag_registry = None
+        acs_module._aggressive_caching_service = None
+
+    def tearDown(self):
+        cache_tags._tag_registry = None
+        acs_module._aggressive_caching_service = None
+
+
+class TestCacheTagRegistry(FakeRedisTestCase):
+
+    def test_invalidate_deletes_tagged_keys_in_batches(self):
+        registry = CacheTagRegistry(self.redis, batch_size=2)
+        for i in range(5):
+            cache.set(f'kelly:symbol:AAPL:{i}', i, 300)
+            registry.register(f'kelly:symbol:AAPL:{i}', [symbol_tag('aapl')], 300)
+        cache.set('kelly:symbol:MSFT', 'keep', 300)
+        registry.register('kelly:symbol:MSFT', [symbol_tag('MSFT')], 300)
+
+        with patch.object(cache, 'delete_many', wraps=cache.delete_many) as delete_many, \
+                patch.object(self.redis, 'scan', side_effect=AssertionError('keyspace scan')), \
+                patch.object(self.redis, 'keys', side_effect=AssertionError('keyspace scan')):
+            deleted = registry.invalidate(symbol_tag('AAPL'))
+
+        self.assertEqual(len(deleted), 5)
+        self.assertEqual([len(call.args[0]) for call in delete_many.call_args_list], [2, 2, 1])
+        for i in range(5):
+            self.assertIsNone(cache.get(f'kelly:symbol:AAPL:{i}'))
+        self.assertEqual(cache.get('kelly:symbol:MSFT'), 'keep')
+        self.assertFalse(self.redis.exists(registry.tag_key(symbol_tag('AAPL'))))
+        self.assertEqual(registry.invalidate(symbol_tag('AAPL')), [])
+
+    def test_tag_set_outlives_members(self):
+        registry = CacheTagRegistry(self.redis)
+        registry.register('a', ['user:1'], 60)
+        ttl = self.redis.ttl(registry.tag_key('user:1'))
+        self.assertGreaterEqual(ttl, cache_tags.MIN_TAG_TTL - 5)
+
+        registry.register('b', ['user:1'], cache_tags.MIN_TAG_TTL * 2)
+        self.assertGreater(self.redis.ttl(registry.tag_key('user:1')), cache_tags.MIN_TAG_TTL)
+        registry.register('c', ['user:1'], 60)  # Never shortened
+        self.assertGreater(self.redis.ttl(registry.tag_key('user:1')), cache_tags.MIN_TAG_TTL)
+        self.assertEqual(registry.members('user:1'), {'a', 'b', 'c'})
+
+    def test_local_fallback_without_redis(self):
+        registry = CacheTagRegistry(None)
+        cache.set('x', 1)
+        registry.register('x', ['strategy:9'])
+        self.assertEqual(registry.invalidate('strategy:9'), ['x'])
+        self.assertIsNone(cache.get('x'))
+
+
+class TestAggressiveCachingServiceTags(FakeRedisTestCase):
+
+    def test_invalidate_tags_clears_memory_and_redis(self):
+        service = AggressiveCachingService(enable_pubsub=False)
+        service.set_cached('kelly:symbol:AAPL', {'kelly_fraction': 0.2}, 3600, tags=[symbol_tag('AAPL')])
+        service.set_cached('kelly:portfolio_metrics:1', {'x': 1}, 300, tags=[user_tag(1)])
+
+        self.assertEqual(service.invalidate_tags(symbol_tag('AAPL')), 1)
+        self.assertNotIn('kelly:symbol:AAPL', service.memory_cache)
+        self.assertIsNone(cache.get('kelly:symbol:AAPL'))
+        self.assertEqual(service.get_cached('kelly:portfolio_metrics:1'), {'x': 1})
+
+    def test_invalidate_pattern_deletes_in_redis(self):
+        service = AggressiveCachingService(enable_pubsub=False)
+        service.set_cached('kelly:symbol:AAPL', 1, 300)
+        service.set_cached('kelly:symbol:MSFT', 2, 300)
+        service.set_cached('price:AAPL', 3, 300)
+
+        self.assertEqual(service.invalidate_pattern('kelly:*'), 2)
+        self.assertIsNone(cache.get('kelly:symbol:AAPL'))
+        self.assertIsNone(cache.get('kelly:symbol:MSFT'))
+        self.assertEqual(len(service.memory_cache), 1)
+        self.assertEqual(cache.get('price:AAPL'), 3)
+
+    def test_peer_memory_tier_invalidated_over_pubsub(self):
+        worker_a = AggressiveCachingService(redis_client=self.redis, enable_pubsub=True)
+        worker_b = AggressiveCachingService(redis_client=self.redis, enable_pubsub=True)
+        self.addCleanup(worker_a.invalidation_bus.stop)
+        self.addCleanup(worker_b.invalidation_bus.stop)
+        self.assertTrue(wait_for(lambda: self.redis.pubsub_numsub(worker_a.invalidation_bus.channel)[0][1] == 2))
+
+        worker_a.set_cached('raha:1', 'signals', 300, tags=[strategy_tag(7)])
+        worker_a.set_cached('raha:2', 'other', 300)
+        self.assertEqual(worker_b.get_cached('raha:1'), 'signals')  # Warms B's memory tier
+        self.assertEqual(worker_b.get_cached('raha:2'), 'other')
+
+        worker_a.invalidate_tags(strategy_tag(7))
+        self.assertTrue(wait_for(lambda: 'raha:1' not in worker_b.memory_cache))
+        self.assertIn('raha:2', worker_b.memory_cache)
+
+        worker_a.invalidate('raha:2')
+        self.assertTrue(wait_for(lambda: 'raha:2' not in worker_b.memory_cache))
+
+
+class TestRahaQueryCacheTags(FakeRedisTestCase):
+
+    def test_user_tag_is_implicit_and_extra_tags_apply(self):
+        signals_key = get_cache_key('raha_signals', 1, symbol='AAPL', strategy_version_id='v1')
+        dashboard_key = get_cache_key('strategy_dashboard', 1)
+        other_user_key = get_cache_key('strategy_dashboard', 2)
+        cache_query_result(signals_key, ['s'], timeout=60, tags=query_cache_tags('v1', 'AAPL'))
+        cache_query_result(dashboard_key, {'d': 1})
+        cache_query_result(other_user_key, {'d': 2})
+
+        self.assertEqual(invalidate_cache_tags(symbol_tag('AAPL')), 1)
+        self.assertIsNone(get_cached_query_result(signals_key))
+        self.assertEqual(get_cached_query_result(dashboard_key), {'d': 1})
+
+        # The signals key is still listed under the user tag; deleting it again is harmless
+        self.assertEqual(invalidate_cache_tags(user_tag(1)), 2)
+        self.assertIsNone(get_cached_query_result(dashboard_key))
+        self.assertEqual(get_cached_query_result(other_user_key), {'d': 2})
+
+    def test_invalidate_cache_pattern(self):
+        cache_query_result(get_cache_key('raha_signals', 1), ['a'])
+        cache_query_result(get_cache_key('raha_signals', 2), ['b'])
+        cache_query_result(get_cache_key('strategies', 1), ['c'])
+
+        self.assertEqual(invalidate_cache_pattern('raha_signals:user_*'), 2)
+        self.assertEqual(get_cached_query_result(get_cache_key('strategies', 1)), ['c'])
+
+    def test_invalidate_clears_this_process_memory_tier(self):
+        service = acs_module.get_aggressive_caching_service()
+        service.set_cached('kelly:symbol:AAPL', {'kelly': 0.1}, ttl=300, tags=[symbol_tag('AAPL')])
+        self.assertEqual(service.get_cached('kelly:symbol:AAPL'), {'kelly': 0.1})
+
+        self.assertEqual(invalidate_cache_tags(symbol_tag('AAPL')), 1)
+        self.assertIsNone(service.get_cached('kelly:symbol:AAPL'))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TestInvalidateWithoutRedis(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        cache_tags._tag_registry = None
+        acs_module._aggressive_caching_service = None
+
+    def tearDown(self):
+        cache_tags._tag_registry = None
+        acs_module._aggressive_caching_service = None
+
+    def test_query_cache_and_service_share_one_registry(self):
+        service = acs_module.get_aggressive_caching_service()
+        self.assertIs(service.tags, cache_tags.get_tag_registry())
+
+        key = get_cache_key('raha_signals', 1, symbol='AAPL')
+        cache_query_result(key, ['s'], timeout=60, tags=[symbol_tag('AAPL')])
+        service.set_cached('kelly:symbol:AAPL', {'kelly': 0.1}, ttl=300, tags=[symbol_tag('AAPL')])
+        self.assertEqual(service.get_cached('kelly:symbol:AAPL'), {'kelly': 0.1})
+
+        self.assertEqual(invalidate_cache_tags(symbol_tag('AAPL')), 2)
+        self.assertIsNone(get_cached_query_result(key))
+        self.assertIsNone(service.get_cached('kelly:symbol:AAPL'))
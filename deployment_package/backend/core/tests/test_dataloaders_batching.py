@@ -0,0 +1,248 @@
+"""
+Tests for deferred DataLoader batching: loads issued while the executor walks
+one level of a query are fetched with one query per loader.
+"""
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+import graphene
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from core.banking_models import BankAccount, BankTransaction
+from core.banking_types import BankAccountType
+from core.dataloaders import DataLoader, Deferred, dispatch_pending
+from core.graphql.dataloaders import (
+    DeferredExecutionContext,
+    create_loaders_for_request,
+    load_related,
+)
+from core.models import IncomeProfile, Portfolio, Stock
+from core.raha_models import RAHASignal, Strategy, StrategyVersion
+from core.raha_types import RAHASignalType
+from core.types import StockType
+
+User = get_user_model()
+
+
+class StockNode(graphene.ObjectType):
+    symbol = graphene.String()
+
+
+class HoldingNode(graphene.ObjectType):
+    shares = graphene.Int()
+    stock = graphene.Field(StockNode)
+
+    def resolve_stock(self, info):
+        return load_related(info, self, 'stock', 'stock_by_id_loader')
+
+
+class UserNode(graphene.ObjectType):
+    email = graphene.String()
+    holdings = graphene.List(HoldingNode)
+
+    def resolve_holdings(self, info):
+        return info.context.loaders.portfolio_holdings_loader.load(self.id)
+
+
+class Query(graphene.ObjectType):
+    holdings = graphene.List(HoldingNode)
+    users = graphene.List(UserNode)
+    stocks = graphene.List(StockNode, symbols=graphene.List(graphene.String))
+    required_stock = graphene.Field(graphene.NonNull(StockNode), symbol=graphene.String())
+
+    def resolve_holdings(self, info):
+        return list(Portfolio.objects.order_by('id'))
+
+    def resolve_users(self, info):
+        return list(User.objects.order_by('id'))
+
+    def resolve_stocks(self, info, symbols):
+        return [info.context.loaders.stock_loader.load(s) for s in symbols]
+
+    def resolve_required_stock(self, info, symbol):
+        return info.context.loaders.stock_loader.load(symbol)
+
+
+schema = graphene.Schema(query=Query)
+
+
+class AppQuery(graphene.ObjectType):
+    """Root fields returning the production types whose relations go through loaders"""
+    stocks = graphene.List(StockType)
+    bank_accounts = graphene.List(BankAccountType)
+
+    def resolve_stocks(self, info):
+        return list(Stock.objects.order_by('id'))
+
+    def resolve_bank_accounts(self, info):
+        return list(BankAccount.objects.order_by('id'))
+
+
+app_schema = graphene.Schema(query=AppQuery, types=[RAHASignalType])
+
+
+def execute(query, schema=schema, user=None):
+    context = SimpleNamespace(loaders=create_loaders_for_request(), user=user)
+    return schema.execute(query, context_value=context, execution_context_class=DeferredExecutionContext)
+
+
+class TestDeferredBatching(TestCase):
+    def setUp(self):
+        self.stocks = [
+            Stock.objects.create(symbol=s, company_name=f'{s} Inc') for s in ('AAPL', 'MSFT', 'NVDA')
+        ]
+        for i in range(3):
+            user = User.objects.create_user(email=f'u{i}@example.com', password='x', name=f'U{i}')
+            for stock in self.stocks[: i + 1]:
+                Portfolio.objects.create(user=user, stock=stock, shares=10 * (i + 1))
+
+    def test_foreign_keys_batch_into_one_query(self):
+        with self.assertNumQueries(2):  # holdings + one IN query for all stocks
+            result = execute('{ holdings { shares stock { symbol } } }')
+        self.assertIsNone(result.errors)
+        self.assertEqual(len(result.data['holdings']), 6)
+        self.assertEqual(result.data['holdings'][0]['stock']['symbol'], 'AAPL')
+
+    def test_nested_relation_batches_per_level(self):
+        with self.assertNumQueries(2):  # users + one query for every user's holdings
+            result = execute('{ users { email holdings { shares stock { symbol } } } }')
+        self.assertIsNone(result.errors)
+        self.assertEqual([len(u['holdings']) for u in result.data['users']], [1, 2, 3])
+
+    def test_duplicate_keys_are_cached_per_request(self):
+        with self.assertNumQueries(1):
+            result = execute('{ stocks(symbols: ["aapl", "AAPL", "MSFT", "ZZZZ"]) { symbol } }')
+        self.assertEqual(
+            result.data['stocks'],
+            [{'symbol': 'AAPL'}, {'symbol': 'AAPL'}, {'symbol': 'MSFT'}, None],
+        )
+
+    def test_missing_non_null_value_is_a_field_error(self):
+        result = execute('{ requiredStock(symbol: "ZZZZ") { symbol } }')
+        self.assertIsNone(result.data)
+        self.assertIn('Cannot return null for non-nullable field', result.errors[0].message)
+
+
+class TestProductionLoaders(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='x', name='Owner')
+        self.other = User.objects.create_user(email='other@example.com', password='x', name='Other')
+        self.stocks = [
+            Stock.objects.create(symbol=s, company_name=f'{s} Inc', market_cap=10 ** 11)
+            for s in ('AAPL', 'MSFT', 'NVDA', 'AMZN')
+        ]
+
+    def test_beginner_score_loads_user_inputs_once_per_request(self):
+        Portfolio.objects.create(user=self.user, stock=self.stocks[0], shares=10, current_price=Decimal('100'))
+        IncomeProfile.objects.create(
+            user=self.user, income_bracket='Under $30,000', age=30, risk_tolerance='Conservative',
+            investment_horizon='5-10 years', investment_goals=['Retirement'],
+        )
+        # stocks + holdings + income profile, however many stocks are scored
+        with self.assertNumQueries(3):
+            result = execute('{ stocks { symbol beginnerFriendlyScore recommendation } }', app_schema, self.user)
+        self.assertIsNone(result.errors)
+        scores = {s['beginnerFriendlyScore'] for s in result.data['stocks']}
+        self.assertEqual(len(scores), 1)  # identical fundamentals, same user inputs
+
+    def test_bank_transactions_batch_across_accounts(self):
+        for i in range(3):
+            account = BankAccount.objects.create(
+                user=self.user, yodlee_account_id=f'acc_{i}', provider='Test Bank',
+                name=f'Account {i}', mask=f'000{i}', account_type='CHECKING', is_verified=True,
+            )
+            for j in range(i + 1):
+                BankTransaction.objects.create(
+                    user=self.user, bank_account=account, yodlee_transaction_id=f'txn_{i}_{j}',
+                    amount=Decimal(-10 - j), description=f'Purchase {j}', transaction_type='DEBIT',
+                    posted_date=date(2026, 1, 1 + j),
+                )
+        with self.assertNumQueries(2):  # accounts + one query for every account's transactions
+            result = execute('{ bankAccounts { name transactions(limit: 2) { description } } }', app_schema)
+        self.assertIsNone(result.errors)
+        self.assertEqual([len(a['transactions']) for a in result.data['bankAccounts']], [1, 2, 2])
+        self.assertEqual(result.data['bankAccounts'][2]['transactions'][0]['description'], 'Purchase 2')
+
+    def test_raha_signals_batch_across_stocks(self):
+        strategy = Strategy.objects.create(
+            slug='orb', name='ORB', category='MOMENTUM', description='Test',
+            market_type='STOCKS', timeframe_supported=['5m'], enabled=True,
+        )
+        version = StrategyVersion.objects.create(
+            strategy=strategy, version=1, is_default=True, config_schema={}, logic_ref='momentum'
+        )
+        for stock in self.stocks[:2]:
+            for owner in (None, self.user, self.other):
+                RAHASignal.objects.create(
+                    user=owner, strategy_version=version, symbol=stock.symbol,
+                    signal_type='ENTRY_LONG', price=Decimal('100.00'),
+                )
+        with self.assertNumQueries(2):  # stocks + one query for every symbol's signals
+            result = execute('{ stocks { symbol rahaSignals { symbol } } }', app_schema, self.user)
+        self.assertIsNone(result.errors)
+        # global + own signals only; other users' personalized signals stay hidden
+        self.assertEqual([len(s['rahaSignals']) for s in result.data['stocks']], [2, 2, 0, 0])
+
+
+class TestDeferredPrimitives(SimpleTestCase):
+    def test_gather_and_chaining(self):
+        a, b = Deferred(), Deferred()
+        combined = Deferred.gather({'a': a, 'b': b, 'c': 3}).then(lambda d: sorted(d.items()))
+        a.resolve(1)
+        self.assertTrue(combined.is_pending)
+        b.resolve(Deferred.gather([2]))
+        self.assertEqual(combined.value, [('a', 1), ('b', [2]), ('c', 3)])
+
+        failed = Deferred()
+        chained = Deferred.gather([failed, 1])
+        failed.reject(ValueError('boom'))
+        with self.assertRaises(ValueError):
+            chained.value
+
+    def test_immediate_and_deferred_loader_modes(self):
+        calls = []
+
+        def batch(keys):
+            calls.append(list(keys))
+            return [k * 2 for k in keys]
+
+        self.assertEqual(DataLoader(batch).load(2), 4)
+
+        loader = DataLoader(batch, deferred=True)
+        pending = [loader.load(k) for k in (1, 2, 1)]
+        many = loader.load_many([3, 2])
+        self.assertTrue(all(isinstance(p, Deferred) for p in pending))
+        self.assertTrue(dispatch_pending())
+        self.assertFalse(dispatch_pending())
+        self.assertEqual([p.value for p in pending], [2, 4, 2])
+        self.assertEqual(many.value, [6, 4])
+        self.assertEqual(calls, [[2], [1, 2, 3]])
+        self.assertEqual(loader.load(1), 2)  # settled values are served from cache
+
+    def test_load_now_settles_queued_keys_in_one_batch(self):
+        calls = []
+
+        def batch(keys):
+            calls.append(list(keys))
+            return [k * 2 for k in keys]
+
+        loader = DataLoader(batch, deferred=True)
+        queued = loader.load(1)
+        self.assertEqual(loader.load_many_now([2, 1, 2]), [4, 2, 4])
+        self.assertEqual(queued.value, 2)
+        self.assertEqual(loader.load_now(2), 4)
+        self.assertEqual(calls, [[1, 2]])
+        self.assertFalse(dispatch_pending())  # nothing left for the executor
+
+
+class TestResolveUser(TestCase):
+    def test_non_numeric_id_resolves_to_none(self):
+        from core.queries import resolve_user
+
+        user = User.objects.create_user(email='who@example.com', password='x', name='Who')
+        info = SimpleNamespace(context=SimpleNamespace(loaders=create_loaders_for_request()))
+        self.assertIsNone(resolve_user(None, info, 'abc'))
+        self.assertIsNone(resolve_user(None, info, None))
+        self.assertEqual(resolve_user(None, SimpleNamespace(context=None), str(user.id)), user)
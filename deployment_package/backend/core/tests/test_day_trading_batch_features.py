@@ -0,0 +1,114 @@
+"""
+Tests for cross-sectional day trading features and scoring: the batch paths
+must match extract_all_features (a panel of one) and DayTradingMLScorer.score symbol by symbol.
+"""
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+from core.day_trading_feature_service import FEATURE_COLUMNS, DayTradingFeatureService, stack_ohlcv
+from core.day_trading_ml_learner import FEATURE_NAMES, DayTradingMLearner
+from core.day_trading_ml_scorer import DayTradingMLScorer
+
+NOW = datetime(2026, 3, 2, 10, 31)
+# Ragged history: too short, every length branch (26, 50, 60) and the 78-bar tail
+BAR_COUNTS = [5, 15, 20, 21, 26, 49, 50, 51, 59, 60, 78, 100, 120, 200]
+
+
+def make_bars(n, rng, scale=1.0):
+    close = 100 + rng.normal(size=n).cumsum() * scale
+    open_ = close + rng.normal(size=n) * 0.3 * scale
+    return pd.DataFrame({
+        "open": open_,
+        "high": np.maximum(open_, close) + rng.random(n) * scale,
+        "low": np.minimum(open_, close) - rng.random(n) * scale,
+        "close": close,
+        "volume": rng.integers(0, 5000, n).astype(float),
+    })
+
+
+@pytest.fixture
+def universe():
+    rng = np.random.default_rng(3)
+    bars_1m, bars_5m = {}, {}
+    for i, n in enumerate(BAR_COUNTS):
+        symbol = f"SYM{i}"
+        bars_5m[symbol] = make_bars(n, rng, scale=(0.1, 1.0, 3.0)[i % 3])
+        bars_1m[symbol] = make_bars(max(5 * n, 3), rng)
+    bars_1m["SYM2"] = bars_1m["SYM2"].head(10)  # Enough 5m bars but not 1m
+    return bars_1m, bars_5m
+
+
+def make_scorer():
+    with patch.object(DayTradingMLScorer, "_initialize_model"):
+        scorer = DayTradingMLScorer()
+    return scorer
+
+
+def test_batch_features_match_per_symbol_extraction(universe):
+    bars_1m, bars_5m = universe
+    service = DayTradingFeatureService()
+    sentiment = {"SYM11": {"score": 0.6, "bull_count": 9, "bear_count": 1, "price_trend": -0.1}}
+    symbols = list(bars_5m) + ["MISSING"]
+
+    batch = service.extract_features_batch(
+        stack_ohlcv(bars_1m), stack_ohlcv(bars_5m), symbols=symbols, sentiment_data=sentiment, current_time=NOW
+    )
+
+    assert list(batch.columns) == list(FEATURE_COLUMNS)
+    assert list(batch.index) == symbols
+    for symbol in bars_5m:
+        features = service.extract_all_features(
+            bars_1m[symbol], bars_5m[symbol], symbol, sentiment_data=sentiment.get(symbol), current_time=NOW
+        )
+        expected = [features.get(name, 0.0) for name in FEATURE_COLUMNS]
+        np.testing.assert_allclose(batch.loc[symbol], expected, rtol=1e-10, atol=1e-12, equal_nan=True, err_msg=symbol)
+    np.testing.assert_array_equal(batch.loc["MISSING"], batch.loc["SYM0"])  # Defaults
+
+
+def test_rule_based_batch_scores_match_per_row_scores(universe):
+    bars_1m, bars_5m = universe
+    features = DayTradingFeatureService().extract_features_batch(
+        stack_ohlcv(bars_1m), stack_ohlcv(bars_5m), current_time=NOW
+    )
+    # Push rows across the rule thresholds
+    rng = np.random.default_rng(5)
+    features = pd.concat([features] * 20, ignore_index=True)
+    features["momentum_15m"] = rng.uniform(-0.05, 0.05, len(features))
+    features["is_high_vol_chop"] = (rng.random(len(features)) > 0.8).astype(float)
+    features["volume_ratio"] = rng.uniform(0, 3, len(features))
+    features["rsi_14"] = rng.uniform(10, 90, len(features))
+    scorer = make_scorer()
+
+    scores = scorer.score_batch(features)
+
+    expected = [scorer.score(row) for row in features.to_dict("records")]
+    np.testing.assert_array_equal(scores, expected)
+    assert len(np.unique(scores)) > 10
+
+
+def test_learner_enhanced_batch_scores_match_per_row_scores(universe):
+    bars_1m, bars_5m = universe
+    features = DayTradingFeatureService().extract_features_batch(
+        stack_ohlcv(bars_1m), stack_ohlcv(bars_5m), current_time=NOW
+    )
+    rng = np.random.default_rng(9)
+    x = rng.normal(size=(200, len(FEATURE_NAMES)))
+    learner = DayTradingMLearner.__new__(DayTradingMLearner)
+    learner.scaler = StandardScaler().fit(x)
+    learner.model = LinearRegression().fit(learner.scaler.transform(x), rng.random(200))
+    scorer = make_scorer()
+    scorer.ml_learner = learner
+    sides = np.where(rng.random(len(features)) > 0.5, "LONG", "SHORT")
+
+    scores = scorer.score_batch(features, mode="AGGRESSIVE", sides=sides)
+
+    expected = [
+        scorer.score(row, mode="AGGRESSIVE", side=side) for row, side in zip(features.to_dict("records"), sides)
+    ]
+    np.testing.assert_allclose(scores, expected, rtol=1e-12)
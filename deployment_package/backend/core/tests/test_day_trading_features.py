@@ -63,6 +63,19 @@ class TestDayTradingFeatureService(unittest.TestCase):
             'volume': [np.random.randint(500000, 5000000) for _ in range(n_bars)]
         })
     
+    def _extract_features(self, ohlcv_5m=None):
+        """Features from the mock bars (optionally with different 5-minute bars)"""
+        return self.service.extract_all_features(
+            self.ohlcv_1m, self.ohlcv_5m if ohlcv_5m is None else ohlcv_5m, "AAPL"
+        )
+    
+    def _with_last_candle(self, **candle):
+        """Mock 5-minute bars with the last candle replaced"""
+        ohlcv = self.ohlcv_5m.copy()
+        for column, value in candle.items():
+            ohlcv.loc[ohlcv.index[-1], column] = value
+        return ohlcv
+    
     def test_extract_all_features(self):
         """Test that all features are extracted"""
         features = self.service.extract_all_features(
@@ -85,7 +98,7 @@ class TestDayTradingFeatureService(unittest.TestCase):
     
     def test_candlestick_features(self):
         """Test candlestick pattern detection"""
-        features = self.service._extract_candlestick_features(self.ohlcv_5m)
+        features = self._extract_features()
         
         # Should have candlestick features
         self.assertIn('body_pct', features)
@@ -103,7 +116,7 @@ class TestDayTradingFeatureService(unittest.TestCase):
     
     def test_technical_indicators(self):
         """Test technical indicator calculation"""
-        features = self.service._extract_technical_indicators(self.ohlcv_5m)
+        features = self._extract_features()
         
         # Moving averages
         self.assertIn('sma_5', features)
@@ -135,7 +148,7 @@ class TestDayTradingFeatureService(unittest.TestCase):
     
     def test_volatility_features(self):
         """Test volatility and breakout features (Bernstein)"""
-        features = self.service._extract_volatility_features(self.ohlcv_5m)
+        features = self._extract_features()
         
         # Volatility metrics
         self.assertIn('realized_vol_20', features)
@@ -155,7 +168,7 @@ class TestDayTradingFeatureService(unittest.TestCase):
     
     def test_regime_detection(self):
         """Test market regime detection (Bernstein)"""
-        features = self.service._detect_market_regime(self.ohlcv_5m)
+        features = self._extract_features()
         
         # Regime features
         self.assertIn('trend_strength', features)
@@ -226,7 +239,7 @@ class TestDayTradingFeatureService(unittest.TestCase):
     
     def test_momentum_features(self):
         """Test momentum feature extraction"""
-        features = self.service._extract_momentum_features(self.ohlcv_1m, self.ohlcv_5m)
+        features = self._extract_features()
         
         self.assertIn('momentum_15m', features)
         self.assertIn('momentum_5m', features)
@@ -235,7 +248,7 @@ class TestDayTradingFeatureService(unittest.TestCase):
     
     def test_vwap_features(self):
         """Test VWAP feature extraction"""
-        features = self.service._extract_vwap_features(self.ohlcv_5m)
+        features = self._extract_features()
         
         self.assertIn('vwap', features)
         self.assertIn('vwap_dist', features)
@@ -243,7 +256,7 @@ class TestDayTradingFeatureService(unittest.TestCase):
     
     def test_risk_features(self):
         """Test risk management features (Day Trading 101)"""
-        features = self.service._extract_risk_features(self.ohlcv_5m)
+        features = self._extract_features()
         
         self.assertIn('atr_5m', features)
         self.assertIn('atr_5m_pct', features)
@@ -275,30 +288,20 @@ class TestDayTradingFeatureService(unittest.TestCase):
     
     def test_pattern_detection_hammer(self):
         """Test hammer pattern detection"""
-        # Create a hammer candle
-        hammer_candle = pd.Series({
-            'open': 100.0,
-            'high': 101.0,
-            'low': 95.0,
-            'close': 99.5
-        })
+        # Long lower wick, small body, almost no upper wick
+        ohlcv = self._with_last_candle(open=100.0, high=100.1, low=95.0, close=99.5)
         
-        is_hammer = self.service._is_hammer(hammer_candle)
-        # Should detect hammer (long lower wick, small body)
-        self.assertIsInstance(is_hammer, bool)
+        features = self._extract_features(ohlcv)
+        self.assertEqual(features['is_hammer'], 1.0)
+        self.assertEqual(features['is_shooting_star'], 0.0)
     
     def test_pattern_detection_doji(self):
         """Test doji pattern detection"""
-        # Create a doji candle
-        doji_candle = pd.Series({
-            'open': 100.0,
-            'high': 100.5,
-            'low': 99.5,
-            'close': 100.0
-        })
+        ohlcv = self._with_last_candle(open=100.0, high=100.5, low=99.5, close=100.0)
         
-        is_doji = self.service._is_doji(doji_candle)
-        self.assertIsInstance(is_doji, bool)
+        features = self._extract_features(ohlcv)
+        self.assertEqual(features['is_doji'], 1.0)
+        self.assertEqual(features['is_marubozu'], 0.0)
     
     def test_default_features(self):
         """Test default features when data is insufficient"""
@@ -0,0 +1,290 @@
+"""
+Parity tests for the vectorized FSS rank backtest.
+
+LoopBacktester keeps the original per-rebalance-date implementations;
+backtest_rank_strategy, backtest_rank_grid, calculate_ic and
+analyze_decile_performance must reproduce them.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.fss_backtest import BacktestResult, FSSBacktester
+
+
+class LoopBacktester(FSSBacktester):
+    """Reference implementation: one pass per rebalance date"""
+
+    def _apply_asymmetric_regime_smoothing(self, regime: pd.Series) -> pd.Series:
+        final_regimes = []
+        current_state = 'Expansion'
+        for i in range(len(regime)):
+            short_start = max(0, i - 2)
+            window_short = regime.iloc[short_start:i + 1]
+            long_start = max(0, i - 9)
+            window_long = regime.iloc[long_start:i + 1]
+            if current_state == 'Expansion':
+                crisis_count = (window_short == 'Crisis').sum()
+                deflation_count = (window_short == 'Deflation').sum()
+                if crisis_count >= 2 or deflation_count >= 2:
+                    current_state = 'Crisis'
+            elif current_state == 'Crisis':
+                expansion_count = (window_long == 'Expansion').sum()
+                parabolic_count = (window_long == 'Parabolic').sum()
+                if expansion_count >= 8 or expansion_count + parabolic_count >= 8:
+                    current_state = 'Expansion'
+            final_regimes.append(current_state)
+        return pd.Series(final_regimes, index=regime.index, name='regime_smoothed')
+
+    def backtest_rank_strategy(self, prices: pd.DataFrame, fss: pd.DataFrame, spy: Optional[pd.Series]=None, rebalance_freq: str='M', top_n: int=20, hold_days: Optional[int]=None, long_only: bool=True, min_liquidity: float=1000000, regime: Optional[pd.Series]=None, cash_out_on_crisis: bool=True, cash_return_rate: float=0.02) -> BacktestResult:
+        rebal_dates = prices.resample(rebalance_freq).last().index.intersection(prices.index)
+        daily_ret = prices.pct_change().fillna(0.0)
+        W = pd.DataFrame(0.0, index=prices.index, columns=prices.columns)
+        cash_position = pd.Series(0.0, index=prices.index)
+        daily_cash_return = cash_return_rate / 252
+        regime_smoothed = None
+        if regime is not None and cash_out_on_crisis:
+            regime_smoothed = self._apply_asymmetric_regime_smoothing(regime)
+        trades = []
+        for i, d in enumerate(rebal_dates):
+            if d not in fss.index:
+                continue
+            go_to_cash = False
+            if cash_out_on_crisis and regime_smoothed is not None:
+                lag_idx = regime_smoothed.index.get_loc(d) - 1 if d in regime_smoothed.index else -1
+                if lag_idx >= 0:
+                    prev_date = regime_smoothed.index[lag_idx]
+                    current_regime = regime_smoothed.loc[prev_date]
+                    if current_regime in ['Crisis', 'Deflation']:
+                        go_to_cash = True
+                elif d in regime_smoothed.index:
+                    current_regime = regime_smoothed.loc[d]
+                    if current_regime in ['Crisis', 'Deflation']:
+                        go_to_cash = True
+            if go_to_cash:
+                w = pd.Series(0.0, index=prices.columns)
+                if hold_days is not None:
+                    start_idx = prices.index.get_loc(d)
+                    end_idx = min(start_idx + hold_days, len(prices.index) - 1)
+                    hold_range = prices.index[start_idx:end_idx + 1]
+                elif i < len(rebal_dates) - 1:
+                    next_d = rebal_dates[i + 1]
+                    hold_range = prices.loc[d:next_d].index
+                    hold_range = hold_range[:-1] if len(hold_range) > 1 else hold_range
+                else:
+                    hold_range = prices.loc[d:].index
+                W.loc[hold_range] = w.values
+                cash_position.loc[hold_range] = 1.0
+                continue
+            scores = fss.loc[d].dropna()
+            if scores.empty:
+                continue
+            winners = scores.sort_values(ascending=False).head(top_n).index
+            w = pd.Series(0.0, index=prices.columns)
+            w.loc[winners] = 1.0 / len(winners)
+            if hold_days is not None:
+                start_idx = prices.index.get_loc(d)
+                end_idx = min(start_idx + hold_days, len(prices.index) - 1)
+                hold_range = prices.index[start_idx:end_idx + 1]
+            elif i < len(rebal_dates) - 1:
+                next_d = rebal_dates[i + 1]
+                hold_range = prices.loc[d:next_d].index
+                hold_range = hold_range[:-1] if len(hold_range) > 1 else hold_range
+            else:
+                hold_range = prices.loc[d:].index
+            W.loc[hold_range] = w.values
+            cash_position.loc[hold_range] = 0.0
+            trades.append({'date': d, 'tickers': list(winners), 'weights': w[winners].to_dict()})
+        stock_ret = (W.shift(1).fillna(0.0) * daily_ret).sum(axis=1)
+        cash_ret = cash_position.shift(1).fillna(0.0) * daily_cash_return
+        port_ret = stock_ret + cash_ret
+        W_rebal = W.loc[rebal_dates].copy()
+        turnover = W_rebal.diff().abs().sum(axis=1).fillna(W_rebal.abs().sum(axis=1))
+        cost = turnover * (self.transaction_cost_bps / 10000.0)
+        cost_daily = pd.Series(0.0, index=prices.index)
+        cost_daily.loc[rebal_dates] = cost.values
+        port_ret_net = port_ret - cost_daily
+        equity = (1.0 + port_ret_net).cumprod()
+        cummax = equity.cummax()
+        drawdown = equity / cummax - 1.0
+        ann_return = equity.iloc[-1] ** (252 / max(1, len(equity))) - 1
+        ann_vol = port_ret_net.std() * np.sqrt(252)
+        sharpe = ann_return / (ann_vol + 1e-12)
+        max_dd = drawdown.min()
+        calmar_ratio = abs(ann_return / max_dd) if max_dd != 0 else 0
+        positive_periods = (port_ret_net > 0).sum()
+        win_rate = positive_periods / len(port_ret_net) if len(port_ret_net) > 0 else 0.0
+        benchmark_return = None
+        alpha = None
+        if spy is not None:
+            spy_ret = spy.pct_change().fillna(0.0)
+            spy_equity = (1.0 + spy_ret).cumprod()
+            benchmark_return = spy_equity.iloc[-1] ** (252 / max(1, len(spy_equity))) - 1
+            alpha = ann_return - benchmark_return
+        return BacktestResult(equity_curve=equity, returns=port_ret_net, drawdown=drawdown, annual_return=ann_return, annual_volatility=ann_vol, sharpe_ratio=sharpe, max_drawdown=max_dd, calmar_ratio=calmar_ratio, win_rate=win_rate, total_trades=len(trades), turnover=turnover, benchmark_return=benchmark_return, alpha=alpha)
+
+    def calculate_ic(self, fss: pd.DataFrame, forward_returns: pd.DataFrame) -> pd.Series:
+        ic_series = []
+        common_dates = fss.index.intersection(forward_returns.index)
+        for date in common_dates:
+            fss_scores = fss.loc[date].dropna()
+            fwd_ret = forward_returns.loc[date].dropna()
+            common_tickers = fss_scores.index.intersection(fwd_ret.index)
+            if len(common_tickers) < 10:
+                continue
+            fss_vals = fss_scores.loc[common_tickers]
+            ret_vals = fwd_ret.loc[common_tickers]
+            ic = fss_vals.corr(ret_vals)
+            if not pd.isna(ic):
+                ic_series.append({'date': date, 'ic': ic})
+        if not ic_series:
+            return pd.Series(dtype=float)
+        ic_df = pd.DataFrame(ic_series).set_index('date')
+        return ic_df['ic']
+
+    def analyze_decile_performance(self, fss: pd.DataFrame, forward_returns: pd.DataFrame, n_deciles: int=10) -> pd.DataFrame:
+        results = []
+        common_dates = fss.index.intersection(forward_returns.index)
+        for date in common_dates:
+            fss_scores = fss.loc[date].dropna()
+            fwd_ret = forward_returns.loc[date].dropna()
+            common_tickers = fss_scores.index.intersection(fwd_ret.index)
+            if len(common_tickers) < n_deciles:
+                continue
+            fss_vals = fss_scores.loc[common_tickers]
+            ret_vals = fwd_ret.loc[common_tickers]
+            fss_vals_ranked = pd.qcut(fss_vals, q=n_deciles, labels=False, duplicates='drop')
+            for decile in range(n_deciles):
+                decile_mask = fss_vals_ranked == decile
+                decile_returns = ret_vals[decile_mask]
+                if len(decile_returns) > 0:
+                    results.append({'date': date, 'decile': decile, 'mean_return': decile_returns.mean(), 'median_return': decile_returns.median(), 'count': len(decile_returns)})
+        if not results:
+            return pd.DataFrame()
+        results_df = pd.DataFrame(results)
+        decile_stats = results_df.groupby('decile').agg({'mean_return': 'mean', 'median_return': 'median', 'count': 'sum'})
+        return decile_stats
+
+
+def make_panel(n=520, k=30, seed=11):
+    """Prices, FSS that partly predicts 21-day returns, SPY and a regime path with crises"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2022-01-03", periods=n)
+    tickers = [f"S{i}" for i in range(k)]
+    prices = pd.DataFrame(
+        100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, (n, k)), axis=0)), index=dates, columns=tickers
+    )
+    fwd = prices.pct_change(21).shift(-21).fillna(0.0)
+    fss = 50 + 150 * fwd + rng.normal(0, 3, (n, k))
+    fss.iloc[:60, :8] = np.nan  # Late listings
+    fss.iloc[::7, 20:] = np.nan  # Patchy coverage
+    fss.iloc[200:210] = np.nan  # A stretch with no scores at all
+    fss = fss.drop(dates[300:305])  # Dates missing from the score frame
+
+    spy = pd.Series(400 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, n))), index=dates)
+    labels = np.array(["Expansion", "Parabolic", "Crisis", "Deflation"])
+    regime = pd.Series(labels[rng.choice(4, n, p=[0.6, 0.1, 0.2, 0.1])], index=dates)
+    regime.iloc[150:190] = "Crisis"
+    return prices, fss, spy, regime
+
+
+@pytest.fixture(scope="module")
+def panel():
+    return make_panel()
+
+
+def assert_same_result(got: BacktestResult, expected: BacktestResult):
+    for field in ("equity_curve", "returns", "drawdown", "turnover"):
+        a, b = getattr(got, field), getattr(expected, field)
+        assert a.index.equals(b.index), field
+        np.testing.assert_allclose(a.to_numpy(), b.to_numpy(), rtol=1e-9, atol=1e-12, err_msg=field)
+    for field in ("annual_return", "annual_volatility", "sharpe_ratio", "max_drawdown", "calmar_ratio",
+                  "win_rate", "benchmark_return", "alpha"):
+        np.testing.assert_allclose(getattr(got, field), getattr(expected, field), rtol=1e-9, err_msg=field)
+    assert got.total_trades == expected.total_trades
+
+
+@pytest.mark.parametrize("kwargs", [
+    dict(rebalance_freq="M", top_n=5),
+    dict(rebalance_freq="W-FRI", top_n=10),
+    dict(rebalance_freq="W-FRI", top_n=40),
+    dict(rebalance_freq="M", top_n=5, hold_days=10),
+    dict(rebalance_freq="W-FRI", top_n=8, hold_days=15, regime=True),
+    dict(rebalance_freq="M", top_n=5, regime=True, cash_return_rate=0.04),
+    dict(rebalance_freq="W-FRI", top_n=5, regime=True, cash_out_on_crisis=False),
+    dict(rebalance_freq="W", top_n=5, hold_days=5),  # Sunday labels: no rebalance dates at all
+])
+def test_rank_strategy_matches_loop(panel, kwargs):
+    prices, fss, spy, regime = panel
+    kwargs = dict(kwargs, regime=regime if kwargs.get("regime") else None)
+
+    got = FSSBacktester(transaction_cost_bps=10.0).backtest_rank_strategy(prices, fss, spy=spy, **kwargs)
+    expected = LoopBacktester(transaction_cost_bps=10.0).backtest_rank_strategy(prices, fss, spy=spy, **kwargs)
+
+    assert_same_result(got, expected)
+    assert got.ic_series is None and got.decile_returns is None
+
+
+def test_regime_smoothing_matches_loop(panel):
+    regime = panel[3]
+    got = FSSBacktester()._apply_asymmetric_regime_smoothing(regime)
+    pd.testing.assert_series_equal(got, LoopBacktester()._apply_asymmetric_regime_smoothing(regime))
+    assert set(got) == {"Expansion", "Crisis"}
+
+
+def test_ic_and_deciles_match_loop(panel):
+    prices, fss, _, _ = panel
+    backtester, loop = FSSBacktester(), LoopBacktester()
+    fwd = backtester.forward_return(prices, horizon=21)
+
+    ic = backtester.calculate_ic(fss, fwd)
+    expected_ic = loop.calculate_ic(fss, fwd)
+    assert ic.name == "ic" and ic.index.equals(expected_ic.index)
+    np.testing.assert_allclose(ic.to_numpy(), expected_ic.to_numpy(), rtol=1e-9)
+    assert ic.mean() > 0.3
+
+    deciles = backtester.analyze_decile_performance(fss, fwd)
+    pd.testing.assert_frame_equal(deciles, loop.analyze_decile_performance(fss, fwd), rtol=1e-9)
+    assert deciles["mean_return"].iloc[-1] > deciles["mean_return"].iloc[0]
+
+    # Few names per date: duplicate edges are dropped the way pd.qcut does
+    coarse = fss.iloc[:, :12].round(-1)
+    pd.testing.assert_frame_equal(
+        backtester.analyze_decile_performance(coarse, fwd, n_deciles=5),
+        loop.analyze_decile_performance(coarse, fwd, n_deciles=5),
+        rtol=1e-9
+    )
+
+
+def test_grid_matches_individual_runs(panel):
+    prices, fss, spy, regime = panel
+    backtester = FSSBacktester(transaction_cost_bps=5.0)
+
+    grid = backtester.backtest_rank_grid(
+        prices, fss, top_n=(5, 15), rebalance_freq=("W-FRI", "M"), transaction_cost_bps=(0.0, 10.0, 25.0),
+        spy=spy, regime=regime, forward_horizon=21
+    )
+
+    assert len(grid.summary) == 12 and grid.returns.shape == (len(prices), 12)
+    assert grid.summary.index.names == ["top_n", "rebalance_freq", "transaction_cost_bps"]
+    for top_n, freq, bps in [(5, "W-FRI", 0.0), (15, "M", 25.0), (15, "W-FRI", 10.0)]:
+        expected = LoopBacktester(transaction_cost_bps=bps).backtest_rank_strategy(
+            prices, fss, spy=spy, rebalance_freq=freq, top_n=top_n, regime=regime
+        )
+        row = grid.summary.loc[(top_n, freq, bps)]
+        np.testing.assert_allclose(grid.returns[(top_n, freq, bps)].to_numpy(), expected.returns.to_numpy(),
+                                   rtol=1e-9, atol=1e-12)
+        for field in ("annual_return", "sharpe_ratio", "max_drawdown", "alpha"):
+            np.testing.assert_allclose(row[field], getattr(expected, field), rtol=1e-9)
+        assert row["total_trades"] == expected.total_trades
+
+    # Costs only ever subtract
+    by_cost = grid.summary["annual_return"].unstack("transaction_cost_bps")
+    assert (by_cost[0.0] >= by_cost[10.0]).all() and (by_cost[10.0] >= by_cost[25.0]).all()
+
+    fwd = backtester.forward_return(prices, horizon=21)
+    np.testing.assert_allclose(grid.ic_series.to_numpy(), LoopBacktester().calculate_ic(fss, fwd).to_numpy(),
+                               rtol=1e-9)
+    assert list(grid.decile_returns.index) == list(range(10))
@@ -0,0 +1,240 @@
+"""
+Tests for the FSS data pipeline fan-out: concurrent per-ticker provider
+requests, partial-result streaming, bounded rate-limit waits and the
+per-fiscal-period fundamentals cache.
+"""
+import asyncio
+import time
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from core import fss_data_pipeline as fdp
+from core.async_http import TokenBucket
+from core.fss_data_pipeline import FSSDataPipeline, FSSDataRequest
+
+LOCMEM_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "test-fss-data-pipeline",
+    }
+}
+LATENCY = 0.1
+METRICS = {"eps_accel": 0.1, "rev_yoy": 0.2, "gm_trend": 0.01, "balance_strength": 70.0}
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache():
+    with override_settings(CACHES=LOCMEM_CACHE):
+        cache.clear()
+        yield
+        cache.clear()
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.status = 200
+        self.body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        return self.body
+
+
+class FakeSession:
+    """Polygon aggregates endpoint with a fixed latency"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def get(self, url, **kwargs):
+        session = self
+
+        class Request(FakeResponse):
+            async def __aenter__(self):
+                session.in_flight += 1
+                session.max_in_flight = max(session.max_in_flight, session.in_flight)
+                try:
+                    await asyncio.sleep(LATENCY)
+                finally:
+                    session.in_flight -= 1
+                return self
+
+        return Request({"results": [{"t": 1736139600000, "o": 1, "h": 2, "l": 0.5, "c": 1.5, "v": 100}]})
+
+
+def price_frames(tickers):
+    index = pd.date_range("2026-01-05", periods=5, freq="B")
+    prices = pd.DataFrame({t: np.arange(5.0) + 1 for t in tickers}, index=index)
+    return prices, prices * 1000
+
+
+def test_polygon_requests_run_concurrently():
+    pipeline = FSSDataPipeline(max_concurrency=10)
+    pipeline.polygon_key = "key"
+    pipeline.session = FakeSession()
+    tickers = [f"T{i}" for i in range(30)]
+
+    with patch.object(fdp, "get_rate_limiter", return_value=TokenBucket(1000.0, 1000)):
+        started = time.perf_counter()
+        bars = asyncio.run(pipeline._fetch_polygon_aggregates(tickers, date(2025, 1, 6), date(2025, 1, 6)))
+        elapsed = time.perf_counter() - started
+
+    # 30 requests at 100ms each would take 3s serially
+    assert elapsed < 1.5
+    assert pipeline.session.max_in_flight == 10
+    assert sorted(bars) == sorted(tickers)
+    assert bars["T0"]["close"].iloc[0] == 1.5
+
+
+def test_rate_limited_tickers_fall_through_to_the_next_provider():
+    pipeline = FSSDataPipeline(rate_limit_wait=0.0)
+    pipeline.polygon_key = "key"
+    pipeline.session = FakeSession()
+
+    # Two tokens: the third ticker gives up instead of waiting
+    with patch.object(fdp, "get_rate_limiter", return_value=TokenBucket(0.001, 2)):
+        bars = asyncio.run(pipeline._fetch_polygon_aggregates(["A", "B", "C"], date(2025, 1, 6), date(2025, 1, 6)))
+
+    assert len(bars) == 2
+
+
+def test_fetch_requests_prices_benchmarks_and_fundamentals_at_once():
+    pipeline = FSSDataPipeline()
+    in_flight = []
+    max_in_flight = []
+
+    def slow(value):
+        async def fetch(*args):
+            in_flight.append(1)
+            max_in_flight.append(len(in_flight))
+            await asyncio.sleep(LATENCY)
+            in_flight.pop()
+            return value(*args)
+        return fetch
+
+    spy = pd.Series(np.arange(5.0), index=pd.date_range("2026-01-05", periods=5, freq="B"))
+    request = FSSDataRequest(tickers=["T0", "T1", "T0", "T2"])
+
+    with patch.object(pipeline, "_fetch_prices_volumes", side_effect=slow(lambda tickers, *dates: price_frames(tickers))), \
+            patch.object(pipeline, "_fetch_fundamentals", side_effect=slow(lambda tickers, lookback: {
+                metric: pd.DataFrame({t: [0.0] for t in tickers}) for metric in fdp.FUNDAMENTAL_METRICS
+            })), \
+            patch.object(pipeline, "_fetch_spy", side_effect=slow(lambda *dates: spy)), \
+            patch.object(pipeline, "_fetch_vix", AsyncMock(side_effect=RuntimeError("no VIX"))):
+        result = asyncio.run(pipeline.fetch_fss_data(request))
+
+    assert max(max_in_flight) == 3
+    assert list(result.prices.columns) == ["T0", "T1", "T2"]
+    assert result.spy is spy and result.vix is None
+    assert result.data_quality["fundamentals_available"] and result.data_quality["missing_tickers"] == []
+    assert result.data_quality["complete"]
+
+
+def test_fetch_raises_when_no_prices_arrive():
+    pipeline = FSSDataPipeline()
+    request = FSSDataRequest(tickers=["AAPL"], include_fundamentals=False)
+
+    with patch.object(pipeline, "_fetch_prices_volumes", AsyncMock(side_effect=ValueError("no data"))), \
+            patch.object(pipeline, "_fetch_spy", AsyncMock(return_value=None)), \
+            patch.object(pipeline, "_fetch_vix", AsyncMock(return_value=None)):
+        with pytest.raises(ValueError, match="Failed to fetch price/volume data"):
+            asyncio.run(pipeline.fetch_fss_data(request))
+
+
+def test_stream_yields_cumulative_results_as_batches_land():
+    pipeline = FSSDataPipeline()
+
+    async def prices_volumes(batch, start_date, end_date):
+        # Later batches land first
+        await asyncio.sleep(LATENCY * (3 - int(batch[0][1:]) // 2))
+        return price_frames(batch)
+
+    spy = pd.Series(np.arange(5.0), index=pd.date_range("2026-01-05", periods=5, freq="B"))
+    request = FSSDataRequest(tickers=[f"T{i}" for i in range(6)], include_fundamentals=False)
+
+    async def collect():
+        return [result async for result in pipeline.stream_fss_data(request, batch_size=2)]
+
+    with patch.object(pipeline, "_fetch_prices_volumes", side_effect=prices_volumes), \
+            patch.object(pipeline, "_fetch_spy", AsyncMock(return_value=spy)), \
+            patch.object(pipeline, "_fetch_vix", AsyncMock(return_value=None)):
+        results = asyncio.run(collect())
+
+    assert [list(r.prices.columns) for r in results] == [
+        ["T4", "T5"], ["T4", "T5", "T2", "T3"], ["T4", "T5", "T2", "T3", "T0", "T1"]
+    ]
+    assert [r.data_quality["complete"] for r in results] == [False, False, True]
+    assert results[0].data_quality["missing_tickers"] == ["T0", "T1", "T2", "T3"]
+    assert results[-1].spy is spy
+
+
+def test_stream_raises_when_no_prices_arrive():
+    pipeline = FSSDataPipeline()
+    request = FSSDataRequest(tickers=["AAPL"], include_fundamentals=False)
+
+    async def drain():
+        return [result async for result in pipeline.stream_fss_data(request)]
+
+    with patch.object(pipeline, "_fetch_prices_volumes", AsyncMock(side_effect=ValueError("no data"))), \
+            patch.object(pipeline, "_fetch_spy", AsyncMock(return_value=None)), \
+            patch.object(pipeline, "_fetch_vix", AsyncMock(return_value=None)):
+        with pytest.raises(ValueError, match="Failed to fetch price/volume data"):
+            asyncio.run(drain())
+
+
+def test_fundamentals_are_cached_per_fiscal_period():
+    pipeline = FSSDataPipeline()
+    fetch = AsyncMock(side_effect=lambda ticker: None if ticker == "NONE" else dict(METRICS))
+
+    with patch.object(pipeline, "_fetch_ticker_fundamentals", fetch):
+        with patch.object(fdp, "fiscal_period", return_value="2026Q2"):
+            first = asyncio.run(pipeline._fetch_fundamentals(["AAPL", "MSFT", "NONE"], lookback_days=30))
+            assert fetch.await_count == 3
+
+            # Same period: only the ticker without data is asked for again
+            asyncio.run(pipeline._fetch_fundamentals(["MSFT", "AAPL", "NONE"], lookback_days=30))
+            assert [c.args[0] for c in fetch.await_args_list[3:]] == ["NONE"]
+
+        # A new quarter has been reported: refetch
+        with patch.object(fdp, "fiscal_period", return_value="2026Q3"):
+            asyncio.run(pipeline._fetch_fundamentals(["AAPL"], lookback_days=30))
+            assert fetch.await_args_list[-1].args[0] == "AAPL"
+
+    assert set(first) == set(fdp.FUNDAMENTAL_METRICS)
+    assert list(first["rev_yoy"].columns) == ["AAPL", "MSFT", "NONE"]
+    assert (first["rev_yoy"]["AAPL"] == 0.2).all() and (first["rev_yoy"]["NONE"] == 0.0).all()
+
+
+def test_alpha_vantage_gives_up_after_max_wait():
+    pipeline = FSSDataPipeline(fundamentals_rate_limit_wait=0.0)
+    pipeline.alpha_vantage_key = "key"
+    pipeline.session = FakeSession()
+
+    # One token: the balance sheet request gives up instead of waiting
+    with patch.object(fdp, "get_rate_limiter", return_value=TokenBucket(0.001, 1)):
+        metrics = asyncio.run(pipeline._fetch_ticker_fundamentals("AAPL"))
+
+    assert metrics is None
+    assert pipeline.session.max_in_flight == 1
+
+
+@pytest.mark.parametrize("as_of, period", [
+    (date(2026, 11, 20), "2026Q3"),
+    (date(2026, 11, 10), "2026Q2"),
+    (date(2026, 2, 20), "2025Q4"),
+    (date(2026, 2, 10), "2025Q3"),
+])
+def test_fiscal_period_waits_for_the_filing_lag(as_of, period):
+    assert fdp.fiscal_period(as_of) == period
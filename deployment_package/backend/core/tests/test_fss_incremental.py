@@ -0,0 +1,119 @@
+"""
+Parity tests for the incremental (rolling-state) FSS engine.
+
+IncrementalFSSEngine.compute_window must reproduce FSSEngine.compute_fss_v3
+on the same window, whichever way the history was fed in.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from core.fss_engine import FSSEngine
+from core.fss_incremental import IncrementalFSSEngine
+
+
+def make_market(n=700, k=8, seed=11):
+    """Synthetic prices/volumes/SPY/VIX on a business-day calendar"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2021-01-04", periods=n, freq="B")
+    tickers = [f"S{i}" for i in range(k)]
+    prices = pd.DataFrame(
+        100 * np.exp(np.cumsum(rng.normal(0.0004, 0.02, (n, k)), axis=0)),
+        index=dates, columns=tickers
+    )
+    volumes = pd.DataFrame(
+        rng.integers(100_000, 1_000_000, (n, k)).astype(float),
+        index=dates, columns=tickers
+    )
+    spy = pd.Series(400 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, n))), index=dates)
+    vix = pd.Series(np.abs(rng.normal(18, 4, n)), index=dates)
+    return prices, volumes, spy, vix
+
+
+def assert_same_fss(got, expected):
+    assert got.columns.equals(expected.columns)
+    assert got.index.equals(expected.index)
+    np.testing.assert_array_equal(got.isna().values, expected.isna().values)
+    np.testing.assert_allclose(got.values, expected.values, rtol=1e-9, atol=1e-9)
+
+
+@pytest.fixture
+def engine():
+    return FSSEngine()
+
+
+@pytest.fixture
+def market():
+    return make_market()
+
+
+def test_rolling_windows_match_full_recompute(engine, market):
+    """Monthly walk-forward windows match a from-scratch compute on each slice"""
+    prices, volumes, spy, vix = market
+    inc = IncrementalFSSEngine(engine)
+
+    for end_idx in range(300, len(prices), 21):
+        end = prices.index[end_idx]
+        start = prices.index[end_idx - 252]
+        inc.advance(prices.loc[:end], volumes.loc[:end], spy.loc[:end], vix.loc[:end])
+
+        expected = engine.compute_fss_v3(
+            prices.loc[start:end], volumes.loc[start:end], spy.loc[start:end], vix.loc[start:end]
+        )
+        assert_same_fss(inc.compute_window(start, end), expected)
+
+
+def test_bar_by_bar_advance_matches_bulk_load(engine, market):
+    """Feeding one bar at a time gives the same state as one bulk advance"""
+    prices, volumes, spy, vix = market
+    bulk = IncrementalFSSEngine(engine)
+    bulk.advance(prices, volumes, spy, vix)
+
+    streamed = IncrementalFSSEngine(engine)
+    streamed.advance(prices.iloc[:200], volumes.iloc[:200], spy.iloc[:200], vix.iloc[:200])
+    for i in range(200, len(prices)):
+        assert streamed.advance(prices.iloc[:i + 1], volumes.iloc[:i + 1], spy.iloc[:i + 1], vix.iloc[:i + 1]) == 1
+
+    start, end = prices.index[-253], prices.index[-1]
+    assert_same_fss(streamed.compute_window(start, end), bulk.compute_window(start, end))
+
+
+def test_short_window_from_history_start(engine, market):
+    """Windows shorter than the rolling lookbacks keep their warm-up semantics"""
+    prices, volumes, spy, vix = market
+    inc = IncrementalFSSEngine(engine)
+    inc.advance(prices, volumes, spy, vix)
+
+    for start_idx, end_idx in [(0, 80), (10, 150), (400, 430)]:
+        start, end = prices.index[start_idx], prices.index[end_idx]
+        expected = engine.compute_fss_v3(
+            prices.loc[start:end], volumes.loc[start:end], spy.loc[start:end], vix.loc[start:end]
+        )
+        assert_same_fss(inc.compute_window(start, end), expected)
+
+
+def test_missing_prices_fall_back_to_full_compute(engine, market):
+    """Gaps inside the window are scored with the stand-alone computation"""
+    prices, volumes, spy, vix = market
+    prices = prices.copy()
+    prices.iloc[350:353, 2] = np.nan
+    inc = IncrementalFSSEngine(engine)
+    inc.advance(prices, volumes, spy, vix)
+
+    start, end = prices.index[300], prices.index[560]
+    expected = engine.compute_fss_v3(
+        prices.loc[start:end], volumes.loc[start:end], spy.loc[start:end], vix.loc[start:end]
+    )
+    assert_same_fss(inc.compute_window(start, end), expected)
+
+
+def test_window_beyond_state_raises(engine, market):
+    prices, volumes, spy, vix = market
+    inc = IncrementalFSSEngine(engine)
+    inc.advance(prices.iloc[:300], volumes.iloc[:300], spy.iloc[:300], vix.iloc[:300])
+
+    with pytest.raises(ValueError):
+        inc.compute_window(prices.index[100], prices.index[400])
+
+    with pytest.raises(ValueError):
+        inc.advance(prices.iloc[:, :4], volumes.iloc[:, :4], spy, vix)
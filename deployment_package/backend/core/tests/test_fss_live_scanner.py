@@ -0,0 +1,94 @@
+"""
+Tests for FSSLiveScanner scoring streamed ticker batches as they land.
+"""
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+
+from core.fss_data_pipeline import FSSDataResult
+from core.fss_engine import RegimeResult
+from core.fss_live_scanner import FSSLiveScanner
+
+DATES = pd.date_range("2026-01-05", periods=5, freq="B")
+
+
+def partial_result(tickers, complete):
+    prices = pd.DataFrame({t: np.arange(5.0) + 1 for t in tickers}, index=DATES)
+    return FSSDataResult(
+        prices=prices,
+        volumes=prices * 1000,
+        spy=pd.Series(np.arange(5.0), index=DATES),
+        vix=None,
+        fundamentals_daily=None,
+        data_quality={"complete": complete, "tickers_with_data": list(tickers)},
+    )
+
+
+class FakePipeline:
+    def __init__(self, results):
+        self.results = results
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def stream_fss_data(self, request):
+        for result in self.results:
+            yield result
+
+
+def fss_scores(prices, **kwargs):
+    # Score = 10 * (ticker number + 1), on the latest date only
+    scores = pd.DataFrame(
+        [[10.0 * (int(t[1:]) + 1) for t in prices.columns]], index=DATES[-1:], columns=prices.columns
+    )
+    return pd.concat({"FSS": scores}, axis=1)
+
+
+def make_scanner(results, tmp_path):
+    engine = MagicMock()
+    engine.compute_fss_v3.side_effect = fss_scores
+    engine.detect_market_regime.return_value = RegimeResult(
+        regime="Expansion", spy_above_200dma=True, vix_below_median=True, confidence=0.8
+    )
+    safety = MagicMock()
+    safety.check_safety.side_effect = lambda ticker, volumes: (ticker != "T1", "ok")
+
+    with patch("core.fss_live_scanner.get_fss_engine", return_value=engine), \
+            patch("core.fss_live_scanner.get_fss_data_pipeline", return_value=FakePipeline(results)), \
+            patch("core.fss_live_scanner.get_universe_manager"), \
+            patch("core.fss_live_scanner.get_safety_filter", return_value=safety):
+        scanner = FSSLiveScanner(prior_top_file=str(tmp_path / "prior.pkl"), alert_threshold=30.0, top_n=2)
+    return scanner, engine, safety
+
+
+def test_scan_scores_each_batch_as_it_lands(tmp_path):
+    results = [
+        partial_result(["T2", "T3"], complete=False),
+        partial_result(["T2", "T3"], complete=False),  # fundamentals only: no rescore
+        partial_result(["T2", "T3", "T0", "T1"], complete=True),
+    ]
+    scanner, engine, safety = make_scanner(results, tmp_path)
+    partials = []
+
+    result = asyncio.run(scanner.scan(["T0", "T1", "T2", "T3"], on_partial=partials.append))
+
+    assert engine.compute_fss_v3.call_count == 2
+    assert engine.detect_market_regime.call_count == 1
+    # Each ticker's safety filter runs once, when its batch arrives
+    assert sorted(c.kwargs["ticker"] for c in safety.check_safety.call_args_list) == ["T0", "T1", "T2", "T3"]
+
+    assert partials == [{
+        "top_stocks": {"T3": {"fss_score": 40.0, "safety_reason": "ok"},
+                       "T2": {"fss_score": 30.0, "safety_reason": "ok"}},
+        "scored": 2,
+        "total": 4,
+    }]
+    assert list(result["top_stocks"]) == ["T3", "T2"]
+    assert result["qualified"] == 3  # T1 failed its safety filter
+    assert sorted(result["new_high_conviction"]) == ["T2", "T3"]
+    assert result["data_quality"]["complete"]
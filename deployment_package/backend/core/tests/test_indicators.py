@@ -0,0 +1,203 @@
+"""
+Tests for the shared indicator kernels: pandas parity, parity with the
+loop-based implementations they replaced, 2-D vs per-symbol parity, and
+streaming vs batch parity.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import indicators as ind
+from core.technical_analysis_service import TechnicalAnalysisService
+
+
+def make_bars(n=300, symbols=4, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(size=(n, symbols)).cumsum(axis=0)
+    high = close + rng.random((n, symbols))
+    low = close - rng.random((n, symbols))
+    volume = rng.integers(0, 1000, (n, symbols)).astype(float)
+    return high, low, close, volume
+
+
+def with_gaps(x):
+    x = x.copy()
+    x[:3, 1] = np.nan  # Leading
+    x[50:55, 2] = np.nan  # Interior run
+    x[[10, 200], 3] = np.nan  # Isolated
+    return x
+
+
+# Loop implementations these kernels replaced, kept as references
+
+def legacy_simple_rsi(prices, period=14):
+    deltas = np.diff(prices)
+    gains = np.where(deltas > 0, deltas, 0)
+    losses = np.where(deltas < 0, -deltas, 0)
+    avg_gains, avg_losses = np.mean(gains[-period:]), np.mean(losses[-period:])
+    return 100.0 if avg_losses == 0 else 100 - 100 / (1 + avg_gains / avg_losses)
+
+
+def legacy_wilder_adx(high, low, close, period=14):
+    n = len(high)
+    plus_dm, minus_dm, tr_arr = np.zeros(n), np.zeros(n), np.zeros(n)
+    for i in range(1, n):
+        up_move, down_move = high[i] - high[i - 1], low[i - 1] - low[i]
+        plus_dm[i] = up_move if (up_move > down_move and up_move > 0) else 0.0
+        minus_dm[i] = down_move if (down_move > up_move and down_move > 0) else 0.0
+        tr_arr[i] = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+    atr = np.mean(tr_arr[1:period + 1])
+    plus_val, minus_val = np.mean(plus_dm[1:period + 1]), np.mean(minus_dm[1:period + 1])
+    dx_values = []
+    for i in range(period + 1, n):
+        atr = atr - atr / period + tr_arr[i]
+        plus_val = plus_val - plus_val / period + plus_dm[i]
+        minus_val = minus_val - minus_val / period + minus_dm[i]
+        plus_di = 100.0 * plus_val / atr if atr > 0 else 0.0
+        minus_di = 100.0 * minus_val / atr if atr > 0 else 0.0
+        di_sum = plus_di + minus_di
+        dx_values.append(abs(plus_di - minus_di) / di_sum * 100.0 if di_sum > 0 else 0.0)
+    return min(100.0, max(0.0, np.mean(dx_values[-period:])))
+
+
+def pandas_adx(high, low, close, period=14):
+    high, low, close = pd.Series(high), pd.Series(low), pd.Series(close)
+    prev_close = close.shift(1)
+    tr = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+    up_move, down_move = high - high.shift(1), low.shift(1) - low
+    plus_dm = pd.Series(np.where((up_move > down_move) & (up_move > 0), up_move, 0.0))
+    minus_dm = pd.Series(np.where((down_move > up_move) & (down_move > 0), down_move, 0.0))
+    atr_s = tr.ewm(span=period, adjust=False).mean().replace(0, np.nan)
+    plus_di = 100 * plus_dm.ewm(span=period, adjust=False).mean() / atr_s
+    minus_di = 100 * minus_dm.ewm(span=period, adjust=False).mean() / atr_s
+    dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di).replace(0, np.nan)
+    return dx.ewm(span=period, adjust=False).mean().to_numpy()
+
+
+@pytest.mark.parametrize("span", [3, 12, 26])
+def test_ema_matches_pandas_including_gaps(span):
+    _, _, close, _ = make_bars()
+    x = with_gaps(close)
+    expected = pd.DataFrame(x).ewm(span=span, adjust=False).mean().to_numpy()
+
+    np.testing.assert_allclose(ind.ema(x, span=span), expected, rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(ind.ema(x[:, 2], span=span), expected[:, 2], rtol=1e-12, equal_nan=True)
+
+
+def test_rolling_windows_match_pandas():
+    _, _, close, _ = make_bars()
+    x = with_gaps(close)
+    frame = pd.DataFrame(x)
+
+    np.testing.assert_allclose(
+        ind.sma(x, 14, min_periods=5), frame.rolling(14, min_periods=5).mean(), rtol=1e-10, equal_nan=True
+    )
+    np.testing.assert_allclose(ind.sma(x, 20), frame.rolling(20).mean(), rtol=1e-10, equal_nan=True)
+    np.testing.assert_allclose(
+        ind.rolling_sum(x, 10, 1), frame.rolling(10, min_periods=1).sum(), rtol=1e-10, equal_nan=True
+    )
+
+
+def test_kernels_match_the_loops_they_replaced():
+    high, low, close, _ = make_bars(symbols=1)
+    high, low, close = high[:, 0], low[:, 0], close[:, 0]
+
+    assert ind.rsi(close, 14)[-1] == pytest.approx(legacy_simple_rsi(close, 14), rel=1e-10)
+    assert ind.rsi(np.arange(20.0), 14)[-1] == 100.0
+
+    ta = TechnicalAnalysisService()
+    frame = pd.DataFrame({"high": high, "low": low, "close": close})
+    for n in (16, 20, 60, 300):
+        assert ta._calculate_adx(frame.iloc[:n]) == pytest.approx(
+            legacy_wilder_adx(high[:n], low[:n], close[:n]), rel=1e-10
+        )
+
+    np.testing.assert_allclose(ind.adx(high, low, close), pandas_adx(high, low, close), rtol=1e-10, equal_nan=True)
+
+
+def test_technical_analysis_macd_signal_is_ema_of_macd_line():
+    _, _, close, _ = make_bars(symbols=1)
+    close = close[:, 0]
+    line, signal, histogram = TechnicalAnalysisService()._calculate_macd(close)
+
+    series = pd.Series(close)
+    expected_line = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+    expected_signal = expected_line.ewm(span=9, adjust=False).mean()
+    assert line == pytest.approx(expected_line.iloc[-1])
+    assert signal == pytest.approx(expected_signal.iloc[-1])
+    assert histogram == pytest.approx(line - signal)
+    assert histogram != 0.0
+
+
+def test_vwap_cumulative_and_windowed():
+    high, low, close, volume = make_bars()
+    typical = (high + low + close) / 3
+
+    np.testing.assert_allclose(
+        ind.vwap(high, low, close, volume)[-1], (typical * volume).sum(0) / volume.sum(0), rtol=1e-12
+    )
+    np.testing.assert_allclose(
+        ind.vwap(high, low, close, volume, window=20)[-1],
+        (typical[-20:] * volume[-20:]).sum(0) / volume[-20:].sum(0),
+        rtol=1e-10,
+    )
+    assert np.isnan(ind.vwap([1.0], [1.0], [1.0], [0.0])[0])
+
+
+@pytest.mark.parametrize("kernel", [
+    lambda h, l, c, v: ind.rsi(c, 14),
+    lambda h, l, c, v: ind.rsi(c, 14, method="wilder"),
+    lambda h, l, c, v: ind.macd(c)[1],
+    lambda h, l, c, v: ind.atr(h, l, c, 14),
+    lambda h, l, c, v: ind.adx(h, l, c, 14),
+    lambda h, l, c, v: ind.directional_index(h, l, c, 14, method="wilder_sum")[2],
+    lambda h, l, c, v: ind.vwap(h, l, c, v, window=30),
+])
+def test_panel_matches_per_symbol(kernel):
+    high, low, close, volume = make_bars()
+    panel = kernel(high, low, close, volume)
+
+    assert panel.shape == close.shape
+    for j in range(close.shape[1]):
+        np.testing.assert_allclose(
+            panel[:, j], kernel(high[:, j], low[:, j], close[:, j], volume[:, j]), rtol=1e-12, equal_nan=True
+        )
+
+
+@pytest.mark.parametrize("state, kernel, columns", [
+    (lambda: ind.EMAState(span=10), lambda h, l, c, v: ind.ema(c, span=10), "c"),
+    (lambda: ind.RSIState(14), lambda h, l, c, v: ind.rsi(c, 14), "c"),
+    (lambda: ind.RSIState(14, method="ema"), lambda h, l, c, v: ind.rsi(c, 14, method="ema"), "c"),
+    (lambda: ind.MACDState(), lambda h, l, c, v: np.stack(ind.macd(c)), "c"),
+    (lambda: ind.ATRState(14, min_periods=5), lambda h, l, c, v: ind.atr(h, l, c, 14, min_periods=5), "hlc"),
+    (lambda: ind.ADXState(14), lambda h, l, c, v: ind.adx(h, l, c, 14), "hlc"),
+    (lambda: ind.VWAPState(), lambda h, l, c, v: ind.vwap(h, l, c, v), "hlcv"),
+    (lambda: ind.VWAPState(window=20), lambda h, l, c, v: ind.vwap(h, l, c, v, window=20), "hlcv"),
+])
+def test_streaming_updates_match_batch(state, kernel, columns):
+    high, low, close, volume = make_bars()
+    close = with_gaps(close)
+    bars = {"h": high, "l": low, "c": close, "v": volume}
+    expected = kernel(high, low, close, volume)
+
+    # One update per bar for the whole panel
+    updater = state()
+    streamed = [updater.update(*(bars[k][t] for k in columns)) for t in range(len(close))]
+    streamed = np.stack([np.stack(s) if isinstance(s, tuple) else s for s in streamed])
+    if streamed.ndim == 3:
+        streamed = np.moveaxis(streamed, 0, 1)
+    np.testing.assert_allclose(streamed, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+    # Scalars in, floats out
+    updater = state()
+    last = [updater.update(*(float(bars[k][t, 0]) for k in columns)) for t in range(len(close))][-1]
+    first_symbol = expected[..., -1, 0]
+    assert np.allclose(last, first_symbol, rtol=1e-9, equal_nan=True)
+    assert isinstance(last if not isinstance(last, tuple) else last[0], float)
+
+
+def test_vwap_state_reset_starts_a_new_session():
+    state = ind.VWAPState()
+    state.update(10.0, 10.0, 10.0, 100.0)
+    state.reset()
+    assert state.update(20.0, 20.0, 20.0, 50.0) == 20.0
@@ -0,0 +1,124 @@
+"""
+Tests for the concurrent intraday data fan-out behind day-trading pick generation.
+"""
+import asyncio
+import time
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from core import queries
+
+LOCMEM_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "test-intraday-fanout",
+    }
+}
+LATENCY = 0.2
+FROZEN_BAR = datetime(2026, 3, 2, 10, 31)
+cache_key = queries._intraday_cache_key
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache():
+    with override_settings(CACHES=LOCMEM_CACHE):
+        cache.clear()
+        # Pin the bar close so a minute rollover mid-test cannot miss the cache
+        with patch.object(queries, "_intraday_cache_key", lambda symbol, now=None: cache_key(symbol, FROZEN_BAR)):
+            yield
+        cache.clear()
+
+
+class FakeProviders:
+    """Stands in for the Polygon -> Alpaca -> fallback chain"""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, symbol):
+        self.calls.append(symbol)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(LATENCY)
+        finally:
+            self.in_flight -= 1
+        if symbol in self.failing:
+            return None, None
+        bars = pd.DataFrame({"close": [100.0, 101.0], "symbol": [symbol, symbol]})
+        return bars, bars
+
+
+def make_scorers():
+    feature_service = MagicMock()
+    feature_service.extract_features_batch.side_effect = lambda ohlcv_1m, ohlcv_5m, symbols: pd.DataFrame(
+        {"momentum_15m": 0.01}, index=symbols
+    )
+    feature_service.extract_all_features.side_effect = lambda ohlcv_1m, ohlcv_5m, symbol: {"momentum_15m": -0.01}
+    feature_service.calculate_risk_metrics.return_value = {"stop": 1.0}
+    ml_scorer = MagicMock()
+    ml_scorer.score_batch.side_effect = lambda features, mode, sides: np.full(len(features), 0.9)
+    ml_scorer.score.return_value = 0.7
+    ml_scorer.calculate_catalyst_score.return_value = 0.5
+    return feature_service, ml_scorer
+
+
+def generate(symbols, providers, scorers=None):
+    feature_service, ml_scorer = scorers or make_scorers()
+    with patch.object(queries, "_fetch_intraday_data", providers):
+        return queries._generate_picks_for_symbols(symbols, feature_service, ml_scorer, "SAFE", 0.5)
+
+
+def test_symbols_are_fetched_concurrently_and_returned_in_universe_order():
+    symbols = [f"SYM{i}" for i in range(30)]
+    providers = FakeProviders(failing={"SYM3"})
+
+    started = time.perf_counter()
+    picks = generate(symbols, providers)
+    elapsed = time.perf_counter() - started
+
+    # 30 symbols at 200ms each would take 6s serially; 10 at a time take ~0.6s
+    assert elapsed < 3.0
+    assert providers.max_in_flight == queries.INTRADAY_FETCH_CONCURRENCY
+    assert [p["symbol"] for p in picks] == [s for s in symbols if s != "SYM3"]
+    assert picks[0]["score"] == 0.9 and picks[0]["side"] == "LONG"
+
+
+def test_batch_scoring_failure_falls_back_to_per_symbol_scoring():
+    feature_service, ml_scorer = make_scorers()
+    ml_scorer.score_batch.side_effect = ValueError("bad feature matrix")
+
+    picks = generate(["AAPL", "MSFT"], FakeProviders(), (feature_service, ml_scorer))
+
+    assert [(p["symbol"], p["score"], p["side"]) for p in picks] == [("AAPL", 0.7, "SHORT"), ("MSFT", 0.7, "SHORT")]
+
+
+def test_bars_are_cached_per_symbol_and_bar_close():
+    providers = FakeProviders(failing={"BAD"})
+    generate(["AAPL", "MSFT", "BAD"], providers)
+    assert sorted(providers.calls) == ["AAPL", "BAD", "MSFT"]
+
+    # Same minute: only the symbol whose fetch failed is retried
+    picks = generate(["MSFT", "AAPL", "NVDA", "BAD"], providers)
+    assert sorted(providers.calls[3:]) == ["BAD", "NVDA"]
+    assert [p["symbol"] for p in picks] == ["MSFT", "AAPL", "NVDA"]
+
+    # Single-symbol callers share the cache
+    with patch.object(queries, "_fetch_intraday_data", providers):
+        ohlcv_1m, _ = asyncio.run(queries._get_intraday_data("NVDA"))
+    assert ohlcv_1m["symbol"].iloc[0] == "NVDA"
+    assert providers.calls.count("NVDA") == 1
+
+
+def test_cache_key_changes_with_each_bar_close():
+    assert cache_key("aapl", datetime(2026, 3, 2, 10, 31, 59)) == cache_key("AAPL", datetime(2026, 3, 2, 10, 31, 0))
+    assert cache_key("AAPL", datetime(2026, 3, 2, 10, 31)) != cache_key("AAPL", datetime(2026, 3, 2, 10, 32))
@@ -0,0 +1,136 @@
+"""
+Parity tests for the compiled merchant matchers: every classifier must agree
+with the per-keyword substring loops it replaced.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from core.merchant_matcher import CategoryMatcher, KeywordMatcher
+from core.spending_habits_service import SpendingHabitsService
+from core.spending_trend_predictor import (
+    SPENDING_TO_SECTORS,
+    SPENDING_TO_STOCKS,
+    WeeklySpendingAccumulator,
+    match_spending_tickers,
+)
+from core.subscription_detector import CATEGORY_KEYWORDS, _classify_merchant
+
+MERCHANTS = [
+    'AMAZON MKTPLACE', 'APPLE.COM/BILL', 'UBER EATS', 'UBER TRIP', 'STARBUCKS #123', 'SHELL GAS',
+    'VEGAS HOTEL', 'TARGET T-1234', 'CVS/PHARMACY', 'LOCAL CAFE', 'NETFLIX.COM', 'AIRBNB', 'Technology',
+    'DELTA AIRLINES', 'MCDONALD\'S', '', None,
+]
+CATEGORIES = ['', 'FOOD', 'TRAVEL', 'SHOPPING', 'Shopping', 'UTILITIES', 'GAS', 'OTHER']
+
+
+def loop_tickers(merchant, description, category):
+    """The original per-transaction substring loop of the spending aggregation"""
+    matched = set()
+    for key, tickers in SPENDING_TO_STOCKS.items():
+        if key in merchant or key in description:
+            matched.update(tickers)
+    for key, tickers in SPENDING_TO_STOCKS.items():
+        if key in category:
+            matched.update(tickers)
+    if not matched:
+        for cat_key in SPENDING_TO_SECTORS:
+            if cat_key in category or cat_key in merchant:
+                matched.update(SPENDING_TO_STOCKS.get(cat_key, []))
+    return tuple(sorted(matched))
+
+
+def make_transactions(n=3000, seed=3):
+    rng = random.Random(seed)
+    return [
+        SimpleNamespace(
+            merchant_name=rng.choice(MERCHANTS),
+            description=rng.choice(MERCHANTS) or 'POS PURCHASE',
+            category=rng.choice(CATEGORIES),
+            amount=-round(rng.uniform(1, 300), 2),
+            transaction_date=date(2025, 1, 1) + timedelta(days=rng.randrange(120)),
+            posted_date=date(2025, 1, 2),
+            user_id=rng.randrange(40),
+        )
+        for _ in range(n)
+    ]
+
+
+def test_keyword_matcher_finds_every_overlapping_keyword():
+    matcher = KeywordMatcher(['GAS', 'GASOLINE', 'SOL', 'LINE', 'AS', 'X.Y', ''])
+
+    assert matcher.find('SHELL GASOLINE') == {'GAS', 'GASOLINE', 'SOL', 'LINE', 'AS'}
+    assert matcher.find('XAY') == frozenset()  # Keywords are literal, not regex
+    assert matcher.find('') == frozenset() and matcher.find(None) == frozenset()
+    assert matcher.find_many(['AS', None, 'AS', 'LINE']) == [{'AS'}, frozenset(), {'AS'}, {'LINE'}]
+
+    rng = random.Random(0)
+    keywords = [''.join(rng.choice('ABC') for _ in range(rng.randint(1, 4))) for _ in range(30)]
+    matcher = KeywordMatcher(keywords)
+    for _ in range(500):
+        text = ''.join(rng.choice('ABCD') for _ in range(rng.randint(0, 12)))
+        assert matcher.find(text) == {k for k in keywords if k in text}
+
+
+def test_category_matcher_returns_the_first_category_in_table_order():
+    for merchant_key in ['apple music', 'amazon prime video', 'planet fitness', 'gym box', 'random shop']:
+        expected = next(
+            (c for c, kws in CATEGORY_KEYWORDS.items() if any(kw in merchant_key for kw in kws)), 'Subscriptions'
+        )
+        assert _classify_merchant(merchant_key) == expected
+
+    matcher = CategoryMatcher({'A': ['ZZ'], 'B': ['Z', 'Y'], 'C': ['Y']})
+    assert matcher.match('xYx') == 'B' and matcher.match('ZZ') == 'A' and matcher.match('q') is None
+
+
+def test_spending_tickers_match_the_substring_loop():
+    txns = make_transactions()
+    merchants = [(t.merchant_name or '').upper() for t in txns]
+    descriptions = [(t.description or '').upper() for t in txns]
+    categories = [(t.category or '').upper() for t in txns]
+
+    got = match_spending_tickers(merchants, descriptions, categories)
+
+    assert got == [loop_tickers(*row) for row in zip(merchants, descriptions, categories)]
+    assert sum(1 for tickers in got if tickers) > len(got) // 2
+
+
+def test_weekly_spending_accumulator_matches_the_loop():
+    txns = make_transactions()
+    rows = []
+    for t in txns:
+        tickers = loop_tickers((t.merchant_name or '').upper(), (t.description or '').upper(), (t.category or '').upper())
+        rows += [{'date': t.transaction_date, 'ticker': ticker, 'amount': abs(Decimal(str(t.amount))), 'user_id': t.user_id}
+                 for ticker in tickers]
+    expected = pd.DataFrame(rows)
+    expected['week'] = pd.to_datetime(expected['date']).dt.to_period('W').dt.start_time.dt.date
+    expected = expected.groupby(['week', 'ticker']).agg(
+        total=('amount', 'sum'), users=('user_id', 'nunique'), count=('amount', 'size')
+    )
+
+    accumulator = WeeklySpendingAccumulator()
+    accumulator.add([
+        (t.transaction_date, t.merchant_name, t.description, t.category, Decimal(str(t.amount)), t.user_id)
+        for t in txns
+    ])
+
+    assert accumulator.pop_all() == [(week, ticker, *row) for (week, ticker), row in expected.iterrows()]
+
+
+@pytest.mark.parametrize('merchant', MERCHANTS)
+def test_spending_habits_category_matches_the_loop(merchant):
+    service = SpendingHabitsService()
+    for category in CATEGORIES:
+        txn = SimpleNamespace(merchant_name=merchant, description='ONLINE PAYMENT ' + (merchant or ''), category=category)
+        expected = None
+        for text in ((merchant or '').upper(), txn.description.upper()):
+            expected = expected or next(
+                (c for c, kws in service.SPENDING_CATEGORIES.items() if any(kw in text for kw in kws)), None
+            )
+        if expected is None:
+            expected = service.TRANSACTION_CATEGORY_MAPPING.get(category.upper(), 'Other') if category else 'Other'
+        assert service._match_transaction_category(txn) == expected
@@ -0,0 +1,76 @@
+"""
+Parity tests for the tail-only feature mode used at inference:
+build_latest_features(df, n) must equal build_features(df).iloc[-n:].
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.ml.features import FEATURE_NAMES, build_features, build_latest_features
+
+
+def make_frame(n=504, seed=1):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-01-02", periods=n)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+    spy = 400 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, n)))
+    return pd.DataFrame({
+        "open": close * (1 + rng.normal(0, 0.002, n)),
+        "high": close * (1 + np.abs(rng.normal(0, 0.01, n))),
+        "low": close * (1 - np.abs(rng.normal(0, 0.01, n))),
+        "close": close,
+        "volume": rng.integers(100_000, 1_000_000, n).astype(float),
+        "spy_close": spy,
+        "spy_volume": rng.integers(1_000_000, 5_000_000, n).astype(float),
+        "qqq_close": 350 * np.exp(np.cumsum(rng.normal(0.0004, 0.012, n))),
+    }, index=dates)
+
+
+def assert_tail_parity(df, last_n):
+    expected = build_features(df).iloc[-last_n:]
+    got = build_latest_features(df, last_n=last_n)
+
+    assert list(got.columns) == FEATURE_NAMES
+    assert got.index.equals(expected.index)
+    np.testing.assert_array_equal(got.isna().values, expected.isna().values)
+    np.testing.assert_allclose(got.values, expected.values, rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize("last_n", [1, 7, 60])
+def test_tail_matches_full_computation(last_n):
+    assert_tail_parity(make_frame(), last_n)
+
+
+def test_short_history_keeps_warm_up_nans():
+    df = make_frame(n=150, seed=2)
+    assert_tail_parity(df, 3)
+    assert build_latest_features(df)["dist_sma_200"].isna().all()
+
+
+def test_missing_context_columns():
+    assert_tail_parity(make_frame(n=300, seed=3).drop(columns=["spy_close", "qqq_close"]), 2)
+
+
+def test_gaps_zero_volume_and_forward_fill():
+    df = make_frame(n=400, seed=4)
+    df.iloc[-3:-1, df.columns.get_loc("close")] = np.nan
+    df.iloc[200:210, df.columns.get_loc("spy_close")] = np.nan
+    df.iloc[-8, df.columns.get_loc("volume")] = 0
+    df.iloc[-30:-15, df.columns.get_loc("volume")] = 500_000.0  # constant window -> zero std
+    for last_n in (1, 10):
+        assert_tail_parity(df, last_n)
+
+
+def test_build_features_last_n_delegates():
+    df = make_frame(n=300, seed=5)
+    pd.testing.assert_frame_equal(build_features(df, last_n=4), build_latest_features(df, last_n=4))
+    assert len(build_latest_features(df, last_n=1000)) == len(df)
+
+
+def test_tail_only_reads_its_lookback_window():
+    # Rows older than the longest lookback (ADX warm-up) must not matter
+    df = make_frame(n=1000, seed=6)
+    expected = build_latest_features(df, last_n=3)
+    cols = ["open", "high", "low", "close", "volume", "spy_close", "qqq_close"]
+    df.iloc[:500, [df.columns.get_loc(c) for c in cols]] *= 7.0
+    pd.testing.assert_frame_equal(build_latest_features(df, last_n=3), expected)
@@ -0,0 +1,72 @@
+"""
+Parity tests for batched inference: ModelRegistry.predict_batch must match
+ModelRegistry.predict called ticker by ticker.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import Ridge
+
+from core.ml import model_registry
+from core.ml.features import FEATURE_NAMES
+from core.ml.model_registry import ModelRegistry
+
+
+def make_frame(seed, n=320):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-01-02", periods=n)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+    spy = 400 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, n)))
+    return pd.DataFrame({
+        "open": close * (1 + rng.normal(0, 0.002, n)),
+        "high": close * 1.01,
+        "low": close * 0.99,
+        "close": close,
+        "volume": rng.integers(100_000, 1_000_000, n).astype(float),
+        "spy_close": spy,
+        "spy_volume": rng.integers(1_000_000, 5_000_000, n).astype(float),
+        "qqq_close": spy * 0.9,
+    }, index=dates)
+
+
+class CountingRidge(Ridge):
+    calls = 0
+
+    def predict(self, X):
+        CountingRidge.calls += 1
+        return super().predict(X)
+
+
+@pytest.fixture
+def saved_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_registry, "_MODEL_DIR", tmp_path)
+    ModelRegistry.clear_cache()
+    rng = np.random.default_rng(0)
+    k = len(FEATURE_NAMES)
+    model = CountingRidge().fit(rng.normal(size=(200, k)), rng.normal(size=200))
+    xs_mean = pd.Series(rng.normal(0, 0.1, k), index=FEATURE_NAMES)
+    xs_std = pd.Series(np.abs(rng.normal(1, 0.2, k)), index=FEATURE_NAMES)
+    xs_std.iloc[3] = 0.0  # zero-variance feature is mapped to 0
+    ModelRegistry.save(model, name="batch", xs_mean=xs_mean, xs_std=xs_std)
+    yield
+    ModelRegistry.clear_cache()
+
+
+def test_predict_batch_matches_single_predictions(saved_model):
+    frames = {f"T{i}": make_frame(i) for i in range(6)}
+    expected = {t: ModelRegistry.predict(df, name="batch") for t, df in frames.items()}
+
+    CountingRidge.calls = 0
+    got = ModelRegistry.predict_batch(frames, name="batch")
+
+    assert CountingRidge.calls == 1
+    assert list(got) == list(frames)
+    for ticker in frames:
+        assert got[ticker] == pytest.approx(expected[ticker], abs=1e-12)
+
+
+def test_predict_batch_skips_unusable_frames(saved_model):
+    frames = {"GOOD": make_frame(1), "BAD": make_frame(2).drop(columns=["volume"])}
+
+    assert list(ModelRegistry.predict_batch(frames, name="batch")) == ["GOOD"]
+    assert ModelRegistry.predict_batch({}, name="batch") == {}
@@ -0,0 +1,79 @@
+"""
+Tests for the process-wide ModelRegistry bundle cache.
+"""
+import os
+
+import joblib
+import pytest
+
+from core.ml import model_registry
+from core.ml.model_registry import ModelRegistry
+
+
+@pytest.fixture
+def registry_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_registry, "_MODEL_DIR", tmp_path)
+    monkeypatch.setattr(model_registry, "_CACHE_STATS", {"hits": 0, "misses": 0, "reloads": 0})
+    ModelRegistry.clear_cache()
+    yield tmp_path
+    ModelRegistry.clear_cache()
+
+
+def write_bundle(path, version):
+    joblib.dump({"model": None, "feature_names": ["f"], "version": version}, path)
+
+
+def test_repeat_loads_hit_cache(registry_dir):
+    write_bundle(registry_dir / "m.pkl", 1)
+
+    first = ModelRegistry.load("m")
+    second = ModelRegistry.load("m")
+
+    assert first is second
+    stats = ModelRegistry.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["reloads"]) == (1, 1, 0)
+    assert stats["cached"] == ["m"]
+
+
+def test_changed_file_is_reloaded(registry_dir):
+    path = registry_dir / "m.pkl"
+    write_bundle(path, 1)
+    ModelRegistry.load("m")
+
+    write_bundle(path, 2)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert ModelRegistry.load("m")["version"] == 2
+    assert ModelRegistry.cache_stats()["reloads"] == 1
+
+
+def test_touch_without_content_change_keeps_bundle(registry_dir):
+    path = registry_dir / "m.pkl"
+    write_bundle(path, 1)
+    bundle = ModelRegistry.load("m")
+
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert ModelRegistry.load("m") is bundle
+    stats = ModelRegistry.cache_stats()
+    assert (stats["misses"], stats["reloads"]) == (1, 0)
+
+
+def test_save_evicts_and_bypass(registry_dir):
+    write_bundle(registry_dir / "m.pkl", 1)
+    ModelRegistry.load("m")
+
+    ModelRegistry.save(model=None, feature_names=["f"], name="m")
+    assert ModelRegistry.cache_stats()["cached"] == []
+
+    ModelRegistry.load("m", use_cache=False)
+    assert ModelRegistry.cache_stats()["cached"] == []
+
+
+def test_warm_up_skips_missing(registry_dir):
+    write_bundle(registry_dir / "m.pkl", 1)
+
+    assert ModelRegistry.warm_up(["m", "absent"]) == {"m": True, "absent": False}
+    assert ModelRegistry.cache_stats()["cached"] == ["m"]
@@ -0,0 +1,154 @@
+"""
+Tests for the indexed OptionChain and StrategyRouter candidate generation on top of it.
+"""
+import time
+
+import numpy as np
+from scipy.stats import norm
+
+from core.option_chain import OptionChain
+from core.options_strategy_router import StrategyRouter
+
+SPOT = 450.0
+
+PLAYBOOKS = {
+    "regimes": {
+        "NEUTRAL": {
+            "eligible_strategies": [
+                "IRON_CONDOR", "BULL_CALL_SPREAD", "BULL_PUT_SPREAD", "CASH_SECURED_PUT", "COVERED_CALL",
+            ],
+        },
+    },
+    "strategies": {
+        "IRON_CONDOR": {"greek_profile": {"delta": 0.0}},
+        "BULL_CALL_SPREAD": {"greek_profile": {"delta": 0.4}},
+        "BULL_PUT_SPREAD": {"greek_profile": {"delta": 0.3}},
+        "CASH_SECURED_PUT": {"greek_profile": {"delta": 0.2}, "complexity_tier": "beginner"},
+        "COVERED_CALL": {"greek_profile": {"delta": 0.3}, "complexity_tier": "beginner"},
+    },
+}
+
+
+def make_chain(expiries=(("2026-11-20", 30), ("2026-12-18", 58)), step=5.0, lo=0.7, hi=1.3, iv=0.25):
+    chain = []
+    for expiry, dte in expiries:
+        t = dte / 365.0
+        for strike in np.arange(SPOT * lo, SPOT * hi + step, step):
+            d1 = (np.log(SPOT / strike) + 0.5 * iv ** 2 * t) / (iv * np.sqrt(t))
+            for option_type, delta in (("call", norm.cdf(d1)), ("put", norm.cdf(d1) - 1)):
+                chain.append({
+                    "strike": float(strike),
+                    "option_type": option_type,
+                    "expiration_date": expiry,
+                    "days_to_expiration": dte,
+                    "delta": float(delta),
+                    "bid": 1.0,
+                    "ask": 1.1,
+                })
+    # Provider order is not strike order
+    np.random.default_rng(0).shuffle(chain)
+    return chain
+
+
+def test_nearest_strike_lookup():
+    chain = OptionChain.build([
+        {"strike": s, "option_type": "put", "bid": 1, "ask": 1.2} for s in [410, 400, 420.5, 430]
+    ])
+    puts = chain.slice("", "put")
+
+    np.testing.assert_array_equal(puts.strikes, [400, 410, 420.5, 430])
+    assert puts.strikes[puts.nearest(419)] == 420.5
+    assert puts.nearest(415) == 1  # Tie goes to the lower strike
+    assert puts.nearest(425.5, tolerance=2) is None
+    assert puts.nearest(1000) == 3
+    np.testing.assert_array_equal(puts.nearest_many([399, 431.5, 500], tolerance=2), [0, 3, -1])
+
+
+def test_delta_band_and_nested_chain_shape():
+    nested = {
+        "2026-12-18": {
+            440: {"call": {"bid": 5, "ask": 5.2, "delta": 0.55}, "put": {"bid": 4, "ask": 4.2, "delta": -0.45}},
+            470: {"call": {"bid": 1, "ask": 1.1, "delta": 0.22}, "put": {"bid": 20, "ask": 21}},
+            480: {"call": {"bid": 0.5, "ask": 0.6, "delta": 0.18}},
+        },
+    }
+    chain = OptionChain.build(nested)
+    calls = chain.slice("2026-12-18", "call")
+
+    assert chain.expiries == ["2026-12-18"]
+    assert len(chain) == 5
+    np.testing.assert_array_equal(calls.strikes[calls.delta_band(0.15, 0.25)], [470, 480])
+    puts = chain.slice("2026-12-18", "put")
+    assert puts.delta_band(-1, 1).tolist() == [0]  # Missing delta is never in a band
+
+
+def test_bull_spreads_enumerate_every_width_pair_across_expiries():
+    router = StrategyRouter(PLAYBOOKS, "SPY", SPOT)
+    chain = OptionChain.build(make_chain())
+
+    spreads = router._generate_bull_call_spreads(chain, 0.25, 30, 0.4)
+    pairs = {(c["expiration"], c["long_strike"], c["short_strike"]) for c in spreads}
+
+    # Strikes every 5 points: each width has one wing per anchor that fits
+    n_strikes = len(chain.slice("2026-11-20", "call"))
+    expected = sum(n_strikes - width // 5 for width in (10, 15, 20, 25)) * 2
+    assert len(spreads) == len(pairs) == expected
+    for spread in spreads:
+        assert spread["short_strike"] - spread["long_strike"] == spread["width"]
+
+    puts = router._generate_bull_put_spreads(chain, 0.25, 30, 0.3)
+    assert all(p["short_strike"] - p["long_strike"] == p["width"] for p in puts)
+    assert {p["expiration"] for p in puts} == {"2026-11-20", "2026-12-18"}
+
+
+def test_iron_condors_combine_all_short_legs_in_delta_bands():
+    router = StrategyRouter(PLAYBOOKS, "SPY", SPOT)
+    records = make_chain()
+    chain = OptionChain.build(records)
+    condors = router._generate_iron_condors(chain, 0.25, 30, 0.0)
+
+    # Brute-force reference over the raw dicts
+    expected = set()
+    for expiry in chain.expiries:
+        puts = [r for r in records if r["expiration_date"] == expiry and r["option_type"] == "put"]
+        calls = [r for r in records if r["expiration_date"] == expiry and r["option_type"] == "call"]
+        for width in (20, 25, 30):
+            for sp in (p for p in puts if -0.25 <= p["delta"] <= -0.15):
+                lp = [p for p in puts if abs(p["strike"] - (sp["strike"] - width)) < 2]
+                for sc in (c for c in calls if 0.15 <= c["delta"] <= 0.25):
+                    lc = [c for c in calls if abs(c["strike"] - (sc["strike"] + width)) < 2]
+                    if lp and lc:
+                        expected.add((expiry, width, lp[0]["strike"], sp["strike"], sc["strike"], lc[0]["strike"]))
+
+    got = {(c["expiration"], c["width"], *(leg["strike"] for leg in c["legs"])) for c in condors}
+    assert len(expected) > 10
+    assert got == expected
+    assert len(condors) == len(got)
+
+
+def test_route_regime_scores_candidates_with_their_own_dte():
+    router = StrategyRouter(PLAYBOOKS, "SPY", SPOT)
+    result = router.route_regime("NEUTRAL", make_chain(), iv=0.25, days_to_expiration=30)
+
+    assert len(result["top_3_strategies"]) == 3
+    assert result["candidate_count"] > 100
+    scores = [c["composite_score"] for c in result["top_3_strategies"]]
+    assert scores == sorted(scores, reverse=True)
+
+    # Single-expiry chain without DTE info falls back to the routed DTE
+    flat = [{k: v for k, v in r.items() if k not in ("expiration_date", "days_to_expiration")}
+            for r in make_chain(expiries=(("x", 30),))]
+    assert router.route_regime("NEUTRAL", flat, iv=0.25, days_to_expiration=30)["top_3_strategies"]
+
+
+def test_full_structure_search_is_fast():
+    router = StrategyRouter(PLAYBOOKS, "SPY", SPOT)
+    expiries = tuple((f"2027-0{m}-15", 30 * m) for m in range(1, 7))
+    chain = make_chain(expiries=expiries, step=1.0)
+
+    started = time.perf_counter()
+    result = router.route_regime("NEUTRAL", chain, iv=0.25, days_to_expiration=30)
+    elapsed = time.perf_counter() - started
+
+    assert result["candidate_count"] > 5000
+    assert elapsed < 5.0
@@ -0,0 +1,145 @@
+"""
+Tests for the batched implied-volatility solver and chain Greeks in OptionsAnalysisService.
+"""
+import math
+import time
+
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from core.implied_volatility import black_scholes_price_vega, implied_volatility
+from core.options_service import OptionsAnalysisService
+
+SPOT = 180.0
+RATE = 0.045
+
+
+def make_chain(n=1200, seed=13):
+    rng = np.random.default_rng(seed)
+    strikes = rng.uniform(SPOT * 0.6, SPOT * 1.4, n).round(1)
+    days = rng.integers(1, 400, n)
+    sigma = rng.uniform(0.08, 1.5, n)
+    is_call = rng.random(n) < 0.5
+    prices, _ = black_scholes_price_vega(SPOT, strikes, days / 365.0, RATE, sigma, is_call)
+    return strikes, days, sigma, is_call, prices
+
+
+def reference_greeks(S, K, days, r, iv, option_type):
+    """The per-contract Black-Scholes formulas the service has always used"""
+    T = days / 365.0
+    d1 = (math.log(S / K) + (r + 0.5 * iv ** 2) * T) / (iv * math.sqrt(T))
+    d2 = d1 - iv * math.sqrt(T)
+    n_d1 = norm.pdf(d1)
+    if option_type == 'call':
+        delta = norm.cdf(d1)
+        theta = (-(S * n_d1 * iv) / (2 * math.sqrt(T)) - r * K * math.exp(-r * T) * norm.cdf(d2)) / 365
+        rho = K * T * math.exp(-r * T) * norm.cdf(d2) / 100
+    else:
+        delta = norm.cdf(d1) - 1
+        theta = (-(S * n_d1 * iv) / (2 * math.sqrt(T)) + r * K * math.exp(-r * T) * norm.cdf(-d2)) / 365
+        rho = -K * T * math.exp(-r * T) * norm.cdf(-d2) / 100
+    return {
+        'delta': delta,
+        'gamma': n_d1 / (S * iv * math.sqrt(T)),
+        'theta': theta,
+        'vega': S * n_d1 * math.sqrt(T) / 100,
+        'rho': rho,
+    }
+
+
+def test_solver_recovers_volatility_for_whole_chain():
+    strikes, days, sigma, is_call, prices = make_chain()
+    # Skip contracts with no meaningful time value, where IV is not identifiable
+    _, vega = black_scholes_price_vega(SPOT, strikes, days / 365.0, RATE, sigma, is_call)
+    identifiable = vega > 0.1  # Price tolerance 1e-4 => IV error < 1e-3
+
+    result = implied_volatility(prices, SPOT, strikes, days / 365.0, RATE, is_call)
+
+    assert result.converged[identifiable].all()
+    np.testing.assert_allclose(result.iv[identifiable], sigma[identifiable], atol=1e-3)
+    solved, _ = black_scholes_price_vega(SPOT, strikes, days / 365.0, RATE, result.iv, is_call)
+    assert np.all(np.abs(solved - prices)[result.converged] < 1e-4)
+
+
+def test_solver_flags_prices_outside_arbitrage_bounds():
+    result = implied_volatility(
+        prices=[1.0, 200.0, 5.0, 0.0],
+        spot=SPOT,
+        strikes=[150.0, 150.0, 180.0, 180.0],  # Deep ITM call below intrinsic; call above spot
+        ttm_years=[0.5, 0.5, 0.25, 0.25],
+        rate=RATE,
+        is_call=[True, True, True, True],
+    )
+    np.testing.assert_array_equal(result.converged, [False, False, True, False])
+
+
+def test_chain_greeks_match_per_contract_formulas():
+    strikes, days, sigma, is_call, prices = make_chain(n=300, seed=4)
+    contracts = [
+        {
+            'contract_symbol': f'O:{i}',
+            'strike': float(k),
+            'option_type': 'call' if c else 'put',
+            'days_to_expiration': int(d),
+            'last_price': float(p),
+            'ask': 0.0,
+            'implied_volatility': 0.0,
+        }
+        for i, (k, d, c, p) in enumerate(zip(strikes, days, is_call, prices))
+    ]
+    service = OptionsAnalysisService()
+    service.set_risk_free_rate(RATE)
+    service._calculate_chain_greeks(contracts, SPOT)
+
+    checked = 0
+    for contract in contracts:
+        assert 'iv_converged' in contract
+        if not contract['iv_converged'] or contract['vega'] < 0.01:
+            continue
+        expected = reference_greeks(
+            SPOT, contract['strike'], contract['days_to_expiration'], RATE,
+            contract['implied_volatility'], contract['option_type'],
+        )
+        for name, value in expected.items():
+            assert contract[name] == pytest.approx(value, abs=2e-3), name
+        checked += 1
+    assert checked > 200
+
+
+def test_single_contract_wrapper_and_defaults():
+    service = OptionsAnalysisService()
+    service.set_risk_free_rate(RATE)
+
+    quoted = {'strike': 185.0, 'option_type': 'call', 'days_to_expiration': 30, 'implied_volatility': 0.25}
+    service._calculate_greeks(quoted, SPOT)
+    expected = reference_greeks(SPOT, 185.0, 30, RATE, 0.25, 'call')
+    assert quoted['delta'] == round(expected['delta'], 4)
+    assert quoted['implied_volatility'] == 0.25
+    assert 'iv_converged' not in quoted  # Quoted IV was used as-is
+
+    no_price = {'strike': 250.0, 'option_type': 'put', 'days_to_expiration': 0, 'last_price': 0}
+    service._calculate_greeks(no_price, SPOT)
+    assert no_price['implied_volatility'] == 0.35  # Deep OTM moneyness estimate
+    assert no_price['iv_converged'] is False
+
+    bad_strike = {'strike': 0, 'option_type': 'put', 'days_to_expiration': 30}
+    service._calculate_greeks(bad_strike, SPOT)
+    assert bad_strike['delta'] == -0.5
+    assert bad_strike['implied_volatility'] == 0.30
+
+    assert 0.05 <= service._estimate_implied_volatility(SPOT, 180.0, 0.25, RATE, 8.0, 'call') <= 3.0
+
+
+def test_large_chain_is_fast():
+    strikes, days, _, is_call, prices = make_chain(n=2000, seed=8)
+    contracts = [
+        {'strike': float(k), 'option_type': 'call' if c else 'put', 'days_to_expiration': int(d),
+         'last_price': float(p)}
+        for k, d, c, p in zip(strikes, days, is_call, prices)
+    ]
+    service = OptionsAnalysisService()
+
+    started = time.perf_counter()
+    service._calculate_chain_greeks(contracts, SPOT)
+    assert time.perf_counter() - started < 1.0
@@ -0,0 +1,212 @@
+"""
+Tests for concurrent option-quote fetching, run against a local stub Polygon server.
+"""
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from aiohttp import web
+
+from core.async_http import ClientSessionPool, TokenBucket
+from core.options_quote_fetcher import PolygonOptionsFetcher
+from core.options_service import OptionsAnalysisService
+from core.polygon_options_flow_service import PolygonOptionsFlowService
+
+LATENCY = 0.1
+
+
+class StubPolygon:
+    """Minimal Polygon look-alike: prev-day aggregates and a paginated chain snapshot"""
+
+    def __init__(self, snapshot_status=200, prev_status=200):
+        self.snapshot_status = snapshot_status
+        self.prev_status = prev_status
+        self.requests = []
+        self.client_ports = set()
+        self.snapshot_pages = {
+            None: ['O:AAPL1', 'O:AAPL2'],
+            'page2': ['O:AAPL3'],
+        }
+        self.url = None
+        self._ready = threading.Event()
+
+    async def prev(self, request):
+        ticker = request.match_info['ticker']
+        self.requests.append(('prev', ticker))
+        self.client_ports.add(request.transport.get_extra_info('peername')[1])
+        await asyncio.sleep(LATENCY)
+        if self.prev_status != 200:
+            return web.json_response({}, status=self.prev_status)
+        price = float(ticker.rsplit('_', 1)[-1]) if '_' in ticker else 2.0
+        return web.json_response({'results': [{'c': price, 'v': 100, 'o': 1.0, 'h': 3.0, 'l': 0.5, 'n': 12}]})
+
+    async def snapshot(self, request):
+        cursor = request.query.get('cursor')
+        self.requests.append(('snapshot', cursor))
+        if self.snapshot_status != 200:
+            return web.json_response({'status': 'NOT_AUTHORIZED'}, status=self.snapshot_status)
+        body = {
+            'results': [
+                {
+                    'details': {'ticker': t},
+                    'day': {'close': 4.0, 'volume': 900},
+                    'last_quote': {'bid': 3.9, 'ask': 4.1},
+                    'open_interest': 1500,
+                    'implied_volatility': 0.42,
+                    'greeks': {'delta': 0.55},
+                }
+                for t in self.snapshot_pages[cursor]
+            ]
+        }
+        if cursor is None:
+            body['next_url'] = f"{self.url}/v3/snapshot/options/{request.match_info['underlying']}?cursor=page2"
+        return web.json_response(body)
+
+    def start(self):
+        def serve():
+            loop = asyncio.new_event_loop()
+            app = web.Application()
+            app.router.add_get('/v2/aggs/ticker/{ticker}/prev', self.prev)
+            app.router.add_get('/v3/snapshot/options/{underlying}', self.snapshot)
+            runner = web.AppRunner(app)
+            loop.run_until_complete(runner.setup())
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            loop.run_until_complete(site.start())
+            self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+            self._loop, self._runner = loop, runner
+            self._ready.set()
+            loop.run_forever()
+
+        threading.Thread(target=serve, daemon=True).start()
+        self._ready.wait(5)
+        return self
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+@pytest.fixture
+def stub():
+    server = StubPolygon().start()
+    yield server
+    server.stop()
+
+
+def make_fetcher(stub, plan='free', **kwargs):
+    kwargs.setdefault('rate_limiter', TokenBucket(rate=1000.0, burst=1000))
+    return PolygonOptionsFetcher(
+        'test-key', base_url=stub.url, plan=plan, session_pool=ClientSessionPool(), **kwargs
+    )
+
+
+def test_chain_quotes_fetched_concurrently_over_pooled_connections(stub):
+    fetcher = make_fetcher(stub, max_concurrency=10)
+    tickers = [f'O:SPY_{i}' for i in range(1, 51)]
+
+    started = time.perf_counter()
+    quotes = fetcher.fetch_quotes_sync('SPY', tickers)
+    elapsed = time.perf_counter() - started
+
+    assert len(quotes) == 50
+    bid, ask, volume, last = quotes['O:SPY_7']
+    assert (last, volume) == (7.0, 100)
+    assert bid == pytest.approx(7.0 * 0.99) and ask == pytest.approx(7.0 * 1.01)
+    # 50 requests at 100ms each would take 5s serially; 10 at a time take ~0.5s
+    assert elapsed < 2.0
+    assert len(stub.client_ports) <= 10
+    assert not any(kind == 'snapshot' for kind, _ in stub.requests)  # Free plan has no snapshot access
+
+
+def test_bulk_snapshot_used_where_plan_allows_it(stub):
+    fetcher = make_fetcher(stub, plan='starter')
+    quotes = fetcher.fetch_quotes_sync('AAPL', ['O:AAPL1', 'O:AAPL3', 'O:AAPL_9'])
+
+    assert quotes['O:AAPL1'] == (3.9, 4.1, 900, 4.0)
+    assert quotes['O:AAPL3'] == (3.9, 4.1, 900, 4.0)  # From the second page
+    assert quotes['O:AAPL_9'][3] == 9.0  # Not in the snapshot: per-contract fallback
+    assert stub.requests.count(('prev', 'O:AAPL_9')) == 1
+    assert [r for r in stub.requests if r[0] == 'snapshot'] == [('snapshot', None), ('snapshot', 'page2')]
+
+
+def test_unentitled_snapshot_falls_back_and_is_not_retried():
+    stub = StubPolygon(snapshot_status=403).start()
+    try:
+        fetcher = make_fetcher(stub, plan='starter')
+        assert len(fetcher.fetch_quotes_sync('AAPL', ['O:AAPL_1', 'O:AAPL_2'])) == 2
+        assert fetcher.snapshots_supported is False
+        fetcher.fetch_quotes_sync('AAPL', ['O:AAPL_1'])
+        assert sum(kind == 'snapshot' for kind, _ in stub.requests) == 1
+    finally:
+        stub.stop()
+
+
+def test_rate_limit_stops_fan_out():
+    stub = StubPolygon(prev_status=429).start()
+    try:
+        fetcher = make_fetcher(stub, max_concurrency=2)
+        assert fetcher.fetch_prev_aggs_sync([f'O:X_{i}' for i in range(20)]) == {}
+        assert len(stub.requests) <= 3
+    finally:
+        stub.stop()
+
+
+def test_token_bucket_paces_requests():
+    bucket = TokenBucket(rate=20.0, burst=2)
+
+    async def take(n):
+        return [await bucket.acquire() for _ in range(n)]
+
+    started = time.perf_counter()
+    assert asyncio.run(take(6)) == [True] * 6
+    # Two from the burst, four at 20/s
+    assert time.perf_counter() - started >= 0.18
+    assert bucket.try_acquire() is False
+    assert asyncio.run(bucket.acquire(max_wait=0.001)) is False
+
+    free_plan = TokenBucket(rate=5 / 60, burst=5)
+    assert [free_plan.try_acquire() for _ in range(6)] == [True] * 5 + [False]
+
+
+def test_options_service_builds_chain_from_batched_quotes(stub):
+    contracts = {
+        'results': [
+            {'ticker': f'O:SPY_{i}', 'expiration_date': '2099-01-15', 'contract_type': ctype,
+             'strike_price': 400 + i}
+            for i, ctype in zip(range(1, 31), ['call', 'put'] * 15)
+        ]
+    }
+    response = MagicMock(ok=True)
+    response.json.return_value = contracts
+    service = OptionsAnalysisService()
+    service.polygon_api_key = 'test-key'
+    service.use_real_data = True
+
+    fetcher = make_fetcher(stub)
+    with patch('requests.get', return_value=response), \
+            patch('core.options_service.get_polygon_options_fetcher', return_value=fetcher):
+        chain = service._get_real_options_chain('SPY', 410.0)
+
+    assert len(chain['calls']) + len(chain['puts']) == 30
+    call = next(c for c in chain['calls'] if c['contract_symbol'] == 'O:SPY_5')
+    assert call['last_price'] == 5.0 and call['volume'] == 100
+    assert len([r for r in stub.requests if r[0] == 'prev']) == 30
+
+
+def test_flow_service_prefers_chain_snapshot(stub):
+    service = PolygonOptionsFlowService()
+    service.polygon_api_key = 'test-key'
+    with patch('core.polygon_options_flow_service.get_polygon_options_fetcher',
+               return_value=make_fetcher(stub, plan='starter')):
+        snapshots = service._get_options_snapshots('AAPL', [{'ticker': 'O:AAPL1'}])
+    assert snapshots['O:AAPL2']['open_interest'] == 1500
+    assert snapshots['O:AAPL2']['implied_volatility'] == 0.42
+    assert not any(kind == 'prev' for kind, _ in stub.requests)
+
+    with patch('core.polygon_options_flow_service.get_polygon_options_fetcher',
+               return_value=make_fetcher(stub)):
+        snapshots = service._get_options_snapshots('AAPL', [{'ticker': f'O:AAPL_{i}'} for i in range(1, 40)])
+    assert len(snapshots) == 25  # Free-tier cap kept
+    assert snapshots['O:AAPL_3']['bid'] == pytest.approx(3.0 * 0.98)
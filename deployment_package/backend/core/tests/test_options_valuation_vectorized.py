@@ -0,0 +1,159 @@
+"""
+Tests for the vectorized Black-Scholes Greeks / ITM probability engine.
+
+The array API is checked against a closed-form scalar reference, and the
+per-leg/per-spread wrappers against the array API.
+"""
+import math
+import time
+
+import numpy as np
+import pytest
+
+from core.options_valuation_engine import (
+    BlackScholesCalculator,
+    OptionLeg,
+    OptionType,
+    ProbabilityCalculator,
+    TradeValuation,
+)
+
+SPOT = 450.0
+RATE = 0.045
+
+
+def norm_cdf(x):
+    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+
+
+def reference_greeks(strike, ttm_days, vol, is_call, spot=SPOT, r=RATE):
+    t = ttm_days / 365.0
+    d1 = (math.log(spot / strike) + (r + 0.5 * vol ** 2) * t) / (vol * math.sqrt(t))
+    d2 = d1 - vol * math.sqrt(t)
+    disc = math.exp(-r * t)
+    pdf = math.exp(-0.5 * d1 ** 2) / math.sqrt(2 * math.pi)
+    gamma = disc * pdf / (spot * vol * math.sqrt(t))
+    theta1 = -(spot * disc * pdf * vol) / (2 * math.sqrt(t))
+    vega = spot * disc * pdf * math.sqrt(t) / 100.0
+    if is_call:
+        return {
+            "delta": disc * norm_cdf(d1),
+            "gamma": gamma,
+            "theta": (theta1 - r * strike * disc * norm_cdf(d2)) / 365.0,
+            "vega": vega,
+            "rho": strike * t * disc * norm_cdf(d2) / 100.0,
+        }
+    return {
+        "delta": -disc * (1 - norm_cdf(d1)),
+        "gamma": gamma,
+        "theta": (theta1 - r * strike * disc * (1 - norm_cdf(d2))) / 365.0,
+        "vega": vega,
+        "rho": -strike * t * disc * (1 - norm_cdf(d2)) / 100.0,
+    }
+
+
+def make_chain(n_strikes=300, expiries=(7, 14, 30, 60, 90), seed=3):
+    rng = np.random.default_rng(seed)
+    strikes = np.tile(np.linspace(SPOT * 0.7, SPOT * 1.3, n_strikes), len(expiries))
+    ttm = np.repeat(expiries, n_strikes)
+    vols = rng.uniform(0.1, 0.6, strikes.size)
+    is_call = rng.random(strikes.size) < 0.5
+    return strikes, ttm, vols, is_call
+
+
+def test_greeks_array_matches_closed_form():
+    calc = BlackScholesCalculator(SPOT)
+    strikes, ttm, vols, is_call = make_chain(n_strikes=40)
+    greeks = calc.greeks_array(strikes, ttm, vols, is_call)
+
+    for i in range(0, strikes.size, 7):
+        expected = reference_greeks(strikes[i], ttm[i], vols[i], bool(is_call[i]))
+        for name, value in expected.items():
+            assert greeks[name][i] == pytest.approx(value, rel=1e-9, abs=1e-12), name
+
+
+def test_probability_array_matches_closed_form():
+    strikes, ttm, vols, is_call = make_chain(n_strikes=40)
+    probs = ProbabilityCalculator.probability_itm_array(SPOT, strikes, ttm, vols, is_call)
+
+    for i in range(0, strikes.size, 7):
+        t = ttm[i] / 365.0
+        d2 = (math.log(SPOT / strikes[i]) + (RATE - 0.5 * vols[i] ** 2) * t) / (vols[i] * math.sqrt(t))
+        expected = norm_cdf(d2) if is_call[i] else 1.0 - norm_cdf(d2)
+        assert probs[i] == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+
+def test_scalar_api_wraps_array_api():
+    calc = BlackScholesCalculator(SPOT)
+    call = calc.calculate_call_greeks(460.0, 30, 0.22)
+    put = calc.calculate_put_greeks(460.0, 30, 0.22)
+    for name, value in reference_greeks(460.0, 30, 0.22, True).items():
+        assert getattr(call, name) == pytest.approx(value, rel=1e-12)
+    for name, value in reference_greeks(460.0, 30, 0.22, False).items():
+        assert getattr(put, name) == pytest.approx(value, rel=1e-12)
+    assert isinstance(call.delta, float)
+
+    p_call = ProbabilityCalculator.probability_call_itm(SPOT, 460.0, 30, 0.22)
+    p_put = ProbabilityCalculator.probability_put_itm(SPOT, 460.0, 30, 0.22)
+    assert p_call + p_put == pytest.approx(1.0)
+
+
+def test_expired_and_zero_vol_legs():
+    calc = BlackScholesCalculator(SPOT)
+    greeks = calc.greeks_array([400.0, 500.0, 400.0, 500.0], 0, 0.3, [True, True, False, False])
+    np.testing.assert_array_equal(greeks["delta"], [1.0, 0.0, 0.0, -1.0])
+    for name in ("gamma", "theta", "vega", "rho"):
+        np.testing.assert_array_equal(greeks[name], 0.0)
+
+    flat = calc.greeks_array([400.0, 500.0], 30, 0.0, True)
+    assert np.all(np.isfinite(flat["delta"]))
+    np.testing.assert_array_equal(flat["gamma"], 0.0)
+
+    probs = ProbabilityCalculator.probability_itm_array(SPOT, [400.0, 500.0], 30, 0.0, [True, True])
+    np.testing.assert_array_equal(probs, [1.0, 0.0])
+    assert ProbabilityCalculator.probability_call_itm(SPOT, 400.0, -1, 0.3) == 1.0
+
+
+def make_leg(strike, option_type, is_long, bid=1.0, ask=1.2):
+    return OptionLeg(
+        symbol="SPY", option_type=option_type, strike=strike, expiration="",
+        price=(bid + ask) / 2, bid=bid, ask=ask, is_long=is_long,
+    )
+
+
+def test_value_spreads_matches_per_spread_valuation():
+    valuation = TradeValuation(SPOT)
+    condor = [
+        make_leg(430.0, OptionType.PUT, False), make_leg(425.0, OptionType.PUT, True),
+        make_leg(470.0, OptionType.CALL, False), make_leg(475.0, OptionType.CALL, True),
+    ]
+    bull_call = [make_leg(450.0, OptionType.CALL, True, 6.0, 6.2), make_leg(460.0, OptionType.CALL, False, 2.0, 2.1)]
+    spreads = [condor, bull_call, [make_leg(440.0, OptionType.PUT, False)]]
+
+    batch = valuation.value_spreads(spreads, ttm_days=30, volatility=0.2)
+    for legs, got in zip(spreads, batch):
+        expected = valuation.value_spread(legs, 30, 0.2)
+        assert got == expected
+
+    short_put = valuation.value_single_leg(make_leg(440.0, OptionType.PUT, False), 30, 0.2)
+    reference = reference_greeks(440.0, 30, 0.2, False)
+    assert short_put["greeks"]["delta"] == pytest.approx(-reference["delta"])
+
+
+def test_value_spreads_per_spread_ttm_and_iv():
+    valuation = TradeValuation(SPOT)
+    spreads = [[make_leg(460.0, OptionType.CALL, True)], [make_leg(460.0, OptionType.CALL, True)]]
+    near, far = valuation.value_spreads(spreads, ttm_days=[7, 90], volatility=[0.3, 0.2])
+    assert near == valuation.value_spread(spreads[0], 7, 0.3)
+    assert far == valuation.value_spread(spreads[1], 90, 0.2)
+
+
+def test_full_chain_is_fast():
+    calc = BlackScholesCalculator(SPOT)
+    strikes, ttm, vols, is_call = make_chain(n_strikes=400)
+    calc.greeks_array(strikes, ttm, vols, is_call)  # Warm up
+
+    started = time.perf_counter()
+    calc.greeks_array(strikes, ttm, vols, is_call)
+    ProbabilityCalculator.probability_itm_array(SPOT, strikes, ttm, vols, is_call)
+    assert time.perf_counter() - started < 0.25
@@ -0,0 +1,205 @@
+"""
+Tests for the atomic sliding-window rate limiter: window math, exact counts
+under parallel load on fakeredis, the local flood guard and the per-route metrics registry.
+"""
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import fakeredis
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.performance_monitoring import get_performance_monitor
+from core.rate_limiting import (
+    LocalFloodGuard,
+    RateLimitMetrics,
+    RateLimitMiddleware,
+    SlidingWindowLimiter,
+    get_rate_limit_metrics,
+)
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class FakeClock:
+    def __init__(self, now=6000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestSlidingWindowLimiter(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.clock = FakeClock()
+        self.server = fakeredis.FakeServer()
+
+    def limiters(self):
+        yield 'redis', SlidingWindowLimiter(redis_client=fakeredis.FakeRedis(server=self.server), clock=self.clock)
+        yield 'cache', SlidingWindowLimiter(clock=self.clock)
+
+    def test_previous_window_is_weighted_by_its_overlap(self):
+        for name, limiter in self.limiters():
+            with self.subTest(name):
+                self.clock.now = 6000.0
+                allowed = [limiter.hit(f'{name}:ip', 10, 60).allowed for _ in range(12)]
+                self.assertEqual(allowed, [True] * 10 + [False] * 2)
+
+                # Half way through the next window 12 * 0.5 = 6 still count
+                self.clock.now = 6090.0
+                decisions = [limiter.hit(f'{name}:ip', 10, 60) for _ in range(5)]
+                self.assertEqual([d.allowed for d in decisions], [True] * 4 + [False])
+                self.assertEqual(decisions[-1].retry_after, 30)
+
+                # Two windows later the old counts are gone
+                self.clock.now = 6240.0
+                self.assertTrue(limiter.hit(f'{name}:ip', 10, 60).allowed)
+
+    def test_redis_counters_expire_after_two_windows(self):
+        redis_client = fakeredis.FakeRedis(server=self.server)
+        SlidingWindowLimiter(redis_client=redis_client, clock=self.clock).hit('ip', 5, 60)
+
+        (key,) = redis_client.keys('*rate_limit:ip:*')
+        self.assertEqual(redis_client.get(key), b'1')
+        self.assertTrue(100 < redis_client.ttl(key) <= 120)
+
+    def test_parallel_requests_are_counted_exactly(self):
+        # Four "workers", each with its own connection to the same Redis
+        limiters = [
+            SlidingWindowLimiter(redis_client=fakeredis.FakeRedis(server=self.server), clock=self.clock)
+            for _ in range(4)
+        ]
+
+        def hit(n):
+            return limiters[n % 4].hit('10.0.0.1:/graphql/', 100, 60).allowed
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(hit, range(400)))
+
+        self.assertEqual(results.count(True), 100)
+        (key,) = fakeredis.FakeRedis(server=self.server).keys('*rate_limit:10.0.0.1*')
+        self.assertEqual(int(fakeredis.FakeRedis(server=self.server).get(key)), 400)
+
+
+def test_local_guard_rejects_once_this_process_alone_is_over_the_limit():
+    clock = FakeClock(6010.0)
+    guard = LocalFloodGuard(clock=clock, max_keys=2)
+
+    assert [guard.hit('a', 3, 60) for _ in range(4)] == [None, None, None, 50]
+    clock.now = 6060.0
+    assert guard.hit('a', 3, 60) is None  # New window
+
+    # Bounded memory: a third key resets the table
+    guard.hit('b', 3, 60)
+    guard.hit('c', 3, 60)
+    assert set(guard._counts) == {'c'}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestRateLimitMiddleware(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        get_rate_limit_metrics().reset()
+        self.server = fakeredis.FakeServer()
+        self.factory = RequestFactory()
+
+    def middleware(self, metrics=None):
+        # A fixed clock keeps every request inside one window
+        clock = FakeClock(6010.0)
+        return RateLimitMiddleware(
+            lambda request: HttpResponse('ok'),
+            limiter=SlidingWindowLimiter(redis_client=fakeredis.FakeRedis(server=self.server), clock=clock),
+            guard=LocalFloodGuard(clock=clock),
+            metrics=metrics,
+        )
+
+    def test_exact_limit_across_workers_under_parallel_load(self):
+        workers = [self.middleware(RateLimitMetrics()) for _ in range(4)]
+        barrier = threading.Barrier(16)
+
+        def call(n):
+            if n < 16:
+                barrier.wait()
+            return workers[n % 4](self.factory.get('/api/portfolio/summary', REMOTE_ADDR='10.0.0.9')).status_code
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            statuses = list(pool.map(call, range(200)))
+
+        self.assertEqual(statuses.count(200), 30)
+        self.assertEqual(statuses.count(429), 170)
+        metrics = [worker.metrics.snapshot()['/api/portfolio/'] for worker in workers]
+        self.assertEqual(sum(m.get('allowed', 0) for m in metrics), 30)
+        self.assertEqual(sum(m.get('limited', 0) + m.get('shed', 0) for m in metrics), 170)
+        # Each worker stops asking Redis once it alone has seen more than the limit
+        self.assertTrue(all(m.get('shed', 0) > 0 for m in metrics))
+
+    def test_limited_response_and_per_route_metrics(self):
+        middleware = self.middleware()
+        for _ in range(3):
+            self.assertEqual(middleware(self.factory.get('/graphql/', REMOTE_ADDR='1.1.1.1')).status_code, 200)
+        for _ in range(10):
+            middleware(self.factory.post(
+                '/api/auth/signup', json.dumps({'email': 'A@x.com '}), content_type='application/json',
+                REMOTE_ADDR='1.1.1.1'
+            ))
+
+        response = middleware(self.factory.post(
+            '/api/auth/signup', 'email=a%40x.com', content_type='application/x-www-form-urlencoded',
+            REMOTE_ADDR='1.1.1.1'
+        ))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '50')
+        self.assertEqual(json.loads(response.content)['retry_after'], int(response['Retry-After']))
+
+        # Another user from the same IP has their own auth budget
+        other = middleware(self.factory.post(
+            '/api/auth/signup', json.dumps({'email': 'b@x.com'}), content_type='application/json', REMOTE_ADDR='1.1.1.1'
+        ))
+        self.assertEqual(other.status_code, 200)
+
+        # Counted in the process-wide registry and reported with the performance summary
+        metrics = get_rate_limit_metrics().snapshot()
+        self.assertEqual(get_performance_monitor().get_summary()['rate_limits'], metrics)
+        self.assertEqual(metrics['/graphql/'], {'allowed': 3})
+        self.assertEqual(metrics['/api/auth/signup']['allowed'], 4)
+        self.assertEqual(metrics['/api/auth/signup'].get('limited', 0) + metrics['/api/auth/signup'].get('shed', 0), 8)
+
+    def test_large_auth_bodies_are_not_parsed(self):
+        middleware = self.middleware()
+        request = self.factory.post(
+            '/api/auth/login', json.dumps({'email': 'x@y.com', 'pad': 'x' * 5000}), content_type='application/json'
+        )
+        self.assertIsNone(middleware.get_auth_username(request))
+        request = self.factory.post('/api/auth/login', json.dumps({'username': 'Bob'}), content_type='application/json')
+        self.assertEqual(middleware.get_auth_username(request), 'Bob')
+
+    def test_limiter_outage_fails_open(self):
+        class BrokenLimiter:
+            def hit(self, *args):
+                raise ConnectionError('redis down')
+
+        middleware = RateLimitMiddleware(lambda request: HttpResponse('ok'), limiter=BrokenLimiter())
+        response = middleware(self.factory.get('/api/market/quotes'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_rate_limit_metrics().snapshot(), {'/api/market/quotes': {'errors': 1}})
+
+    def test_metrics_are_logged_periodically(self):
+        clock = FakeClock(0.0)
+        metrics = RateLimitMetrics(clock=clock, log_interval=60)
+
+        with self.assertLogs('core.rate_limiting', level='INFO') as logs:
+            metrics.record('/graphql/', 'allowed')
+            clock.now = 61.0
+            metrics.record('/graphql/', 'limited')
+            metrics.record('/graphql/', 'limited')  # next line not due for another minute
+
+        self.assertEqual(logs.output, [
+            'INFO:core.rate_limiting:Rate limit metrics: {"/graphql/": {"allowed": 1, "limited": 1}}'
+        ])
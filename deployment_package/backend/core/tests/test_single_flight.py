@@ -0,0 +1,211 @@
+"""
+Tests for single-flight request coalescing and stale-while-revalidate caching.
+"""
+import asyncio
+import threading
+import time
+
+import fakeredis
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from core.aggressive_caching_service import AggressiveCachingService
+from core.single_flight import DistributedLock, SingleFlight, get_or_compute, wrap_stale
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def cache_io():
+    return {'get': cache.get, 'set': lambda key, value, ttl: cache.set(key, value, ttl)}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestSingleFlight(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_threads_share_one_computation(self):
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(2)
+            return {'kelly': 0.25}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                get_or_compute('kelly:AAPL', compute, ttl=60, flight=flight, **cache_io())
+            ))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        self.assertTrue(wait_for(lambda: flight.stats['coalesced'] + flight.stats['computations'] == 8))
+        release.set()
+        for thread in threads:
+            thread.join(2)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'kelly': 0.25}] * 8)
+        self.assertEqual(cache.get('kelly:AAPL'), {'kelly': 0.25})
+
+    def test_leader_error_reaches_waiters_and_is_not_cached(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def failing():
+            started.set()
+            release.wait(2)
+            raise ValueError('boom')
+
+        errors = []
+
+        def call():
+            try:
+                flight.do('k', failing)
+            except ValueError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait(2)
+        follower = threading.Thread(target=call)
+        follower.start()
+        self.assertTrue(wait_for(lambda: flight.stats['coalesced'] == 1))
+        release.set()
+        leader.join(2)
+        follower.join(2)
+
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(flight.do('k', lambda: 'ok'), 'ok')
+
+    def test_async_callers_share_one_computation(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return [1, 2, 3]
+
+        async def main():
+            return await asyncio.gather(*[flight.ado('features_AAPL', compute) for _ in range(10)])
+
+        self.assertEqual(asyncio.run(main()), [[1, 2, 3]] * 10)
+        self.assertEqual(len(calls), 1)
+
+    def test_stale_value_served_while_refreshing(self):
+        flight = SingleFlight()
+        entry = wrap_stale('old', ttl=60)
+        entry['fresh_until'] = time.time() - 1
+        cache.set('dash', entry, 300)
+
+        refreshed = threading.Event()
+
+        def compute():
+            refreshed.set()
+            return 'new'
+
+        value = get_or_compute('dash', compute, ttl=60, stale_ttl=60, flight=flight, **cache_io())
+        self.assertEqual(value, 'old')
+        self.assertTrue(refreshed.wait(2))
+        self.assertTrue(wait_for(lambda: cache.get('dash')['value'] == 'new'))
+        self.assertEqual(
+            get_or_compute('dash', lambda: 'unused', ttl=60, stale_ttl=60, flight=flight, **cache_io()),
+            'new'
+        )
+        self.assertEqual(flight.stats['stale_served'], 1)
+
+    def test_distributed_lock_coalesces_across_workers(self):
+        redis_client = fakeredis.FakeRedis()
+        lock = DistributedLock(redis_client)
+        worker_a, worker_b = SingleFlight(), SingleFlight()
+        release = threading.Event()
+        b_calls = []
+
+        def compute_a():
+            release.wait(2)
+            return 'from-a'
+
+        results = {}
+        thread_a = threading.Thread(target=lambda: results.setdefault('a', get_or_compute(
+            'fss:universe', compute_a, ttl=60, lock=lock, lock_timeout=5, flight=worker_a, **cache_io()
+        )))
+        thread_a.start()
+        self.assertTrue(wait_for(lambda: lock.is_locked('fss:universe')))
+
+        thread_b = threading.Thread(target=lambda: results.setdefault('b', get_or_compute(
+            'fss:universe', lambda: b_calls.append(1) or 'from-b', ttl=60, lock=lock, lock_timeout=5,
+            flight=worker_b, **cache_io()
+        )))
+        thread_b.start()
+        time.sleep(0.1)
+        release.set()
+        thread_a.join(3)
+        thread_b.join(3)
+
+        self.assertEqual(results, {'a': 'from-a', 'b': 'from-a'})
+        self.assertEqual(b_calls, [])
+        self.assertFalse(lock.is_locked('fss:universe'))
+
+    def test_lock_release_only_by_owner(self):
+        lock = DistributedLock(fakeredis.FakeRedis())
+        token = lock.acquire('k', timeout=5)
+        self.assertIsNotNone(token)
+        self.assertIsNone(lock.acquire('k', timeout=5))
+        lock.release('k', 'someone-else')
+        self.assertTrue(lock.is_locked('k'))
+        lock.release('k', token)
+        self.assertFalse(lock.is_locked('k'))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestCachedFunctionCoalescing(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.service = AggressiveCachingService(enable_pubsub=False)
+
+    def test_async_function_is_coalesced(self):
+        calls = []
+
+        @self.service.cached_function('options_chain', ttl=30)
+        async def fetch_chain(symbol):
+            calls.append(symbol)
+            await asyncio.sleep(0.05)
+            return {'symbol': symbol}
+
+        async def main():
+            return await asyncio.gather(*[fetch_chain('AAPL') for _ in range(5)])
+
+        self.assertEqual(asyncio.run(main()), [{'symbol': 'AAPL'}] * 5)
+        self.assertEqual(calls, ['AAPL'])
+        self.assertEqual(asyncio.run(fetch_chain('AAPL')), {'symbol': 'AAPL'})
+        self.assertEqual(calls, ['AAPL'])
+
+    def test_sync_function_cached_and_stats_reported(self):
+        calls = []
+
+        @self.service.cached_function('fss', ttl=30)
+        def score(ticker):
+            calls.append(ticker)
+            return 0.7
+
+        self.assertEqual(score('MSFT'), 0.7)
+        self.assertEqual(score('MSFT'), 0.7)
+        self.assertEqual(calls, ['MSFT'])
+        self.assertEqual(self.service.get_stats()['single_flight']['computations'], 1)
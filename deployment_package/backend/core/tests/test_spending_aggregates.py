@@ -0,0 +1,200 @@
+"""
+Tests for the streaming weekly spending aggregate builder: parity with a
+one-pass aggregation, incremental refresh of dirty weeks only, atomic and
+serialized refreshes, and loading.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pandas as pd
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from core import single_flight
+from core import spending_trend_predictor as stp
+from core.banking_models import BankAccount, BankProviderAccount, BankTransaction
+from core.cache_tags import get_default_redis_client
+from core.spending_aggregate_models import SpendingWeeklyAggregate
+from core.spending_trend_predictor import (
+    TRAINING_TRANSACTION_FIELDS,
+    WEEKLY_SPENDING_LOCK,
+    WeeklySpendingAccumulator,
+    load_weekly_spending,
+    refresh_weekly_spending,
+)
+
+User = get_user_model()
+
+MERCHANTS = ['AMAZON MKTPLACE', 'UBER EATS', 'STARBUCKS #123', 'SHELL GAS', 'TARGET T-1234', 'LOCAL CAFE', 'NETFLIX.COM']
+CATEGORIES = ['', 'FOOD', 'TRAVEL', 'SHOPPING', 'GAS', 'OTHER']
+START = date(2025, 1, 1)
+
+
+class WeeklySpendingAggregateTestCase(TestCase):
+    """Tests for refresh_weekly_spending / load_weekly_spending"""
+
+    def setUp(self):
+        self.rng = random.Random(11)
+        self.accounts = []
+        for n in range(4):
+            user = User.objects.create_user(email=f'spender{n}@example.com', password='testpass123', name=f'Spender {n}')
+            provider_account = BankProviderAccount.objects.create(
+                user=user, provider_account_id=f'p{n}', provider_name='Test Bank'
+            )
+            self.accounts.append(BankAccount.objects.create(
+                user=user,
+                provider_account=provider_account,
+                yodlee_account_id=f'acc{n}',
+                provider='Test Bank',
+                name='Checking Account',
+                account_type='CHECKING',
+            ))
+        self.next_id = 0
+
+    def add_transactions(self, n, first_day=0, days=90, **overrides):
+        txns = []
+        for _ in range(n):
+            account = self.rng.choice(self.accounts)
+            day = START + timedelta(days=first_day + self.rng.randrange(days))
+            self.next_id += 1
+            fields = dict(
+                user=account.user,
+                bank_account=account,
+                yodlee_transaction_id=str(self.next_id),
+                amount=Decimal(self.rng.randrange(100, 30000)) / 100 + Decimal(self.next_id) / 10000,
+                description=self.rng.choice(MERCHANTS),
+                merchant_name=self.rng.choice(MERCHANTS),
+                category=self.rng.choice(CATEGORIES),
+                transaction_type='DEBIT',
+                posted_date=day,
+                transaction_date=day,
+                status='POSTED',
+            )
+            fields.update(overrides)
+            txns.append(BankTransaction(**fields))
+        BankTransaction.objects.bulk_create(txns)
+
+    def expected(self):
+        """All spending transactions aggregated in one pass"""
+        accumulator = WeeklySpendingAccumulator()
+        accumulator.add(list(BankTransaction.objects.filter(
+            transaction_type='DEBIT', status='POSTED'
+        ).order_by('transaction_date').values_list(*TRAINING_TRANSACTION_FIELDS)))
+        weeks, tickers, totals, user_counts, _ = zip(*accumulator.pop_all())
+        return pd.DataFrame({
+            'date': pd.to_datetime(weeks),
+            'ticker': tickers,
+            'total_spending': [float(total) for total in totals],
+            'user_count': user_counts,
+        })
+
+    def loaded(self):
+        return load_weekly_spending(START - timedelta(days=30), START + timedelta(days=400))
+
+    def test_streamed_build_matches_one_pass_aggregation(self):
+        self.add_transactions(600)
+        self.add_transactions(20, transaction_type='CREDIT')
+        self.add_transactions(20, status='PENDING')
+
+        stats = refresh_weekly_spending(chunk_size=37)
+
+        self.assertTrue(stats.full_rebuild)
+        self.assertEqual(stats.transactions, 600)
+        self.assertEqual(stats.rows_written, SpendingWeeklyAggregate.objects.count())
+        pd.testing.assert_frame_equal(self.loaded(), self.expected(), check_dtype=False)
+
+    def test_refresh_recomputes_only_weeks_with_changed_transactions(self):
+        self.add_transactions(400)
+        refresh_weekly_spending(chunk_size=50)
+        untouched = SpendingWeeklyAggregate.objects.get(week_start=date(2025, 1, 13), ticker='AMZN')
+
+        # A new week, a late transaction in an old week, and a cancellation in another
+        self.add_transactions(30, first_day=120, days=5)
+        self.add_transactions(1, first_day=40, days=1)
+        cancelled = BankTransaction.objects.filter(transaction_date__gte=date(2025, 3, 3)).order_by('id').first()
+        cancelled.status = 'CANCELLED'
+        cancelled.save()
+
+        stats = refresh_weekly_spending(chunk_size=50)
+
+        self.assertFalse(stats.full_rebuild)
+        self.assertLessEqual(stats.weeks_refreshed, 4)
+        self.assertLess(stats.transactions, 100)
+        self.assertEqual(SpendingWeeklyAggregate.objects.get(pk=untouched.pk).built_at, untouched.built_at)
+        pd.testing.assert_frame_equal(self.loaded(), self.expected(), check_dtype=False)
+
+        # Nothing changed since: two cheap queries, no rebuild
+        with self.assertNumQueries(2):
+            stats = refresh_weekly_spending()
+        self.assertEqual((stats.weeks_refreshed, stats.transactions), (0, 0))
+
+        # A full rebuild gives the same table
+        refresh_weekly_spending(full=True)
+        pd.testing.assert_frame_equal(self.loaded(), self.expected(), check_dtype=False)
+
+    def test_failed_rebuild_keeps_the_previous_table_and_watermark(self):
+        self.add_transactions(300)
+        refresh_weekly_spending(chunk_size=40)
+        before = list(SpendingWeeklyAggregate.objects.order_by('pk').values_list())
+        self.add_transactions(30, first_day=120, days=5)
+
+        # Fail after the first weeks have been written
+        write = stp._write_weekly_spending
+        calls = []
+
+        def failing_write(*args):
+            calls.append(1)
+            if len(calls) > 2:
+                raise RuntimeError('connection lost')
+            return write(*args)
+
+        with patch.object(stp, '_write_weekly_spending', side_effect=failing_write):
+            with self.assertRaises(RuntimeError):
+                refresh_weekly_spending(full=True, chunk_size=40)
+
+        self.assertEqual(list(SpendingWeeklyAggregate.objects.order_by('pk').values_list()), before)
+        # The watermark still predates the new transactions, so they are picked up
+        stats = refresh_weekly_spending(chunk_size=40)
+        self.assertFalse(stats.full_rebuild)
+        pd.testing.assert_frame_equal(self.loaded(), self.expected(), check_dtype=False)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_refresh_is_skipped_while_another_one_holds_the_lock(self):
+        self.add_transactions(100)
+        lock = single_flight.DistributedLock(get_default_redis_client())
+        token = lock.acquire(WEEKLY_SPENDING_LOCK)
+        try:
+            stats = refresh_weekly_spending()
+        finally:
+            lock.release(WEEKLY_SPENDING_LOCK, token)
+
+        self.assertTrue(stats.skipped)
+        self.assertFalse(SpendingWeeklyAggregate.objects.exists())
+        self.assertFalse(refresh_weekly_spending().skipped)
+        pd.testing.assert_frame_equal(self.loaded(), self.expected(), check_dtype=False)
+
+    def test_load_returns_weeks_overlapping_the_window(self):
+        self.add_transactions(200)
+        refresh_weekly_spending()
+
+        window = load_weekly_spending(date(2025, 1, 15), date(2025, 1, 31))
+
+        self.assertEqual(sorted(window['date'].dt.date.unique()), [date(2025, 1, 13), date(2025, 1, 20), date(2025, 1, 27)])
+        self.assertEqual(list(window.columns), ['date', 'ticker', 'total_spending', 'user_count'])
+        self.assertTrue(load_weekly_spending(date(2030, 1, 1), date(2030, 2, 1)).empty)
+
+
+def test_accumulator_releases_weeks_once_they_close():
+    acc = WeeklySpendingAccumulator()
+    acc.add([
+        (date(2025, 1, 6), 'AMAZON', '', '', Decimal('-10'), 1),
+        (date(2025, 1, 8), 'AMAZON', '', '', Decimal('5'), 2),
+        (date(2025, 1, 8), 'LOCAL SHOP', '', '', Decimal('-7'), 2),
+        (date(2025, 1, 13), 'AMAZON', '', '', Decimal('-1'), 1),
+    ])
+
+    assert acc.pop_closed_weeks() == [(date(2025, 1, 6), 'AMZN', Decimal('15'), 2, 2)]
+    assert acc.pop_closed_weeks() == []
+    assert acc.pop_all() == [(date(2025, 1, 13), 'AMZN', Decimal('1'), 1, 1)]
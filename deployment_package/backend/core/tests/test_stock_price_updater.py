@@ -0,0 +1,142 @@
+"""
+Tests for the StockPriceUpdater tick cycle: streamed vs provider quotes,
+one bulk write for changed prices only, coalesced broadcasts, provider
+cache pruning and shutdown, and batched provider quotes.
+"""
+import asyncio
+import time
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.market_data_api_service import DataProvider, MarketDataAPIService
+from core.models import Stock, Watchlist
+from core.websocket_service import StockPriceUpdater
+from core.websocket_streaming import WebSocketStreamingService
+
+User = get_user_model()
+
+
+class StockPriceUpdaterCycleTestCase(TestCase):
+    """Tests for StockPriceUpdater.run_cycle"""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(email=f'watcher{n}@example.com', password='testpass123', name=f'Watcher {n}')
+            for n in range(2)
+        ]
+        self.stocks = {
+            symbol: Stock.objects.create(symbol=symbol, company_name=symbol, current_price=price)
+            for symbol, price in [('AAPL', Decimal('190.00')), ('MSFT', Decimal('410.00')),
+                                  ('NVDA', Decimal('120.00')), ('TSLA', None), ('IBM', Decimal('150.00'))]
+        }
+        for user, symbols in [(self.users[0], ['AAPL', 'MSFT', 'TSLA']), (self.users[1], ['AAPL', 'NVDA'])]:
+            for symbol in symbols:
+                Watchlist.objects.create(user=user, stock=self.stocks[symbol])
+
+        self.stream = WebSocketStreamingService()
+        self.stream.price_cache = {
+            'AAPL': {'price': 191.234, 'volume': 10, 'last_updated': time.time()},  # Fresh: used
+            'MSFT': {'price': 999.0, 'last_updated': time.time() - 3600},  # Stale: ignored
+        }
+        self.updater = StockPriceUpdater()
+        self.updater.websocket_service.channel_layer = MagicMock(group_send=AsyncMock())
+        self.updater.market_service.get_stock_quotes = AsyncMock(return_value={
+            'MSFT': {'price': 410.0, 'change': 0.0},  # Unchanged
+            'NVDA': {'price': 125.5, 'change': 5.5, 'change_percent': 4.58, 'volume': 1000},
+            'TSLA': {'price': 250.0},
+        })
+
+    def run_cycle(self):
+        with patch('core.websocket_service.get_websocket_service', return_value=self.stream):
+            return self.updater.run_cycle()
+
+    def test_cycle_writes_changed_prices_in_one_statement(self):
+        with CaptureQueriesContext(connection) as queries:
+            stats = self.run_cycle()
+
+        self.assertEqual(stats, {'watched': 4, 'quoted': 4, 'streamed': 1, 'changed': 3})
+        self.updater.market_service.get_stock_quotes.assert_awaited_once()
+        self.assertEqual(sorted(self.updater.market_service.get_stock_quotes.await_args.args[0]), ['MSFT', 'NVDA', 'TSLA'])
+
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        prices = dict(Stock.objects.values_list('symbol', 'current_price'))
+        self.assertEqual(prices, {
+            'AAPL': Decimal('191.23'), 'MSFT': Decimal('410.00'), 'NVDA': Decimal('125.50'),
+            'TSLA': Decimal('250.00'), 'IBM': Decimal('150.00'),
+        })
+
+    def test_cycle_broadcasts_one_message_per_group(self):
+        self.run_cycle()
+
+        sends = {call.args[0]: call.args[1] for call in self.updater.websocket_service.channel_layer.group_send.call_args_list}
+        self.assertEqual(len(sends), 3)
+        self.assertEqual({u['symbol'] for u in sends['stock_prices_all']['updates']}, {'AAPL', 'NVDA', 'TSLA'})
+        self.assertEqual([u['symbol'] for u in sends[f'stock_prices_{self.users[0].id}']['updates']], ['AAPL', 'TSLA'])
+        self.assertEqual([u['symbol'] for u in sends[f'stock_prices_{self.users[1].id}']['updates']], ['AAPL', 'NVDA'])
+        self.assertTrue(all(message['type'] == 'stock_price_batch' for message in sends.values()))
+
+        # Nothing changed on the next cycle: no writes, no broadcasts
+        self.updater.websocket_service.channel_layer.group_send.reset_mock()
+        with CaptureQueriesContext(connection) as queries:
+            stats = self.run_cycle()
+        self.assertEqual(stats['changed'], 0)
+        self.assertFalse(any(q['sql'].startswith('UPDATE') for q in queries.captured_queries))
+        self.updater.websocket_service.channel_layer.group_send.assert_not_called()
+
+    def test_cycle_prunes_expired_provider_cache_entries(self):
+        cache = self.updater.market_service.cache
+        cache['auto_OLD_quote_20260101_09'] = (time.time() - 7200, {'price': 1.0})
+        cache['auto_NEW_quote_20260101_10'] = (time.time(), {'price': 2.0})
+
+        self.run_cycle()
+
+        self.assertEqual(list(cache), ['auto_NEW_quote_20260101_10'])
+
+    def test_stop_closes_the_provider_session_then_the_loop(self):
+        self.run_cycle()
+        loop = self.updater._loop
+        closed_while_loop_open = []
+
+        async def close():
+            closed_while_loop_open.append(not loop.is_closed())
+
+        self.updater.market_service.close = close
+        self.updater.stop()
+
+        self.assertEqual(closed_while_loop_open, [True])
+        self.assertTrue(loop.is_closed())
+        self.assertIsNone(self.updater._loop)
+
+        # A later cycle gets a fresh loop
+        self.run_cycle()
+        self.assertFalse(self.updater._loop.is_closed())
+        self.updater.stop()
+
+
+class BatchedQuotesTestCase(TestCase):
+    """Tests for MarketDataAPIService.get_stock_quotes"""
+
+    def test_cached_then_snapshot_batches_then_fallback(self):
+        service = MarketDataAPIService()
+        service.session = MagicMock()
+        service.api_keys = {DataProvider.POLYGON: MagicMock(rate_limit=100, last_request=time.time(), request_count=0)}
+        service.cache[service._get_cache_key('auto', 'AAPL', 'quote')] = (time.time(), {'price': 1.0})
+
+        async def snapshot(symbols):
+            return {s: {'symbol': s, 'price': 2.0} for s in symbols if s != 'ZZZ'}
+
+        with patch.object(service, '_fetch_polygon_snapshot', side_effect=snapshot) as snapshot_mock, \
+                patch.object(service, 'get_stock_quote', AsyncMock(return_value=None)) as single_mock:
+            quotes = asyncio.run(service.get_stock_quotes(['AAPL', 'MSFT', 'NVDA', 'TSLA', 'ZZZ', 'MSFT'], batch_size=2))
+
+        self.assertEqual(quotes['AAPL'], {'price': 1.0})
+        self.assertEqual(sorted(quotes), ['AAPL', 'MSFT', 'NVDA', 'TSLA'])
+        self.assertEqual([call.args[0] for call in snapshot_mock.call_args_list], [['MSFT', 'NVDA'], ['TSLA', 'ZZZ']])
+        single_mock.assert_awaited_once_with('ZZZ')
+        self.assertTrue(service._is_cache_valid(service._get_cache_key('auto', 'NVDA', 'quote')))
@@ -539,10 +539,15 @@ class StockType(DjangoObjectType):
     recommendation = graphene.String(description="Investment recommendation: BUY, HOLD, or AVOID")
     fssScore = graphene.Field('core.types.FSSScoreType', description="Future Success Score v3.0")
     mlScore = graphene.Float(description="ML-based stock score")
+    rahaSignals = graphene.List(
+        'core.raha_types.RAHASignalType',
+        limit=graphene.Int(default_value=5),
+        description="Most recent RAHA signals for this symbol",
+    )
 
     def resolve_beginnerFriendlyScore(self, info):
         """Resolve camelCase beginnerFriendlyScore - uses dynamic calculation."""
-        return self.resolve_beginner_friendly_score(info)
+        return StockType.resolve_beginner_friendly_score(self, info)
 
     def resolve_recommendation(self, info):
         """Calculate recommendation based on beginner-friendly score.
@@ -551,7 +556,7 @@ class StockType(DjangoObjectType):
         - HOLD: Score 40-59 (neutral)
         - AVOID: Score < 40 (too risky for beginners)
         """
-        score = self.resolve_beginner_friendly_score(info)
+        score = StockType.resolve_beginner_friendly_score(self, info)
 
         if score >= 60:
             return "BUY"
@@ -657,15 +662,16 @@ class StockType(DjangoObjectType):
                 logger = logging.getLogger(__name__)
 
                 try:
-                    # Get user's portfolio and financial profile
-                    from core.models import Portfolio, IncomeProfile
-                    from django.db.models import Sum
+                    # Get user's portfolio and financial profile (loaded once per
+                    # request, not once per scored stock)
+                    from .dataloaders import batch_load_portfolio_holdings, batch_load_income_profiles
+                    from .graphql.dataloaders import load_now
+
+                    holdings = load_now(info, 'portfolio_holdings_loader', batch_load_portfolio_holdings, [user.id])[0]
+                    profile = load_now(info, 'income_profile_loader', batch_load_income_profiles, [user.id])[0]
 
                     # Get TOTAL portfolio value across all holdings
-                    portfolio_total = Portfolio.objects.filter(user=user).aggregate(
-                        total=Sum('total_value')
-                    )
-                    portfolio_value = float(portfolio_total.get('total') or 0)
+                    portfolio_value = float(sum(h.total_value or 0 for h in holdings or []))
 
                     # Smaller portfolios = prefer safer stocks (higher bonus for safe stocks)
                     if portfolio_value > 0:
@@ -684,8 +690,7 @@ class StockType(DjangoObjectType):
 
                     # Get user's income profile for risk tolerance
                     # Note: Using IncomeProfile (not UserProfile which doesn't exist)
-                    try:
-                        profile = IncomeProfile.objects.get(user=user)
+                    if profile is not None:
                         risk_tolerance = getattr(profile, 'risk_tolerance', 'Moderate').lower()
                         income_bracket = getattr(profile, 'income_bracket', 'Unknown').lower()
 
@@ -705,7 +710,7 @@ class StockType(DjangoObjectType):
                             user_adjustment += 5
                         elif '250k' in income_bracket or '500k' in income_bracket:
                             user_adjustment += 2
-                    except IncomeProfile.DoesNotExist:
+                    else:
                         # No income profile yet - use moderate defaults
                         logger.debug(f"User {user.id} has no IncomeProfile, using defaults")
                         user_adjustment += 5  # Default moderate adjustment
@@ -766,6 +771,21 @@ class StockType(DjangoObjectType):
         """Get ML score (if available)"""
         # This would come from ML service
         return None
+
+    def resolve_rahaSignals(self, info, limit=5):
+        """Latest global and own RAHA signals (one query for every stock in the result)"""
+        from .dataloaders import Deferred, batch_load_raha_signals
+        from .graphql.dataloaders import get_loader
+
+        user = getattr(info.context, 'user', None)
+        user_id = user.id if user and not getattr(user, 'is_anonymous', True) else None
+
+        def visible(signals):
+            return [s for s in signals or [] if s.user_id is None or s.user_id == user_id][:limit]
+
+        loader = get_loader(info, 'raha_signals_loader')
+        signals = loader.load(self.symbol) if loader else batch_load_raha_signals([self.symbol])[0]
+        return signals.then(visible) if isinstance(signals, Deferred) else visible(signals)
 class StockDataType(DjangoObjectType):
     class Meta:
 
@@ -850,9 +870,8 @@ class PortfolioType(DjangoObjectType):
     createdAt = graphene.DateTime()
     updatedAt = graphene.DateTime()
     def resolve_stock(self, info):
-
-
-                return self.stock
+        from .graphql.dataloaders import load_related
+        return load_related(info, self, 'stock', 'stock_by_id_loader')
     def resolve_currentPrice(self, info):
 
 
@@ -897,9 +916,8 @@ class DiscussionCommentType(DjangoObjectType):
     score = graphene.Int()
     replyCount = graphene.Int()
     def resolve_user(self, info):
-
-
-                return self.user
+        from .graphql.dataloaders import load_related
+        return load_related(info, self, 'user', 'user_loader')
     def resolve_parentComment(self, info):
 
 
@@ -952,13 +970,11 @@ class StockDiscussionType(DjangoObjectType):
     commentCount = graphene.Int()
     comments = graphene.List(DiscussionCommentType)
     def resolve_user(self, info):
-
-
-                return self.user
+        from .graphql.dataloaders import load_related
+        return load_related(info, self, 'user', 'user_loader')
     def resolve_stock(self, info):
-
-
-                return self.stock
+        from .graphql.dataloaders import load_related
+        return load_related(info, self, 'stock', 'stock_by_id_loader')
     def resolve_discussionType(self, info):
 
 
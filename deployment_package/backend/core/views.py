@@ -5,12 +5,16 @@ from django.utils.decorators import method_decorator
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
 from .authentication import get_user_from_token
+from .graphql.dataloaders.execution import DeferredExecutionContext
 import json
 
 User = get_user_model()
 
 
 class AuthenticatedGraphQLView(GraphQLView):
+    # Resolves DataLoader Deferreds so context.loaders batch one query per level
+    execution_context_class = DeferredExecutionContext
+
     def parse_body(self, request):
         """Parse the request body and extract the JWT token"""
         # Always call super first to parse the body
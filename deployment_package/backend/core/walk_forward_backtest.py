@@ -20,6 +20,7 @@ from datetime import datetime, timedelta
 import asyncio
 
 from .fss_engine import get_fss_engine, FSSEngine
+from .fss_incremental import IncrementalFSSEngine
 from .fss_data_pipeline import get_fss_data_pipeline, FSSDataRequest, FSSDataResult
 from .chan_quant_signal_engine import ChanQuantSignalEngine
 from .chan_portfolio_allocator import get_chan_portfolio_allocator, ChanPortfolioAllocator
@@ -82,7 +83,8 @@ class WalkForwardBacktester:
         rebalance_freq: str = "M",  # Monthly rebalancing
         min_robustness: float = 0.5,  # Minimum robustness to include
         max_positions: int = 20,  # Maximum positions
-        transaction_cost_bps: float = 5.0  # 5 bps transaction cost
+        transaction_cost_bps: float = 5.0,  # 5 bps transaction cost
+        incremental_fss: bool = True  # Roll FSS signals forward between rebalances
     ):
         """
         Initialize walk-forward backtester.
@@ -94,6 +96,8 @@ class WalkForwardBacktester:
             min_robustness: Minimum robustness score to include stock
             max_positions: Maximum number of positions
             transaction_cost_bps: Transaction cost in basis points
+            incremental_fss: Reuse rolling FSS state across rebalances instead of
+                recomputing every training window from scratch (same scores)
         """
         self.training_window_days = training_window_days
         self.testing_window_days = testing_window_days
@@ -101,6 +105,7 @@ class WalkForwardBacktester:
         self.min_robustness = min_robustness
         self.max_positions = max_positions
         self.transaction_cost_bps = transaction_cost_bps
+        self.incremental_fss = incremental_fss
         
         self.fss_engine = get_fss_engine()
         self.chan_engine = ChanQuantSignalEngine()
@@ -148,7 +153,7 @@ class WalkForwardBacktester:
         # Filter to test period
         prices = data_result.prices.loc[start_date:end_date]
         volumes = data_result.volumes.loc[start_date:end_date] if benchmark_ticker in data_result.volumes.columns else data_result.volumes
-        spy = data_result.spy.loc[start_date:end_date] if benchmark_ticker in data_result.spy.index else None
+        spy = data_result.spy.loc[start_date:end_date] if data_result.spy is not None and not data_result.spy.empty else None
         
         # Get rebalance dates
         rebal_dates = prices.resample(self.rebalance_freq).last().index
@@ -162,6 +167,9 @@ class WalkForwardBacktester:
         # Track performance
         robustness_vs_returns_data = []
         
+        # Rolling FSS state shared by all rebalances of this run
+        incremental_fss = IncrementalFSSEngine(self.fss_engine) if self.incremental_fss else None
+        
         # Walk-forward loop
         for i, rebal_date in enumerate(rebal_dates):
             if rebal_date not in prices.index:
@@ -186,12 +194,22 @@ class WalkForwardBacktester:
             
             try:
                 # 1. Calculate FSS scores (using only training data)
-                fss_data = self.fss_engine.compute_fss_v3(
-                    prices=train_prices,
-                    volumes=train_volumes,
-                    spy=train_spy,
-                    vix=train_vix
-                )
+                if incremental_fss is not None and train_volumes is not None and train_spy is not None:
+                    # Only the bars since the previous rebalance are new
+                    incremental_fss.advance(
+                        prices=prices.loc[:train_end],
+                        volumes=volumes.loc[:train_end],
+                        spy=spy.loc[:train_end],
+                        vix=data_result.vix.loc[:train_end] if data_result.vix is not None else None
+                    )
+                    fss_data = incremental_fss.compute_window(train_start, train_end)
+                else:
+                    fss_data = self.fss_engine.compute_fss_v3(
+                        prices=train_prices,
+                        volumes=train_volumes,
+                        spy=train_spy,
+                        vix=train_vix
+                    )
                 
                 # 2. Calculate robustness and get Kelly fractions for each ticker
                 ticker_signals = {}
@@ -200,23 +218,29 @@ class WalkForwardBacktester:
                 fss_robustness = {}
                 volatilities = {}
                 
+                # Robustness for the whole universe in one pass
+                scored = [t for t in tickers if t in fss_data.columns.get_level_values(1)]
+                robustness_scores = (
+                    self.fss_engine.calculate_regime_robustness_panel(
+                        fss_data, train_prices, train_spy, train_vix, tickers=scored
+                    )
+                    if train_spy is not None and scored else pd.Series(dtype=float)
+                )
+                
                 for ticker in tickers:
                     if ticker not in train_prices.columns:
                         continue
                     
                     try:
-                        # Get FSS result with robustness
                         fss_result = self.fss_engine.get_stock_fss(
                             ticker=ticker,
                             fss_data=fss_data,
-                            regime="Expansion",  # Will be calculated internally
-                            prices=train_prices,
-                            spy=train_spy,
-                            vix=train_vix,
-                            calculate_robustness=True
+                            regime="Expansion",
+                            calculate_robustness=False
                         )
                         
-                        if fss_result.regime_robustness_score is None or fss_result.regime_robustness_score < self.min_robustness:
+                        robustness = robustness_scores.get(ticker)
+                        if robustness is None or robustness < self.min_robustness:
                             continue  # Skip low robustness stocks
                         
                         # Get Chan quant signals (for Kelly)
@@ -235,13 +259,13 @@ class WalkForwardBacktester:
                         # Store signals
                         ticker_signals[ticker] = {
                             "fss": fss_result.fss_score,
-                            "robustness": fss_result.regime_robustness_score,
+                            "robustness": robustness,
                             "kelly": kelly_fraction
                         }
                         
                         kelly_fractions[ticker] = kelly_fraction
                         fss_scores[ticker] = fss_result.fss_score
-                        fss_robustness[ticker] = fss_result.regime_robustness_score
+                        fss_robustness[ticker] = robustness
                         
                         # Calculate volatility
                         returns = train_prices[ticker].pct_change().dropna()
@@ -1,9 +1,15 @@
+import asyncio
+
 import threading
 
 import logging
 
 import time
 
+from collections import defaultdict
+
+from decimal import Decimal, InvalidOperation
+
 
 
 from asgiref.sync import async_to_sync
@@ -16,12 +22,40 @@ from .models import Stock, Watchlist
 
 from .market_data_service import MarketDataService
 
+from .market_data_api_service import MarketDataAPIService
+
+from .websocket_streaming import get_websocket_service
+
 
 
 logger = logging.getLogger(__name__)
 
 
 
+# Seconds between the starts of two price update cycles
+
+PRICE_UPDATE_INTERVAL = 300
+
+
+
+# Streamed prices younger than this (seconds) are used instead of a provider quote
+
+STREAM_PRICE_MAX_AGE = 60
+
+
+
+# Rows per UPDATE statement when writing changed prices
+
+PRICE_WRITE_BATCH_SIZE = 500
+
+
+
+# Longest wait in stop() for an in-flight update cycle to finish
+
+STOP_TIMEOUT = 30
+
+
+
 
 
 class WebSocketService:
@@ -146,6 +180,104 @@ class WebSocketService:
 
 
 
+    def broadcast_stock_price_batch(self, price_updates: dict):
+
+        """Broadcast one cycle's changed prices as one message per group."""
+
+        if not price_updates or not self._ensure_channel_layer():
+
+            return
+
+
+
+        try:
+
+            timestamp = time.time()
+
+            updates = {
+
+                symbol: {
+
+                    "symbol": symbol,
+
+                    "price": price_data.get("price", 0),
+
+                    "change": price_data.get("change", 0),
+
+                    "change_percent": price_data.get("change_percent", 0),
+
+                    "volume": price_data.get("volume", 0),
+
+                }
+
+                for symbol, price_data in price_updates.items()
+
+            }
+
+
+
+            # One message with every changed symbol for all users
+
+            async_to_sync(self.channel_layer.group_send)(
+
+                "stock_prices_all",
+
+                {
+
+                    "type": "stock_price_batch",
+
+                    "updates": list(updates.values()),
+
+                    "timestamp": timestamp,
+
+                },
+
+            )
+
+
+
+            # One message per user with the changed symbols on their watchlist
+
+            user_symbols = defaultdict(list)
+
+            for user_id, symbol in (
+
+                Watchlist.objects.filter(stock__symbol__in=list(updates))
+
+                .values_list("user_id", "stock__symbol")
+
+                .distinct()
+
+            ):
+
+                user_symbols[user_id].append(symbol)
+
+
+
+            for user_id, symbols in user_symbols.items():
+
+                async_to_sync(self.channel_layer.group_send)(
+
+                    f"stock_prices_{user_id}",
+
+                    {
+
+                        "type": "stock_price_batch",
+
+                        "updates": [updates[symbol] for symbol in sorted(symbols)],
+
+                        "timestamp": timestamp,
+
+                    },
+
+                )
+
+        except Exception as e:
+
+            logger.error(f"Error broadcasting {len(price_updates)} stock price updates: {e}")
+
+
+
     def broadcast_price_alert(self, user_id, symbol, price, alert_type, message):
 
         """Broadcast a price alert to a specific user."""
@@ -304,10 +436,18 @@ class StockPriceUpdater:
 
         self.websocket_service = WebSocketService()
 
-        self.market_service = MarketDataService()
+        self.market_service = MarketDataAPIService()
 
         self.running = False
 
+        self._loop = None
+
+        self._loop_lock = threading.Lock()
+
+        self._thread = None
+
+        self._stop_event = threading.Event()
+
 
 
     def start(self):
@@ -322,103 +462,249 @@ class StockPriceUpdater:
 
         self.running = True
 
+        self._stop_event.clear()
+
         logger.info("Starting stock price updater service")
 
-        thread = threading.Thread(target=self._update_loop, daemon=True)
+        self._thread = threading.Thread(target=self._update_loop, daemon=True)
 
-        thread.start()
+        self._thread.start()
 
 
 
     def stop(self):
 
-        """Stop the stock price updater service."""
+        """Stop the stock price updater service and release its provider session and event loop."""
 
         self.running = False
 
+        self._stop_event.set()
+
         logger.info("Stopping stock price updater service")
 
+        thread = self._thread
+
+        if thread is not None and thread is not threading.current_thread():
+
+            # Let an in-flight cycle finish before closing what it uses
+
+            thread.join(timeout=STOP_TIMEOUT)
+
+        self._close_loop()
+
 
 
     def _update_loop(self):
 
         """Main update loop for stock prices."""
 
-        while self.running:
+        try:
+
+            while self.running:
 
-            try:
+                try:
 
-                watched_stocks = (
+                    started = time.monotonic()
 
-                    Stock.objects.filter(watchlist__isnull=False).distinct()
+                    self.run_cycle()
 
-                )
 
 
+                    # Wait out the rest of the interval before the next cycle (stop() wakes it)
+
+                    self._stop_event.wait(max(0.0, PRICE_UPDATE_INTERVAL - (time.monotonic() - started)))
+
+                except Exception as e:
+
+                    logger.error(f"Error in stock price update loop: {e}")
+
+                    # Back off 1 minute before retry
+
+                    self._stop_event.wait(60)
+
+        finally:
+
+            self._close_loop()
+
+
+
+    def run_cycle(self) -> dict:
+
+        """
+
+        Refresh the prices of every watched stock once.
+
+
+
+        Quotes come from the streaming price cache when fresh, otherwise from
+
+        batched provider calls. Changed prices are written with one
+
+        bulk_update and broadcast as one message per group.
+
+
+
+        Returns:
+
+            Counts of watched, quoted, streamed and changed symbols
+
+        """
+
+        watched_stocks = list(
+
+            Stock.objects.filter(watchlisted_by__isnull=False)
+
+            .distinct()
+
+            .only("id", "symbol", "current_price")
+
+        )
+
+        quotes, streamed = self._fetch_quotes([stock.symbol for stock in watched_stocks])
 
-                for stock in watched_stocks:
+        # The provider's quote cache is keyed by hour; drop what has expired
 
-                    try:
+        self.market_service.prune_cache()
 
-                        price_data = self.market_service.get_stock_quote(stock.symbol)
 
-                        if not price_data:
 
-                            continue
+        changed = []
 
+        price_updates = {}
 
+        for stock in watched_stocks:
 
-                        # Update DB
+            price_data = quotes.get(stock.symbol)
 
-                        stock.current_price = price_data.get(
+            price = self._to_price(price_data.get("price")) if price_data else None
 
-                            "price", stock.current_price
+            if price is None or price == stock.current_price:
 
-                        )
+                continue
 
-                        stock.save(update_fields=["current_price"])
+            stock.current_price = price
 
+            changed.append(stock)
 
+            price_updates[stock.symbol] = price_data
 
-                        # Broadcast via WebSocket
 
-                        self.websocket_service.broadcast_stock_price_update(
 
-                            stock.symbol, price_data
+        if changed:
 
-                        )
+            Stock.objects.bulk_update(changed, ["current_price"], batch_size=PRICE_WRITE_BATCH_SIZE)
 
+            self.websocket_service.broadcast_stock_price_batch(price_updates)
 
 
-                        logger.info(
 
-                            f"Updated price for {stock.symbol}: "
+        stats = {
 
-                            f"${price_data.get('price', 0)}"
+            "watched": len(watched_stocks),
 
-                        )
+            "quoted": len(quotes),
 
-                    except Exception as e:
+            "streamed": streamed,
 
-                        logger.error(
+            "changed": len(changed),
 
-                            f"Error updating price for {stock.symbol}: {e}"
+        }
 
-                        )
+        logger.info(f"Stock price update cycle: {stats}")
 
+        return stats
 
 
-                # Wait 5 minutes before next refresh
 
-                time.sleep(300)
+    def _fetch_quotes(self, symbols):
+
+        """Fresh streamed prices where available, batched provider quotes for the rest."""
+
+        quotes = {}
+
+        stream = get_websocket_service()
+
+        now = time.time()
+
+        for symbol in symbols:
+
+            cached = stream.get_latest_price(symbol)
+
+            if not cached or now - cached.get("last_updated", 0) > STREAM_PRICE_MAX_AGE:
+
+                continue
+
+            price = cached.get("price") or cached.get("close")
+
+            if price:
+
+                quotes[symbol] = {**cached, "price": price}
+
+        streamed = len(quotes)
+
+
+
+        missing = [symbol for symbol in symbols if symbol not in quotes]
+
+        if missing:
+
+            # The provider's aiohttp session stays bound to this updater's own loop
+
+            # (held under the lock so stop() cannot close it mid-fetch)
+
+            with self._loop_lock:
+
+                if self._loop is None or self._loop.is_closed():
+
+                    self._loop = asyncio.new_event_loop()
+
+                quotes.update(self._loop.run_until_complete(self.market_service.get_stock_quotes(missing)))
+
+        return quotes, streamed
+
+
+
+    def _close_loop(self):
+
+        """Close the provider session, then the private event loop."""
+
+        with self._loop_lock:
+
+            loop, self._loop = self._loop, None
+
+            if loop is None or loop.is_closed():
+
+                return
+
+            try:
+
+                loop.run_until_complete(self.market_service.close())
 
             except Exception as e:
 
-                logger.error(f"Error in stock price update loop: {e}")
+                logger.warning(f"Error closing market data session: {e}")
+
+            finally:
+
+                loop.close()
+
+
+
+    @staticmethod
+
+    def _to_price(value):
+
+        """Quote price as a 2-dp Decimal (the current_price column), or None if unusable."""
+
+        try:
+
+            price = Decimal(str(value)).quantize(Decimal("0.01"))
+
+        except (InvalidOperation, TypeError, ValueError):
 
-                # Back off 1 minute before retry
+            return None
 
-                time.sleep(60)
+        return price if price > 0 else None
 
 
 
@@ -4,12 +4,15 @@ Yodlee API Client - Wrapper for Yodlee FastLink and Data APIs
 import os
 import requests
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 from django.conf import settings
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Largest page Yodlee's /transactions endpoint returns
+TRANSACTIONS_PAGE_SIZE = 500
+
 
 class YodleeClient:
     """Client for Yodlee API integration"""
@@ -312,36 +315,63 @@ class YodleeClient:
         from_date: Optional[str] = None,
         to_date: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get transactions for user"""
+        """Get transactions for user (all pages)"""
         try:
-            transactions_url = f"{self.base_url}/transactions"
-            headers = self._get_user_token_headers(user_id)
-            
-            params = {}
-            if account_id:
-                params['accountId'] = account_id
-            if from_date:
-                params['fromDate'] = from_date
-            if to_date:
-                params['toDate'] = to_date
-            
+            return [
+                txn
+                for page in self.iter_transaction_pages(user_id, account_id, from_date, to_date)
+                for txn in page
+            ]
+        
+        except Exception as e:
+            logger.error(f"Error getting transactions: {e}")
+            return []
+    
+    def iter_transaction_pages(
+        self,
+        user_id: str,
+        account_id: Optional[str] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        page_size: int = TRANSACTIONS_PAGE_SIZE
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield transactions one page at a time, following Yodlee's skip/top paging.
+        
+        Raises:
+            requests.HTTPError: If a page cannot be fetched
+        """
+        transactions_url = f"{self.base_url}/transactions"
+        headers = self._get_user_token_headers(user_id)
+        
+        params = {'top': page_size}
+        if account_id:
+            params['accountId'] = account_id
+        if from_date:
+            params['fromDate'] = from_date
+        if to_date:
+            params['toDate'] = to_date
+        
+        skip = 0
+        while True:
             response = requests.get(
                 transactions_url,
                 headers=headers,
-                params=params,
+                params={**params, 'skip': skip},
                 timeout=10
             )
             
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('transaction', [])
-            else:
+            if response.status_code != 200:
                 logger.error(f"Failed to get transactions: {response.status_code} - {response.text}")
-                return []
-        
-        except Exception as e:
-            logger.error(f"Error getting transactions: {e}")
-            return []
+                response.raise_for_status()
+                raise requests.HTTPError(f"Unexpected status {response.status_code}", response=response)
+            
+            page = response.json().get('transaction', []) or []
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            skip += len(page)
     
     def refresh_account(self, provider_account_id: str) -> bool:
         """Trigger account refresh for provider account"""
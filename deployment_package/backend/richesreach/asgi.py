@@ -16,3 +16,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'richesreach.settings')
 # is populated before importing code that may import ORM models.
 application = get_asgi_application()
 
+# Load ML model bundles now rather than on the first scoring request
+from core.ml.model_registry import warm_up_from_settings  # noqa: E402
+
+warm_up_from_settings()
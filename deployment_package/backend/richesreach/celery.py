@@ -1,9 +1,18 @@
 import os
 
 from celery import Celery
+from celery.signals import worker_process_init
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'richesreach.settings')
 
 app = Celery('richesreach')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
+
+
+@worker_process_init.connect
+def warm_ml_models(**kwargs):
+    """Load ML model bundles in each worker process before it takes tasks."""
+    from core.ml.model_registry import warm_up_from_settings
+
+    warm_up_from_settings()
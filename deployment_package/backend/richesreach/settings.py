@@ -50,6 +50,9 @@ ENABLE_SHADOW_MODELS = os.getenv('ENABLE_SHADOW_MODELS', 'true').lower() == 'tru
 ENABLE_ADAPTIVE_BANDIT = os.getenv('ENABLE_ADAPTIVE_BANDIT', 'true').lower() == 'true'
 ENABLE_EXECUTION_RL = os.getenv('ENABLE_EXECUTION_RL', 'true').lower() == 'true'
 ENABLE_HMM_REGIME = os.getenv('ENABLE_HMM_REGIME', 'true').lower() == 'true'
+# Pre-load ML model bundles (core/ml/model_registry) when web/Celery workers start
+ML_WARM_MODELS = os.getenv('ML_WARM_MODELS', 'true').lower() == 'true'
+ML_WARM_MODEL_NAMES = [n.strip() for n in os.getenv('ML_WARM_MODEL_NAMES', 'production_r2').split(',') if n.strip()]
 
 # Application definition
 INSTALLED_APPS = [
@@ -288,6 +291,7 @@ OPENAI_TIMEOUT_S = 15.0 # Request timeout in seconds
 OPENAI_MAX_RETRIES = 2 # Maximum retries on transient errors
 OPENAI_MAX_CONCURRENCY = 10 # Maximum concurrent OpenAI calls (async only)
 OPENAI_MAX_HISTORY = 20 # Maximum message history to include in prompts
+OPENAI_PING_CACHE_TTL_S = 15 # Health-check pings are coalesced and cached this long
 
 # Google Gemini Configuration (Hybrid AI Architecture)
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY') # Set this in environment variable GEMINI_API_KEY
@@ -310,6 +314,16 @@ AI_RATE_LIMIT_PER_USER = 30 # Requests per user per minute
 AI_RATE_LIMIT_WINDOW_S = 60 # Rate limit window in seconds
 # Market data cache TTL (seconds)
 MARKET_REGIME_CACHE_TTL_S = 60 # Cache market regime indicators for 60 seconds
+# AggressiveCachingService in-process memory tier (per worker; LRU + TTL)
+AGGRESSIVE_CACHE_MEMORY_TTL_S = int(os.getenv('AGGRESSIVE_CACHE_MEMORY_TTL_S', 60))
+AGGRESSIVE_CACHE_MEMORY_MAX_ENTRIES = int(os.getenv('AGGRESSIVE_CACHE_MEMORY_MAX_ENTRIES', 10000))
+AGGRESSIVE_CACHE_MEMORY_MAX_BYTES = int(os.getenv('AGGRESSIVE_CACHE_MEMORY_MAX_BYTES', 64 * 1024 * 1024))
+# Drop peer workers' memory-tier copies via Redis pub/sub when keys/tags are invalidated
+AGGRESSIVE_CACHE_PUBSUB_INVALIDATION = os.getenv('AGGRESSIVE_CACHE_PUBSUB_INVALIDATION', 'true').lower() == 'true'
+# Coalesce cache misses across workers with a short Redis lock (per-process coalescing is always on)
+AGGRESSIVE_CACHE_DISTRIBUTED_LOCKS = os.getenv('AGGRESSIVE_CACHE_DISTRIBUTED_LOCKS', 'false').lower() == 'true'
+# Polygon subscription plan ('free', 'starter', 'developer', 'advanced'): sets request pacing and snapshot access
+POLYGON_PLAN = os.getenv('POLYGON_PLAN', 'free').lower()
 # AlphaVantage API Configuration
 ALPHA_VANTAGE_API_KEY = os.getenv('ALPHA_VANTAGE_API_KEY')
 if not ALPHA_VANTAGE_API_KEY:
@@ -43,3 +43,6 @@ LOGGING = {
 # Force synchronous spending analysis in tests to avoid SQLite locking
 SPENDING_HABITS_SYNC = True
 
+
+# No background cache-invalidation subscriber threads in tests
+AGGRESSIVE_CACHE_PUBSUB_INVALIDATION = False
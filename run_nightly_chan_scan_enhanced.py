@@ -30,6 +30,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'deployment_package')
 from backend.core.fss_engine import get_fss_engine
 from backend.core.chan_quant_signal_engine import ChanQuantSignalEngine
 from backend.core.chan_portfolio_allocator import get_chan_portfolio_allocator
+from backend.core.bar_store import fetch_yfinance_bars, get_bar_store
 
 # Try to import yfinance
 try:
@@ -77,37 +78,14 @@ def fetch_historical_data(tickers: List[str], lookback_days: int = 252) -> Optio
     end_date = datetime.now()
     start_date = end_date - timedelta(days=lookback_days + 30)
     
-    prices_dict = {}
-    volumes_dict = {}
-    spy_data = None
+    # Read through the local bar store: one batched download for the missing days
+    bars = get_bar_store().get(list(tickers) + ["SPY"], start_date, end_date, fetch=fetch_yfinance_bars)
+    for ticker in list(tickers) + ["SPY"]:
+        print(f"   {ticker}: {'✅' if ticker in bars else '❌'}")
     
-    for ticker in tickers:
-        try:
-            print(f"   Fetching {ticker}...", end=" ", flush=True)
-            stock = yf.Ticker(ticker)
-            hist = stock.history(start=start_date, end=end_date, auto_adjust=True)
-            
-            if not hist.empty:
-                prices_dict[ticker] = hist['Close']
-                volumes_dict[ticker] = hist['Volume']
-                print("✅")
-            else:
-                print("❌")
-        except Exception as e:
-            print(f"❌ ({e})")
-    
-    # Fetch SPY
-    try:
-        print(f"   Fetching SPY...", end=" ", flush=True)
-        spy = yf.Ticker("SPY")
-        spy_hist = spy.history(start=start_date, end=end_date, auto_adjust=True)
-        if not spy_hist.empty:
-            spy_data = spy_hist['Close']
-            print("✅")
-        else:
-            print("❌")
-    except Exception as e:
-        print(f"❌ ({e})")
+    prices_dict = {t: bars[t]['close'] for t in tickers if t in bars}
+    volumes_dict = {t: bars[t]['volume'] for t in tickers if t in bars}
+    spy_data = bars['SPY']['close'] if 'SPY' in bars else None
     
     if not prices_dict:
         return None
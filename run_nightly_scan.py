@@ -26,9 +26,10 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'deployment_package')
 from backend.core.fss_engine import get_fss_engine
 from backend.core.chan_quant_signal_engine import ChanQuantSignalEngine
 from backend.core.chan_portfolio_allocator import get_chan_portfolio_allocator
+from backend.core.bar_store import fetch_yfinance_bars, get_bar_store
 
 try:
-    import yfinance as yf
+    import yfinance  # noqa: F401
     YFINANCE_AVAILABLE = True
 except ImportError:
     YFINANCE_AVAILABLE = False
@@ -139,20 +140,16 @@ def run_nightly_scan():
     chan_engine = ChanQuantSignalEngine()
     allocator = get_chan_portfolio_allocator()
     
-    # Fetch SPY once for all tickers (efficiency)
-    print(f"\n📊 Fetching SPY data...")
-    spy_df = yf.download('SPY', period="2y", progress=False, auto_adjust=True)
-    if spy_df.empty:
+    # Fetch 2 years for SPY and the universe at once, through the local bar store
+    # (only days it has not stored yet are downloaded)
+    print(f"\n📊 Fetching market data...")
+    start_date = datetime.now().date() - timedelta(days=730)
+    bars = get_bar_store().get(['SPY'] + UNIVERSE, start_date, fetch=fetch_yfinance_bars)
+    if 'SPY' not in bars:
         print("❌ Failed to fetch SPY data")
         return
     
-    if isinstance(spy_df.columns, pd.MultiIndex):
-        try:
-            spy_df = spy_df.xs('SPY', axis=1, level=1)
-        except:
-            spy_df.columns = spy_df.columns.droplevel(1)
-    
-    spy_prices = spy_df['Close']
+    spy_prices = bars['SPY']['close']
     market_regime = detect_regime(spy_prices)
     print(f"   Market Regime: {market_regime}")
     
@@ -181,7 +178,7 @@ def run_nightly_scan():
         
         try:
             # Fetch data (2 years for regime diversity)
-            df = yf.download(ticker, period="2y", progress=False, auto_adjust=True)
+            df = bars.get(ticker, pd.DataFrame())
             if df.empty or len(df) < GATING_RULES['MIN_HISTORY']:
                 print("SKIP (Insufficient data)")
                 log_decision({
@@ -192,16 +189,6 @@ def run_nightly_scan():
                 })
                 continue
             
-            # Handle MultiIndex
-            if isinstance(df.columns, pd.MultiIndex):
-                try:
-                    df = df.xs(ticker, axis=1, level=1)
-                except:
-                    df.columns = df.columns.droplevel(1)
-            
-            # Standardize columns
-            df = df.rename(columns={"Close": "close", "Open": "open", "High": "high", "Low": "low", "Volume": "volume"})
-            
             # --- REAL CHAN STRATEGY CALCULATION (Vectorized) ---
             
             # A. MEAN REVERSION (Bollinger Bands %B)
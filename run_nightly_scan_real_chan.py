@@ -27,9 +27,10 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'deployment_package')
 from backend.core.fss_engine import get_fss_engine
 from backend.core.chan_quant_signal_engine import ChanQuantSignalEngine
 from backend.core.chan_portfolio_allocator import get_chan_portfolio_allocator
+from backend.core.bar_store import fetch_yfinance_bars, get_bar_store
 
 try:
-    import yfinance as yf
+    import yfinance  # noqa: F401
     YFINANCE_AVAILABLE = True
 except ImportError:
     YFINANCE_AVAILABLE = False
@@ -237,21 +238,16 @@ def run_nightly_scan():
     chan_engine = ChanQuantSignalEngine()
     allocator = get_chan_portfolio_allocator()
     
-    # Fetch SPY for regime detection and relative strength
-    print(f"\n📊 Fetching SPY data...")
-    spy_data = yf.download('SPY', period="2y", progress=False, auto_adjust=True)
-    if spy_data.empty:
+    # Fetch 2 years for SPY (regime detection and relative strength) and the
+    # universe at once, through the local bar store (only missing days are downloaded)
+    print(f"\n📊 Fetching market data...")
+    start_date = datetime.now().date() - timedelta(days=730)
+    bars = get_bar_store().get(['SPY'] + UNIVERSE, start_date, fetch=fetch_yfinance_bars)
+    if 'SPY' not in bars:
         print("❌ Failed to fetch SPY data")
         return
     
-    # Handle MultiIndex
-    if isinstance(spy_data.columns, pd.MultiIndex):
-        try:
-            spy_data = spy_data.xs('SPY', axis=1, level=1)
-        except:
-            spy_data.columns = spy_data.columns.droplevel(1)
-    
-    spy_prices = spy_data['Close']
+    spy_prices = bars['SPY']['close']
     market_regime = detect_regime(spy_prices)
     print(f"   Market Regime: {market_regime}")
     
@@ -280,7 +276,7 @@ def run_nightly_scan():
         
         try:
             # Fetch data (2 years for regime diversity)
-            stock_data = yf.download(ticker, period="2y", progress=False, auto_adjust=True)
+            stock_data = bars.get(ticker, pd.DataFrame())
             if stock_data.empty or len(stock_data) < GATING_RULES['MIN_HISTORY']:
                 print("SKIP (Insufficient data)")
                 log_decision({
@@ -291,15 +287,8 @@ def run_nightly_scan():
                 })
                 continue
             
-            # Handle MultiIndex
-            if isinstance(stock_data.columns, pd.MultiIndex):
-                try:
-                    stock_data = stock_data.xs(ticker, axis=1, level=1)
-                except:
-                    stock_data.columns = stock_data.columns.droplevel(1)
-            
-            prices = stock_data['Close']
-            volumes = stock_data['Volume']
+            prices = stock_data['close']
+            volumes = stock_data['volume']
             current_price = float(prices.iloc[-1])
             
             # Build REAL Chan FSS history
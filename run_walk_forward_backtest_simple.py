@@ -18,7 +18,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'deployment_package')
 
 # Try to import yfinance
 try:
-    import yfinance as yf
+    import yfinance  # noqa: F401
     YFINANCE_AVAILABLE = True
 except ImportError:
     print("⚠️  yfinance not available. Install with: pip install yfinance")
@@ -28,6 +28,7 @@ except ImportError:
 from backend.core.fss_engine import get_fss_engine
 from backend.core.chan_quant_signal_engine import ChanQuantSignalEngine
 from backend.core.chan_portfolio_allocator import get_chan_portfolio_allocator
+from backend.core.bar_store import fetch_yfinance_bars, get_bar_store
 from backend.core.fss_backtest import FSSBacktester
 
 
@@ -35,37 +36,14 @@ def fetch_data_yfinance(tickers: List[str], start_date: datetime, end_date: date
     """Fetch historical data using yfinance"""
     print(f"\n📊 Fetching data for {len(tickers)} tickers from {start_date.date()} to {end_date.date()}...")
     
-    prices_dict = {}
-    volumes_dict = {}
-    spy_data = None
+    # Read through the local bar store: one batched download for the missing days
+    bars = get_bar_store().get(list(tickers) + ["SPY"], start_date, end_date, fetch=fetch_yfinance_bars)
+    for ticker in list(tickers) + ["SPY"]:
+        print(f"   {ticker}: {'✅' if ticker in bars else '❌ (no data)'}")
     
-    for ticker in tickers:
-        try:
-            print(f"   Fetching {ticker}...", end=" ", flush=True)
-            stock = yf.Ticker(ticker)
-            hist = stock.history(start=start_date, end=end_date, auto_adjust=True)
-            
-            if not hist.empty:
-                prices_dict[ticker] = hist['Close']
-                volumes_dict[ticker] = hist['Volume']
-                print("✅")
-            else:
-                print("❌ (no data)")
-        except Exception as e:
-            print(f"❌ ({e})")
-    
-    # Fetch SPY for benchmark
-    try:
-        print(f"   Fetching SPY...", end=" ", flush=True)
-        spy = yf.Ticker("SPY")
-        spy_hist = spy.history(start=start_date, end=end_date, auto_adjust=True)
-        if not spy_hist.empty:
-            spy_data = spy_hist['Close']
-            print("✅")
-        else:
-            print("❌")
-    except Exception as e:
-        print(f"❌ ({e})")
+    prices_dict = {t: bars[t]['close'] for t in tickers if t in bars}
+    volumes_dict = {t: bars[t]['volume'] for t in tickers if t in bars}
+    spy_data = bars['SPY']['close'] if 'SPY' in bars else None
     
     # Convert to DataFrames
     prices = pd.DataFrame(prices_dict)